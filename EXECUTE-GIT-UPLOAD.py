@@ -1,85 +1,17 @@
 #!/usr/bin/env python3
 """
 SCRIPT INDEPENDIENTE PARA SUBIR CAMBIOS A GITHUB
-Se ejecuta completamente independiente del terminal actual
+Usa rent360push: una sola sesión git para status, add, commit y push
 """
 
-import subprocess
 import os
 import sys
-import time
 
-# Cambiar al directorio del proyecto
-project_dir = r'C:\Users\Perrita\Documents\GitHub\Rent360.finalizado'
-os.chdir(project_dir)
+from rent360push import upload
 
-def run_command(cmd, description, show_output=True):
-    """Ejecuta comando con configuración independiente"""
-    print(f"\n🔧 {description}...")
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
 
-    try:
-        # Ejecutar con configuración que no depende del terminal actual
-        result = subprocess.run(
-            cmd,
-            shell=True,
-            cwd=project_dir,
-            capture_output=True,
-            text=True,
-            timeout=30,
-            env=dict(os.environ, **{
-                'GIT_TERMINAL_PROMPT': '0',
-                'GIT_ASKPASS': '',
-                'SSH_ASKPASS': ''
-            })
-        )
-
-        if result.returncode == 0:
-            print("✅ ÉXITO")
-            if show_output and result.stdout.strip():
-                print(f"   → {result.stdout.strip()}")
-            return True, result.stdout.strip()
-        else:
-            print("❌ ERROR")
-            if result.stderr.strip():
-                print(f"   → {result.stderr.strip()}")
-            return False, result.stderr.strip()
-
-    except subprocess.TimeoutExpired:
-        print("⏰ TIMEOUT (30s)")
-        return False, "Timeout"
-    except Exception as e:
-        print(f"💥 EXCEPCIÓN: {str(e)}")
-        return False, str(e)
-
-def main():
-    print("🚀 SUBIENDO CORRECCIÓN CRÍTICA A GITHUB")
-    print("=" * 60)
-    print("Ejecutando de manera INDEPENDIENTE del terminal actual")
-    print("=" * 60)
-
-    # Verificar entorno
-    print(f"📁 Directorio: {project_dir}")
-    print(f"🔍 Git disponible: {'Sí' if subprocess.run('git --version', shell=True, capture_output=True).returncode == 0 else 'No'}")
-
-    # Paso 1: Verificar estado
-    success, output = run_command('git status --porcelain', 'Verificando cambios pendientes')
-    if not success:
-        print("\n❌ Error al verificar estado")
-        return False
-
-    if not output.strip():
-        print("📋 No hay cambios pendientes")
-        return True
-
-    print(f"📝 Cambios encontrados:\n{output}")
-
-    # Paso 2: Agregar cambios
-    success, _ = run_command('git add .', 'Agregando todos los cambios')
-    if not success:
-        return False
-
-    # Paso 3: Crear commit
-    commit_msg = '''fix: correccion FINAL error TypeScript createdAt
+COMMIT_MESSAGE = '''fix: correccion FINAL error TypeScript createdAt
 
 🚨 CORRECCIÓN CRÍTICA PARA DIGITALOCEAN APP PLATFORM
 
@@ -91,50 +23,7 @@ def main():
 
 Este commit resuelve el error que está causando fallos en DigitalOcean.'''
 
-    success, output = run_command(f'git commit -m "{commit_msg}"', 'Creando commit')
-
-    # Si no hay cambios para commitear, es normal
-    if not success:
-        if "nothing to commit" in (output or "").lower():
-            print("⚠️  No hay cambios nuevos para commitear")
-        else:
-            return False
-
-    # Paso 4: Subir a GitHub
-    success, _ = run_command('git push origin master', 'Subiendo a GitHub (master)')
-    if not success:
-        print("⚠️  Intentando con rama 'main'...")
-        success, _ = run_command('git push origin main', 'Subiendo a GitHub (main)')
-        if not success:
-            return False
-
-    print("\n" + "=" * 60)
-    print("🎉 ¡CORRECCIÓN SUBIDA EXITOSAMENTE A GITHUB!")
-    print("=" * 60)
-    print("\n✅ DigitalOcean ahora puede hacer build exitosamente")
-    print("✅ Error TypeScript corregido")
-    print("✅ Proyecto listo para producción")
-    print("\n🚀 El próximo build debería ser EXITOSO!")
-
-    return True
-
 if __name__ == "__main__":
-    try:
-        success = main()
-        if success:
-            print("\n✅ PROCESO COMPLETADO EXITOSAMENTE")
-        else:
-            print("\n❌ Error en el proceso")
-            sys.exit(1)
-    except KeyboardInterrupt:
-        print("\n⏹️  Proceso interrumpido por usuario")
-        sys.exit(1)
-    except Exception as e:
-        print(f"\n💥 Error inesperado: {str(e)}")
-        sys.exit(1)
-
-    # Pausa al final
-    try:
-        input("\nPresiona Enter para salir...")
-    except:
-        pass
+    print("🚀 SUBIENDO CORRECCIÓN CRÍTICA A GITHUB")
+    print("=" * 60)
+    sys.exit(0 if upload(COMMIT_MESSAGE, root=PROJECT_DIR) else 1)
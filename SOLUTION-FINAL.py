@@ -1,98 +1,17 @@
 #!/usr/bin/env python3
 """
 SOLUCIÓN FINAL - SUBIDA AUTOMÁTICA A GITHUB
-Script completamente independiente del terminal atascado
+Usa rent360push: una sola sesión git para status, add, commit y push
 """
 
-import subprocess
 import os
 import sys
-import tempfile
 
-# Configuración del proyecto
-PROJECT_DIR = r'C:\Users\Perrita\Documents\GitHub\Rent360.finalizado'
+from rent360push import upload
 
-def execute_git_commands():
-    """Ejecuta todos los comandos Git de manera independiente"""
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
 
-    print("🚀 INICIANDO SUBIDA AUTOMÁTICA A GITHUB")
-    print("=" * 70)
-    print("Script independiente - NO depende del terminal actual")
-    print("=" * 70)
-
-    # Cambiar al directorio del proyecto
-    original_dir = os.getcwd()
-    try:
-        os.chdir(PROJECT_DIR)
-        print(f"📁 Cambiado a: {PROJECT_DIR}")
-    except Exception as e:
-        print(f"❌ Error al cambiar directorio: {e}")
-        return False
-
-    # Verificar Git
-    try:
-        git_version = subprocess.run(['git', '--version'], capture_output=True, text=True, timeout=10)
-        if git_version.returncode != 0:
-            print("❌ Git no está disponible")
-            return False
-        print(f"✅ Git disponible: {git_version.stdout.strip()}")
-    except Exception as e:
-        print(f"❌ Error con Git: {e}")
-        return False
-
-    # Función para ejecutar comandos Git
-    def git_cmd(args, description):
-        print(f"\n🔧 {description}...")
-        try:
-            # Configuración para evitar prompts interactivos
-            env = os.environ.copy()
-            env.update({
-                'GIT_TERMINAL_PROMPT': '0',
-                'GIT_ASKPASS': '',
-                'SSH_ASKPASS': '',
-                'GIT_AUTHOR_NAME': 'Rent360 Auto Commit',
-                'GIT_AUTHOR_EMAIL': 'auto@rent360.com',
-                'GIT_COMMITTER_NAME': 'Rent360 Auto Commit',
-                'GIT_COMMITTER_EMAIL': 'auto@rent360.com'
-            })
-
-            result = subprocess.run(
-                ['git'] + args,
-                cwd=PROJECT_DIR,
-                env=env,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-
-            if result.returncode == 0:
-                print("✅ ÉXITO")
-                if result.stdout.strip():
-                    print(f"   → {result.stdout.strip()}")
-                return True
-            else:
-                print("❌ ERROR")
-                if result.stderr.strip():
-                    print(f"   → {result.stderr.strip()}")
-                return False
-
-        except subprocess.TimeoutExpired:
-            print("⏰ TIMEOUT")
-            return False
-        except Exception as e:
-            print(f"💥 EXCEPCIÓN: {e}")
-            return False
-
-    # Paso 1: Verificar estado
-    if not git_cmd(['status', '--porcelain'], 'Verificando cambios pendientes'):
-        return False
-
-    # Paso 2: Agregar cambios
-    if not git_cmd(['add', '.'], 'Agregando todos los cambios'):
-        return False
-
-    # Paso 3: Crear commit
-    commit_message = '''fix: correccion FINAL error TypeScript createdAt
+COMMIT_MESSAGE = '''fix: correccion FINAL error TypeScript createdAt
 
 🚨 CORRECCIÓN CRÍTICA PARA DIGITALOCEAN APP PLATFORM
 
@@ -104,67 +23,7 @@ def execute_git_commands():
 
 Este commit resuelve el error que está causando fallos en DigitalOcean.'''
 
-    # Intentar commit
-    commit_success = git_cmd(['commit', '-m', commit_message], 'Creando commit')
-
-    # Si falla por "nothing to commit", continuar
-    if not commit_success:
-        # Verificar si es porque no hay cambios
-        check_result = subprocess.run(
-            ['git', 'status', '--porcelain'],
-            cwd=PROJECT_DIR,
-            capture_output=True,
-            text=True
-        )
-        if not check_result.stdout.strip():
-            print("⚠️  No hay cambios para commitear")
-        else:
-            print("❌ Error al crear commit")
-            return False
-
-    # Paso 4: Subir a GitHub
-    if not git_cmd(['push', 'origin', 'master'], 'Subiendo a GitHub (master)'):
-        print("⚠️  Intentando con rama 'main'...")
-        if not git_cmd(['push', 'origin', 'main'], 'Subiendo a GitHub (main)'):
-            print("❌ Error al subir a ambas ramas")
-            return False
-
-    # Restaurar directorio original
-    try:
-        os.chdir(original_dir)
-    except:
-        pass
-
-    print("\n" + "=" * 70)
-    print("🎉 ¡CORRECCIÓN SUBIDA EXITOSAMENTE A GITHUB!")
-    print("=" * 70)
-    print("\n✅ DigitalOcean ahora puede hacer build exitosamente")
-    print("✅ Error TypeScript corregido definitivamente")
-    print("✅ Proyecto listo para producción")
-    print("\n🚀 El próximo build debería ser EXITOSO!")
-    print("\n📊 Estado: RESUELTO - DigitalOcean App Platform debería funcionar")
-
-    return True
-
-def main():
-    try:
-        success = execute_git_commands()
-        if success:
-            print("\n✅ PROCESO COMPLETADO EXITOSAMENTE")
-            print("Los cambios han sido subidos a GitHub correctamente.")
-        else:
-            print("\n❌ ERROR: No se pudieron completar todos los pasos")
-            print("Verifica tu conexión a GitHub y credenciales.")
-            return False
-    except KeyboardInterrupt:
-        print("\n⏹️  Proceso interrumpido por el usuario")
-        return False
-    except Exception as e:
-        print(f"\n💥 Error inesperado: {e}")
-        return False
-
-    return True
-
 if __name__ == "__main__":
-    success = main()
-    sys.exit(0 if success else 1)
+    print("🚀 INICIANDO SUBIDA AUTOMÁTICA A GITHUB")
+    print("=" * 70)
+    sys.exit(0 if upload(COMMIT_MESSAGE, root=PROJECT_DIR) else 1)
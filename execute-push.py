@@ -1,28 +1,27 @@
-import subprocess
+import os
+import runpy
 import sys
 
 print("🚀 EJECUTANDO PUSH FINAL...")
 print("=" * 50)
 
-# Ejecutar el script push-final.py
-try:
-    result = subprocess.run([sys.executable, 'push-final.py'],
-                          capture_output=True, text=True,
-                          cwd=r'C:\Users\Perrita\Documents\GitHub\Rent360.finalizado')
-
-    print("STDOUT:")
-    print(result.stdout)
+# push-final.py corre en este mismo intérprete (antes se lanzaba un segundo
+# Python con subprocess y se pagaba otra vez el arranque y los imports)
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'push-final.py')
 
-    if result.stderr:
-        print("\nSTDERR:")
-        print(result.stderr)
+try:
+    try:
+        runpy.run_path(SCRIPT, run_name='__main__')
+        returncode = 0
+    except SystemExit as e:
+        returncode = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
 
-    print(f"\nReturn code: {result.returncode}")
+    print(f"\nReturn code: {returncode}")
 
-    if result.returncode == 0:
+    if returncode == 0:
         print("\n✅ ¡SCRIPT EJECUTADO EXITOSAMENTE!")
     else:
-        print(f"\n❌ Error en ejecución (código: {result.returncode})")
+        print(f"\n❌ Error en ejecución (código: {returncode})")
 
 except Exception as e:
     print(f"💥 Error al ejecutar script: {str(e)}")
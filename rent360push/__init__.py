@@ -0,0 +1,124 @@
+"""
+rent360push - herramienta única de subida a GitHub para Rent360.
+
+Reúne en un paquete importable la lógica que estaba copiada en los scripts
+de la raíz (SOLUTION-FINAL.py, EXECUTE-GIT-UPLOAD.py, push-simple.py, ...).
+
+Uso:
+    python -m rent360push push -m "fix: mensaje"
+
+o desde Python:
+    from rent360push import upload
+    upload("fix: mensaje")
+"""
+
+__version__ = '0.1.0'
+
+
+def upload(message, paths=None, root=None, push=True, verbose=True, full_scan=False, verify=True, deploy=False,
+           fix=False):
+    """Agrega, commitea y sube los cambios. Devuelve True si todo salió bien.
+
+    Con `deploy` se empuja a la rama de deploy aunque el diff no afecte el build.
+    Con `fix` se aplican antes los codemods (codemod.py) y, si se pasaron
+    `paths`, se agregan los archivos que modificaron.
+
+    Si otra subida está en curso en el mismo repositorio, el pedido se suma a
+    su cola y se espera el resultado (coordinator.py).
+    """
+    import os
+
+    from . import coordinator
+    from .git import find_repo_root
+    from .cli import print_step
+    from .pipeline import StepResult
+
+    root = find_repo_root(root or '.')
+    intent = coordinator.Intent(message, list(paths) if paths else None, push, verify, deploy, fix, full_scan)
+
+    def run_batch(intents):
+        # Todos los pedidos del grupo tienen las mismas opciones (coordinator.group)
+        first = intents[0]
+        result = _upload(
+            coordinator.merge_messages(i.message for i in intents), coordinator.merge_paths(intents), root,
+            push=first.push, verbose=verbose, full_scan=first.full_scan, verify=first.verify,
+            deploy=first.deploy, fix=first.fix,
+        )
+        return {
+            'ok': result.ok,
+            'commit': result.commit,
+            'pushed_to': result.pushed_to,
+            'steps': [[s.name, s.ok, s.duration, s.detail] for s in result.steps],
+        }
+
+    def on_wait(pid):
+        if verbose:
+            print(f"⏳ Hay otra subida en curso (pid {pid or '?'}): el pedido quedó en cola")
+
+    def on_batch(batch):
+        if verbose and len(batch) > 1:
+            print(f"📦 {len(batch)} pedidos en cola: se suben en un solo commit")
+
+    result = coordinator.submit(root, intent, run_batch, on_wait=on_wait, on_batch=on_batch)
+    if verbose and result.get('leader') != os.getpid():
+        for step in result.get('steps', []):
+            print_step(StepResult(*step))
+        if result.get('batch', 1) > 1:
+            print(f"📦 Subido junto con otros {result['batch'] - 1} pedidos (pid {result['leader']})")
+    if verbose and result.get('error'):
+        print(f"❌ {result['error']}")
+    return result['ok']
+
+
+def _upload(message, paths, root, push, verbose, full_scan, verify, deploy, fix):
+    """Una subida (sin coordinación); devuelve el pipeline.UploadResult"""
+    import os
+
+    from . import trace
+    from .config import load_config, state_dir
+    from .git import GitSession
+    from .pipeline import UploadPipeline
+    from .plugins import Registry
+    from .cli import print_buildlog, print_check, print_codemod, print_output, print_step
+
+    with GitSession(root) as session:
+        config = load_config(session.root)
+        trace.configure(session.root, config)
+        if fix:
+            from . import codemod
+            fixed = codemod.run(session.root, config)
+            if verbose:
+                print_codemod(fixed)
+            if paths is not None:
+                paths = list(paths) + [p for p in fixed.paths if p not in paths]
+        detector = None
+        if config.stat_cache and not full_scan:
+            from .changes import ChangeDetector
+            detector = ChangeDetector(session)
+        plugins = Registry(config, checks=verify)
+        pipeline = UploadPipeline(
+            session,
+            config,
+            on_step=print_step if verbose else None,
+            detector=detector,
+            on_check=print_check if verbose else None,
+            on_output=print_output if verbose else None,
+            classify=not deploy,
+            plugins=plugins,
+        )
+        # Errores del último build fallido analizado; buildlog.py (y sus
+        # regex) solo se importa si hay un informe guardado
+        if verbose and os.path.exists(os.path.join(state_dir(session.root), 'buildlog.json')):
+            from . import buildlog
+            report = buildlog.load(session.root)
+            if report and report.errors:
+                print_buildlog(report, touched=buildlog.touched_since(session.root, report), limit=10)
+        result = pipeline.run(message, paths=paths, push=push)
+        if result.spooled:
+            from . import spool
+            spool.start_drainer(session.root)
+            if verbose:
+                commits = len({e['commit'] for e in spool.pending(session.root)})
+                print(f"📴 Sin conexión: el commit quedó en cola ({commits} sin subir); "
+                      "se reintenta en segundo plano")
+        return result
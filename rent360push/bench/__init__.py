@@ -0,0 +1,6 @@
+"""
+Benchmarks de rent360push.
+
+Todos trabajan sobre repositorios sintéticos en un directorio temporal con un
+remoto bare local, así que no tocan el checkout real ni GitHub.
+"""
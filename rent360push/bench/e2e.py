@@ -0,0 +1,339 @@
+"""
+Benchmark de extremo a extremo de la subida sobre repositorios sintéticos.
+
+Para cada tamaño (de 1k a 100k archivos) se crea un repo con remoto bare
+local y, en cada ronda, se aplica un churn controlado (modificados,
+agregados, borrados) y se sube con cada variante:
+
+- `legacy`: el flujo de SOLUTION-FINAL.py / EXECUTE-GIT-UPLOAD.py, un
+  `subprocess.run(..., shell=True)` por comando;
+- `pipeline`: UploadPipeline con GitSession y la caché de stat.
+
+Por fase (status, stage, commit, push) se mide tiempo real, CPU (del
+proceso y de los git hijos) y pico de RSS de todo el árbol de procesos. Las
+corridas se agregan a `.git/rent360push/bench/history.jsonl` junto con el
+commit de la herramienta, para comparar entre commits y detectar
+regresiones.
+"""
+
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+
+from ..config import Config, state_dir
+from ..git import GitError, GitSession, find_repo_root
+from ..pipeline import UploadPipeline
+from .synthetic import Churn, bench_env, create_repo
+
+PHASES = ('status', 'stage', 'commit', 'push')
+VARIANTS = ('legacy', 'pipeline')
+DEFAULT_SIZES = (1000, 10000, 100000)
+HISTORY_FILE = 'history.jsonl'
+# Diferencias menores que esto (ms) se consideran ruido
+NOISE_MS = 5.0
+
+_PAGE_KB = os.sysconf('SC_PAGE_SIZE') // 1024 if hasattr(os, 'sysconf') else 4
+
+
+def tree_rss_kb(pid):
+    """RSS total de `pid` y todos sus descendientes (Linux, vía /proc)"""
+    parents = {}
+    rss = {}
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat', 'rb') as f:
+                data = f.read()
+        except OSError:
+            continue
+        # El nombre del comando va entre paréntesis y puede contener espacios
+        fields = data[data.rfind(b')') + 2:].split()
+        parents[int(name)] = int(fields[1])
+        rss[int(name)] = int(fields[21])
+    children = {}
+    for child, parent in parents.items():
+        children.setdefault(parent, []).append(child)
+    total = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        total += rss.get(current, 0)
+        stack.extend(children.get(current, ()))
+    return total * _PAGE_KB
+
+
+class _Sampler(threading.Thread):
+    """Muestrea el RSS del árbol de procesos y guarda el pico"""
+
+    def __init__(self, interval):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.pid = os.getpid()
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.peak = 0
+        self.cpu = 0.0
+
+    def sample(self):
+        value = tree_rss_kb(self.pid)
+        with self.lock:
+            self.peak = max(self.peak, value)
+
+    def take_peak(self):
+        self.sample()
+        with self.lock:
+            peak, self.peak = self.peak, 0
+        return peak
+
+    def run(self):
+        start = time.thread_time()
+        while not self.stopped.wait(self.interval):
+            self.sample()
+            self.cpu = time.thread_time() - start
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def _cpu_seconds():
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    kids = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + kids.ru_utime + kids.ru_stime
+
+
+class PhaseMeter:
+    """Mide tiempo, CPU y pico de RSS entre llamadas sucesivas a mark()"""
+
+    def __init__(self, interval=0.02):
+        self.phases = {}
+        self.sampler = _Sampler(interval) if os.path.isdir('/proc') else None
+
+    def __enter__(self):
+        if self.sampler:
+            self.sampler.start()
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.sampler:
+            self.sampler.stop()
+
+    def _sampler_cpu(self):
+        return self.sampler.cpu if self.sampler else 0.0
+
+    def start(self):
+        self._wall = time.perf_counter()
+        self._cpu = _cpu_seconds() - self._sampler_cpu()
+        if self.sampler:
+            self.sampler.take_peak()
+
+    def mark(self, name):
+        wall = time.perf_counter()
+        cpu = _cpu_seconds() - self._sampler_cpu()
+        if self.sampler:
+            peak = self.sampler.take_peak()
+        else:
+            peak = max(resource.getrusage(r).ru_maxrss for r in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN))
+        self.phases[name] = {
+            'wall_ms': (wall - self._wall) * 1000,
+            'cpu_ms': max(0.0, cpu - self._cpu) * 1000,
+            'peak_rss_kb': peak,
+        }
+        self._wall, self._cpu = wall, cpu
+
+
+def _legacy_round(root, env, meter):
+    commands = {
+        'status': 'git status --porcelain',
+        'stage': 'git add .',
+        'commit': 'git commit -m "bench: legacy"',
+        'push': 'git push origin master',
+    }
+    meter.start()
+    for phase, command in commands.items():
+        subprocess.run(command, shell=True, cwd=root, env=env, capture_output=True, text=True)
+        meter.mark(phase)
+
+
+def _pipeline_round(root, env, meter):
+    from ..changes import ChangeDetector
+
+    meter.start()
+    with GitSession(root, env=env) as session:
+        detector = ChangeDetector(session)
+        pipeline = UploadPipeline(
+            session, Config(validate=False), detector=detector, on_step=lambda step: meter.mark(step.name)
+        )
+        pipeline.run('bench: pipeline')
+
+
+ROUNDS = {'legacy': _legacy_round, 'pipeline': _pipeline_round}
+
+
+def _environment():
+    """Commit de la herramienta y datos de la máquina, para comparar corridas"""
+    info = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+    git = subprocess.run(['git', '--version'], capture_output=True, text=True)
+    info['git'] = git.stdout.strip().replace('git version ', '')
+    try:
+        here = find_repo_root(os.path.dirname(__file__))
+    except GitError:
+        return info
+    head = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=here, capture_output=True, text=True)
+    dirty = subprocess.run(
+        ['git', 'status', '--porcelain', '--untracked-files=no', '--', 'rent360push'],
+        cwd=here, capture_output=True, text=True,
+    )
+    info['commit'] = head.stdout.strip() or None
+    info['dirty'] = bool(dirty.stdout.strip())
+    return info
+
+
+def _median_phases(samples):
+    result = {}
+    for phase in PHASES:
+        rows = [s[phase] for s in samples if phase in s]
+        if rows:
+            result[phase] = {
+                key: round(statistics.median(r[key] for r in rows), 2) for key in ('wall_ms', 'cpu_ms', 'peak_rss_kb')
+            }
+    return result
+
+
+def run(sizes=DEFAULT_SIZES, modify=50, add=5, delete=5, rounds=3, warmup=1, variants=VARIANTS,
+        seed=0, workdir=None, on_result=None):
+    """Corre el benchmark y devuelve una lista de registros (uno por tamaño
+    y variante) con las medianas de cada fase"""
+    env = bench_env()
+    stamp = time.time()
+    environment = _environment()
+    records = []
+    for files in sizes:
+        for variant in variants:
+            with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+                setup = time.perf_counter()
+                root = create_repo(os.path.join(tmp, 'repo'), files)
+                setup = time.perf_counter() - setup
+                churn = Churn(root, files, seed)
+                samples = []
+                for i in range(warmup + rounds):
+                    churn.apply(modify, add, delete)
+                    with PhaseMeter() as meter:
+                        ROUNDS[variant](root, env, meter)
+                    if i >= warmup:
+                        samples.append(meter.phases)
+            phases = _median_phases(samples)
+            record = {
+                'suite': 'e2e',
+                'time': stamp,
+                'variant': variant,
+                'files': files,
+                'churn': {'modify': modify, 'add': add, 'delete': delete},
+                'rounds': rounds,
+                'setup_s': round(setup, 2),
+                'phases': phases,
+                'total_ms': round(sum(p['wall_ms'] for p in phases.values()), 2),
+                **environment,
+            }
+            records.append(record)
+            if on_result:
+                on_result(record)
+    return records
+
+
+def history_path(root):
+    return os.path.join(state_dir(root, 'bench'), HISTORY_FILE)
+
+
+def load_history(path):
+    records = []
+    try:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def append_history(path, records):
+    with open(path, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+
+def _key(record):
+    churn = record.get('churn', {})
+    return (record.get('variant'), record.get('files'), churn.get('modify'), churn.get('add'), churn.get('delete'))
+
+
+def compare(records, history, threshold=0.2, baseline=None):
+    """Compara cada registro con el último comparable del historial (o con
+    el de `baseline`, un prefijo de commit). Devuelve filas
+    {variant, files, phase, before_ms, after_ms, change, regression}."""
+    rows = []
+    for record in records:
+        candidates = [
+            h for h in history
+            if _key(h) == _key(record) and h.get('time') != record.get('time')
+            and (baseline is None or (h.get('commit') or '').startswith(baseline))
+        ]
+        if not candidates:
+            continue
+        previous = max(candidates, key=lambda h: h.get('time', 0))
+        for phase, now in record['phases'].items():
+            before = previous.get('phases', {}).get(phase)
+            if not before:
+                continue
+            b, a = before['wall_ms'], now['wall_ms']
+            change = (a - b) / b if b else 0.0
+            rows.append({
+                'variant': record['variant'],
+                'files': record['files'],
+                'phase': phase,
+                'before_ms': b,
+                'after_ms': a,
+                'change': round(change, 3),
+                'regression': change > threshold and a - b > NOISE_MS,
+                'baseline': (previous.get('commit') or '?')[:12],
+            })
+    return rows
+
+
+def format_record(record):
+    lines = [f"📦 {record['files']} archivos, {record['variant']} ({record['total_ms']:.0f} ms en total)"]
+    for phase, row in record['phases'].items():
+        lines.append(
+            f"   {phase:<7} {row['wall_ms']:>9.1f} ms  cpu {row['cpu_ms']:>9.1f} ms  "
+            f"rss {row['peak_rss_kb'] / 1024:>7.1f} MB"
+        )
+    return '\n'.join(lines)
+
+
+def format_comparison(rows):
+    if not rows:
+        return 'Sin corridas anteriores comparables en el historial'
+    lines = []
+    for row in rows:
+        mark = '❌' if row['regression'] else '✅'
+        lines.append(
+            f"{mark} {row['variant']:<8} {row['files']:>7} {row['phase']:<7} "
+            f"{row['before_ms']:>9.1f} → {row['after_ms']:>9.1f} ms ({row['change'] * 100:+.0f}%, vs {row['baseline']})"
+        )
+    return '\n'.join(lines)
+
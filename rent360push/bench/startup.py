@@ -0,0 +1,128 @@
+"""
+Benchmark de arranque de la CLI.
+
+Los `.cmd` y los scripts de la raíz lanzan `python -m rent360push` para cada
+subida, así que el costo fijo de arranque (intérprete, imports, parser)
+se paga siempre, haya o no cambios. Se miden, sobre un repo sintético ya
+subido:
+
+- `python`: `python -c pass`, el piso del intérprete;
+- `version`: `python -m rent360push --version`;
+- `noop`: `python -m rent360push push -m ...` sin nada que commitear ni
+  empujar.
+
+El presupuesto es sobre la diferencia `noop - python` (lo que agrega la
+herramienta), no sobre el tiempo absoluto, que depende de la máquina.
+Además se revisa con `-X importtime` que el `noop` no importe los módulos
+pesados que solo hacen falta cuando hay trabajo (LAZY_MODULES).
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from ..changes import RACY_NS
+from .e2e import _environment
+from .synthetic import bench_env, create_repo
+
+PACKAGE_PARENT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Módulos que una subida sin cambios no debe importar
+LAZY_MODULES = (
+    'asyncio', 'importlib.metadata', 'rent360push.runner', 'rent360push.validate', 'rent360push.guard',
+    'rent360push.buildlog', 'rent360push.codemod', 'rent360push.bench',
+)
+BUDGET_MS = 50
+
+
+def commands():
+    return {
+        'python': [sys.executable, '-c', 'pass'],
+        'version': [sys.executable, '-m', 'rent360push', '--version'],
+        'noop': [sys.executable, '-m', 'rent360push', 'push', '-m', 'chore: sin cambios'],
+    }
+
+
+def _env():
+    env = bench_env()
+    # Se mide con los .pyc al día, como en una instalación normal
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [PACKAGE_PARENT, env.get('PYTHONPATH')]))
+    return env
+
+
+def _time(cmd, cwd, env):
+    start = time.perf_counter()
+    subprocess.run(cmd, cwd=cwd, env=env, check=True, capture_output=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def imported_modules(cmd, cwd, env=None):
+    """Módulos que importa `cmd` (un `python ...`), según `-X importtime`"""
+    proc = subprocess.run(
+        [cmd[0], '-X', 'importtime', *cmd[1:]], cwd=cwd, env=env or _env(), check=True, capture_output=True,
+        text=True,
+    )
+    modules = set()
+    for line in proc.stderr.splitlines():
+        if line.startswith('import time:') and line.count('|') == 2:
+            name = line.rsplit('|', 1)[1].strip()
+            if name != 'package':
+                modules.add(name)
+    return modules
+
+
+def eager(modules):
+    """Los LAZY_MODULES (o sus submódulos) presentes en `modules`"""
+    return sorted(m for m in modules if any(m == lazy or m.startswith(lazy + '.') for lazy in LAZY_MODULES))
+
+
+def run(rounds=15, files=200, workdir=None):
+    """Mediana de cada comando en `rounds` corridas intercaladas (para que
+    el ruido de la máquina afecte a todos por igual)"""
+    env = _env()
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        root = create_repo(os.path.join(tmp, 'repo'), files)
+        cmds = commands()
+        # Archivos recién escritos son "racy" y la caché de stat los
+        # revisaría en cada corrida; la primera subida arma la caché y no cuenta
+        time.sleep(RACY_NS / 1e9)
+        for cmd in cmds.values():
+            _time(cmd, root, env)
+        samples = {name: [] for name in cmds}
+        for _ in range(rounds):
+            for name, cmd in cmds.items():
+                samples[name].append(_time(cmd, root, env))
+        modules = imported_modules(cmds['noop'], root, env)
+    phases = {name: {'wall_ms': round(statistics.median(values), 2)} for name, values in samples.items()}
+    return {
+        'suite': 'startup',
+        'time': time.time(),
+        'variant': 'startup',
+        'files': files,
+        'churn': {},
+        'rounds': rounds,
+        'phases': phases,
+        'overhead_ms': round(phases['noop']['wall_ms'] - phases['python']['wall_ms'], 2),
+        'eager': eager(modules),
+        **_environment(),
+    }
+
+
+def over_budget(record, budget=BUDGET_MS):
+    return record['overhead_ms'] > budget or bool(record['eager'])
+
+
+def format_record(record, budget=BUDGET_MS):
+    phases = record['phases']
+    lines = [f"🚀 Arranque ({record['rounds']} corridas, mediana)"]
+    for name, row in phases.items():
+        lines.append(f"   {name:<8} {row['wall_ms']:>7.1f} ms")
+    mark = '❌' if record['overhead_ms'] > budget else '✅'
+    lines.append(f"{mark} push sin cambios: +{record['overhead_ms']:.1f} ms sobre el intérprete "
+                 f"(presupuesto {budget:g} ms)")
+    if record['eager']:
+        lines.append(f"❌ Importados sin necesidad: {', '.join(record['eager'])}")
+    return '\n'.join(lines)
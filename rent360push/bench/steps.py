@@ -0,0 +1,93 @@
+"""
+Latencia por paso: scripts antiguos vs GitSession.
+
+"Antes" reproduce el wrapper de los scripts de la raíz: un
+`subprocess.run(..., shell=True, capture_output=True)` por comando.
+"Después" usa UploadPipeline/GitSession sobre el mismo repositorio.
+Además de status/add/commit/push se mide una consulta de objeto suelta
+(`git cat-file -p` por objeto vs `cat-file --batch` persistente), que es
+donde más se nota el coste fijo de lanzar procesos.
+"""
+
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+
+from ..config import Config
+from ..git import GitSession
+from ..pipeline import UploadPipeline
+from .synthetic import bench_env, create_repo, touch_files
+
+STEPS = ('status', 'stage', 'commit', 'push', 'lookup')
+
+
+def _legacy(cmd, cwd, env):
+    start = time.perf_counter()
+    subprocess.run(cmd, shell=True, cwd=cwd, env=env, capture_output=True, text=True, timeout=60)
+    return time.perf_counter() - start
+
+
+def _legacy_round(root, env, lookups):
+    timings = {
+        'status': _legacy('git status --porcelain', root, env),
+        'stage': _legacy('git add .', root, env),
+        'commit': _legacy('git commit -m "bench: legacy"', root, env),
+        'push': _legacy('git push origin master', root, env),
+    }
+    lookup = [_legacy(f'git cat-file -p {obj}', root, env) for obj in lookups]
+    timings['lookup'] = statistics.mean(lookup)
+    return timings
+
+
+def _session_round(root, env, lookups):
+    with GitSession(root, env=env) as session:
+        pipeline = UploadPipeline(session, Config(branches=['master']))
+        pipeline.run('bench: session')
+        timings = {step.name: step.duration for step in pipeline.result.steps}
+        lookup = []
+        for obj in lookups:
+            start = time.perf_counter()
+            session.read_object(obj)
+            lookup.append(time.perf_counter() - start)
+        timings['lookup'] = statistics.mean(lookup)
+    return timings
+
+
+def run(files=945, changed=50, rounds=5, lookups=20, workdir=None):
+    """Devuelve {paso: {'before_ms', 'after_ms', 'speedup'}} con medianas"""
+    env = bench_env()
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        root = create_repo(os.path.join(tmp, 'repo'), files)
+        objects = [f'HEAD:src/mod{i:04d}' for i in range(lookups)]
+        before = {step: [] for step in STEPS}
+        after = {step: [] for step in STEPS}
+        revision = 0
+        for _ in range(rounds):
+            revision += 1
+            touch_files(root, files, changed, revision)
+            for step, value in _legacy_round(root, env, objects).items():
+                before[step].append(value)
+            revision += 1
+            touch_files(root, files, changed, revision)
+            for step, value in _session_round(root, env, objects).items():
+                after[step].append(value)
+
+    report = {}
+    for step in STEPS:
+        b = statistics.median(before[step]) * 1000
+        a = statistics.median(after[step]) * 1000
+        report[step] = {
+            'before_ms': round(b, 2),
+            'after_ms': round(a, 2),
+            'speedup': round(b / a, 2) if a else None,
+        }
+    return report
+
+
+def format_report(report):
+    lines = [f"{'paso':<8} {'antes (ms)':>11} {'después (ms)':>13} {'x':>6}"]
+    for step, row in report.items():
+        lines.append(f"{step:<8} {row['before_ms']:>11.2f} {row['after_ms']:>13.2f} {row['speedup'] or 0:>6.2f}")
+    return '\n'.join(lines)
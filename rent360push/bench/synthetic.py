@@ -0,0 +1,116 @@
+"""
+Repositorios sintéticos para benchmarks.
+
+La forma imita a `src/`: carpetas de ~30 archivos `.ts` pequeños.
+"""
+
+import os
+import random
+import subprocess
+
+from ..git import git_env
+
+BENCH_IDENTITY = {
+    'GIT_AUTHOR_NAME': 'Rent360 Bench',
+    'GIT_AUTHOR_EMAIL': 'bench@rent360.local',
+    'GIT_COMMITTER_NAME': 'Rent360 Bench',
+    'GIT_COMMITTER_EMAIL': 'bench@rent360.local',
+}
+
+FILES_PER_DIR = 30
+
+
+def bench_env():
+    return git_env(BENCH_IDENTITY)
+
+
+def _git(cwd, *args):
+    subprocess.run(['git', *args], cwd=cwd, env=bench_env(), check=True, capture_output=True)
+
+
+def file_path(index):
+    return os.path.join('src', f'mod{index // FILES_PER_DIR:04d}', f'file{index:06d}.ts')
+
+
+def _content(index, revision):
+    return (
+        f"// archivo sintético {index}\n"
+        f"export const value{index} = {revision};\n"
+        f"export function fn{index}(x: number): number {{\n"
+        f"  return x + value{index};\n"
+        f"}}\n"
+    )
+
+
+def create_repo(path, files, branch='master'):
+    """Crea un repo con `files` archivos commiteados y un remoto bare en
+    `<path>.remote.git`. Devuelve la ruta del working tree."""
+    work = os.path.abspath(path)
+    remote = work + '.remote.git'
+    os.makedirs(work, exist_ok=True)
+    subprocess.run(['git', 'init', '-q', '--bare', remote], check=True, capture_output=True)
+    _git(work, 'init', '-q', '-b', branch)
+    for i in range(files):
+        target = os.path.join(work, file_path(i))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'w', encoding='utf-8') as f:
+            f.write(_content(i, 0))
+    _git(work, 'add', '-A')
+    _git(work, 'commit', '-q', '-m', 'initial')
+    _git(work, 'remote', 'add', 'origin', remote)
+    _git(work, 'push', '-q', 'origin', branch)
+    return work
+
+
+def touch_files(root, files, count, revision, seed=0):
+    """Modifica `count` archivos al azar (reproducible con `seed`) y devuelve
+    sus rutas relativas"""
+    rng = random.Random(seed * 1_000_003 + revision)
+    chosen = rng.sample(range(files), min(count, files))
+    paths = []
+    for i in chosen:
+        rel = file_path(i)
+        with open(os.path.join(root, rel), 'w', encoding='utf-8') as f:
+            f.write(_content(i, revision))
+        paths.append(rel)
+    return paths
+
+
+class Churn:
+    """Cambios controlados y reproducibles sobre un repo de create_repo:
+    en cada ronda se modifican, agregan y borran cantidades fijas de archivos"""
+
+    def __init__(self, root, files, seed=0):
+        self.root = root
+        self.live = list(range(files))
+        self.next_index = files
+        self.rng = random.Random(seed)
+        self.revision = 0
+
+    def apply(self, modify=0, add=0, delete=0):
+        """Devuelve {'modified', 'added', 'deleted'} con las rutas tocadas"""
+        self.revision += 1
+        picked = self.rng.sample(range(len(self.live)), min(modify + delete, len(self.live)))
+        doomed = {self.live[i] for i in picked[modify:]}
+        modified = [self.live[i] for i in picked[:modify]]
+        result = {'modified': [], 'added': [], 'deleted': []}
+        for i in modified:
+            self._write(i)
+            result['modified'].append(file_path(i))
+        for i in doomed:
+            os.remove(os.path.join(self.root, file_path(i)))
+            result['deleted'].append(file_path(i))
+        self.live = [i for i in self.live if i not in doomed]
+        for _ in range(add):
+            i = self.next_index
+            self.next_index += 1
+            target = os.path.join(self.root, file_path(i))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            self._write(i)
+            self.live.append(i)
+            result['added'].append(file_path(i))
+        return result
+
+    def _write(self, index):
+        with open(os.path.join(self.root, file_path(index)), 'w', encoding='utf-8') as f:
+            f.write(_content(index, self.revision))
@@ -0,0 +1,242 @@
+"""
+Bisect en paralelo del commit que rompió el build, con resultados en caché.
+
+Cuando el build de DigitalOcean se rompe después de una tanda de pushes de
+`auto-push.py` o `SOLUTION-FINAL.py`, buscar el commit culpable a mano (o
+con `git bisect`, que prueba un punto medio por vez) cuesta un build por
+cada paso: cinco builds seguidos para 32 commits. Aquí:
+
+- los candidatos son la cadena de primeros padres de `bueno..malo`; el
+  extremo malo se da por malo y el bueno por bueno, como en `git bisect`;
+- en cada ronda se eligen tantos puntos del rango sin resolver como
+  procesos (`bisect_jobs`), repartidos a la misma distancia, y el comando
+  (`bisect_command`, p.ej. `tsc --noEmit` o `next build`) corre a la vez en
+  un checkout por punto, tomado del pool de worktrees (worktrees.py, con el
+  `node_modules` del repo compartido);
+- el rango se acota al último bueno antes del primer malo y se repite. Con
+  tantos procesos como commits alcanza una ronda;
+- el resultado de cada árbol (no de cada commit: un revert o un commit vacío
+  reutilizan el de su árbol) se guarda en `.git/rent360push/bisect.json`
+  junto con el comando. Un árbol ya visto no se vuelve a construir.
+
+Como en `git bisect run`, el código de salida 125 marca el commit como no
+comprobable. Un comando que pasa `bisect_timeout` segundos sin escribir nada
+se corta y ese punto se trata como no comprobable, sin guardarlo.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+
+from . import coordinator, worktrees
+from .config import state_dir
+
+CACHE_FILE = 'bisect.json'
+LOCK_FILE = 'bisect.lock'
+# Resultados de árboles que se conservan (los más nuevos)
+MAX_ENTRIES = 5000
+SKIP_CODE = 125
+OUTPUT_TAIL = 40
+
+GOOD, BAD, SKIP = 'good', 'bad', 'skip'
+
+
+@dataclass
+class Probe:
+    commit: str
+    tree: str
+    subject: str
+    status: str
+    duration: float = 0.0
+    cached: bool = False
+    errors: list = field(default_factory=list)
+    timed_out: bool = False
+
+
+@dataclass
+class Bisection:
+    good: str
+    bad: str
+    commits: list
+    # Primer commit malo comprobado
+    first_bad: Probe | None = None
+    # No comprobables entre el último bueno y el primer malo: cualquiera de
+    # ellos puede ser el culpable
+    suspects: list = field(default_factory=list)
+    probes: list = field(default_factory=list)
+    rounds: int = 0
+    wall: float = 0.0
+
+    @property
+    def built(self):
+        return [p for p in self.probes if not p.cached]
+
+
+def cache_key(command, tree):
+    return hashlib.sha1(f'{json.dumps(command)}\0{tree}'.encode()).hexdigest()
+
+
+class ResultCache:
+    """{clave: resultado} por (comando, árbol), en orden de inserción"""
+
+    def __init__(self, root):
+        self.path = os.path.join(state_dir(root), CACHE_FILE)
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.entries = {}
+        self.dirty = False
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def put(self, key, probe):
+        self.entries.pop(key, None)
+        self.entries[key] = {'status': probe.status, 'duration': probe.duration,
+                             'errors': probe.errors, 'commit': probe.commit, 'time': time.time()}
+        self.dirty = True
+
+    def save(self):
+        data = dict(list(self.entries.items())[-MAX_ENTRIES:])
+        with open(self.path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(self.path + '.tmp', self.path)
+        self.dirty = False
+
+
+def candidates(session, good, bad):
+    """[(commit, árbol, asunto)] de good (excluido) a bad (incluido), en
+    orden cronológico por la cadena de primeros padres"""
+    result = session.run('rev-list', '--first-parent', '--reverse', '--format=%T %s',
+                         f'{good}..{bad}', '--', check=False)
+    if not result.ok:
+        raise ValueError(result.error_text or f'rango inválido: {good}..{bad}')
+    commits, lines = [], result.text.splitlines()
+    for header, body in zip(lines[::2], lines[1::2]):
+        tree, _, subject = body.partition(' ')
+        commits.append((header.split()[1], tree, subject))
+    return commits
+
+
+def pick(unknown, count):
+    """`count` puntos de `unknown` a la misma distancia (todos si alcanzan)"""
+    if len(unknown) <= count:
+        return list(unknown)
+    step = (len(unknown) + 1) / (count + 1)
+    return sorted({unknown[min(len(unknown) - 1, int(step * k) - 1)] for k in range(1, count + 1)})
+
+
+def _resolve(cwd, command):
+    """Comando con el binario resuelto (node_modules/.bin primero) o None"""
+    name = command[0]
+    local = os.path.join(cwd, 'node_modules', '.bin', name + ('.cmd' if os.name == 'nt' else ''))
+    if os.path.exists(local):
+        return [local, *command[1:]]
+    found = shutil.which(name)
+    return [found, *command[1:]] if found else None
+
+
+def _errors(root, output):
+    from .buildcache import error_digest
+
+    return error_digest(output, root)[1][-OUTPUT_TAIL:]
+
+
+def probe_all(session, config, targets, jobs, on_probe=None):
+    """Corre el comando en un checkout del pool por commit de `targets`, a la vez"""
+    from . import runner
+
+    root = session.root
+    probes = {}
+
+    def finished(n, result):
+        probe = probes[n]
+        probe.duration = round(result.duration, 3)
+        probe.timed_out = result.timed_out
+        if result.timed_out or result.returncode == SKIP_CODE:
+            probe.status = SKIP
+        else:
+            probe.status = GOOD if result.ok else BAD
+        if probe.status == BAD:
+            probe.errors = _errors(root, result.stdout + result.stderr)
+        if on_probe:
+            on_probe(probe)
+
+    with contextlib.ExitStack() as stack:
+        work = []
+        size = max(jobs, config.worktree_pool_size)
+        for n, (commit, tree, subject) in enumerate(targets):
+            checkout = stack.enter_context(worktrees.claim(session, config, commit, size=size))
+            command = _resolve(checkout.path, config.bisect_command)
+            if command is None:
+                raise RuntimeError(f'{config.bisect_command[0]} no instalado (npm ci)')
+            probes[n] = Probe(commit, tree, subject, SKIP)
+            work.append((n, command, {'cwd': checkout.path, 'env': checkout.env, 'idle_timeout': config.bisect_timeout or None}))
+        runner.run_many(work, limit=jobs, on_result=finished)
+    return [probes[n] for n in range(len(targets))]
+
+
+def bisect(session, config, good, bad='HEAD', jobs=None, use_cache=True, on_probe=None, on_round=None):
+    """Busca el primer commit malo de good..bad; devuelve un Bisection"""
+    root = session.root
+    jobs = jobs or config.bisect_jobs or os.cpu_count() or 1
+    commits = candidates(session, good, bad)
+    if not commits:
+        raise ValueError(f'{bad} no tiene commits después de {good}')
+    lock = coordinator.FileLock(os.path.join(state_dir(root), LOCK_FILE))
+    if not lock.acquire(blocking=False):
+        raise RuntimeError('ya hay un bisect en curso')
+    started = time.perf_counter()
+    cache = ResultCache(root)
+    result = Bisection(good, commits[-1][0], commits)
+    status = {len(commits) - 1: BAD}
+    try:
+        while True:
+            hi = min(i for i, s in status.items() if s == BAD)
+            lo = max([i for i, s in status.items() if s == GOOD and i < hi], default=-1)
+            unknown = [i for i in range(lo + 1, hi) if i not in status]
+            if not unknown:
+                break
+            hits = []
+            for i in unknown:
+                commit, tree, subject = commits[i]
+                entry = cache.get(cache_key(config.bisect_command, tree)) if use_cache else None
+                if entry is not None:
+                    hits.append(Probe(commit, tree, subject, entry['status'], entry['duration'], True,
+                                      entry['errors']))
+                    status[i] = entry['status']
+            if hits:
+                result.probes += hits
+                if on_probe:
+                    for probe in hits:
+                        on_probe(probe)
+                continue
+            chosen = pick(unknown, jobs)
+            result.rounds += 1
+            if on_round:
+                on_round(result.rounds, len(chosen), len(unknown))
+            probes = probe_all(session, config, [commits[i] for i in chosen], jobs, on_probe)
+            for i, probe in zip(chosen, probes):
+                status[i] = probe.status
+                if not probe.timed_out:
+                    cache.put(cache_key(config.bisect_command, probe.tree), probe)
+            result.probes += probes
+            if cache.dirty:
+                cache.save()
+    finally:
+        lock.release()
+        if cache.dirty:
+            cache.save()
+    hi = min(i for i, s in status.items() if s == BAD)
+    lo = max([i for i, s in status.items() if s == GOOD and i < hi], default=-1)
+    by_commit = {p.commit: p for p in result.probes}
+    first = commits[hi]
+    result.first_bad = by_commit.get(first[0]) or Probe(first[0], first[1], first[2], BAD)
+    result.suspects = [by_commit[commits[i][0]] for i in range(lo + 1, hi)]
+    result.wall = round(time.perf_counter() - started, 3)
+    return result
@@ -0,0 +1,269 @@
+"""
+Caché local de builds indexada por el contenido de las entradas del build.
+
+Un `npm run build` local antes del push atrapa los errores antes que
+DigitalOcean, pero un build completo de Next.js en cada subida es demasiado
+lento. Aquí se calcula una clave con las entradas reales del build
+(`build_inputs`: `src/`, `prisma/`, `messages/`, `public/`, `package.json`,
+`package-lock.json`, `next.config.*`, `tsconfig.json`, los configs de
+PostCSS y Tailwind) tal como están en el árbol del commit que se sube, no en
+disco: los oid de los blobs salen de `git ls-tree`, filtrados con
+`.dockerignore` igual que el contexto que recibe Docker, más el comando de
+build. Un cambio sin commitear no puede dar un acierto falso.
+
+Cada resultado (ok/falló, digest de los errores, log comprimido y, si el
+build pasó, un tar.gz de `build_artifact` sin `cache/`) se guarda en
+`.git/rent360push/buildcache/objects/<ab>/<clave>/`. El build corre en el
+árbol de trabajo: si las entradas tienen cambios sin commitear, el resultado
+no se guarda (no corresponde a la clave). Si la clave ya está, el build no
+se ejecuta: se devuelve el resultado guardado. El índice lleva el tamaño y
+el último uso de cada entrada y, al pasar `build_cache_max_bytes`, se
+borran las usadas hace más tiempo (LRU).
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
+import tarfile
+import time
+from dataclasses import asdict, dataclass, field
+
+from . import docker
+from .config import state_dir
+
+CACHE_DIR = 'buildcache'
+INDEX_FILE = 'index.json'
+RESULT_FILE = 'result.json'
+LOG_FILE = 'build.log.gz'
+ARTIFACT_FILE = 'artifact.tar.gz'
+KEY_VERSION = 2
+MAX_ERRORS = 20
+
+
+@dataclass
+class BuildResult:
+    key: str
+    ok: bool
+    duration: float
+    # sha1 de los errores (archivo:línea:código) o de la cola del log
+    error_digest: str | None = None
+    errors: list = field(default_factory=list)
+    # Rutas dentro del directorio de la entrada (None = no se guardó)
+    log: str | None = None
+    artifact: str | None = None
+    created: float = 0.0
+
+
+def input_files(session, config, rev='HEAD'):
+    """[(ruta, oid)] de las entradas del build en el árbol de `rev` que
+    llegarían al contexto de Docker (con el .dockerignore de ese árbol)"""
+    shown = session.run('show', f'{rev}:{docker.DOCKERIGNORE}', check=False)
+    ignore = docker.DockerIgnore(docker.parse(shown.text.splitlines())) if shown.ok else docker.DockerIgnore()
+    raw = session.run('ls-tree', '-r', '-z', '--full-tree', rev, '--', *config.build_inputs).stdout
+    files = []
+    for entry in raw.split(b'\0'):
+        if not entry:
+            continue
+        meta, path = entry.split(b'\t', 1)
+        _, kind, oid = meta.split()
+        rel = path.decode('utf-8', 'surrogateescape')
+        if kind == b'blob' and not ignore.excluded(rel):
+            files.append((rel, oid.decode()))
+    return sorted(files)
+
+
+def input_key(session, config, rev='HEAD'):
+    """Clave de contenido de las entradas del build en `rev`; devuelve
+    (clave, archivos)"""
+    files = input_files(session, config, rev)
+    h = hashlib.sha256(f'v{KEY_VERSION}\0{json.dumps(config.build_command)}\n'.encode())
+    for rel, oid in files:
+        h.update(f'{rel}\0{oid}\n'.encode('utf-8', 'surrogateescape'))
+    return h.hexdigest(), len(files)
+
+
+def inputs_dirty(session, config):
+    """True si las entradas del build tienen cambios sin commitear en disco"""
+    return bool(session.run('status', '--porcelain', '-z', '--', *config.build_inputs).stdout)
+
+
+def error_digest(output, root=None):
+    """(digest, errores legibles) de la salida de un build fallido: con los
+    errores que reconoce buildlog.py si los hay, si no con la cola del log"""
+    from . import buildlog
+
+    report = buildlog.parse_stream(io.BytesIO(output), root)
+    if report.errors:
+        keys = sorted(f'{e.path}:{e.line}:{e.code}' for e in report.errors)
+        errors = [f'{e.location} {e.code} {e.message}'.strip() for e in report.ranked()[:MAX_ERRORS]]
+    else:
+        keys = errors = output.decode('utf-8', 'replace').strip().splitlines()[-MAX_ERRORS:]
+    return hashlib.sha1('\n'.join(keys).encode('utf-8')).hexdigest(), errors
+
+
+def _skip_cache_dir(info):
+    # La caché de webpack de .next/cache pesa más que el build y no hace falta
+    parts = info.name.split('/')
+    return None if len(parts) > 1 and parts[1] == 'cache' else info
+
+
+class BuildCache:
+    """Resultados de build por clave, con desalojo LRU por tamaño"""
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.dir = state_dir(root, CACHE_DIR)
+        self.index_path = os.path.join(self.dir, INDEX_FILE)
+        self.index = self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_index(self):
+        with open(self.index_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=1)
+        os.replace(self.index_path + '.tmp', self.index_path)
+
+    def entry_dir(self, key):
+        return os.path.join(self.dir, 'objects', key[:2], key)
+
+    def path(self, result, name):
+        """Ruta absoluta de `result.log` / `result.artifact`"""
+        return os.path.join(self.entry_dir(result.key), name) if name else None
+
+    def get(self, key):
+        """Resultado guardado para `key` (y lo marca como recién usado)"""
+        if key not in self.index:
+            return None
+        try:
+            with open(os.path.join(self.entry_dir(key), RESULT_FILE), encoding='utf-8') as f:
+                result = BuildResult(**json.load(f))
+        except (FileNotFoundError, ValueError, TypeError):
+            self.index.pop(key, None)
+            self._save_index()
+            return None
+        self.index[key]['used'] = time.time()
+        self._save_index()
+        return result
+
+    def put(self, result, output=b'', artifact_dir=None):
+        """Guarda un resultado con su log y su artefacto; devuelve las claves
+        desalojadas para respetar `max_bytes`"""
+        target = self.entry_dir(result.key)
+        tmp = target + '.tmp'
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        with gzip.open(os.path.join(tmp, LOG_FILE), 'wb') as f:
+            f.write(output)
+        result.log = LOG_FILE
+        result.artifact = None
+        if artifact_dir and os.path.isdir(artifact_dir):
+            with tarfile.open(os.path.join(tmp, ARTIFACT_FILE), 'w:gz') as tar:
+                tar.add(artifact_dir, arcname=os.path.basename(artifact_dir), filter=_skip_cache_dir)
+            result.artifact = ARTIFACT_FILE
+        with open(os.path.join(tmp, RESULT_FILE), 'w', encoding='utf-8') as f:
+            json.dump(asdict(result), f, ensure_ascii=False)
+        size = sum(e.stat().st_size for e in os.scandir(tmp))
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(tmp, target)
+        self.index[result.key] = {'size': size, 'used': time.time(), 'ok': result.ok}
+        evicted = self.evict(keep=result.key)
+        self._save_index()
+        return evicted
+
+    def evict(self, keep=None):
+        """Borra las entradas usadas hace más tiempo hasta entrar en `max_bytes`"""
+        total = sum(e['size'] for e in self.index.values())
+        evicted = []
+        for key in sorted(self.index, key=lambda k: self.index[k]['used']):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= self.index.pop(key)['size']
+            shutil.rmtree(self.entry_dir(key), ignore_errors=True)
+            evicted.append(key)
+        return evicted
+
+    def total_bytes(self):
+        return sum(e['size'] for e in self.index.values())
+
+    def restore(self, result, destination):
+        """Extrae el artefacto de `result` en `destination` (p.ej. la raíz
+        del repo, para recuperar `.next`)"""
+        path = self.path(result, result.artifact)
+        if not path or not os.path.exists(path):
+            return False
+        with tarfile.open(path, 'r:gz') as tar:
+            top = {m.name.split('/')[0] for m in tar.getmembers()}
+            for name in top:
+                shutil.rmtree(os.path.join(destination, name), ignore_errors=True)
+            if hasattr(tarfile, 'data_filter'):
+                tar.extractall(destination, filter='data')
+            else:
+                tar.extractall(destination)
+        return True
+
+
+def _command(root, config):
+    """Comando de build resuelto, o (None, motivo) si no se puede ejecutar"""
+    command = list(config.build_command)
+    executable = shutil.which(command[0])
+    if executable is None:
+        return None, f'{command[0]} no instalado'
+    if os.path.exists(os.path.join(root, 'package.json')) and not os.path.isdir(os.path.join(root, 'node_modules')):
+        return None, 'sin node_modules (npm ci)'
+    return [executable, *command[1:]], None
+
+
+def check(session, config, force=False, on_output=None, rev='HEAD'):
+    """Build con caché para el árbol de `rev`. Devuelve (BuildResult,
+    desde_caché) o (None, motivo) si el build no se puede ejecutar aquí. Un
+    resultado sin `log` no se guardó (había cambios sin commitear)"""
+    from . import runner
+
+    root = session.root
+    key, _ = input_key(session, config, rev)
+    cache = BuildCache(root, config.build_cache_max_bytes)
+    cached = None if force else cache.get(key)
+    if cached is not None:
+        return cached, True
+    command, reason = _command(root, config)
+    if command is None:
+        return None, reason
+    dirty = inputs_dirty(session, config)
+    run = runner.run(command, cwd=root, on_output=on_output)
+    output = run.stdout + run.stderr
+    result = BuildResult(key, run.ok, round(run.duration, 3), created=time.time())
+    if not run.ok:
+        result.error_digest, result.errors = error_digest(output, root)
+    if not dirty:
+        artifact = os.path.join(root, config.build_artifact) if run.ok and config.build_artifact else None
+        cache.put(result, output, artifact)
+    return result, False
+
+
+def pre_push_check(pipeline):
+    """Chequeo pre-push: `npm run build` salvo que las entradas ya tengan
+    un build registrado"""
+    result, cached = check(pipeline.session, pipeline.config, on_output=pipeline.on_output)
+    if result is None:
+        return True, f'⚠️  sin ejecutar: {cached}'
+    source = 'en caché' if cached else f'{result.duration:.0f} s'
+    if not cached and result.log is None:
+        source += ', sin guardar: entradas con cambios sin commitear'
+    if result.ok:
+        return True, f'{result.key[:12]} ({source})'
+    first = result.errors[0] if result.errors else ''
+    return False, f'falló ({source}, {len(result.errors)} errores): {first}'
+
+
+pre_push_check.step = 'build'
@@ -0,0 +1,311 @@
+"""
+Análisis de logs de build de DigitalOcean en memoria acotada.
+
+Después de cada deploy fallido el log se pegaba en `build logs` o
+`errores DigitalOcean` y se leía a mano; con la salida detallada de Prisma y
+webpack un build de Next.js llega a cientos de MB. Aquí el log (archivo o
+stdin) se lee línea a línea, con líneas truncadas a `MAX_LINE` bytes, y se
+extraen:
+
+- errores de tsc (`src/x.ts(12,5): error TS2322: ...`, `src/x.ts:12:5 - error TS2322: ...`);
+- errores de tipos de `next build` (`./src/x.ts:12:5` + `Type error: ...`);
+- problemas de ESLint (encabezado de archivo + `12:5  Error: ...  regla`);
+- errores de webpack (`Module not found`, `Syntax error`, `ERROR in ...`).
+
+Solo se conserva un estado de pocas líneas y un registro por error único
+(archivo:línea:código), hasta `max_errors`. Las rutas del contenedor
+(`/workspace/...`, `/app/...`) se traducen a rutas del repositorio.
+
+El último análisis queda en `.git/rent360push/buildlog.json` y `push` lo
+muestra antes del siguiente intento, marcando los archivos ya modificados.
+"""
+
+import json
+import os
+import re
+import time
+from dataclasses import asdict, dataclass, field
+
+from .config import state_dir
+
+REPORT_FILE = 'buildlog.json'
+MAX_LINE = 8192
+MAX_MESSAGE = 500
+
+_ANSI = re.compile(r'\x1b\[[0-9;?]*[A-Za-z]')
+# "[2025-10-16 12:00:00]", "rent360 2025-10-16T12:00:00.123Z", "web | ", "#12 3.456 "
+_PREFIX = re.compile(
+    r'^(?:\[[^\]]{0,64}\]\s*|[\w.-]{1,40}\s+\|\s*|\d{4}-\d\d-\d\d[T ][\d:.,]+Z?\s*'
+    r'|[\w-]{1,40}\s+(?=\d{4}-\d\d-\d\d[T ])|#\d+\s+[\d.]+\s+)+'
+)
+_PATH = r'(?P<path>(?:\.{0,2}/)?[\w@.$\[\]()+-][\w@.$\[\]()+/-]*\.(?:tsx?|jsx?|mjs|cjs|json|css|scss|prisma))'
+_TSC = re.compile(
+    _PATH + r'(?:\((?P<line>\d+),(?P<col>\d+)\)\s*:|:(?P<line2>\d+):(?P<col2>\d+)\s+-)\s*'
+    r'(?P<severity>error|warning)\s+(?P<code>TS\d+)\s*:\s*(?P<message>.*)'
+)
+_LOCATION = re.compile(r'^' + _PATH + r'(?::(?P<line>\d+)(?::(?P<col>\d+))?)?\s*$')
+_WEBPACK = re.compile(
+    r'^(?P<severity>ERROR|WARNING) in (?:\[\w+\] )?' + _PATH
+    + r'(?:\s*\(?(?P<line>\d+)[:,](?P<col>\d+)\)?(?:-\d+(?::\d+)?)?)?'
+)
+_ESLINT = re.compile(
+    r'^\s*(?P<line>\d+):(?P<col>\d+)\s+(?P<severity>Error|Warning|error|warning):?\s+'
+    r'(?P<message>.*?)(?:\s{2,}(?P<code>[@\w/-]+))?\s*$'
+)
+_MESSAGE = re.compile(
+    r'^(?P<kind>Type error|Syntax error|SyntaxError|Module not found|Module build failed|Error):\s*(?P<message>.*)'
+)
+# Sin contexto pendiente, las líneas sin una ruta de fuente se descartan sin
+# pasar por los demás regex (la gran mayoría: Prisma, npm, progreso)
+_INTEREST = re.compile(r'\.(?:tsx?|jsx?|mjs|cjs|json|css|scss|prisma)\b|Failed to compile|Build (?:failed|error)')
+_TS_CODE = re.compile(r'\b(TS\d{4,5})\b')
+_CODES = {
+    'Type error': 'type-error',
+    'Syntax error': 'syntax-error',
+    'SyntaxError': 'syntax-error',
+    'Module not found': 'module-not-found',
+    'Module build failed': 'module-build-failed',
+    'Error': 'webpack',
+}
+
+
+@dataclass
+class LogError:
+    kind: str
+    severity: str
+    path: str
+    line: int | None
+    column: int | None
+    code: str
+    message: str
+    # Ruta encontrada en el repositorio (False = tal cual aparece en el log)
+    in_repo: bool = False
+    count: int = 1
+    # Primera línea del log donde apareció
+    first_seen: int = 0
+
+    @property
+    def key(self):
+        return (self.path, self.line, self.code)
+
+    @property
+    def location(self):
+        if self.line is None:
+            return self.path
+        return f'{self.path}:{self.line}' + (f':{self.column}' if self.column else '')
+
+
+@dataclass
+class Report:
+    errors: list = field(default_factory=list)
+    lines: int = 0
+    bytes: int = 0
+    # Errores únicos descartados al superar max_errors
+    dropped: int = 0
+    failed: bool = False
+    time: float = 0.0
+
+    @property
+    def error_count(self):
+        return sum(1 for e in self.errors if e.severity == 'error')
+
+    def ranked(self):
+        """Errores antes que advertencias; luego los más repetidos y los primeros"""
+        return sorted(self.errors, key=lambda e: (e.severity != 'error', -e.count, e.first_seen))
+
+    def files(self):
+        return sorted({e.path for e in self.errors})
+
+
+class PathMapper:
+    """Traduce rutas del log (absolutas del contenedor, `./src/...`, con `\\`)
+    al sufijo más largo que existe en el repositorio"""
+
+    def __init__(self, root, limit=4096):
+        self.root = root
+        self.limit = limit
+        self.known = {}
+
+    def __call__(self, raw):
+        if raw in self.known:
+            return self.known[raw]
+        parts = [p for p in raw.replace('\\', '/').split('/') if p not in ('', '.')]
+        found = ('/'.join(parts), False)
+        if self.root:
+            for i in range(len(parts)):
+                candidate = '/'.join(parts[i:])
+                if '..' not in parts[i:] and os.path.isfile(os.path.join(self.root, candidate)):
+                    found = (candidate, True)
+                    break
+        if len(self.known) < self.limit:
+            self.known[raw] = found
+        return found
+
+
+class LogParser:
+    """Máquina de estados línea a línea; el estado son solo el último
+    encabezado de archivo y la ubicación pendiente de mensaje"""
+
+    def __init__(self, root=None, max_errors=5000):
+        self.map_path = PathMapper(root)
+        self.max_errors = max_errors
+        self.found = {}
+        self.report = Report(time=time.time())
+        # Encabezado de archivo (ESLint, webpack) y ubicación esperando mensaje
+        self.header = None
+        self.pending = None
+
+    def _add(self, kind, severity, raw_path, line, column, code, message):
+        path, in_repo = self.map_path(raw_path)
+        line = int(line) if line else None
+        key = (path, line, code)
+        existing = self.found.get(key)
+        if existing:
+            existing.count += 1
+            return
+        if len(self.found) >= self.max_errors:
+            self.report.dropped += 1
+            return
+        self.found[key] = LogError(
+            kind, severity.lower(), path, line, int(column) if column else None, code,
+            message.strip()[:MAX_MESSAGE], in_repo, first_seen=self.report.lines,
+        )
+
+    def feed(self, text):
+        self.report.lines += 1
+        if self.pending is None and self.header is None and not _INTEREST.search(text):
+            return
+        if '\x1b' in text:
+            text = _ANSI.sub('', text)
+        text = _PREFIX.sub('', text.rstrip('\r\n'))
+        stripped = text.strip()
+        if not stripped:
+            self.header = None
+            return
+        if stripped.endswith('Failed to compile.') or 'Build failed' in stripped or 'Build error occurred' in stripped:
+            self.report.failed = True
+
+        match = _TSC.search(stripped)
+        if match:
+            self.pending = None
+            self._add('typescript', match['severity'], match['path'], match['line'] or match['line2'],
+                      match['col'] or match['col2'], match['code'], match['message'])
+            return
+
+        if self.pending:
+            match = _MESSAGE.match(stripped)
+            if match or self.pending[0] == 'webpack':
+                _, raw, line, column, severity = self.pending
+                self.pending = None
+                code = _CODES[match['kind']] if match else 'webpack'
+                message = match['message'] if match else stripped
+                ts = _TS_CODE.search(stripped)
+                if ts:
+                    code = ts.group(1)
+                    message = message.removeprefix(f'{code}:')
+                kind = 'typescript' if code.startswith('TS') or code == 'type-error' else 'webpack'
+                self._add(kind, severity, raw, line, column, code, message)
+                return
+
+        match = _WEBPACK.match(stripped)
+        if match:
+            self.header = None
+            self.pending = ('webpack', match['path'], match['line'], match['col'], match['severity'])
+            return
+
+        match = _LOCATION.match(stripped)
+        if match:
+            self.header = match['path'] if not match['line'] else None
+            self.pending = ('location', match['path'], match['line'], match['col'], 'error')
+            return
+
+        if self.header:
+            match = _ESLINT.match(text)
+            if match:
+                self.pending = None
+                message = match['message']
+                code = match['code'] or 'eslint'
+                self._add('eslint', match['severity'], self.header, match['line'], match['col'], code, message)
+                return
+        self.pending = None
+
+    def finish(self):
+        self.report.errors = list(self.found.values())
+        if self.report.error_count:
+            self.report.failed = True
+        return self.report
+
+
+def parse_stream(stream, root=None, max_errors=5000, max_line=MAX_LINE):
+    """Analiza un stream binario (archivo abierto en 'rb', sys.stdin.buffer)
+    sin cargarlo entero: cada línea se corta a `max_line` bytes"""
+    parser = LogParser(root, max_errors)
+    truncated = False
+    while True:
+        chunk = stream.readline(max_line)
+        if not chunk:
+            break
+        parser.report.bytes += len(chunk)
+        complete = chunk.endswith(b'\n')
+        if not truncated:
+            parser.feed(chunk.decode('utf-8', 'replace'))
+        # El resto de una línea larga se descarta hasta el próximo \n
+        truncated = not complete
+    return parser.finish()
+
+
+def parse_file(path, root=None, **kwargs):
+    with open(path, 'rb') as f:
+        return parse_stream(f, root, **kwargs)
+
+
+# Informe guardado para el próximo push ------------------------------------
+
+def report_path(root):
+    return os.path.join(state_dir(root), REPORT_FILE)
+
+
+def save(root, report):
+    data = asdict(report)
+    data['errors'] = [asdict(e) for e in report.ranked()]
+    tmp = report_path(root) + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, report_path(root))
+
+
+def load(root):
+    try:
+        with open(report_path(root), encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    data['errors'] = [LogError(**e) for e in data.get('errors', [])]
+    return Report(**data)
+
+
+def clear(root):
+    try:
+        os.remove(report_path(root))
+    except FileNotFoundError:
+        pass
+
+
+def post_push(pipeline, result):
+    """Hook post_push: si el push llegó a una rama con build, el informe del
+    build anterior ya no aplica"""
+    branch = pipeline.config.non_build_branch
+    if result.ok and any(p.ok and p.target.branch != branch for p in result.pushes):
+        clear(pipeline.session.root)
+
+
+def touched_since(root, report):
+    """Archivos del informe modificados después del análisis"""
+    touched = set()
+    for path in report.files():
+        try:
+            if os.path.getmtime(os.path.join(root, path)) > report.time:
+                touched.add(path)
+        except OSError:
+            continue
+    return touched
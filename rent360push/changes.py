@@ -0,0 +1,330 @@
+"""
+Detección incremental de cambios con caché de stat.
+
+`git status --porcelain` + `git add .` vuelven a recorrer y hashear todo el
+árbol en cada subida. ChangeDetector guarda (mtime, tamaño, inodo) de cada
+archivo versionado y el mtime de cada directorio no ignorado en
+`.git/rent360push/statcache.json`; en las subidas siguientes solo hace lstat
+(o, si el diario de inotify está activo, ni eso) y solo pasa a
+`update-index` las rutas que cambiaron de verdad.
+
+La caché se invalida sola si el contenido del índice cambia fuera de
+rent360push (un `git add`/`checkout` manual): en ese caso se reconstruye con
+un `git status` completo. Si solo cambió el stat del índice (p.ej. un
+`git status` que refrescó las marcas de tiempo) basta con comparar el
+resumen de `ls-files --stage`.
+"""
+
+import json
+import os
+import time
+
+from .config import state_dir
+from .pipeline import StatusEntry, parse_porcelain
+
+CACHE_VERSION = 1
+CACHE_FILE = 'statcache.json'
+JOURNAL_DIR = 'journal'
+JOURNAL_LOG = 'events.log'
+JOURNAL_INFO = 'watcher.json'
+# Marca de desbordamiento en el diario: obliga a un escaneo completo
+JOURNAL_OVERFLOW = '*'
+# Directorios que nunca se recorren (además de lo que diga .gitignore)
+ALWAYS_SKIP = {'.git', 'node_modules', '.next'}
+# Margen para "racy git": un archivo modificado dentro de este intervalo
+# antes de guardar la caché se vuelve a revisar en la siguiente subida
+RACY_NS = 2_000_000_000
+
+
+def _stamp(st):
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def _lstat(path):
+    try:
+        return os.lstat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _parent(rel):
+    return rel.rpartition('/')[0]
+
+
+class ChangeDetector:
+    """Calcula las rutas cambiadas respecto al índice usando la caché"""
+
+    def __init__(self, session):
+        self.session = session
+        self.root = session.root
+        self.path = os.path.join(state_dir(self.root), CACHE_FILE)
+        self.journal_dir = os.path.join(state_dir(self.root), JOURNAL_DIR)
+        self.files = {}
+        self.dirs = {}
+        self.untracked = set()
+        self.index_stamp = None
+        self.index_digest = None
+        self.journal_id = None
+        self.journal_offset = 0
+        self.mode = None
+        self._load()
+
+    # Persistencia -----------------------------------------------------------
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get('version') != CACHE_VERSION:
+            return
+        self.files = data['files']
+        self.dirs = data['dirs']
+        self.untracked = set(data['untracked'])
+        self.index_stamp = data['index']
+        self.index_digest = data.get('index_digest')
+        self.journal_id = data.get('journal_id')
+        self.journal_offset = data.get('journal_offset', 0)
+
+    def save(self):
+        """Guarda la caché; llamar después del commit para registrar el índice"""
+        now = time.time_ns()
+        for path, stamp in self.files.items():
+            if stamp is not None and now - stamp[0] < RACY_NS:
+                self.files[path] = None
+        index = self._index_stamp()
+        # Índice intacto desde la carga: el digest guardado sigue valiendo
+        # (evita un `ls-files` por corrida sin cambios)
+        digest = self.index_digest if index is not None and index == self.index_stamp else None
+        data = {
+            'version': CACHE_VERSION,
+            'index': index,
+            'index_digest': digest or self._index_digest(),
+            'files': self.files,
+            'dirs': self.dirs,
+            'untracked': sorted(self.untracked),
+            'journal_id': self.journal_id,
+            'journal_offset': self.journal_offset,
+        }
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(data, separators=(',', ':')))
+        os.replace(tmp, self.path)
+
+    def _index_stamp(self):
+        st = _lstat(os.path.join(self.session.git_dir, 'index'))
+        return _stamp(st) if st else None
+
+    def _index_digest(self):
+        import hashlib
+
+        listing = self.session.run('ls-files', '--stage', '-z').stdout
+        return hashlib.sha1(listing).hexdigest()
+
+    def _index_unchanged(self):
+        if self.index_stamp is None:
+            return False
+        if self.index_stamp == self._index_stamp():
+            return True
+        return self.index_digest is not None and self.index_digest == self._index_digest()
+
+    def _abs(self, rel):
+        return os.path.join(self.root, rel)
+
+    # Ignorados --------------------------------------------------------------
+
+    def _ignored(self, paths):
+        paths = list(paths)
+        if not paths:
+            return set()
+        payload = b''.join(os.fsencode(p) + b'\0' for p in paths)
+        result = self.session.run('check-ignore', '-z', '--stdin', input=payload, check=False)
+        return {p.decode('utf-8', 'surrogateescape') for p in result.stdout.split(b'\0') if p}
+
+    def _walk_dirs(self, start):
+        """Registra `start` y sus subdirectorios no ignorados; devuelve los
+        archivos encontrados"""
+        found = []
+        level = [start]
+        while level:
+            next_level = []
+            for rel in level:
+                st = _lstat(self._abs(rel) if rel else self.root)
+                if st is None:
+                    continue
+                self.dirs[rel] = st.st_mtime_ns
+                try:
+                    entries = list(os.scandir(self._abs(rel) if rel else self.root))
+                except OSError:
+                    continue
+                for entry in entries:
+                    child = f'{rel}/{entry.name}' if rel else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in ALWAYS_SKIP:
+                            next_level.append(child)
+                    else:
+                        found.append(child)
+            ignored = self._ignored(next_level)
+            level = [d for d in next_level if d not in ignored]
+        return found
+
+    # Detección --------------------------------------------------------------
+
+    def _rebuild(self):
+        """Escaneo completo: un `git status` y un `ls-files` como referencia"""
+        self.mode = 'full'
+        self._sync_journal_position()
+        raw = self.session.run('status', '--porcelain=v1', '-z', '--no-renames', '--untracked-files=all').stdout
+        entries = parse_porcelain(raw)
+        tracked = self.session.run('ls-files', '-z').stdout.split(b'\0')
+        dirty = {e.path for e in entries if e.needs_staging}
+        self.files = {}
+        for raw_path in tracked:
+            if not raw_path:
+                continue
+            rel = raw_path.decode('utf-8', 'surrogateescape')
+            st = None if rel in dirty else _lstat(self._abs(rel))
+            self.files[rel] = _stamp(st) if st else None
+        self.untracked = {e.path for e in entries if e.untracked}
+        self.dirs = {}
+        self._walk_dirs('')
+        return entries
+
+    def _journal(self):
+        """Rutas reportadas por el vigilante desde la última subida, o None
+        si el diario no es confiable y hay que revisar todo"""
+        try:
+            with open(os.path.join(self.journal_dir, JOURNAL_INFO), encoding='utf-8') as f:
+                info = json.load(f)
+            os.kill(info['pid'], 0)
+        except (OSError, ValueError, KeyError):
+            return None
+        if info['id'] != self.journal_id:
+            return None
+        log = os.path.join(self.journal_dir, JOURNAL_LOG)
+        try:
+            with open(log, 'rb') as f:
+                f.seek(self.journal_offset)
+                data = f.read()
+        except OSError:
+            return None
+        complete = data[:data.rfind(b'\n') + 1]
+        self.journal_offset += len(complete)
+        paths = set(complete.decode('utf-8', 'surrogateescape').splitlines())
+        if JOURNAL_OVERFLOW in paths:
+            return None
+        return paths
+
+    def _sync_journal_position(self):
+        try:
+            with open(os.path.join(self.journal_dir, JOURNAL_INFO), encoding='utf-8') as f:
+                self.journal_id = json.load(f)['id']
+            self.journal_offset = os.path.getsize(os.path.join(self.journal_dir, JOURNAL_LOG))
+        except (OSError, ValueError, KeyError):
+            self.journal_id = None
+            self.journal_offset = 0
+
+    def detect(self):
+        """Devuelve la lista de StatusEntry con las rutas cambiadas"""
+        if not self._index_unchanged():
+            return self._rebuild()
+
+        journal = self._journal()
+        if journal is None:
+            self.mode = 'stat'
+            tracked = list(self.files)
+            dirs = list(self.dirs)
+            self._sync_journal_position()
+        else:
+            self.mode = 'journal'
+            tracked = [p for p in journal if p in self.files]
+            tracked += [p for p, stamp in self.files.items() if stamp is None]
+            dirs = {p for p in journal if p in self.dirs}
+            dirs.update(_parent(p) for p in journal)
+            dirs = [d for d in dirs if d in self.dirs]
+
+        entries = []
+        for rel in set(tracked):
+            st = _lstat(self._abs(rel))
+            if st is None:
+                entries.append(StatusEntry(' ', 'D', rel))
+            elif self.files[rel] != _stamp(st):
+                entries.append(StatusEntry(' ', 'M', rel))
+
+        candidates = []
+        new_dirs = []
+        for rel in dirs:
+            st = _lstat(self._abs(rel) if rel else self.root)
+            if st is None:
+                self.dirs.pop(rel, None)
+                continue
+            if st.st_mtime_ns == self.dirs[rel] and journal is None:
+                continue
+            self.dirs[rel] = st.st_mtime_ns
+            try:
+                scanned = list(os.scandir(self._abs(rel) if rel else self.root))
+            except OSError:
+                continue
+            for entry in scanned:
+                child = f'{rel}/{entry.name}' if rel else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if child not in self.dirs and entry.name not in ALWAYS_SKIP:
+                        new_dirs.append(child)
+                elif child not in self.files and child not in self.untracked:
+                    candidates.append(child)
+
+        ignored = self._ignored(candidates + new_dirs)
+        self.untracked.update(p for p in candidates if p not in ignored)
+        found = []
+        for rel in new_dirs:
+            if rel not in ignored:
+                found.extend(self._walk_dirs(rel))
+        # Un solo check-ignore para todo lo que apareció en directorios nuevos
+        ignored = self._ignored(found)
+        self.untracked.update(p for p in found if p not in ignored)
+
+        self.untracked = {p for p in self.untracked if _lstat(self._abs(p)) is not None}
+        entries.extend(StatusEntry('?', '?', p) for p in sorted(self.untracked))
+        return entries
+
+    def mark_staged(self, paths):
+        """Actualiza la caché con las rutas que `update-index` acaba de escribir"""
+        for rel in paths:
+            st = _lstat(self._abs(rel))
+            self.untracked.discard(rel)
+            if st is None:
+                self.files.pop(rel, None)
+            else:
+                self.files[rel] = _stamp(st)
+
+
+def run_journal(root, stop=None):
+    """Vigilante inotify que alimenta el diario de ChangeDetector.
+
+    Escribe una ruta relativa por línea en `.git/rent360push/journal/events.log`
+    hasta que `stop()` devuelva True (o hasta Ctrl+C).
+    """
+    from .inotify import Inotify
+
+    journal_dir = state_dir(root, JOURNAL_DIR)
+    watcher = Inotify(root, skip=lambda rel: rel.rsplit('/', 1)[-1] in ALWAYS_SKIP)
+    log = open(os.path.join(journal_dir, JOURNAL_LOG), 'w', encoding='utf-8')
+    info_path = os.path.join(journal_dir, JOURNAL_INFO)
+    with open(info_path, 'w', encoding='utf-8') as f:
+        json.dump({'pid': os.getpid(), 'id': time.time_ns()}, f)
+    try:
+        while not (stop and stop()):
+            events = watcher.read(timeout=1.0)
+            if not events:
+                continue
+            lines = [JOURNAL_OVERFLOW if path is None else path for path, _ in events]
+            log.write('\n'.join(lines) + '\n')
+            log.flush()
+    finally:
+        watcher.close()
+        log.close()
+        try:
+            os.remove(info_path)
+        except OSError:
+            pass
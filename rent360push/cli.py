@@ -0,0 +1,1080 @@
+"""
+Línea de comandos de rent360push (`python -m rent360push ...`).
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+# Líneas de error por archivo de test fallido
+OUTPUT_LINES = 15
+# Líneas de progreso de git ("Writing objects:  45% (9/20)")
+_PROGRESS = re.compile(r'^[\w ]+: +\d+% ')
+
+
+def print_step(step):
+    mark = '✅' if step.ok else '❌'
+    detail = f' → {step.detail}' if step.detail else ''
+    print(f"{mark} {step.name} ({step.duration * 1000:.0f} ms){detail}")
+
+
+def print_check(result):
+    if result.skipped:
+        print(f"   ⚠️  {result.task.label}: {result.output}")
+        return
+    mark = '✅' if result.ok else '❌'
+    print(f"   {mark} {result.task.label} ({result.duration:.1f} s, {len(result.task.files)} archivos)")
+    if not result.ok and result.output:
+        print('      ' + result.output.replace('\n', '\n      '))
+
+
+def print_output(stream, line):
+    """Salida en vivo del push; el progreso se reescribe en la misma línea"""
+    if _PROGRESS.match(line) and not line.endswith('done.'):
+        sys.stdout.write(f'\r   {line}')
+        sys.stdout.flush()
+    else:
+        print(f'\r   {line}')
+
+
+def print_codemod(result):
+    verb = 'a modificar' if result.dry_run else 'modificados'
+    print(f"🔧 Codemods: {len(result.changes)} archivos {verb} ({result.read} leídos de {result.files})")
+    for change in result.changes:
+        rules = ', '.join(f'{name} ×{n}' for name, n in sorted(change.rules.items()))
+        print(f"   ✏️  {change.path}: {rules}")
+
+
+def print_buildlog(report, touched=(), limit=20):
+    errors = report.ranked()
+    warnings = len(errors) - report.error_count
+    print(f"🧾 Último build: {report.error_count} errores, {warnings} advertencias "
+          f"en {len(report.files())} archivos ({report.lines} líneas de log)")
+    for error in errors[:limit]:
+        mark = '❌' if error.severity == 'error' else '⚠️ '
+        if error.path in touched:
+            mark = '✏️ '
+        repeat = f' ×{error.count}' if error.count > 1 else ''
+        print(f"   {mark} {error.location} {error.code}{repeat}: {error.message}")
+    if len(errors) > limit:
+        print(f"   ... y {len(errors) - limit} más")
+    if report.dropped:
+        print(f"   ⚠️  {report.dropped} errores únicos descartados por el límite")
+
+
+def cmd_push(args):
+    from . import upload
+
+    ok = upload(
+        args.message,
+        paths=args.paths or None,
+        push=not args.no_push,
+        full_scan=args.full_scan,
+        verify=not args.no_verify,
+        deploy=args.deploy,
+        fix=args.fix,
+    )
+    print('\n🎉 ¡CAMBIOS SUBIDOS EXITOSAMENTE!' if ok else '\n❌ ERROR: No se pudieron subir los cambios')
+    return 0 if ok else 1
+
+
+def cmd_validate(args):
+    from . import trace, validate
+    from .config import load_config
+    from .git import GitSession
+
+    with GitSession() as session:
+        config = load_config(session.root)
+        trace.configure(session.root, config)
+        if args.files:
+            changed, removed = args.files, []
+        else:
+            changed, removed = validate.diff_paths(session, config, base=args.base, staged=args.snapshot)
+        if args.snapshot:
+            # Lo preparado, en un worktree del pool: los cambios sin preparar no cuentan
+            from . import worktrees
+
+            with worktrees.claim(session, config, worktrees.snapshot(session)) as checkout:
+                tasks = validate.plan(session.root, changed, args.jobs, checkout.path, removed)
+                print(f"🔍 Validando {len(changed)} archivos preparados en {checkout.name} "
+                      f"({len(tasks)} tareas, listo en {checkout.reset:.1f} s)")
+                results = validate.run(checkout.path, tasks, args.jobs, on_result=print_check, env=checkout.env)
+        else:
+            tasks = validate.plan(session.root, changed, args.jobs, removed=removed)
+            print(f"🔍 Validando {len(changed)} archivos cambiados ({len(tasks)} tareas)")
+            results = validate.run(session.root, tasks, args.jobs, on_result=print_check)
+    ok = all(r.ok for r in results)
+    print('\n✅ Validación OK' if ok else '\n❌ La validación falló: el push se bloquearía')
+    return 0 if ok else 1
+
+
+def cmd_jest(args):
+    import os
+
+    from . import jestshard, trace
+    from .config import load_config
+    from .git import find_repo_root
+
+    root = find_repo_root()
+    config = load_config(root)
+    trace.configure(root, config)
+    jobs = args.jobs or config.jest_jobs or os.cpu_count() or 1
+    command = jestshard.jest_command(root, config)
+    if command is None:
+        print(f"❌ {config.jest_command[0]} no instalado (npm ci)")
+        return 1
+    configs = [c for c in (args.config or config.jest_configs) if os.path.exists(os.path.join(root, c))]
+    try:
+        files = {c: jestshard.list_tests(root, command, c) for c in configs}
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+    timings = jestshard.Timings(root)
+    for jest_config, found in files.items():
+        timings.forget_missing(jest_config, found)
+    if args.paths:
+        wanted = {p.replace(os.sep, '/') for p in args.paths}
+        files = {c: [f for f in found if f in wanted or f.startswith(tuple(w.rstrip('/') + '/' for w in wanted))]
+                 for c, found in files.items()}
+    shards = jestshard.plan(root, files, jobs, timings)
+    if not shards:
+        print('⚠️  No hay archivos de test')
+        return 0
+    makespan = max(s.estimate for s in shards)
+    total = sum(s.estimate for s in shards)
+    print(f"🧪 {sum(len(s.files) for s in shards)} archivos en {len(shards)} shards "
+          f"(estimado {makespan:.0f} s en paralelo, {total:.0f} s en serie)")
+    for shard in shards:
+        print(f"   {shard.config} [{shard.index}] {len(shard.files)} archivos, ~{shard.estimate:.1f} s")
+    if args.plan:
+        return 0
+
+    def on_shard(result):
+        mark = '✅' if result.ok else '❌'
+        shard = result.shard
+        print(f"   {mark} {shard.config} [{shard.index}] {result.duration:.1f} s (estimado {shard.estimate:.1f} s)")
+
+    try:
+        report = jestshard.run(root, config, shards, coverage=args.coverage, jobs=jobs, on_shard=on_shard)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+    jestshard.update_timings(root, report, timings)
+    tests, failed = report.totals()
+    for result in report.failed_files[:args.limit]:
+        print(f"   ❌ {result.path} ({result.failed} fallidos)")
+        if result.message:
+            print('      ' + '\n      '.join(result.message.strip().splitlines()[:OUTPUT_LINES]))
+    serial = sum(s.duration for s in report.shards)
+    print(f"{'✅' if report.ok else '❌'} {tests} tests, {failed} fallidos en {report.wall:.1f} s "
+          f"({serial:.1f} s sumando shards)")
+    if report.coverage:
+        parts = ', '.join(f"{key} {report.coverage[key]['pct']}%" for key in jestshard.COVERAGE_KEYS)
+        print(f"📊 Cobertura unida: {parts} (coverage/coverage-summary.json)")
+    for miss in report.coverage_misses:
+        print(f"   ❌ coverageThreshold {miss}")
+    return 0 if report.ok else 1
+
+
+def cmd_graph(args):
+    from .git import find_repo_root
+    from .graph import ImportGraph
+
+    root = find_repo_root()
+    graph = ImportGraph.load(root, args.jobs)
+    if args.action == 'stats':
+        print(json.dumps(graph.stats, indent=2))
+        return 0
+    paths = [os.path.relpath(os.path.abspath(p), root).replace(os.sep, '/') for p in args.paths]
+    if args.action == 'deps':
+        found = {dep for p in paths for dep in graph.dependencies(p)}
+    else:
+        found = graph.dependents(paths, transitive=not args.direct) - set(paths)
+    for path in sorted(found):
+        print(path)
+    return 0
+
+
+def cmd_impact(args):
+    from . import impact
+    from .config import load_config
+    from .git import GitSession
+
+    with GitSession() as session:
+        config = load_config(session.root)
+        if args.paths:
+            result = impact.classify(args.paths, config)
+            result.base = 'argumentos'
+        else:
+            result = impact.pending(session, config)
+        totals = impact.saved(session.root)
+    print(f"🔍 Diff contra {result.base or '(sin rama remota)'}: {result.describe()}")
+    for path in result.build[:args.limit]:
+        print(f'   🏗️  {path}')
+    for path in result.no_build[:args.limit]:
+        print(f'   📄 {path}')
+    verdict = 'dispara un build' if result.affects_build else f'no dispara build ({config.non_build_push})'
+    print(f'\n➡️  El próximo push {verdict}')
+    print(f"💰 Builds evitados: {totals['builds']} (~{totals['minutes']:g} minutos de build)")
+    return 0
+
+
+def cmd_scan(args):
+    from . import scan
+    from .config import load_config
+    from .git import find_repo_root
+
+    root = find_repo_root()
+    config = load_config(root)
+    if args.pattern:
+        config.scan_patterns = args.pattern
+    result = scan.scan(root, config, args.jobs)
+    output = os.path.join(root, args.output or config.scan_output)
+    print(f"🔍 {len(result.rows)} coincidencias en {result.files} archivos "
+          f"({result.rescanned} re-escaneados, {result.ms:.0f} ms)")
+    if args.check:
+        current = ''
+        if os.path.exists(output):
+            with open(output, encoding='utf-8', newline='') as f:
+                current = f.read()
+        if current != scan.render_csv(result.rows):
+            print(f'❌ {os.path.relpath(output, root)} está desactualizado')
+            return 1
+        print(f'✅ {os.path.relpath(output, root)} está al día')
+        return 0
+    changed = scan.write_csv(output, result.rows)
+    print(f"{'✅ Actualizado' if changed else '✅ Sin cambios:'} {os.path.relpath(output, root)}")
+    return 0
+
+
+def cmd_codemod(args):
+    from . import codemod, upload
+    from .config import load_config
+    from .git import find_repo_root
+
+    root = find_repo_root()
+    config = load_config(root)
+    if args.list:
+        for rule in codemod.load_rules(config):
+            print(f"{rule['name']}: {rule['pattern']} → {rule['replace']}")
+        return 0
+    try:
+        result = codemod.run(root, config, dry_run=args.dry_run, jobs=args.jobs, paths=args.paths or None,
+                             only=args.rule)
+    except ValueError as e:
+        print(f'❌ {e}')
+        return 2
+    print_codemod(result)
+    if args.dry_run:
+        for change in result.changes:
+            sys.stdout.write(change.diff)
+        return 0
+    if not args.commit or not result.changes:
+        return 0
+    # Solo los archivos que cambiaron los codemods van al commit
+    ok = upload(args.commit, paths=result.paths, root=root, push=not args.no_push)
+    return 0 if ok else 1
+
+
+def cmd_buildlog(args):
+    from . import buildlog
+    from .git import find_repo_root
+
+    root = find_repo_root()
+    if args.show:
+        report = buildlog.load(root)
+        if report is None:
+            print('Sin informe guardado (.git/rent360push/buildlog.json)')
+            return 0
+    elif args.log == '-':
+        report = buildlog.parse_stream(sys.stdin.buffer, root, max_errors=args.max_errors)
+    else:
+        report = buildlog.parse_file(args.log, root, max_errors=args.max_errors)
+    if not args.show and not args.no_save:
+        buildlog.save(root, report)
+    if args.json:
+        print(json.dumps([vars(e) for e in report.ranked()], ensure_ascii=False, indent=2))
+    else:
+        print_buildlog(report, touched=buildlog.touched_since(root, report) if args.show else (), limit=args.limit)
+    return 1 if report.error_count else 0
+
+
+def cmd_build(args):
+    import time
+
+    from . import buildcache
+    from .config import load_config
+    from .git import GitSession, find_repo_root
+
+    root = find_repo_root()
+    config = load_config(root)
+    cache = buildcache.BuildCache(root, config.build_cache_max_bytes)
+    if args.list:
+        for key, entry in sorted(cache.index.items(), key=lambda item: -item[1]['used']):
+            mark = '✅' if entry['ok'] else '❌'
+            used = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['used']))
+            print(f"{mark} {key[:12]}  {entry['size'] / 1e6:8.1f} MB  usado {used}")
+        limit = config.build_cache_max_bytes / 1e6
+        print(f"📦 {len(cache.index)} builds, {cache.total_bytes() / 1e6:.1f} MB de {limit:.0f} MB")
+        return 0
+    with GitSession(root) as session:
+        start = time.perf_counter()
+        key, files = buildcache.input_key(session, config)
+        print(f"🔑 {key[:12]} ({files} archivos de entrada en HEAD, {(time.perf_counter() - start) * 1000:.0f} ms)")
+        on_output = None if args.quiet else print_output
+        result, cached = buildcache.check(session, config, force=args.force, on_output=on_output)
+    if result is None:
+        print(f"⚠️  Build sin ejecutar: {cached}")
+        return 1
+    source = 'en caché' if cached else f'{result.duration:.0f} s'
+    if not cached and result.log is None:
+        print("⚠️  Resultado sin guardar: las entradas del build tienen cambios sin commitear")
+    if result.ok:
+        print(f"✅ Build ok ({source})")
+        if args.restore and cached:
+            restored = cache.restore(result, root)
+            print(f"📦 {config.build_artifact} restaurado" if restored else '⚠️  El build guardado no tiene artefacto')
+        return 0
+    print(f"❌ Build falló ({source}), digest {result.error_digest[:12]}")
+    for line in result.errors:
+        print(f'   {line}')
+    return 1
+
+
+def cmd_bisect(args):
+    import shlex
+
+    from . import bisect
+    from .config import load_config
+    from .git import GitSession
+
+    marks = {bisect.GOOD: '✅', bisect.BAD: '❌', bisect.SKIP: '⏭️ '}
+
+    def on_round(number, chosen, pending):
+        print(f"🔁 Ronda {number}: {chosen} de {pending} commits pendientes en paralelo")
+
+    def on_probe(probe):
+        source = 'en caché' if probe.cached else f'{probe.duration:.1f} s'
+        timeout = ', sin salida: cortado' if probe.timed_out else ''
+        print(f"   {marks[probe.status]} {probe.commit[:10]} {probe.subject[:60]} ({source}{timeout})")
+
+    with GitSession() as session:
+        config = load_config(session.root)
+        if args.run:
+            config.bisect_command = shlex.split(args.run)
+        jobs = args.jobs or config.bisect_jobs or os.cpu_count() or 1
+        print(f"🔎 {args.good}..{args.bad} con `{' '.join(config.bisect_command)}`, {jobs} procesos")
+        try:
+            result = bisect.bisect(session, config, args.good, args.bad, jobs=jobs, use_cache=not args.no_cache,
+                                   on_probe=on_probe, on_round=on_round)
+        except (ValueError, RuntimeError) as exc:
+            print(f"❌ {exc}")
+            return 1
+    first = result.first_bad
+    print(f"🎯 Primer commit malo: {first.commit[:10]} {first.subject}")
+    for line in first.errors[:args.limit]:
+        print(f'   {line}')
+    if result.suspects:
+        print(f"⚠️  No comprobables justo antes (pueden ser el culpable): "
+              f"{', '.join(p.commit[:10] for p in result.suspects)}")
+    cached = len(result.probes) - len(result.built)
+    print(f"⏱️  {len(result.commits)} commits: {len(result.built)} builds en {result.rounds} rondas, "
+          f"{cached} en caché ({result.wall:.1f} s)")
+    return 0
+
+
+def cmd_worktrees(args):
+    import subprocess
+
+    from . import worktrees
+    from .config import load_config
+    from .git import GitSession
+
+    with GitSession() as session:
+        config = load_config(session.root)
+        root = session.root
+        if args.action == 'status':
+            entries = worktrees.status(root)
+            for name, busy, state in entries:
+                mark = '🔒' if busy else '✅'
+                commit = (state.get('commit') or '')[:10] or 'árbol'
+                fresh = state.get('modules') == worktrees.modules_signature(root)
+                modules = f"node_modules {state.get('mode')}" + ('' if fresh else ' (desactualizado)')
+                print(f"{mark} {name}  {commit} {(state.get('tree') or '')[:10]}  "
+                      f"{modules if state.get('mode') else 'sin node_modules'}")
+            if not entries:
+                print('Pool vacío (python -m rent360push worktrees warm)')
+            return 0
+        if args.action == 'clean':
+            print(f"🧹 {worktrees.remove(session)} worktrees borrados")
+            return 0
+        if args.action == 'warm':
+            def on_slot(checkout):
+                modules = f", node_modules {checkout.modules}" if checkout.modules else ''
+                print(f"✅ {checkout.name} en {checkout.tree[:10]} ({checkout.reset:.1f} s{modules})")
+
+            try:
+                worktrees.warm(session, config, args.rev or 'HEAD', args.count, on_slot)
+            except RuntimeError as e:
+                print(f"❌ {e}")
+                return 1
+            return 0
+        command = args.extra
+        if not command:
+            print('❌ Falta el comando (python -m rent360push worktrees run -- npx tsc --noEmit)')
+            return 1
+        rev = args.rev or worktrees.snapshot(session)
+        with worktrees.claim(session, config, rev) as checkout:
+            print(f"📂 {checkout.name} en {checkout.tree[:10]} (listo en {checkout.reset:.1f} s)")
+            return subprocess.call(command, cwd=checkout.path, env=checkout.env)
+
+
+def cmd_i18n(args):
+    from dataclasses import asdict
+
+    from . import i18n
+    from .config import load_config
+    from .git import find_repo_root
+
+    root = find_repo_root()
+    config = load_config(root)
+    report = i18n.check(root, config, args.jobs)
+    if args.json:
+        print(json.dumps(asdict(report), ensure_ascii=False, indent=2))
+        return 1 if report.problems else 0
+    catalogs = ', '.join(f'{lang} {count}' for lang, count in report.catalogs.items())
+    print(f"🌐 Catálogos: {catalogs or 'ninguno'}; {report.used} claves usadas en {report.files} archivos "
+          f"({report.rescanned} re-leídos)")
+    for error in report.errors:
+        print(f"❌ {error}")
+    for lang, keys in report.missing.items():
+        print(f"❌ Faltan en {lang} ({len(keys)}):")
+        for key in keys[:args.limit]:
+            print(f'   {key}')
+    if report.undefined:
+        print(f"❌ Usadas pero en ningún catálogo ({len(report.undefined)}):")
+        for usage in report.undefined[:args.limit]:
+            print(f'   {usage.path}:{usage.line}  {usage.key}')
+    if report.placeholders:
+        print(f"❌ Argumentos distintos entre idiomas ({len(report.placeholders)}):")
+        for key, present in list(report.placeholders.items())[:args.limit]:
+            print(f'   {key}: {i18n.describe_arguments(present)}')
+    if report.unresolved:
+        print(f"⚠️  {report.unresolved} llamadas con espacio de nombres no literal (sin revisar)")
+    if args.orphans:
+        print(f"🗑️  Huérfanas ({len(report.orphans)}):")
+        for key in report.orphans[:args.limit]:
+            print(f'   {key}')
+    elif report.orphans:
+        print(f"🗑️  {len(report.orphans)} claves sin uso (--orphans para listarlas)")
+    if not report.problems:
+        print('✅ Catálogos consistentes')
+    return 1 if report.problems else 0
+
+
+def cmd_docker(args):
+    import time
+
+    from . import docker
+    from .config import load_config
+    from .git import GitSession
+
+    with GitSession() as session:
+        config = load_config(session.root)
+        root = session.root
+        ignore = docker.DockerIgnore.load(root)
+        stages = docker.load_dockerfile(root, config.dockerfile)
+        if args.action == 'context':
+            start = time.perf_counter()
+            files, total, groups = docker.context_report(root, ignore, args.depth)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"📦 Contexto de build: {files} archivos, {total / 1e6:.1f} MB ({elapsed:.0f} ms)")
+            ranked = sorted(groups.items(), key=lambda item: -item[1][1])
+            for name, (count, size) in ranked[:args.limit]:
+                print(f"   {size / 1e6:8.2f} MB {size * 100 / max(total, 1):5.1f}%  {count:6d}  {name}")
+            if len(ranked) > args.limit:
+                print(f"   ... y {len(ranked) - args.limit} grupos más")
+            if stages is not None:
+                context = [rel for rel, _ in docker.context_files(root, ignore)]
+                for instruction in docker.unmatched_copies(stages, context):
+                    print(f"❌ {config.dockerfile}:{instruction.line} {instruction} no coincide con nada del contexto")
+            return 0
+        if stages is None:
+            print(f"❌ No existe {config.dockerfile}")
+            return 1
+        paths = args.paths or docker.pending_paths(session, config)
+    prediction = docker.predict(stages, paths, ignore)
+    print(f"🔍 {len(paths)} rutas cambiadas: {len(prediction.context_paths)} en el contexto, "
+          f"{len(prediction.ignored_paths)} excluidas por .dockerignore")
+    width = max((len(layer.stage) for layer in prediction.layers), default=0) + 2
+    for layer in prediction.layers:
+        mark = '♻️ ' if layer.invalidated else '✅'
+        cause = ''
+        if layer.paths:
+            more = f' +{len(layer.paths) - 3}' if len(layer.paths) > 3 else ''
+            cause = f"  ← {', '.join(layer.paths[:3])}{more}"
+        elif layer.invalidated and not layer.cause.startswith('línea'):
+            cause = f'  ← {layer.cause}'
+        text = str(layer.instruction)
+        text = text if len(text) <= 70 else text[:67] + '...'
+        print(f"   {mark} {'[' + layer.stage + ']':{width}} {layer.instruction.line:3d} {text}{cause}")
+    busted = prediction.install_busted
+    if busted:
+        print(f"\n⚠️  El push reconstruye la instalación de dependencias (línea {busted[0].instruction.line})")
+        return 1 if args.strict else 0
+    print(f"\n➡️  {docker.describe(prediction)}")
+    return 0
+
+
+def cmd_hooks(args):
+    from . import hooks, trace
+    from .config import load_config
+    from .git import GitError, GitSession
+
+    with GitSession() as session:
+        config = load_config(session.root)
+        if args.action == 'clear':
+            hooks.PassCache(session.root).clear()
+            print('🧹 Caché de hooks vaciada')
+            return 0
+        if args.action == 'status':
+            cache = hooks.PassCache(session.root)
+            for stage in hooks.stages(config, [s['name'] for s in config.hook_stages]):
+                manual = ' (manual)' if stage.manual else ''
+                print(f"   {stage.name}{manual}: {len(cache.keys.get(stage.name, ()))} pasadas guardadas")
+            return 0
+        trace.configure(session.root, config)
+
+        def on_result(result):
+            if result.skipped:
+                print(f"   ⚠️  {result.stage}: {result.output}")
+                return
+            mark = '✅' if result.ok else '❌'
+            fixed = f", {len(result.fixed)} corregidos" if result.fixed else ''
+            print(f"   {mark} {result.stage} ({result.duration:.1f} s, "
+                  f"{len(result.checked)} revisados, {result.cached} en caché{fixed})")
+            if not result.ok and result.output:
+                print('      ' + result.output.replace('\n', '\n      '))
+
+        what = 'todo el índice' if args.all else 'lo preparado'
+        print(f"🪝 Hooks sobre {what}")
+        try:
+            results, elapsed = hooks.run(session, config, args.stage, args.all, args.jobs, on_result, args.fix)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 2
+        except GitError as e:
+            print(f"❌ {e}")
+            return 1
+    ok = all(r.ok for r in results)
+    print(f"{'✅' if ok else '❌'} {elapsed:.1f} s")
+    return 0 if ok else 1
+
+
+def cmd_guard(args):
+    import time
+
+    from . import guard
+    from .config import load_config
+    from .git import GitSession
+
+    with GitSession() as session:
+        config = load_config(session.root)
+        start = time.perf_counter()
+        blobs = guard.tree_blobs(session, args.tree) if args.tree else guard.staged_blobs(session)
+        findings, read = guard.scan(session, config, blobs)
+        elapsed = (time.perf_counter() - start) * 1000
+    what = f'árbol de {args.tree}' if args.tree else 'índice'
+    print(f"🔍 {len(blobs)} blobs del {what}, {read} leídos ({elapsed:.0f} ms)")
+    for line in guard.format_findings(findings, args.limit):
+        print(f'   ❌ {line}')
+    if not findings:
+        print('✅ Sin secretos ni archivos basura')
+    return 1 if findings else 0
+
+
+def cmd_spool(args):
+    import time
+
+    from . import spool
+    from .git import find_repo_root
+
+    root = find_repo_root()
+    if args.action == 'drain':
+        def on_attempt(ok, pushes):
+            if not args.quiet:
+                for push in pushes:
+                    mark = '✅' if push.ok else '📴' if spool.is_offline(push) else '❌'
+                    print(f"{mark} {push.target} {push.error}".rstrip())
+
+        done = spool.drain(root, once=args.once, on_attempt=on_attempt)
+        if done is None and not args.quiet:
+            print('⏳ Ya hay un proceso de reintentos en curso')
+        return 0 if done is not False else 1
+    if args.action == 'clear':
+        spool.clear(root)
+        print('🗑️  Cola vacía')
+        return 0
+    state = spool.load(root)
+    if not state['entries']:
+        print('✅ Sin pushes pendientes')
+        return 0
+    for (remote, branch), commit in spool.latest(state['entries']).items():
+        count = len({e['commit'] for e in state['entries'] if (e['remote'], e['branch']) == (remote, branch)})
+        name = f'{remote}/{branch}' if branch else f'{remote} (rama por defecto)'
+        print(f"📴 {name}: {count} commits en cola (último {commit[:12]})")
+    wait = state['next_at'] - time.time()
+    print(f"   intentos: {state['attempts']}, próximo en {max(wait, 0):.0f} s")
+    if state['error']:
+        print(f"   último error: {state['error']}")
+    return 0
+
+
+def print_pack_stats(stats):
+    graph = ('✅' if not stats.commit_graph_stale else '⚠️  desactualizado') if stats.commit_graph else '❌'
+    midx = ('✅' if not stats.midx_stale else '⚠️  desactualizado') if stats.midx else '❌'
+    print(f"📦 {stats.total_bytes / 1e6:.1f} MB: {stats.loose_objects} objetos sueltos "
+          f"({stats.loose_bytes / 1e6:.1f} MB), {stats.packed_objects} en {stats.packs} packs "
+          f"({stats.pack_bytes / 1e6:.1f} MB); commit-graph {graph}, multi-pack-index {midx}")
+    if stats.garbage:
+        print(f"   ⚠️  {stats.garbage} archivos basura en objects/")
+
+
+def cmd_maintenance(args):
+    import time
+
+    from . import maintenance, trace
+    from .config import load_config
+    from .git import GitSession
+
+    with GitSession() as session:
+        config = load_config(session.root)
+        trace.configure(session.root, config)
+        root = session.root
+        if args.action == 'status':
+            stats = maintenance.stats(session)
+            print_pack_stats(stats)
+            tasks = maintenance.plan(stats, config)
+            for task in tasks:
+                print(f"   🔧 {task.name}: {task.reason} → git {' '.join(task.args)}")
+            if not tasks:
+                print('✅ Nada que mantener')
+            if args.blobs:
+                print('🐘 Blobs más pesados de la historia:')
+                for disk, size, sha, path in maintenance.largest_blobs(session, args.blobs):
+                    print(f"   {disk / 1e6:8.2f} MB en disco ({size / 1e6:.2f} MB)  {sha[:10]}  {path}")
+            runs = maintenance.load(root)['runs']
+            if runs:
+                last = runs[-1]
+                freed = (sum(last['before'][k] for k in ('loose_bytes', 'pack_bytes'))
+                         - sum(last['after'][k] for k in ('loose_bytes', 'pack_bytes')))
+                when = time.strftime('%Y-%m-%d %H:%M', time.localtime(last['time']))
+                names = ', '.join(t['name'] for t in last['tasks'])
+                print(f"🕒 Último mantenimiento {when} ({names}): {freed / 1e6:+.1f} MB liberados")
+                effect = maintenance.effect(root, last)
+                if effect:
+                    print(f"   push p50 {effect[0]:.0f} ms → {effect[1]:.0f} ms ({effect[2]} pushes después)")
+            return 0
+
+        if args.auto and not maintenance.wait_for_uploads(root):
+            return 1
+        tasks = [maintenance.Task(name, 'a pedido', maintenance.TASKS[name]) for name in args.task or ()] or None
+
+        def on_task(task, result):
+            if not args.quiet:
+                mark = '✅' if result.ok else '❌'
+                error = f' → {result.error}' if result.error else ''
+                print(f"{mark} {task.name} ({task.reason}, {result.duration:.1f} s){error}")
+
+        run = maintenance.maintain(session, config, tasks, on_task)
+    if run is None:
+        if not args.quiet:
+            print('⏳ Ya hay un mantenimiento en curso')
+        return 0
+    if args.quiet:
+        return 0 if all(t['ok'] for t in run.tasks) else 1
+    if not run.tasks:
+        print('✅ Nada que mantener')
+        return 0
+    before, after = maintenance.PackStats(**run.before), maintenance.PackStats(**run.after)
+    print_pack_stats(after)
+    print(f"📉 {before.total_bytes / 1e6:.1f} MB → {after.total_bytes / 1e6:.1f} MB, "
+          f"{before.loose_objects} → {after.loose_objects} sueltos, {before.packs} → {after.packs} packs")
+    if run.probe_before is not None and run.probe_after is not None:
+        print(f"⏱️  Enumeración de objetos (rev-list --objects --all): "
+              f"{run.probe_before * 1000:.0f} ms → {run.probe_after * 1000:.0f} ms")
+    return 0 if all(t['ok'] for t in run.tasks) else 1
+
+
+def cmd_plugins(args):
+    from .config import load_config
+    from .git import find_repo_root
+    from .plugins import Registry
+
+    registry = Registry(load_config(find_repo_root()))
+    failed = 0
+    for hook, plugins in registry.declared().items():
+        print(f'🔌 {hook}')
+        for plugin in plugins:
+            target = plugin.target if isinstance(plugin.target, str) else repr(plugin)
+            if not args.check:
+                print(f'   {plugin.name} → {target}')
+                continue
+            try:
+                plugin.load()
+                print(f'   ✅ {plugin.name} → {target}')
+            except (ImportError, AttributeError) as e:
+                failed += 1
+                print(f'   ❌ {plugin.name} → {target}: {e}')
+    return 1 if failed else 0
+
+
+def cmd_summary(args):
+    from . import trace
+    from .git import find_repo_root
+
+    summary = trace.summarize(trace.read(find_repo_root()), last_runs=args.last)
+    if args.json:
+        summary['commands'] = {' / '.join(key): row for key, row in summary['commands'].items()}
+        print(json.dumps(summary, indent=2))
+        return 0
+    if not summary['steps'] and not summary['commands']:
+        print('Sin trazas todavía (.git/rent360push/trace/)')
+        return 0
+
+    def table(title, rows):
+        print(f"\n{title:<40} {'n':>5} {'fallos':>6} {'p50 ms':>10} {'p95 ms':>10} {'máx ms':>10}")
+        for name, row in sorted(rows, key=lambda item: -item[1]['p95_ms']):
+            print(f"{name[:40]:<40} {row['count']:>5} {row['failures']:>6} "
+                  f"{row['p50_ms']:>10.1f} {row['p95_ms']:>10.1f} {row['max_ms']:>10.1f}")
+
+    print(f"📊 {summary['runs']} corridas")
+    table('paso', summary['steps'].items())
+    if args.commands:
+        table('paso / comando', ((' / '.join(key), row) for key, row in summary['commands'].items()))
+    return 0
+
+
+def cmd_journal(args):
+    from .changes import run_journal
+    from .git import find_repo_root
+    from .inotify import available
+
+    if not available():
+        print('❌ inotify no está disponible; la caché de stat seguirá funcionando sin diario')
+        return 1
+    root = find_repo_root()
+    print(f'👀 Registrando cambios de {root} (Ctrl+C para salir)')
+    try:
+        run_journal(root)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_watch(args):
+    from .config import load_config
+    from .git import find_repo_root
+    from .inotify import available
+    from .watch import run_watch
+
+    if not available():
+        print('❌ inotify no está disponible en esta plataforma')
+        return 1
+    root = find_repo_root()
+    config = load_config(root)
+    for name in ('quiet', 'max_delay', 'min_push_interval'):
+        value = getattr(args, name)
+        if value is not None:
+            setattr(config, f'watch_{name}', value)
+    print(f'👀 Vigilando {root} (Ctrl+C para salir)')
+    print(f'   commit tras {config.watch_quiet:g} s sin cambios, '
+          f'push como mucho cada {config.watch_min_push_interval:g} s')
+    try:
+        run_watch(root, config, message=args.message, push=not args.no_push,
+                  on_step=print_step, on_check=print_check, on_output=print_output)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_bench(args):
+    if args.suite == 'e2e':
+        return _bench_e2e(args)
+    if args.suite == 'startup':
+        return _bench_startup(args)
+    from .bench import steps
+
+    report = steps.run(files=args.files, changed=args.changed, rounds=args.rounds)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(steps.format_report(report))
+    return 0
+
+
+def _bench_e2e(args):
+    from .bench import e2e
+    from .git import find_repo_root
+
+    history = args.history or e2e.history_path(find_repo_root())
+    records = e2e.run(
+        sizes=[int(s) for s in args.sizes.split(',')],
+        modify=args.modify,
+        add=args.add,
+        delete=args.delete,
+        rounds=args.rounds,
+        variants=args.variants.split(','),
+        on_result=None if args.json else lambda r: print(e2e.format_record(r)),
+    )
+    rows = e2e.compare(records, e2e.load_history(history), args.threshold, args.baseline)
+    if not args.no_save:
+        e2e.append_history(history, records)
+    if args.json:
+        print(json.dumps({'records': records, 'comparison': rows}, indent=2))
+    else:
+        print('\n' + e2e.format_comparison(rows))
+    return 1 if any(r['regression'] for r in rows) else 0
+
+
+class _Unused:
+    """Subcomando que no se va a ejecutar: sus argumentos no se construyen"""
+
+    def add_argument(self, *args, **kwargs):
+        pass
+
+    def set_defaults(self, **kwargs):
+        pass
+
+
+def _bench_startup(args):
+    from .bench import e2e, startup
+    from .git import find_repo_root
+
+    history = args.history or e2e.history_path(find_repo_root())
+    record = startup.run(rounds=args.rounds)
+    rows = e2e.compare([record], e2e.load_history(history), args.threshold, args.baseline)
+    if not args.no_save:
+        e2e.append_history(history, [record])
+    over = startup.over_budget(record, args.budget)
+    if args.json:
+        print(json.dumps({'record': record, 'comparison': rows, 'over_budget': over}, indent=2))
+    else:
+        print(startup.format_record(record, args.budget))
+        if rows:
+            print('\n' + e2e.format_comparison(rows))
+    return 1 if over or any(r['regression'] for r in rows) else 0
+
+
+def build_parser(command=None):
+    """Parser de la CLI. Con `command` solo se arma ese subcomando: armar los
+    ~70 argumentos de todos cuesta más que el resto de un `push` sin cambios"""
+    from . import __version__
+
+    parser = argparse.ArgumentParser(prog='rent360push', description='Subida de cambios de Rent360 a GitHub')
+    parser.add_argument('--version', action='version', version=f'%(prog)s {__version__}')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def add_parser(name, **kwargs):
+        if command is not None and name != command:
+            return _Unused()
+        return sub.add_parser(name, **kwargs)
+
+    push = add_parser('push', help='agrega, commitea y sube los cambios')
+    push.add_argument('-m', '--message', required=True, help='mensaje del commit')
+    push.add_argument('paths', nargs='*', help='limitar el commit a estas rutas')
+    push.add_argument('--no-push', action='store_true', help='solo commit local')
+    push.add_argument('--full-scan', action='store_true', help='ignorar la caché de stat y usar git status')
+    push.add_argument('--no-verify', action='store_true', help='no revisar secretos ni validar antes del push')
+    push.add_argument('--deploy', action='store_true', help='empujar a la rama de deploy aunque no afecte el build')
+    push.add_argument('--fix', action='store_true', help='aplicar los codemods antes de commitear')
+    push.set_defaults(func=cmd_push)
+
+    check = add_parser('validate', help='tsc/ESLint/Jest solo sobre los archivos afectados')
+    check.add_argument('files', nargs='*', help='archivos cambiados (por defecto: diff contra el remoto)')
+    check.add_argument('--base', help='ref base del diff (por defecto: rama remota)')
+    check.add_argument('-j', '--jobs', type=int, default=None, help='procesos en paralelo (por defecto: núcleos)')
+    check.add_argument('--snapshot', action='store_true', help='validar lo preparado en un worktree del pool')
+    check.set_defaults(func=cmd_validate)
+
+    jest = add_parser('jest', help='Jest en shards paralelos repartidos por duración, con cobertura unida')
+    jest.add_argument('paths', nargs='*', help='solo estos archivos o directorios de test')
+    jest.add_argument('--config', action='append', help='config de Jest (repetible; por defecto jest_configs)')
+    jest.add_argument('-j', '--jobs', type=int, default=None, help='shards en paralelo (por defecto: núcleos)')
+    jest.add_argument('--coverage', action='store_true', help='cobertura por shard unida en coverage/')
+    jest.add_argument('--plan', action='store_true', help='solo mostrar el reparto estimado')
+    jest.add_argument('--limit', type=int, default=20, help='archivos fallidos a mostrar')
+    jest.set_defaults(func=cmd_jest)
+
+    graph = add_parser('graph', help='consultas al índice de imports de src/ y services/')
+    graph.add_argument('action', choices=['dependents', 'deps', 'stats'])
+    graph.add_argument('paths', nargs='*')
+    graph.add_argument('--direct', action='store_true', help='solo importadores directos')
+    graph.add_argument('-j', '--jobs', type=int, default=None)
+    graph.set_defaults(func=cmd_graph)
+
+    impact = add_parser('impact', help='qué parte del diff pendiente afecta el build de DigitalOcean')
+    impact.add_argument('paths', nargs='*', help='clasificar estas rutas en lugar del diff pendiente')
+    impact.add_argument('--limit', type=int, default=20, help='rutas a mostrar por grupo')
+    impact.set_defaults(func=cmd_impact)
+
+    scan = add_parser('scan', help='regenera console_usage.csv (console.*, logger.error suelto, ...)')
+    scan.add_argument('--pattern', action='append', help='regex a buscar (reemplaza scan_patterns; repetible)')
+    scan.add_argument('--output', help='CSV de salida (por defecto scan_output)')
+    scan.add_argument('--check', action='store_true', help='solo verificar que el CSV esté al día')
+    scan.add_argument('-j', '--jobs', type=int, default=None)
+    scan.set_defaults(func=cmd_scan)
+
+    codemod = add_parser('codemod', help='aplica todas las reglas de reescritura en una sola pasada')
+    codemod.add_argument('paths', nargs='*', help='archivos a procesar (por defecto: codemod_dirs)')
+    codemod.add_argument('--dry-run', action='store_true', help='mostrar el diff sin escribir')
+    codemod.add_argument('--rule', action='append', help='aplicar solo esta regla (repetible)')
+    codemod.add_argument('--list', action='store_true', help='listar las reglas cargadas')
+    codemod.add_argument('--commit', metavar='MENSAJE', help='commitear (y subir) solo los archivos modificados')
+    codemod.add_argument('--no-push', action='store_true', help='con --commit: solo commit local')
+    codemod.add_argument('-j', '--jobs', type=int, default=None)
+    codemod.set_defaults(func=cmd_codemod)
+
+    log = add_parser('buildlog', help='resume los errores de un log de build de DigitalOcean')
+    log.add_argument('log', nargs='?', default='-', help="archivo de log ('-' = stdin)")
+    log.add_argument('--show', action='store_true', help='mostrar el último informe guardado')
+    log.add_argument('--limit', type=int, default=20, help='errores a mostrar')
+    log.add_argument('--max-errors', type=int, default=5000, help='errores únicos a conservar')
+    log.add_argument('--no-save', action='store_true', help='no guardar el informe para el próximo push')
+    log.add_argument('--json', action='store_true')
+    log.set_defaults(func=cmd_buildlog)
+
+    build = add_parser('build', help='npm run build con caché por contenido de las entradas')
+    build.add_argument('--force', action='store_true', help='construir aunque haya un resultado guardado')
+    build.add_argument('--restore', action='store_true', help='restaurar el artefacto (.next) de un build en caché')
+    build.add_argument('--list', action='store_true', help='listar los builds guardados')
+    build.add_argument('--quiet', action='store_true', help='sin la salida del build')
+    build.set_defaults(func=cmd_build)
+
+    bis = add_parser('bisect', help='commit que rompió el build, probando varios puntos a la vez en worktrees')
+    bis.add_argument('good', help='último commit bueno conocido')
+    bis.add_argument('bad', nargs='?', default='HEAD', help='commit malo (por defecto HEAD)')
+    bis.add_argument('--run', help="comando a probar (por defecto bisect_command), p.ej. 'next build'")
+    bis.add_argument('-j', '--jobs', type=int, default=None, help='worktrees en paralelo (por defecto: núcleos)')
+    bis.add_argument('--no-cache', action='store_true', help='volver a probar árboles ya vistos')
+    bis.add_argument('--limit', type=int, default=20, help='errores a mostrar')
+    bis.set_defaults(func=cmd_bisect)
+
+    pool = add_parser('worktrees', help='pool de worktrees aislados con node_modules compartido')
+    pool.add_argument('action', nargs='?', default='status', choices=['status', 'warm', 'run', 'clean'])
+    pool.add_argument('--rev', help='warm/run: commit o árbol (por defecto: HEAD / lo preparado)')
+    pool.add_argument('-n', '--count', type=int, default=None, help='warm: lugares (por defecto worktree_pool_size)')
+    pool.set_defaults(func=cmd_worktrees)
+
+    intl = add_parser('i18n', help='claves de messages/*.json faltantes, sin uso o con argumentos distintos')
+    intl.add_argument('--orphans', action='store_true', help='listar las claves sin uso')
+    intl.add_argument('--limit', type=int, default=30, help='claves a mostrar por sección')
+    intl.add_argument('-j', '--jobs', type=int, default=None)
+    intl.add_argument('--json', action='store_true')
+    intl.set_defaults(func=cmd_i18n)
+
+    dock = add_parser('docker', help='tamaño del contexto de Docker y capas que invalida el push')
+    dock.add_argument('action', nargs='?', default='context', choices=['context', 'layers'])
+    dock.add_argument('paths', nargs='*', help='layers: rutas cambiadas (por defecto: índice contra el remoto)')
+    dock.add_argument('--depth', type=int, default=1, help='context: niveles de directorio por grupo')
+    dock.add_argument('--limit', type=int, default=20, help='context: grupos a mostrar')
+    dock.add_argument('--strict', action='store_true', help='layers: salir con 1 si se reinstalan dependencias')
+    dock.set_defaults(func=cmd_docker)
+
+    hook = add_parser('hooks', help='etapas del pre-commit en paralelo con caché por contenido (husky)')
+    hook.add_argument('action', nargs='?', default='run', choices=['run', 'status', 'clear'])
+    hook.add_argument('--stage', action='append', help='solo esta etapa, aunque sea manual (repetible)')
+    hook.add_argument('--all', action='store_true', help='revisar todo el índice, no solo lo preparado')
+    hook.add_argument('--fix', action='store_true', help='corregir (eslint --fix, prettier --write) y volver a preparar')
+    hook.add_argument('-j', '--jobs', type=int, default=None)
+    hook.set_defaults(func=cmd_hooks)
+
+    guard = add_parser('guard', help='secretos y archivos basura en lo que se va a commitear')
+    guard.add_argument('--tree', metavar='REV', help='revisar todo el árbol de REV en lugar del índice')
+    guard.add_argument('--limit', type=int, default=50, help='hallazgos a mostrar')
+    guard.set_defaults(func=cmd_guard)
+
+    spool = add_parser('spool', help='pushes en cola por falta de conexión (spool.py)')
+    spool.add_argument('action', nargs='?', default='status', choices=['status', 'drain', 'clear'])
+    spool.add_argument('--once', action='store_true', help='drain: un solo intento, sin esperar el backoff')
+    spool.add_argument('--quiet', action='store_true', help='drain: sin salida (proceso en segundo plano)')
+    spool.set_defaults(func=cmd_spool)
+
+    maint = add_parser('maintenance', help='estadísticas de packs y repack/commit-graph/midx cuando compensan')
+    maint.add_argument('action', nargs='?', default='status', choices=['status', 'run'])
+    maint.add_argument('--task', action='append', choices=('loose', 'geometric', 'commit-graph', 'midx'),
+                       help='run: ejecutar esta tarea aunque no haga falta (repetible)')
+    maint.add_argument('--blobs', type=int, default=0, metavar='N', help='status: los N blobs más pesados')
+    maint.add_argument('--auto', action='store_true', help='run: esperar a que no haya una subida en curso')
+    maint.add_argument('--quiet', action='store_true', help='run: sin salida (proceso en segundo plano)')
+    maint.set_defaults(func=cmd_maintenance)
+
+    plugins = add_parser('plugins', help='plugins registrados por hook (plugins.py)')
+    plugins.add_argument('--check', action='store_true', help='importar cada plugin para verificar que exista')
+    plugins.set_defaults(func=cmd_plugins)
+
+    summary = add_parser('summary', help='p50/p95 por paso a partir de las trazas de las subidas')
+    summary.add_argument('--last', type=int, help='solo las últimas N corridas')
+    summary.add_argument('--commands', action='store_true', help='detalle por comando dentro de cada paso')
+    summary.add_argument('--json', action='store_true')
+    summary.set_defaults(func=cmd_summary)
+
+    journal = add_parser('journal', help='vigilante inotify que alimenta la caché de stat')
+    journal.set_defaults(func=cmd_journal)
+
+    watch = add_parser('watch', help='commits automáticos agrupados y pushes con límite de ritmo')
+    watch.add_argument('-m', '--message', default='auto-commit: cambios automáticos', help='prefijo del commit')
+    watch.add_argument('--quiet', type=float, help='segundos sin cambios antes de commitear')
+    watch.add_argument('--max-delay', type=float, help='espera máxima desde el primer cambio')
+    watch.add_argument('--min-push-interval', type=float, help='segundos mínimos entre pushes')
+    watch.add_argument('--no-push', action='store_true', help='solo commits locales')
+    watch.set_defaults(func=cmd_watch)
+
+    bench = add_parser('bench', help='benchmarks sobre repositorios sintéticos')
+    bench.add_argument('suite', nargs='?', default='steps', choices=['steps', 'e2e', 'startup'],
+                       help='steps: latencia por paso, scripts antiguos vs sesión persistente; '
+                            'e2e: subida completa por tamaño de repo, con historial; '
+                            'startup: arranque de la CLI sin cambios, con presupuesto')
+    bench.add_argument('--files', type=int, default=945, help='steps: archivos del repo')
+    bench.add_argument('--changed', type=int, default=50, help='steps: archivos modificados por ronda')
+    bench.add_argument('--rounds', type=int, default=5)
+    bench.add_argument('--json', action='store_true')
+    bench.add_argument('--sizes', default='1000,10000,100000', help='e2e: tamaños de repo separados por coma')
+    bench.add_argument('--modify', type=int, default=50, help='e2e: archivos modificados por ronda')
+    bench.add_argument('--add', type=int, default=5, help='e2e: archivos agregados por ronda')
+    bench.add_argument('--delete', type=int, default=5, help='e2e: archivos borrados por ronda')
+    bench.add_argument('--variants', default='legacy,pipeline', help='e2e: legacy, pipeline')
+    bench.add_argument('--history', help='e2e: archivo de historial (por defecto .git/rent360push/bench/)')
+    bench.add_argument('--baseline', help='e2e: comparar contra este commit en lugar de la última corrida')
+    bench.add_argument('--threshold', type=float, default=0.2, help='e2e: aumento relativo que cuenta como regresión')
+    bench.add_argument('--no-save', action='store_true', help='e2e: no agregar la corrida al historial')
+    bench.add_argument('--budget', type=float, default=50,
+                       help='startup: ms permitidos por encima del arranque del intérprete')
+    bench.set_defaults(func=cmd_bench)
+    if command is not None and command not in sub.choices:
+        # Subcomando desconocido: parser completo para el mensaje de error
+        return build_parser()
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv and not argv[0].startswith('-') else None
+    # `worktrees run [opciones] -- comando ...`: lo que sigue a `--` no se parsea
+    extra = []
+    if command == 'worktrees' and '--' in argv:
+        index = argv.index('--')
+        argv, extra = argv[:index], argv[index + 1:]
+    args = build_parser(command).parse_args(argv)
+    args.extra = extra
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        print('\n⏹️  Proceso interrumpido por el usuario')
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
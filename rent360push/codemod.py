@@ -0,0 +1,225 @@
+"""
+Motor de reescrituras (codemods) en una sola pasada.
+
+Cada `fix-logger-*.js`, `fix-all-logger-errors.js`,
+`fix_handleError_imports.ps1` y `scripts/fix-*.js` recorría todo el árbol
+para aplicar una sola sustitución por regex, y antes de cada subida se
+corrían varios. Aquí se cargan todas las reglas y cada archivo se lee una
+sola vez: se aplican en orden todas las reglas que correspondan, en un pool
+de procesos, y el resultado se escribe de forma atómica (archivo temporal +
+`os.replace`) o se muestra como diff (`dry_run`).
+
+Una regla es un dict:
+
+    {"name": "...", "pattern": "regex", "replace": "reemplazo (sintaxis re.sub)",
+     "literal": false, "when": "regex opcional", "files": ["globs opcionales"]}
+
+`when` se evalúa sobre el contenido original: la regla solo se aplica a los
+archivos donde aparece (como el `git grep` de fix_handleError_imports.ps1).
+`files` usa la sintaxis de globs de impact.py.
+
+Los archivos que ninguna regla modifica se recuerdan por stat en
+`.git/rent360push/codemod.json` (para el mismo juego de reglas), así que la
+siguiente pasada ni siquiera los abre.
+"""
+
+import difflib
+import functools
+import json
+import os
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from . import imports
+from .config import state_dir
+from .filecache import CHUNK_SIZE, PARALLEL_THRESHOLD, digest
+from .impact import compile_globs
+
+CACHE_FILE = 'codemod.json'
+CACHE_VERSION = 1
+
+# Equivalentes de los scripts de la raíz y de scripts/
+DEFAULT_RULES = [
+    {
+        # fix-logger-errors.js, fix-logger-batch.js, fix-all-logger-errors.js,
+        # fix-all-bank-integrations-logger.js
+        'name': 'logger-error-context',
+        'pattern': r"""logger\.error\((['"`])([^'"`\n]+)\1\s*,\s*([A-Za-z_$][\w$.]*)\s*\)""",
+        'replace': r'logger.error(\1\2\1, { error: \3 instanceof Error ? \3.message : String(\3) })',
+    },
+    {
+        # fix_handleError_imports.ps1, fix_remaining_handleError.ps1
+        'name': 'handle-api-error-import',
+        'pattern': r"import \{ (ValidationError, )?handleError \} from '@/lib/errors';",
+        'replace': r"import { \1handleApiError } from '@/lib/api-error-handler';",
+        # Con el mismo límite que las llamadas: renombrar solo el import rompe el build
+        'files': ['*.ts'],
+    },
+    {
+        'name': 'handle-api-error-calls',
+        'pattern': r'\bhandleError\(',
+        'replace': 'handleApiError(',
+        'when': r"handleError.*from.*@/lib/errors",
+        'files': ['*.ts'],
+    },
+]
+
+
+@dataclass
+class FileChange:
+    path: str
+    # {regla: sustituciones}
+    rules: dict
+    diff: str = ''
+
+
+@dataclass
+class CodemodResult:
+    changes: list = field(default_factory=list)
+    files: int = 0
+    read: int = 0
+    dry_run: bool = False
+
+    @property
+    def paths(self):
+        return [c.path for c in self.changes]
+
+
+def load_rules(config):
+    """Reglas por defecto + `codemod_rules`, sin las de `codemod_disable`"""
+    rules = [r for r in DEFAULT_RULES + list(config.codemod_rules) if r['name'] not in config.codemod_disable]
+    names = [r['name'] for r in rules]
+    duplicated = sorted({n for n in names if names.count(n) > 1})
+    if duplicated:
+        raise ValueError(f"reglas de codemod repetidas: {', '.join(duplicated)}")
+    return rules
+
+
+@functools.lru_cache(maxsize=8)
+def _compile(spec):
+    compiled = []
+    for rule in json.loads(spec):
+        pattern = re.escape(rule['pattern']) if rule.get('literal') else rule['pattern']
+        replace = rule['replace'].replace('\\', '\\\\') if rule.get('literal') else rule['replace']
+        compiled.append((
+            rule['name'],
+            re.compile(pattern),
+            replace,
+            re.compile(rule['when']) if rule.get('when') else None,
+            compile_globs(rule.get('files')),
+        ))
+    return compiled
+
+
+def rewrite(spec, rel, text):
+    """Aplica todas las reglas a `text`; devuelve (nuevo_texto, {regla: n})"""
+    counts = {}
+    original = text
+    for name, regex, replace, when, files in _compile(spec):
+        if files is not None and not files.match(rel):
+            continue
+        if when is not None and not when.search(original):
+            continue
+        text, n = regex.subn(replace, text)
+        if n:
+            counts[name] = n
+    return text, counts
+
+
+def _write_atomic(path, text):
+    tmp = os.path.join(os.path.dirname(path), f'.{os.path.basename(path)}.codemod.tmp')
+    with open(tmp, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+    shutil.copymode(path, tmp)
+    os.replace(tmp, path)
+
+
+def _process(root, spec, batch, dry_run):
+    """Lee cada archivo una vez y aplica todas las reglas:
+    [rel] -> [(rel, {regla: n}, diff)]"""
+    results = []
+    for rel in batch:
+        path = os.path.join(root, rel)
+        try:
+            with open(path, encoding='utf-8', newline='') as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError):
+            results.append((rel, {}, ''))
+            continue
+        new, counts = rewrite(spec, rel, text)
+        if new == text:
+            results.append((rel, {}, ''))
+            continue
+        diff = ''
+        if dry_run:
+            diff = ''.join(difflib.unified_diff(
+                text.splitlines(True), new.splitlines(True), f'a/{rel}', f'b/{rel}'
+            ))
+        else:
+            _write_atomic(path, new)
+        results.append((rel, counts, diff))
+    return results
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def run(root, config, dry_run=False, jobs=None, paths=None, only=None):
+    """Aplica las reglas a `paths` (por defecto, los fuentes de
+    `config.codemod_dirs`). `only` limita a esas reglas por nombre."""
+    rules = load_rules(config)
+    if only:
+        unknown = sorted(set(only) - {r['name'] for r in rules})
+        if unknown:
+            raise ValueError(f"reglas desconocidas: {', '.join(unknown)}")
+        rules = [r for r in rules if r['name'] in only]
+    spec = json.dumps(rules, sort_keys=True)
+    files = list(paths) if paths is not None else imports.source_files(root, config.codemod_dirs)
+
+    cache_path = os.path.join(state_dir(root), CACHE_FILE)
+    version = f'{CACHE_VERSION}:{digest(spec.encode("utf-8"))}'
+    clean = {}
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == version:
+            clean = data['clean']
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+
+    stamps = {rel: _stamp(os.path.join(root, rel)) for rel in files}
+    pending = [rel for rel in files if stamps[rel] is not None and clean.get(rel) != stamps[rel]]
+
+    if len(pending) < PARALLEL_THRESHOLD or jobs == 1:
+        processed = _process(root, spec, pending, dry_run)
+    else:
+        batches = [pending[i:i + CHUNK_SIZE] for i in range(0, len(pending), CHUNK_SIZE)]
+        n = len(batches)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            processed = [
+                item
+                for chunk in pool.map(_process, [root] * n, [spec] * n, batches, [dry_run] * n)
+                for item in chunk
+            ]
+
+    result = CodemodResult(files=len(files), read=len(pending), dry_run=dry_run)
+    for rel, counts, diff in processed:
+        if counts:
+            clean.pop(rel, None)
+            result.changes.append(FileChange(rel, counts, diff))
+        else:
+            clean[rel] = stamps[rel]
+    clean = {rel: stamp for rel, stamp in clean.items() if rel in stamps}
+    tmp = cache_path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'version': version, 'clean': clean}, separators=(',', ':')))
+    os.replace(tmp, cache_path)
+    result.changes.sort(key=lambda c: c.path)
+    return result
@@ -0,0 +1,177 @@
+"""
+Configuración de rent360push.
+
+Se lee de `.rent360push.json` en la raíz del repositorio; todos los campos son
+opcionales. El estado persistente (cachés, colas, historiales) vive dentro del
+directorio git para que nunca termine en un `git add`.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field, fields
+
+from .git import git_dir
+
+CONFIG_FILE = '.rent360push.json'
+NON_BUILD_MODES = ('batch', 'side-branch', 'push')
+
+
+@dataclass
+class Config:
+    remote: str = 'origin'
+    # Ramas candidatas si el remoto no anuncia su HEAD (`ls-remote --symref`)
+    branches: list = field(default_factory=lambda: ['master', 'main'])
+    # Destinos de push en paralelo: "remoto" (rama por defecto) o "remoto:rama".
+    # Vacío = solo `remote`
+    targets: list = field(default_factory=list)
+    # Segundos que se confía en la rama por defecto guardada de cada remoto
+    default_branch_ttl: float = 86400
+    # Detección de cambios con caché de stat en lugar de `git status` completo
+    stat_cache: bool = True
+    # Clasificación del diff (impact.py): globs que nunca/siempre afectan el build
+    no_build_paths: list = field(default_factory=lambda: [
+        '*.md', '*.txt', '*.cmd', '*.bat', '*.ps1', '*.vbs', '*.sh', '*.py',
+        'docs/**', 'rent360push/**', 'tests/tooling/**', '.rent360push.json',
+    ])
+    build_paths: list = field(default_factory=lambda: ['src/**', 'prisma/**', 'public/**', 'messages/**'])
+    # Qué hacer con un push que no afecta el build: "batch" (esperar al
+    # próximo push con build), "side-branch" (empujar a `non_build_branch`)
+    # o "push" (empujar igual)
+    non_build_push: str = 'batch'
+    non_build_branch: str = 'no-build'
+    # Minutos que tarda un build de DigitalOcean (para el registro de ahorro)
+    build_minutes: float = 8
+    # Segundos sin salida antes de abortar un push, más un margen por MB a enviar
+    idle_timeout: float = 60
+    idle_timeout_per_mb: float = 2
+    # Sin conexión (spool.py): los commits cuyo push falla por la red quedan
+    # en cola y se reintentan en segundo plano, con backoff exponencial de
+    # `spool_backoff` a `spool_backoff_max` segundos
+    offline_spool: bool = True
+    spool_backoff: float = 5
+    spool_backoff_max: float = 300
+    # Modo vigilante: segundos de calma antes de commitear, espera máxima
+    # desde el primer cambio y separación mínima entre pushes (= builds)
+    watch_quiet: float = 5
+    watch_max_delay: float = 60
+    watch_min_push_interval: float = 300
+    # Escaneo de patrones (scan.py): directorios, regex y CSV de salida
+    scan_dirs: list = field(default_factory=lambda: ['src', 'services'])
+    scan_patterns: list = field(default_factory=lambda: [
+        r'\bconsole\.(?:log|error|warn|info|debug|trace)\s*\(',
+        r'\blogger\.(?:error|warn)\(\s*(?:\'[^\'\n]*\'|"[^"\n]*"|`[^`\n]*`)\s*,\s*[A-Za-z_$][\w$.]*\s*\)',
+    ])
+    scan_output: str = 'console_usage.csv'
+    # Codemods (codemod.py): reglas extra, reglas por defecto desactivadas
+    # y directorios donde se aplican
+    codemod_rules: list = field(default_factory=list)
+    codemod_disable: list = field(default_factory=list)
+    codemod_dirs: list = field(default_factory=lambda: ['src', 'services'])
+    # Trazas JSON-lines de pasos y comandos (trace.py) y su rotación
+    trace: bool = True
+    trace_max_bytes: int = 5_000_000
+    trace_backups: int = 3
+    # Secretos y archivos basura en lo que se va a commitear (guard.py)
+    guard: bool = True
+    guard_max_bytes: int = 5_000_000
+    guard_binary_paths: list = field(default_factory=lambda: [
+        'public/**', '*.png', '*.jpg', '*.jpeg', '*.gif', '*.ico', '*.webp', '*.woff', '*.woff2', '*.ttf', '*.pdf',
+    ])
+    # Rutas que no se revisan
+    guard_allow: list = field(default_factory=list)
+    # Etapas de hook en paralelo con caché por contenido (hooks.py), que
+    # corren antes de cada commit de una subida y desde .husky/pre-commit;
+    # `fix` es el comando que corrige en el lugar (como lint-staged)
+    hooks: bool = True
+    hook_jobs: int = 0
+    hook_stages: list = field(default_factory=lambda: [
+        {'name': 'eslint', 'command': ['eslint'],
+         'files': ['src/**/*.ts', 'src/**/*.tsx', 'src/**/*.js', 'src/**/*.jsx', 'services/**/*.ts',
+                   'services/**/*.js'],
+         'config': ['.eslintrc.json', '.eslintrc.js', 'package-lock.json'], 'fix': ['eslint', '--fix']},
+        {'name': 'prettier', 'command': ['prettier', '--check', '--ignore-unknown'],
+         'files': ['*.ts', '*.tsx', '*.js', '*.jsx', '*.json', '*.md'],
+         'config': ['.prettierrc', '.prettierignore', 'package-lock.json'],
+         'fix': ['prettier', '--write', '--ignore-unknown']},
+        {'name': 'typecheck', 'command': ['tsc', '--noEmit', '-p', 'tsconfig.json'], 'per_file': False,
+         'files': ['*.ts', '*.tsx'], 'config': ['tsconfig.json', 'package-lock.json'], 'manual': True},
+    ])
+    # Plugins (plugins.py): {"pre_push": ["módulo:atributo", ...], ...} y
+    # nombres de plugins a desactivar (incluidos los propios: "guard", ...)
+    plugins: dict = field(default_factory=dict)
+    plugins_disable: list = field(default_factory=list)
+    # `npm run build` antes del push (buildcache.py), salteado si las entradas
+    # del build en el commit que se sube (filtradas con .dockerignore) ya
+    # tienen un resultado guardado. `build_artifact` se archiva con cada build
+    # exitoso y la caché se recorta por LRU al pasar `build_cache_max_bytes`
+    build_check: bool = False
+    build_command: list = field(default_factory=lambda: ['npm', 'run', 'build'])
+    build_inputs: list = field(default_factory=lambda: [
+        'src', 'prisma', 'messages', 'public', 'package.json', 'package-lock.json', 'next.config.js',
+        'next.config.mjs', 'tsconfig.json', 'postcss.config.js', 'postcss.config.mjs', 'tailwind.config.ts',
+        'tailwind.config.js',
+    ])
+    build_artifact: str = '.next'
+    build_cache_max_bytes: int = 2_000_000_000
+    # Capas COPY del Dockerfile que invalida el push (docker.py); solo avisa,
+    # sobre todo si se reconstruye la capa de `npm ci`
+    docker_check: bool = True
+    dockerfile: str = 'Dockerfile'
+    # Claves de next-intl (i18n.py): catálogos comparados entre sí y con las
+    # llamadas t('...') de `i18n_sources`; bloquea lo que introduce el push
+    i18n_check: bool = True
+    i18n_catalogs: list = field(default_factory=lambda: ['messages/es.json', 'messages/en.json'])
+    i18n_sources: list = field(default_factory=lambda: ['src'])
+    # Mantenimiento del repo entre pushes (maintenance.py): se revisa como
+    # mucho cada `maintenance_interval` s y corre en segundo plano si hay
+    # más objetos sueltos o packs que estos umbrales
+    maintenance: bool = True
+    maintenance_interval: int = 3600
+    maintenance_loose_objects: int = 1000
+    maintenance_max_packs: int = 10
+    # tsc/ESLint/Jest sobre los archivos afectados antes de cada push
+    validate: bool = True
+    # Procesos de validación en paralelo (0 = un proceso por núcleo)
+    validate_jobs: int = 0
+    # Validar el commit que se sube en un worktree del pool, no en el árbol
+    # de trabajo (que puede tener cambios sin commitear)
+    validate_isolated: bool = False
+    # Jest repartido en shards por duración (jestshard.py)
+    jest_command: list = field(default_factory=lambda: ['jest'])
+    jest_configs: list = field(default_factory=lambda: ['jest.config.js', 'jest.config.integration.js'])
+    jest_jobs: int = 0
+    # Bisect en paralelo del commit que rompió el build (bisect.py): un
+    # worktree por proceso (0 = uno por núcleo) y resultados por árbol. Un
+    # comando sin salida durante `bisect_timeout` s se corta
+    bisect_command: list = field(default_factory=lambda: ['tsc', '--noEmit'])
+    bisect_jobs: int = 0
+    bisect_timeout: int = 900
+    # Pool de worktrees para chequeos aislados (worktrees.py): lugares que se
+    # mantienen creados y cómo se comparte node_modules ('hardlink' o
+    # 'symlink')
+    worktree_pool_size: int = 4
+    worktree_modules: str = 'hardlink'
+
+
+def load_config(root):
+    """Carga la configuración del repositorio (valores por defecto si no existe)"""
+    path = os.path.join(root, CONFIG_FILE)
+    if not os.path.exists(path):
+        return Config()
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    known = {f.name for f in fields(Config)}
+    unknown = sorted(set(data) - known)
+    if unknown:
+        raise ValueError(f"{CONFIG_FILE}: claves desconocidas: {', '.join(unknown)}")
+    config = Config(**data)
+    if config.non_build_push not in NON_BUILD_MODES:
+        raise ValueError(f"{CONFIG_FILE}: non_build_push debe ser uno de: {', '.join(NON_BUILD_MODES)}")
+    return config
+
+
+def state_dir(root, *parts):
+    """Directorio de estado de rent360push dentro de `.git` (se crea si falta)"""
+    path = os.path.join(git_dir(root), 'rent360push', *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
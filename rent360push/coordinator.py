@@ -0,0 +1,287 @@
+"""
+Una sola subida a la vez por repositorio, con cola de pedidos.
+
+`execute-push.py` lanzaba `push-final.py` como proceso hijo y los `.cmd`
+pueden arrancar varios scripts a la vez: los `git add .` concurrentes
+chocaban en `index.lock` y todo volvía a empezar. Ahora cada llamada a
+`upload()` deja su pedido (mensaje, rutas, opciones) en
+`.git/rent360push/queue/` y trata de tomar el lock `upload.lock`:
+
+- quien lo toma es el líder: reclama todos los pedidos de la cola, junta
+  los compatibles (mismas opciones) en un solo commit + push, escribe el
+  resultado de cada pedido y repite hasta vaciar la cola. Cada grupo sube
+  con sus propias opciones; un grupo que tocaría lo de otro grupo anterior
+  de la misma tanda (rutas en común, todos los cambios, o un push que
+  arrastraría el commit de un pedido sin push) se rechaza con un error;
+- los demás esperan su resultado; si el líder termina (o muere) sin haber
+  tomado su pedido, el siguiente en conseguir el lock pasa a ser líder.
+
+Una ráfaga de N invocaciones produce así uno o dos commits y pushes en lugar
+de N intentos que se pisan. El lock es del sistema operativo (`flock` /
+`msvcrt.locking`): se libera solo si el proceso muere.
+"""
+
+import contextlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+
+from .config import state_dir
+
+QUEUE_DIR = 'queue'
+LOCK_FILE = 'upload.lock'
+POLL = 0.1
+# Resultados sin reclamar (el que esperaba murió) se borran pasado este tiempo
+RESULT_TTL = 86400
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """Lock exclusivo entre procesos sobre un archivo"""
+
+    def __init__(self, path):
+        self.path = path
+        self.fd = None
+
+    def acquire(self, blocking=True):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if not blocking:
+                    os.close(fd)
+                    return False
+                time.sleep(POLL)
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self.fd = fd
+        return True
+
+    def release(self):
+        if self.fd is None:
+            return
+        fd, self.fd = self.fd, None
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        os.close(fd)
+
+    def holder(self):
+        """pid que tomó el lock por última vez (informativo)"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return int(f.read().strip() or 0) or None
+        except (OSError, ValueError):
+            return None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def lock(root):
+    return FileLock(os.path.join(state_dir(root), LOCK_FILE))
+
+
+@contextlib.contextmanager
+def exclusive(root):
+    """Toma el lock de subida (para quien escribe en el repo por fuera de la cola)"""
+    with lock(root):
+        yield
+
+
+@dataclass
+class Intent:
+    """Pedido de subida de una invocación"""
+
+    message: str
+    # None = todos los cambios
+    paths: list | None = None
+    push: bool = True
+    verify: bool = True
+    deploy: bool = False
+    fix: bool = False
+    full_scan: bool = False
+    id: str = field(default_factory=lambda: f'{time.time():.6f}-{os.getpid()}-{os.urandom(4).hex()}')
+    pid: int = field(default_factory=os.getpid)
+
+    @property
+    def options(self):
+        return (self.push, self.verify, self.deploy, self.fix, self.full_scan)
+
+
+def merge_messages(messages):
+    """Un mensaje de commit para varios pedidos: el asunto del primero y,
+    en el cuerpo, todos los mensajes"""
+    unique = list(dict.fromkeys(m.strip() for m in messages))
+    if len(unique) == 1:
+        return unique[0]
+    subject = unique[0].splitlines()[0]
+    return f'{subject} (+{len(unique) - 1})\n\n' + '\n\n'.join(unique)
+
+
+def merge_paths(intents):
+    if any(i.paths is None for i in intents):
+        return None
+    return list(dict.fromkeys(p for i in intents for p in i.paths))
+
+
+def group(intents):
+    """Pedidos compatibles (mismas opciones), en orden de llegada"""
+    groups = {}
+    for intent in intents:
+        groups.setdefault(intent.options, []).append(intent)
+    return list(groups.values())
+
+
+def conflict(earlier, batch):
+    """Motivo por el que `batch` no puede subir después de los grupos
+    `earlier` de la misma tanda (None si puede)"""
+    paths = merge_paths(batch)
+    for other in earlier:
+        previous = merge_paths(other)
+        if paths is None or previous is None or set(paths) & set(previous):
+            return 'hay otro pedido en cola con opciones distintas sobre los mismos cambios'
+        if batch[0].push and not other[0].push:
+            return 'el push subiría el commit de un pedido en cola sin push'
+    return None
+
+
+def _queue(root):
+    return state_dir(root, QUEUE_DIR)
+
+
+def _write_json(path, data):
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(path + '.tmp', path)
+
+
+def enqueue(root, intent):
+    _write_json(os.path.join(_queue(root), f'{intent.id}.json'), asdict(intent))
+
+
+def withdraw(root, intent):
+    """Saca un pedido que nadie tomó todavía; False si ya lo tomó un líder"""
+    try:
+        os.remove(os.path.join(_queue(root), f'{intent.id}.json'))
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def claim(root):
+    """Toma todos los pedidos en cola (solo el líder, con el lock tomado)"""
+    queue = _queue(root)
+    intents = []
+    for name in sorted(os.listdir(queue)):
+        if not name.endswith('.json') or name.endswith('.result.json'):
+            continue
+        taken = os.path.join(queue, name[:-len('.json')] + '.taken')
+        try:
+            os.replace(os.path.join(queue, name), taken)
+            with open(taken, encoding='utf-8') as f:
+                intents.append(Intent(**json.load(f)))
+        except (FileNotFoundError, ValueError, TypeError):
+            continue
+    return intents
+
+
+def _recover(root):
+    """Con el lock tomado nadie está procesando: los pedidos que un líder
+    muerto dejó a medias vuelven a la cola y se limpian resultados viejos"""
+    queue = _queue(root)
+    now = time.time()
+    for name in os.listdir(queue):
+        path = os.path.join(queue, name)
+        if name.endswith('.taken'):
+            os.replace(path, path[:-len('.taken')] + '.json')
+        elif name.endswith('.result.json'):
+            with contextlib.suppress(OSError):
+                if now - os.path.getmtime(path) > RESULT_TTL:
+                    os.remove(path)
+
+
+def _result_path(root, intent_id):
+    return os.path.join(_queue(root), f'{intent_id}.result.json')
+
+
+def drain(root, run_batch, on_batch=None):
+    """Procesa la cola hasta vaciarla. `run_batch(intents)` hace la subida
+    conjunta y devuelve un dict de resultado (con 'ok')"""
+    _recover(root)
+    while True:
+        intents = claim(root)
+        if not intents:
+            return
+        done = []
+        for batch in group(intents):
+            reason = conflict(done, batch)
+            if reason:
+                result = {'ok': False, 'error': f'{reason}; lanzar la subida de nuevo'}
+            else:
+                done.append(batch)
+                if on_batch:
+                    on_batch(batch)
+                try:
+                    result = run_batch(batch)
+                except Exception as e:
+                    result = {'ok': False, 'error': f'{type(e).__name__}: {e}'}
+            result = {**result, 'leader': os.getpid(), 'batch': len(batch)}
+            for intent in batch:
+                _write_json(_result_path(root, intent.id), result)
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(os.path.join(_queue(root), f'{intent.id}.taken'))
+
+
+def _take_result(root, intent):
+    path = _result_path(root, intent.id)
+    try:
+        with open(path, encoding='utf-8') as f:
+            result = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    os.remove(path)
+    return result
+
+
+def submit(root, intent, run_batch, on_wait=None, on_batch=None):
+    """Encola `intent` y devuelve su resultado: lo procesa este proceso si
+    consigue el lock, o espera a que lo procese el líder actual"""
+    enqueue(root, intent)
+    file_lock = lock(root)
+    waiting = False
+    try:
+        while True:
+            result = _take_result(root, intent)
+            if result is not None:
+                return result
+            if file_lock.acquire(blocking=False):
+                try:
+                    drain(root, run_batch, on_batch)
+                finally:
+                    file_lock.release()
+                continue
+            if not waiting and on_wait:
+                on_wait(file_lock.holder())
+            waiting = True
+            time.sleep(POLL)
+    except BaseException:
+        withdraw(root, intent)
+        raise
@@ -0,0 +1,432 @@
+"""
+Contexto de build de Docker según `.dockerignore`.
+
+DigitalOcean construye la imagen con el `Dockerfile` de la raíz y le envía
+como contexto todo lo que `.dockerignore` no excluye. Aquí se reproduce esa
+selección con la semántica de Docker (no la de `.gitignore`):
+
+- los patrones son relativos a la raíz del contexto (`*.md` solo excluye los
+  `.md` de la raíz, `**/*.md` los de cualquier nivel);
+- `*` y `?` no cruzan `/`, `**` cruza cualquier cantidad de directorios;
+- un patrón que coincide con un directorio excluye todo lo que contiene;
+- `!patrón` vuelve a incluir y gana el último patrón que coincide.
+
+Todos los patrones se compilan en una sola regex (en orden inverso, así el
+primer grupo que coincide es el último patrón) y la decisión de cada
+directorio se hereda hacia abajo: cada ruta se evalúa con un solo
+`fullmatch`. Los directorios excluidos que ninguna excepción puede reabrir
+no se recorren.
+
+Además se lee el `Dockerfile` para predecir qué capas invalida un conjunto
+de rutas cambiadas: un `COPY`/`ADD` del contexto se reconstruye si alguna
+ruta cambiada (no excluida) coincide con sus orígenes, y desde ahí todas las
+capas siguientes de la etapa, las etapas `FROM <etapa>` y los
+`COPY --from=<etapa>`. Si entre ellas está el `RUN npm ci`, el deploy vuelve
+a instalar todas las dependencias.
+"""
+
+import json
+import os
+import posixpath
+import re
+from dataclasses import dataclass, field
+
+DOCKERIGNORE = '.dockerignore'
+_WILDCARDS = re.compile(r'[*?\[\\]')
+
+
+def _translate(pattern):
+    """Patrón de .dockerignore -> regex (como moby/patternmatcher)"""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        ch = pattern[i]
+        if ch == '*':
+            if i + 1 < n and pattern[i + 1] == '*':
+                i += 2
+                # `**/` equivale a `**`
+                if i < n and pattern[i] == '/':
+                    i += 1
+                out.append('.*' if i >= n else '(?:.*/)?')
+                continue
+            out.append('[^/]*')
+        elif ch == '?':
+            out.append('[^/]')
+        elif ch == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                out.append(re.escape(ch))
+            else:
+                body = pattern[i + 1:end].replace('\\', '\\\\')
+                if body.startswith(('^', '!')):
+                    out.append('[^' + body[1:] + ']')
+                else:
+                    out.append('[' + body + ']')
+                i = end
+        elif ch == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(ch))
+        i += 1
+    return ''.join(out)
+
+
+def parse(lines):
+    """Líneas de .dockerignore -> [(patrón, excepción)] normalizados"""
+    patterns = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        negated = line.startswith('!')
+        if negated:
+            line = line[1:].strip()
+        line = posixpath.normpath(line.replace('\\', '/')).lstrip('/')
+        if line and line != '.':
+            patterns.append((line, negated))
+    return patterns
+
+
+class DockerIgnore:
+    """Decide qué rutas (relativas, con `/`) quedan fuera del contexto"""
+
+    def __init__(self, patterns=()):
+        self.patterns = list(patterns)
+        self.negated = [neg for _, neg in self.patterns]
+        self.has_exceptions = any(self.negated)
+        if self.patterns:
+            groups = [f'(?P<p{i}>{_translate(p)})' for i, (p, _) in reversed(list(enumerate(self.patterns)))]
+            self._regex = re.compile('|'.join(groups), re.DOTALL)
+        else:
+            self._regex = None
+        self._dirs = {'': None}
+
+    @classmethod
+    def load(cls, root, name=DOCKERIGNORE):
+        try:
+            with open(os.path.join(root, name), encoding='utf-8') as f:
+                return cls(parse(f))
+        except FileNotFoundError:
+            return cls()
+
+    def _last(self, rel):
+        """Índice del último patrón que coincide con `rel` (sin padres)"""
+        if self._regex is None:
+            return None
+        match = self._regex.fullmatch(rel)
+        return int(match.lastgroup[1:]) if match else None
+
+    def _dir_decision(self, rel_dir):
+        """Último patrón que coincide con `rel_dir` o alguno de sus padres"""
+        if rel_dir in self._dirs:
+            return self._dirs[rel_dir]
+        parent = self._dir_decision(posixpath.dirname(rel_dir))
+        own = self._last(rel_dir)
+        decision = own if parent is None or (own is not None and own > parent) else parent
+        self._dirs[rel_dir] = decision
+        return decision
+
+    def excluded(self, rel):
+        parent = self._dir_decision(posixpath.dirname(rel))
+        own = self._last(rel)
+        last = own if parent is None or (own is not None and own > parent) else parent
+        return last is not None and not self.negated[last]
+
+    def excluded_dir(self, rel_dir):
+        last = self._dir_decision(rel_dir)
+        return last is not None and not self.negated[last]
+
+    def can_prune(self, rel_dir):
+        """True si el directorio está excluido y ninguna excepción puede
+        volver a incluir algo dentro de él"""
+        if not self.excluded_dir(rel_dir):
+            return False
+        prefix = rel_dir + '/'
+        for (pattern, negated) in self.patterns:
+            if not negated:
+                continue
+            wildcard = _WILDCARDS.search(pattern)
+            literal = pattern[:wildcard.start()] if wildcard else pattern
+            if literal.startswith(prefix) or (wildcard and prefix.startswith(literal)):
+                return False
+        return True
+
+
+def context_files(root, ignore=None, paths=None):
+    """Archivos del contexto de build: genera (ruta relativa, tamaño).
+
+    Con `paths` solo se recorren esas rutas (archivos o directorios) del
+    contexto. No se siguen los enlaces simbólicos a directorios (Docker los
+    envía como enlaces).
+    """
+    ignore = ignore if ignore is not None else DockerIgnore.load(root)
+    stack = []
+    for rel in paths if paths is not None else ['']:
+        rel = posixpath.normpath(rel.replace('\\', '/')).strip('/') if rel else ''
+        rel = '' if rel == '.' else rel
+        full = os.path.join(root, rel) if rel else root
+        if rel and os.path.isfile(full) and not os.path.islink(full):
+            if not ignore.excluded(rel):
+                yield rel, os.path.getsize(full)
+        elif os.path.isdir(full) and not (rel and ignore.can_prune(rel)):
+            stack.append(rel)
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            entries = os.scandir(os.path.join(root, rel_dir) if rel_dir else root)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                rel = f'{rel_dir}/{entry.name}' if rel_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if not ignore.can_prune(rel):
+                        stack.append(rel)
+                elif not ignore.excluded(rel):
+                    try:
+                        size = entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+                    yield rel, size
+
+
+def context_report(root, ignore=None, depth=1):
+    """Tamaño del contexto por directorio: (archivos, bytes, {grupo: [archivos, bytes]}).
+
+    Las rutas se agrupan por sus primeros `depth` directorios; los archivos
+    sueltos de esos niveles se agrupan como `<dir>/*` (`*` en la raíz).
+    """
+    groups = {}
+    files = total = 0
+    for rel, size in context_files(root, ignore):
+        parts = rel.split('/')
+        key = '/'.join(parts[:depth]) + '/' if len(parts) > depth else '/'.join(parts[:-1] + ['*'])
+        group = groups.setdefault(key, [0, 0])
+        group[0] += 1
+        group[1] += size
+        files += 1
+        total += size
+    return files, total, groups
+
+
+# ---------------------------------------------------------------------------
+# Dockerfile
+
+# Instrucciones que crean capas o cuyo estado de caché interesa mostrar
+LAYER_COMMANDS = ('COPY', 'ADD', 'RUN')
+_INSTALL = re.compile(r'\b(?:npm\s+(?:ci|install|i)|yarn(?:\s+install)?|pnpm\s+(?:install|i))(?:\s|$|&|;)')
+_FLAG = re.compile(r'--([\w-]+)(?:=(\S*))?\s*')
+
+
+@dataclass
+class Instruction:
+    line: int
+    command: str
+    args: str
+    flags: dict = field(default_factory=dict)
+
+    @property
+    def sources(self):
+        """Orígenes de un COPY/ADD (forma shell o JSON), sin el destino"""
+        args = self.args.strip()
+        if args.startswith('['):
+            try:
+                parts = json.loads(args)
+            except ValueError:
+                parts = args.split()
+        else:
+            parts = args.split()
+        return parts[:-1]
+
+    @property
+    def installs_dependencies(self):
+        return self.command == 'RUN' and bool(_INSTALL.search(self.args))
+
+    def __str__(self):
+        flags = ''.join(f'--{k}={v} ' if v is not None else f'--{k} ' for k, v in self.flags.items())
+        return f'{self.command} {flags}{self.args}'
+
+
+@dataclass
+class Stage:
+    index: int
+    base: str
+    name: str | None = None
+    instructions: list = field(default_factory=list)
+
+    @property
+    def label(self):
+        return self.name or str(self.index)
+
+
+def _logical_lines(text):
+    """(número de línea, texto) con las continuaciones `\\` unidas y sin
+    comentarios ni líneas vacías"""
+    pending, start = [], None
+    for number, raw in enumerate(text.splitlines(), 1):
+        line = raw.strip()
+        if line.startswith('#') or (not line and not pending):
+            continue
+        if start is None:
+            start = number
+        if line.endswith('\\'):
+            pending.append(line[:-1].strip())
+            continue
+        pending.append(line)
+        yield start, ' '.join(p for p in pending if p)
+        pending, start = [], None
+    if pending:
+        yield start, ' '.join(p for p in pending if p)
+
+
+def parse_dockerfile(text):
+    """Etapas del Dockerfile con sus instrucciones"""
+    stages = []
+    for number, line in _logical_lines(text):
+        command, _, args = line.partition(' ')
+        command = command.upper()
+        flags = {}
+        args = args.strip()
+        while args.startswith('--'):
+            match = _FLAG.match(args)
+            if not match:
+                break
+            flags[match.group(1)] = match.group(2)
+            args = args[match.end():]
+        if command == 'FROM':
+            parts = args.split()
+            name = parts[2] if len(parts) >= 3 and parts[1].upper() == 'AS' else None
+            stages.append(Stage(len(stages), parts[0] if parts else '', name))
+        elif stages:
+            stages[-1].instructions.append(Instruction(number, command, args, flags))
+    return stages
+
+
+def load_dockerfile(root, name='Dockerfile'):
+    try:
+        with open(os.path.join(root, name), encoding='utf-8') as f:
+            return parse_dockerfile(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def _source_regex(sources):
+    """Regex de las rutas del contexto que copia un COPY con esos orígenes
+    (un origen que es un directorio copia todo su contenido)"""
+    alternatives = []
+    for source in sources:
+        source = posixpath.normpath(source.replace('\\', '/')).lstrip('/')
+        if source in ('.', ''):
+            return re.compile('.*', re.DOTALL)
+        alternatives.append(_translate(source))
+    if not alternatives:
+        return None
+    return re.compile('(?:' + '|'.join(alternatives) + ')(?:/.*)?', re.DOTALL)
+
+
+@dataclass
+class Layer:
+    stage: str
+    instruction: Instruction
+    invalidated: bool = False
+    # Rutas cambiadas que coinciden con los orígenes del COPY/ADD, o el
+    # motivo heredado ("línea 18", "etapa deps")
+    paths: list = field(default_factory=list)
+    cause: str = ''
+
+
+@dataclass
+class Prediction:
+    layers: list = field(default_factory=list)
+    # Rutas cambiadas que sí entran en el contexto
+    context_paths: list = field(default_factory=list)
+    ignored_paths: list = field(default_factory=list)
+
+    @property
+    def invalidated(self):
+        return [layer for layer in self.layers if layer.invalidated]
+
+    @property
+    def install_busted(self):
+        """Capas de instalación de dependencias (`npm ci`) que se reconstruyen"""
+        return [layer for layer in self.invalidated if layer.instruction.installs_dependencies]
+
+
+def predict(stages, changed, ignore):
+    """Capas que invalidan las rutas `changed` (relativas a la raíz)"""
+    prediction = Prediction()
+    for rel in changed:
+        (prediction.ignored_paths if ignore.excluded(rel) else prediction.context_paths).append(rel)
+    busted = {}
+    for stage in stages:
+        cause = busted.get(stage.base)
+        for instruction in stage.instructions:
+            layer = Layer(stage.label, instruction)
+            if instruction.command in ('COPY', 'ADD'):
+                origin = instruction.flags.get('from')
+                if origin is not None:
+                    if cause is None and busted.get(origin):
+                        cause = f'etapa {origin}'
+                else:
+                    regex = _source_regex(instruction.sources)
+                    layer.paths = [p for p in prediction.context_paths if regex and regex.fullmatch(p)]
+                    if cause is None and layer.paths:
+                        cause = f'línea {instruction.line}'
+            if instruction.command in LAYER_COMMANDS:
+                layer.invalidated = cause is not None
+                layer.cause = cause or ''
+                prediction.layers.append(layer)
+        busted[stage.label] = cause
+        busted[str(stage.index)] = cause
+    return prediction
+
+
+def unmatched_copies(stages, files):
+    """COPY/ADD del contexto cuyos orígenes no coinciden con ningún archivo
+    del contexto (p.ej. excluidos por .dockerignore): fallan en el deploy"""
+    missing = []
+    for stage in stages:
+        for instruction in stage.instructions:
+            if instruction.command not in ('COPY', 'ADD') or 'from' in instruction.flags:
+                continue
+            sources = [s for s in instruction.sources if '://' not in s]
+            regex = _source_regex(sources)
+            if regex is not None and not any(regex.fullmatch(rel) for rel in files):
+                missing.append(instruction)
+    return missing
+
+
+def pending_paths(session, config):
+    """Rutas que cambian respecto de lo desplegado: el índice (lo preparado
+    y los commits sin subir) contra la rama remota, o contra HEAD si no hay"""
+    from . import remotes
+
+    base = remotes.tracking_ref(session, config) or ('HEAD' if session.resolve('HEAD') else None)
+    if base is None:
+        raw = session.run('ls-files', '-z').stdout
+    else:
+        raw = session.run('diff', '--cached', '--name-only', '-z', '--no-renames', base).stdout
+    return [p.decode('utf-8', 'surrogateescape') for p in raw.split(b'\0') if p]
+
+
+def pre_push_check(pipeline):
+    """Chequeo pre-push informativo: capas del Dockerfile que se reconstruyen"""
+    root = pipeline.session.root
+    stages = load_dockerfile(root, pipeline.config.dockerfile)
+    if stages is None:
+        return True, f'sin {pipeline.config.dockerfile}'
+    prediction = predict(stages, pending_paths(pipeline.session, pipeline.config), DockerIgnore.load(root))
+    return True, describe(prediction)
+
+
+def describe(prediction):
+    invalidated = prediction.invalidated
+    if not invalidated:
+        return f'caché de capas intacta ({len(prediction.ignored_paths)} rutas fuera del contexto)'
+    first = invalidated[0].instruction
+    detail = f'{len(invalidated)}/{len(prediction.layers)} capas desde línea {first.line} ({first.command})'
+    busted = prediction.install_busted
+    if busted:
+        detail += f' ⚠️  reinstala dependencias (línea {busted[0].instruction.line}: {busted[0].instruction.args})'
+    return detail
@@ -0,0 +1,146 @@
+"""
+Caché de resultados por archivo, indexada por hash de contenido.
+
+Para cada archivo se guarda (mtime, tamaño, inodo, sha1, valor). Si el stat
+no cambió no se lee el archivo; si cambió, se lee y se compara el sha1, y
+solo si el contenido es distinto se vuelve a calcular el valor. Los cálculos
+pendientes se reparten en un pool de procesos.
+
+`compute(rel, data)` debe ser una función de nivel de módulo (o un
+functools.partial de una) porque se envía a los procesos del pool, y
+devolver algo serializable en JSON. Con `use_mmap` el archivo se mapea en
+memoria en lugar de leerse: `data` es entonces un objeto mmap (soporta
+regex de bytes, slicing y `find`) válido solo durante la llamada.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .config import state_dir
+
+# Por debajo de este número de archivos no compensa arrancar procesos
+PARALLEL_THRESHOLD = 64
+CHUNK_SIZE = 32
+
+
+def digest(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+def _stamp(st):
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def _process(root, compute, batch, use_mmap=False):
+    """Lee y calcula un lote: [(rel, sha1 conocido)] -> [(rel, sha1, valor, recalculado)]"""
+    results = []
+    for rel, known in batch:
+        try:
+            with open(os.path.join(root, rel), 'rb') as f:
+                if use_mmap:
+                    try:
+                        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    except ValueError:
+                        # Archivo vacío: no se puede mapear
+                        data = b''
+                else:
+                    data = f.read()
+        except OSError:
+            results.append((rel, None, None, False))
+            continue
+        try:
+            sha = digest(data)
+            if sha == known:
+                results.append((rel, sha, None, False))
+            else:
+                results.append((rel, sha, compute(rel, data), True))
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+    return results
+
+
+class FileCache:
+    """Resultados por archivo persistidos en `.git/rent360push/<name>.json`"""
+
+    def __init__(self, root, name, compute, version=1, use_mmap=False):
+        self.root = root
+        self.compute = compute
+        self.version = version
+        self.use_mmap = use_mmap
+        self.path = os.path.join(state_dir(root), f'{name}.json')
+        self.entries = {}
+        self.meta = {}
+        self.recomputed = []
+        self.dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get('version') == self.version:
+            self.entries = data['entries']
+            self.meta = data.get('meta', {})
+
+    def save(self):
+        tmp = self.path + '.tmp'
+        data = {'version': self.version, 'meta': self.meta, 'entries': self.entries}
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(data, separators=(',', ':')))
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+    def update(self, paths, jobs=None):
+        """Actualiza la caché para `paths` (las demás entradas se descartan) y
+        devuelve {ruta: valor}. `self.recomputed` queda con las rutas recalculadas
+        y `self.dirty` indica si hay algo que guardar."""
+        paths = list(paths)
+        pending = []
+        stamps = {}
+        for rel in paths:
+            try:
+                st = os.stat(os.path.join(self.root, rel))
+            except OSError:
+                continue
+            stamps[rel] = _stamp(st)
+            entry = self.entries.get(rel)
+            if entry is None or entry[0] != stamps[rel]:
+                pending.append((rel, entry[1] if entry else None))
+
+        if len(pending) < PARALLEL_THRESHOLD or jobs == 1:
+            processed = _process(self.root, self.compute, pending, self.use_mmap)
+        else:
+            batches = [pending[i:i + CHUNK_SIZE] for i in range(0, len(pending), CHUNK_SIZE)]
+            n = len(batches)
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                processed = [
+                    item
+                    for chunk in pool.map(_process, [self.root] * n, [self.compute] * n, batches, [self.use_mmap] * n)
+                    for item in chunk
+                ]
+
+        self.recomputed = []
+        self.dirty = self.dirty or bool(processed)
+        for rel, sha, value, recomputed in processed:
+            if sha is None:
+                stamps.pop(rel, None)
+            elif recomputed:
+                self.entries[rel] = [stamps[rel], sha, value]
+                self.recomputed.append(rel)
+            else:
+                self.entries[rel][0] = stamps[rel]
+
+        kept = {rel: self.entries[rel] for rel in stamps if rel in self.entries}
+        self.dirty = self.dirty or len(kept) != len(self.entries)
+        self.entries = kept
+        return {rel: entry[2] for rel, entry in self.entries.items()}
+
+    def digest_of(self, rel):
+        entry = self.entries.get(rel)
+        return entry[1] if entry else None
@@ -0,0 +1,325 @@
+"""
+Sesión git persistente para las subidas de Rent360.
+
+Los scripts antiguos lanzaban un proceso nuevo (muchas veces con shell=True)
+por cada paso de la subida. GitSession mantiene abiertos los procesos
+auxiliares de git (`cat-file --batch`, `cat-file --batch-check` y
+`update-index --stdin`) mientras dura la subida, de modo que el coste fijo
+de arranque se paga una sola vez.
+"""
+
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+
+from . import trace
+
+# Evita prompts interactivos de credenciales (igual que los scripts originales)
+GIT_ENV = {
+    'GIT_TERMINAL_PROMPT': '0',
+    'GIT_ASKPASS': '',
+    'SSH_ASKPASS': '',
+}
+
+
+class GitError(Exception):
+    """Error al ejecutar un comando git"""
+
+    def __init__(self, args, returncode, stderr):
+        self.command = list(args)
+        self.returncode = returncode
+        self.stderr = stderr
+        detail = stderr.strip() or 'sin salida de error'
+        super().__init__(f"git {' '.join(self.command)} falló ({returncode}): {detail}")
+
+
+@dataclass
+class GitResult:
+    """Resultado de un comando git ejecutado por la sesión"""
+
+    args: list
+    returncode: int
+    stdout: bytes
+    stderr: bytes
+    duration: float
+    timed_out: bool = False
+
+    @property
+    def ok(self):
+        return self.returncode == 0 and not self.timed_out
+
+    @property
+    def text(self):
+        return self.stdout.decode('utf-8', 'replace')
+
+    @property
+    def error_text(self):
+        return self.stderr.decode('utf-8', 'replace')
+
+
+@dataclass
+class ObjectInfo:
+    """Cabecera de un objeto devuelta por `cat-file --batch(-check)`"""
+
+    oid: str
+    type: str
+    size: int
+    data: bytes | None = None
+
+
+def find_repo_root(start='.'):
+    """Busca hacia arriba el directorio que contiene `.git`"""
+    path = os.path.abspath(start)
+    while True:
+        if os.path.exists(os.path.join(path, '.git')):
+            return path
+        parent = os.path.dirname(path)
+        if parent == path:
+            raise GitError(['rev-parse', '--show-toplevel'], 128, f'{start} no es un repositorio git')
+        path = parent
+
+
+def git_dir(root):
+    """Directorio git real (soporta worktrees, donde `.git` es un archivo)"""
+    dot_git = os.path.join(root, '.git')
+    if os.path.isfile(dot_git):
+        with open(dot_git, encoding='utf-8') as f:
+            line = f.readline().strip()
+        if line.startswith('gitdir:'):
+            target = line[len('gitdir:'):].strip()
+            return os.path.normpath(os.path.join(root, target))
+    return dot_git
+
+
+def git_env(extra=None):
+    env = os.environ.copy()
+    env.update(GIT_ENV)
+    if extra:
+        env.update(extra)
+    return env
+
+
+class _CatFile:
+    """Proceso `git cat-file --batch` o `--batch-check` de larga duración"""
+
+    def __init__(self, root, env, with_data):
+        mode = '--batch' if with_data else '--batch-check'
+        self.with_data = with_data
+        self.lock = threading.Lock()
+        self.proc = subprocess.Popen(
+            ['git', 'cat-file', mode],
+            cwd=root,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def _read_one(self):
+        header = self.proc.stdout.readline()
+        if not header:
+            raise GitError(['cat-file'], self.proc.poll() or 128, 'cat-file terminó inesperadamente')
+        parts = header.split()
+        if len(parts) != 3:
+            # "<nombre> missing" o "<nombre> ambiguous"
+            return None
+        info = ObjectInfo(parts[0].decode(), parts[1].decode(), int(parts[2]))
+        if self.with_data:
+            info.data = self.proc.stdout.read(info.size)
+            self.proc.stdout.read(1)
+        return info
+
+    def query(self, name):
+        with self.lock:
+            self.proc.stdin.write(name.encode('utf-8') + b'\n')
+            self.proc.stdin.flush()
+            return self._read_one()
+
+    def query_many(self, names):
+        """Consulta varios objetos en tubería; la escritura va en otro hilo
+        para que un stdout lleno no bloquee a git"""
+        names = list(names)
+        if not names:
+            return []
+
+        def feed():
+            for name in names:
+                self.proc.stdin.write(name.encode('utf-8') + b'\n')
+            self.proc.stdin.flush()
+
+        with self.lock:
+            writer = threading.Thread(target=feed, daemon=True)
+            writer.start()
+            results = [self._read_one() for _ in names]
+            writer.join()
+        return results
+
+    def close(self):
+        if self.proc.poll() is None:
+            self.proc.stdin.close()
+            self.proc.wait()
+
+
+class GitSession:
+    """Agrupa todos los accesos a git de una subida.
+
+    Los comandos "normales" (status, commit, push) se lanzan sin shell; las
+    consultas de objetos y la actualización del índice reutilizan procesos
+    persistentes. Usar como context manager para cerrar los auxiliares.
+    """
+
+    def __init__(self, root=None, env=None):
+        self.root = find_repo_root(root or '.')
+        self.git_dir = git_dir(self.root)
+        self.env = git_env(env)
+        self._cat = None
+        self._check = None
+        self._index = None
+        self._index_started = None
+        self._index_stderr = None
+        self._index_paths = 0
+        self.spawned = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def run(self, *args, check=True, input=None, timeout=None, env=None):
+        """Ejecuta `git <args>` sin shell. Antes vuelca el índice pendiente.
+        `env` reemplaza el entorno de la sesión"""
+        self.flush_index()
+        started = time.time()
+        start = time.perf_counter()
+        proc = subprocess.run(
+            ['git', *args],
+            cwd=self.root,
+            env=self.env if env is None else env,
+            input=input,
+            capture_output=True,
+            timeout=timeout,
+        )
+        self.spawned += 1
+        result = GitResult(list(args), proc.returncode, proc.stdout, proc.stderr, time.perf_counter() - start)
+        trace.command(['git', *args], started, result.duration, proc.returncode, len(proc.stdout), len(proc.stderr))
+        if check and not result.ok:
+            raise GitError(args, result.returncode, result.error_text)
+        return result
+
+    def stream(self, *args, check=True, idle_timeout=None, on_output=None):
+        """Como run(), pero con salida línea a línea y timeout por inactividad
+        (para push/fetch, que pueden tardar mucho sin estar colgados)"""
+        from .runner import run
+
+        self.flush_index()
+        result = run(['git', *args], cwd=self.root, env=self.env, idle_timeout=idle_timeout, on_output=on_output)
+        self.spawned += 1
+        git_result = GitResult(
+            list(args), result.returncode, result.stdout, result.stderr, result.duration, result.timed_out
+        )
+        if check and not git_result.ok:
+            stderr = git_result.error_text
+            if result.timed_out:
+                stderr = f'sin salida durante {idle_timeout:.0f} s\n{stderr}'
+            raise GitError(args, git_result.returncode, stderr)
+        return git_result
+
+    def pending_pack_size(self, remote, rev='HEAD'):
+        """Bytes en disco de los objetos que `rev` tiene y el remoto no
+        (estimación del pack a enviar); 0 si no se puede calcular"""
+        result = self.run('rev-list', '--objects', '--disk-usage', rev, '--not', f'--remotes={remote}', check=False)
+        try:
+            return int(result.text.strip() or 0)
+        except ValueError:
+            return 0
+
+    # Consultas de objetos -------------------------------------------------
+
+    def object_info(self, name):
+        """Tipo y tamaño de un objeto (o None si no existe)"""
+        if self._check is None:
+            self._check = _CatFile(self.root, self.env, with_data=False)
+            self.spawned += 1
+        return self._check.query(name)
+
+    def object_infos(self, names):
+        if self._check is None:
+            self._check = _CatFile(self.root, self.env, with_data=False)
+            self.spawned += 1
+        return self._check.query_many(names)
+
+    def read_object(self, name):
+        """Contenido de un objeto (o None si no existe)"""
+        if self._cat is None:
+            self._cat = _CatFile(self.root, self.env, with_data=True)
+            self.spawned += 1
+        return self._cat.query(name)
+
+    def read_objects(self, names):
+        if self._cat is None:
+            self._cat = _CatFile(self.root, self.env, with_data=True)
+            self.spawned += 1
+        return self._cat.query_many(names)
+
+    def resolve(self, name):
+        info = self.object_info(name)
+        return info.oid if info else None
+
+    # Índice -----------------------------------------------------------------
+
+    def stage(self, paths):
+        """Agrega/elimina rutas del índice a través de `update-index --stdin`.
+
+        El proceso mantiene `index.lock` mientras está abierto; cualquier
+        comando posterior de la sesión lo vuelca automáticamente. Su stderr va
+        a un archivo temporal: un pipe que nadie lee mientras escribimos rutas
+        se llena con los avisos de un lote grande y bloquea a git.
+        """
+        paths = list(paths)
+        if not paths:
+            return 0
+        if self._index is None:
+            self._index_started = (time.time(), time.perf_counter())
+            self._index_paths = 0
+            self._index_stderr = tempfile.TemporaryFile()
+            self._index = subprocess.Popen(
+                ['git', 'update-index', '--add', '--remove', '--replace', '-z', '--stdin'],
+                cwd=self.root,
+                env=self.env,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=self._index_stderr,
+            )
+            self.spawned += 1
+        payload = b''.join(os.fsencode(p) + b'\0' for p in paths)
+        self._index_paths += len(paths)
+        self._index.stdin.write(payload)
+        self._index.stdin.flush()
+        return len(paths)
+
+    def flush_index(self):
+        """Cierra `update-index` y devuelve cuántas rutas se le enviaron"""
+        if self._index is None:
+            return 0
+        proc, self._index = self._index, None
+        proc.communicate()
+        with self._index_stderr as errors:
+            errors.seek(0)
+            stderr = errors.read()
+        self._index_stderr = None
+        started, start = self._index_started
+        trace.command(proc.args, started, time.perf_counter() - start, proc.returncode, 0, len(stderr))
+        if proc.returncode != 0:
+            raise GitError(['update-index', '--stdin'], proc.returncode, stderr.decode('utf-8', 'replace'))
+        return self._index_paths
+
+    def close(self):
+        self.flush_index()
+        for helper in (self._cat, self._check):
+            if helper is not None:
+                helper.close()
+        self._cat = self._check = None
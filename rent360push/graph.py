@@ -0,0 +1,157 @@
+"""
+Índice incremental del grafo de imports de `src/`, `services/` y `tests/`.
+
+Los imports de cada archivo se guardan por hash de contenido (FileCache en
+`.git/rent360push/imports.json`), así que después de la primera pasada solo
+se vuelven a parsear los archivos modificados, y en paralelo si son muchos.
+Las aristas resueltas también se guardan; si la lista de archivos y los
+tsconfig no cambiaron, solo se resuelven las de los archivos re-parseados.
+
+Cada archivo usa los alias `paths` de su tsconfig más cercano (siguiendo
+`extends`), por lo que `@/` funciona igual en `src/` y en `services/*`.
+"""
+
+import json
+import os
+import time
+
+from . import imports
+from .filecache import FileCache, digest
+
+CACHE_NAME = 'imports'
+CACHE_VERSION = 1
+
+
+def _parse(rel, data):
+    return imports.parse_imports(data.decode('utf-8', 'replace'))
+
+
+class ImportGraph:
+    """Grafo directo (archivo -> importados) e inverso (archivo -> importadores)"""
+
+    def __init__(self, root):
+        self.root = root
+        self.forward = {}
+        self.reverse = {}
+        self.stats = {}
+        self.specs = {}
+        self._tsconfig = {}
+        self._aliases = {}
+
+    @classmethod
+    def load(cls, root, jobs=None):
+        graph = cls(root)
+        graph.update(jobs)
+        return graph
+
+    def _tsconfig_for(self, directory):
+        """Como imports.nearest_tsconfig, memorizado por directorio"""
+        if directory not in self._tsconfig:
+            candidate = f'{directory}/tsconfig.json' if directory else 'tsconfig.json'
+            if os.path.exists(os.path.join(self.root, candidate)):
+                self._tsconfig[directory] = candidate
+            elif directory:
+                self._tsconfig[directory] = self._tsconfig_for(os.path.dirname(directory))
+            else:
+                self._tsconfig[directory] = None
+        return self._tsconfig[directory]
+
+    def _aliases_for(self, rel):
+        tsconfig = self._tsconfig_for(os.path.dirname(rel))
+        if tsconfig not in self._aliases:
+            self._aliases[tsconfig] = imports.load_aliases(self.root, tsconfig) if tsconfig else []
+        return self._aliases[tsconfig]
+
+    def _signature(self, files):
+        """Cambia si aparecen/desaparecen archivos o cambian los alias"""
+        for rel in files:
+            self._aliases_for(rel)
+        aliases = sorted((t or '', a) for t, a in self._aliases.items())
+        return digest(json.dumps([sorted(files), aliases]).encode('utf-8'))
+
+    def update(self, jobs=None):
+        start = time.perf_counter()
+        files = imports.source_files(self.root)
+        cache = FileCache(self.root, CACHE_NAME, _parse, version=CACHE_VERSION)
+        specs = cache.update(files, jobs)
+        self.specs = specs
+        known = set(specs)
+        signature = self._signature(known)
+
+        cached_edges = cache.meta.get('edges') if cache.meta.get('signature') == signature else None
+        recomputed = set(cache.recomputed)
+        resolved = 0
+        self.forward = {}
+        for rel, spec_list in specs.items():
+            if cached_edges is not None and rel not in recomputed and rel in cached_edges:
+                self.forward[rel] = cached_edges[rel]
+                continue
+            aliases = self._aliases_for(rel)
+            targets = {imports.resolve(self.root, rel, spec, aliases, known) for spec in spec_list}
+            targets.discard(None)
+            self.forward[rel] = sorted(targets)
+            resolved += 1
+
+        if cache.dirty or cached_edges is None:
+            cache.meta = {'signature': signature, 'edges': self.forward}
+            cache.save()
+
+        self.reverse = {}
+        for rel, targets in self.forward.items():
+            for target in targets:
+                self.reverse.setdefault(target, []).append(rel)
+        self.stats = {
+            'files': len(self.forward),
+            'edges': sum(len(t) for t in self.forward.values()),
+            'parsed': len(recomputed),
+            'resolved': resolved,
+            'ms': round((time.perf_counter() - start) * 1000, 1),
+        }
+        return self
+
+    def dependencies(self, rel):
+        return list(self.forward.get(rel, ()))
+
+    def missing_importers(self, paths):
+        """Archivos cuyos imports resolverían a alguno de `paths` si
+        existieran (archivos borrados, que ya no tienen aristas)"""
+        wanted = set(paths)
+        names = set()
+        for path in wanted:
+            stem, _ = os.path.splitext(os.path.basename(path))
+            names.add(os.path.basename(os.path.dirname(path)) if stem == 'index' else stem)
+        known = set(self.specs) | wanted
+        found = set()
+        for rel, spec_list in self.specs.items():
+            for spec in spec_list:
+                name = spec.rstrip('/').rsplit('/', 1)[-1]
+                if name.endswith(imports.SOURCE_EXTS):
+                    name = os.path.splitext(name)[0]
+                if name in names and imports.resolve(self.root, rel, spec, self._aliases_for(rel), known) in wanted:
+                    found.add(rel)
+                    break
+        return found
+
+    def dependents(self, paths, transitive=True):
+        """Archivos que importan alguno de `paths` (incluidos los propios
+        `paths`); para los que ya no existen se buscan quienes los importaban"""
+        affected = set(paths)
+        stack = list(paths)
+        missing = [p for p in paths if p not in self.forward]
+        if missing:
+            for importer in self.missing_importers(missing) - affected:
+                affected.add(importer)
+                stack.append(importer)
+        while stack:
+            for importer in self.reverse.get(stack.pop(), ()):
+                if importer not in affected:
+                    affected.add(importer)
+                    if transitive:
+                        stack.append(importer)
+        return affected
+
+
+def dependents(root, changed, jobs=None):
+    """Atajo: actualiza el índice y devuelve los dependientes de `changed`"""
+    return ImportGraph.load(root, jobs).dependents(changed)
+
@@ -0,0 +1,366 @@
+"""
+Detección de secretos y archivos basura en lo que se va a commitear.
+
+`app.yaml` ya tiene valores literales de `JWT_SECRET`/`NEXTAUTH_SECRET`, y el
+`git add .` de los scripts de subida commiteó archivos como `tatus`,
+`tatus --porcelain`, `h origin master` o `ter`: pantallas de `less`
+guardadas con la tecla `s` al tipear `git status` dentro del paginador.
+
+Antes del commit se revisan solo los blobs nuevos o modificados del índice
+(`git diff-index --cached HEAD`), leídos por los `cat-file --batch-check`
+y `--batch` persistentes de GitSession:
+
+- nombres de archivo con pinta de comando (`--opción`, comillas,
+  paréntesis, `origin master`, `...` al final, caracteres de control) y
+  `.env*` con valores reales;
+- contenido de terminal: códigos ANSI o texto con overstrike (ayuda de less);
+- archivos de más de `guard_max_bytes` y binarios fuera de `guard_binary_paths`;
+- secretos: un autómata Aho-Corasick busca todas las palabras clave
+  (`secret`, `password`, `token`, `AKIA`, `-----BEGIN`, ...) en una pasada y
+  en cada línea encontrada (y la siguiente, para el `key:`/`value:` de
+  app.yaml) se buscan valores con alta entropía o formatos de token conocidos.
+
+Los blobs revisados sin hallazgos se recuerdan por (ruta, oid) en
+`.git/rent360push/guard.json`, junto con la configuración de guard con la
+que se revisaron: binarios y tamaños dependen de la ruta y del config.
+Una línea con `rent360push: allow` se ignora.
+"""
+
+import json
+import math
+import os
+import re
+from collections import deque
+from dataclasses import dataclass
+
+from .config import state_dir
+from .filecache import digest
+from .impact import compile_globs
+
+CACHE_FILE = 'guard.json'
+CACHE_VERSION = 2
+CACHE_LIMIT = 50_000
+ALLOW_MARKER = b'rent360push: allow'
+# Bytes iniciales donde se buscan NUL, ANSI y overstrike
+SNIFF_BYTES = 8000
+
+KEYWORDS = (
+    'secret', 'password', 'passwd', 'api_key', 'apikey', 'api-key', 'token', 'private_key',
+    'access_key', 'credential', 'auth', 'database_url', 'bearer ',
+    '://', 'akia', 'ghp_', 'gho_', 'github_pat_', 'sk_live_', 'rk_live_', 'xoxb-', 'xoxp-', 'aiza',
+    '-----begin',
+)
+# Formatos de token que no necesitan chequeo de entropía
+_KNOWN = re.compile(
+    rb'-----BEGIN (?:[A-Z]+ )?PRIVATE KEY-----|\bAKIA[0-9A-Z]{16}\b|\bgh[po]_[A-Za-z0-9]{36}\b'
+    rb'|\bgithub_pat_\w{40,}|\b[sr]k_live_[A-Za-z0-9]{20,}|\bxox[bp]-[A-Za-z0-9-]{20,}|\bAIza[\w-]{35}\b'
+)
+_URL_PASSWORD = re.compile(
+    rb'\b[a-z][a-z0-9+.-]*://(?P<user>[^\s:/@\'"]+):(?P<password>[^\s@/\'"]+)@(?P<host>[^\s:/\'"]+)'
+)
+_LOCAL_HOST = re.compile(rb'localhost|127\.0\.0\.1|0\.0\.0\.0|host\.docker\.internal')
+# URLs sin credenciales (ids de imágenes, query strings) e integrity de npm
+_NOT_SECRET = re.compile(rb'https?://[^\s\'"`)]+|\bsha(?:1|256|384|512)-[A-Za-z0-9+/=]+')
+_CANDIDATE = re.compile(rb'[A-Za-z0-9+=_-]{20,}')
+_HEX = re.compile(rb'[0-9a-fA-F]+')
+_PLACEHOLDER = re.compile(
+    rb'xxxx|your[_-]|tu[_-]|password|example|change[_-]?me|placeholder|dummy'
+    rb'|\$\{|process\.env|<[^>]*>|\*\*\*', re.I
+)
+HEX_ENTROPY = 3.0
+TOKEN_ENTROPY = 4.2
+TOKEN_MIN = 24
+
+_JUNK_NAME = re.compile(
+    r'''\s--?\w|['"`()|;<>$]|\.\.\.$|\s$|\s(?:origin|master|main|HEAD)\b'''
+    r'|[\x00-\x1f\x7f\ue000-\uf8ff]'
+)
+_ENV_FILE = re.compile(r'(?:^|/)\.env(?:\.[\w.-]+)?$')
+_ENV_TEMPLATE = re.compile(r'\.(?:example|sample|template)$')
+_ANSI = re.compile(rb'\x1b\[[0-9;]*m')
+_OVERSTRIKE = re.compile(rb'(.)\x08\1')
+
+
+@dataclass
+class Finding:
+    path: str
+    kind: str
+    detail: str
+    line: int | None = None
+
+    def __str__(self):
+        where = f'{self.path}:{self.line}' if self.line else self.path
+        return f'{where} {self.kind}: {self.detail}'
+
+
+class AhoCorasick:
+    """Autómata Aho-Corasick sobre bytes, sin distinguir mayúsculas.
+
+    Se construye la tabla de transiciones completa (estado × byte), así la
+    búsqueda es una sola indexación por byte, sin seguir enlaces de fallo.
+    """
+
+    def __init__(self, words):
+        self.words = [w.lower().encode('utf-8') for w in words]
+        goto = [{}]
+        out = [set()]
+        for index, word in enumerate(self.words):
+            state = 0
+            for byte in word:
+                if byte not in goto[state]:
+                    goto.append({})
+                    out.append(set())
+                    goto[state][byte] = len(goto) - 1
+                state = goto[state][byte]
+            out[state].add(index)
+
+        fail = [0] * len(goto)
+        table = [[0] * 256 for _ in goto]
+        for byte, child in goto[0].items():
+            table[0][byte] = child
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            out[state] |= out[fail[state]]
+            row = table[state]
+            row[:] = table[fail[state]]
+            for byte, child in goto[state].items():
+                fail[child] = table[fail[state]][byte]
+                row[byte] = child
+                queue.append(child)
+        # Mayúsculas ASCII: misma transición que la minúscula
+        for row in table:
+            for byte in range(65, 91):
+                row[byte] = row[byte + 32]
+        self.table = table
+        self.out = [tuple(sorted(o)) for o in out]
+
+    def search(self, data):
+        """[(fin, índice de palabra)] de todas las apariciones en `data`"""
+        table, out = self.table, self.out
+        found = []
+        state = 0
+        for pos, byte in enumerate(data):
+            state = table[state][byte]
+            if out[state]:
+                found.extend((pos, index) for index in out[state])
+        return found
+
+
+_MATCHER = None
+
+
+def matcher():
+    global _MATCHER
+    if _MATCHER is None:
+        _MATCHER = AhoCorasick(KEYWORDS)
+    return _MATCHER
+
+
+def entropy(token):
+    """Entropía de Shannon en bits por carácter"""
+    counts = {}
+    for byte in token:
+        counts[byte] = counts.get(byte, 0) + 1
+    total = len(token)
+    return -sum(c / total * math.log2(c / total) for c in counts.values())
+
+
+def _secret_value(text):
+    """Descripción del valor sospechoso en `text`, o None"""
+    known = _KNOWN.search(text)
+    if known:
+        return known.group(0)[:24].decode('ascii', 'replace') + '…'
+    url = _URL_PASSWORD.search(text)
+    if (url and len(url['password']) >= 6 and url['password'] != url['user']
+            and not _PLACEHOLDER.search(url['password']) and not _LOCAL_HOST.fullmatch(url['host'])):
+        return 'contraseña en URL'
+    if _PLACEHOLDER.search(text):
+        return None
+    for match in _CANDIDATE.finditer(_NOT_SECRET.sub(b' ', text)):
+        token = match.group(0)
+        if not (re.search(rb'\d', token) and re.search(rb'[A-Za-z]', token)):
+            continue
+        if _HEX.fullmatch(token):
+            if len(token) >= 32 and entropy(token) >= HEX_ENTROPY:
+                return f'hex de {len(token)} caracteres'
+        elif len(token) >= TOKEN_MIN and entropy(token) >= TOKEN_ENTROPY:
+            return f'token de {len(token)} caracteres (entropía {entropy(token):.1f})'
+    return None
+
+
+def find_secrets(data):
+    """[(línea, palabra clave, descripción)] de los secretos en `data`"""
+    words = matcher().words
+    found = []
+    seen = set()
+    for end, index in matcher().search(data):
+        start = data.rfind(b'\n', 0, end) + 1
+        if start in seen:
+            continue
+        seen.add(start)
+        stop = data.find(b'\n', end)
+        stop = len(data) if stop < 0 else stop
+        line = data[start:stop]
+        if ALLOW_MARKER in line:
+            continue
+        value = _secret_value(line)
+        if value is None:
+            # `- key: JWT_SECRET` / `value: "..."` en líneas separadas
+            after = data.find(b'\n', stop + 1)
+            following = data[stop + 1:len(data) if after < 0 else after]
+            if ALLOW_MARKER not in following and re.match(rb'\s*value\s*:', following):
+                value = _secret_value(following)
+        if value:
+            number = data.count(b'\n', 0, start) + 1
+            found.append((number, words[index].decode('utf-8').strip(), value))
+    return found
+
+
+def junk_name(path):
+    """Motivo por el que el nombre parece basura (o None)"""
+    name = path.rsplit('/', 1)[-1]
+    if _ENV_FILE.search(path) and not _ENV_TEMPLATE.search(name):
+        return 'archivo .env con variables reales'
+    if _JUNK_NAME.search(name):
+        return 'nombre con pinta de comando de shell'
+    return None
+
+
+def junk_content(data):
+    head = data[:SNIFF_BYTES]
+    if _OVERSTRIKE.search(head):
+        return 'pantalla de less (texto con overstrike)'
+    if len(_ANSI.findall(head)) >= 3:
+        return 'salida de terminal (códigos ANSI)'
+    return None
+
+
+def inspect(path, data, config, binary_re=None):
+    """Hallazgos de un blob"""
+    findings = []
+    if b'\0' in data[:SNIFF_BYTES]:
+        if binary_re is None or not binary_re.match(path):
+            findings.append(Finding(path, 'binario', f'{len(data)} bytes fuera de guard_binary_paths'))
+        return findings
+    reason = junk_content(data)
+    if reason:
+        findings.append(Finding(path, 'basura', reason))
+        return findings
+    for line, keyword, value in find_secrets(data):
+        findings.append(Finding(path, 'secreto', f'{value} (cerca de "{keyword}")', line))
+    return findings
+
+
+def staged_blobs(session):
+    """[(ruta, oid)] de los blobs agregados o modificados en el índice"""
+    head = session.run('rev-parse', '--verify', '-q', 'HEAD', check=False)
+    base = 'HEAD' if head.ok else session.run('hash-object', '-t', 'tree', '--stdin', input=b'').text.strip()
+    raw = session.run('diff-index', '--cached', '--raw', '-z', '--no-renames', base).stdout
+    fields = raw.split(b'\0')
+    blobs = []
+    for meta, path in zip(fields[0::2], fields[1::2]):
+        parts = meta.split()
+        if len(parts) < 5 or parts[4] == b'D' or parts[1] == b'160000':
+            continue
+        blobs.append((path.decode('utf-8', 'surrogateescape'), parts[3].decode()))
+    return blobs
+
+
+def tree_blobs(session, rev='HEAD'):
+    """[(ruta, oid)] de todos los blobs de `rev`"""
+    raw = session.run('ls-tree', '-r', '-z', '--full-tree', rev).stdout
+    blobs = []
+    for entry in raw.split(b'\0'):
+        if not entry:
+            continue
+        meta, path = entry.split(b'\t', 1)
+        mode, kind, oid = meta.split()
+        if kind == b'blob':
+            blobs.append((path.decode('utf-8', 'surrogateescape'), oid.decode()))
+    return blobs
+
+
+def _cache_version(config):
+    """Versión del caché: cambia si cambian las reglas que dependen de la ruta"""
+    rules = (config.guard_max_bytes, tuple(config.guard_binary_paths), tuple(config.guard_allow))
+    return f'{CACHE_VERSION}:{digest(repr(rules).encode("utf-8"))}'
+
+
+def _load_clean(root, version):
+    try:
+        with open(os.path.join(state_dir(root), CACHE_FILE), encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return []
+    return [tuple(entry) for entry in data.get('clean', [])] if data.get('version') == version else []
+
+
+def _save_clean(root, version, clean):
+    path = os.path.join(state_dir(root), CACHE_FILE)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'version': version, 'clean': clean[-CACHE_LIMIT:]}, f)
+    os.replace(path + '.tmp', path)
+
+
+def scan(session, config, blobs):
+    """Revisa los blobs [(ruta, oid)] y devuelve (hallazgos, blobs leídos)"""
+    allow_re = compile_globs(config.guard_allow)
+    binary_re = compile_globs(config.guard_binary_paths)
+    blobs = [(p, o) for p, o in blobs if allow_re is None or not allow_re.match(p)]
+    version = _cache_version(config)
+    clean = _load_clean(session.root, version)
+    known = set(clean)
+    findings = []
+    pending = []
+    for path, oid in blobs:
+        reason = junk_name(path)
+        if reason:
+            findings.append(Finding(path, 'basura', reason))
+        elif (path, oid) not in known:
+            pending.append((path, oid))
+
+    # Primero solo tamaños: los blobs gigantes no se leen
+    infos = session.object_infos(oid for _, oid in pending)
+    readable = []
+    for (path, oid), info in zip(pending, infos):
+        if info is None:
+            continue
+        if info.size > config.guard_max_bytes:
+            limit = f'máximo {config.guard_max_bytes / 1e6:.1f} MB'
+            findings.append(Finding(path, 'grande', f'{info.size / 1e6:.1f} MB ({limit})'))
+        else:
+            readable.append((path, oid))
+
+    for (path, oid), info in zip(readable, session.read_objects(oid for _, oid in readable)):
+        found = inspect(path, info.data, config, binary_re) if info else []
+        findings.extend(found)
+        if not found and (path, oid) not in known:
+            known.add((path, oid))
+            clean.append((path, oid))
+    if readable:
+        _save_clean(session.root, version, clean)
+    findings.sort(key=lambda f: (f.path, f.line or 0))
+    return findings, len(readable)
+
+
+def format_findings(findings, limit=10):
+    lines = [str(f) for f in findings[:limit]]
+    if len(findings) > limit:
+        lines.append(f'... y {len(findings) - limit} más')
+    return lines
+
+
+def pre_commit_check(pipeline):
+    """Chequeo pre-commit para UploadPipeline: no commitea si hay hallazgos"""
+    blobs = staged_blobs(pipeline.session)
+    findings, read = scan(pipeline.session, pipeline.config, blobs)
+    detail = f'{len(blobs)} blobs, {read} leídos'
+    if findings:
+        lines = format_findings(findings)
+        detail += f', {len(findings)} hallazgos (corregir o `git restore --staged <ruta>`):'
+        detail += '\n      ' + '\n      '.join(lines)
+    return not findings, detail
+
+
+pre_commit_check.step = 'guard'
@@ -0,0 +1,344 @@
+"""
+Hooks de git en paralelo con caché de resultados por contenido.
+
+`.husky/pre-commit` (lint-staged: ESLint y Prettier) y
+`scripts/pre-commit.sh` (tsc, ESLint, ...) corrían sus etapas una detrás de
+otra en cada commit y volvían a revisar archivos que no habían cambiado
+desde la última pasada exitosa; el `git commit` de las subidas esperaba todo
+eso. Aquí las etapas (`hook_stages` en `.rent360push.json`) corren a la vez,
+repartidas en lotes por núcleo, y cada pasada exitosa se recuerda:
+
+- etapas por archivo (ESLint, Prettier): clave (versión de la etapa, ruta,
+  blob del índice). Un archivo ya aprobado con el mismo contenido no se
+  vuelve a pasar;
+- etapas de árbol (`"per_file": false`, p.ej. tsc): una sola clave con los
+  blobs de todos los archivos que cubre. Corren si se preparó alguno de
+  ellos o de sus archivos de configuración (`tsconfig.json`, ...).
+
+La versión de una etapa es el hash de su definición y del contenido de sus
+archivos de configuración (`.eslintrc.json`, `package-lock.json`, ...): si
+cambian, todo se revisa de nuevo. El hash de cada archivo es el oid del
+blob en el índice (`git ls-files -s`), así que no se lee ningún archivo
+para calcular las claves.
+
+Se revisa lo que se va a commitear, no lo que hay en disco: si algún
+archivo a revisar tiene además cambios sin preparar, las etapas corren en
+un worktree del pool (worktrees.py) con el árbol del índice.
+
+Con `fix` (husky y la subida, como hacía lint-staged) antes de revisar se
+corre el `fix` de cada etapa que lo tenga (`eslint --fix`,
+`prettier --write`), una etapa detrás de otra para que dos procesos nunca
+escriban el mismo archivo, y lo que reescribieron se vuelve a preparar.
+Los archivos con cambios sin preparar no se corrigen (se mezclarían con
+esos cambios): solo se revisan.
+
+El mismo runner lo usan la subida (plugin `pre_commit`) y husky
+(`python -m rent360push hooks run --fix`): el hook del `git commit` de una
+subida encuentra todo en caché. Las etapas con `"manual": true` solo corren
+si se piden con `--stage`. El caché vive en `.git/rent360push/hookcache.json`.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+
+from .config import state_dir
+
+CACHE_FILE = 'hookcache.json'
+# Claves aprobadas que se conservan por etapa (las más nuevas)
+MAX_KEYS = 50_000
+# Archivos por lote como mínimo (menos lotes = menos arranques de node)
+MIN_BATCH = 10
+OUTPUT_TAIL = 40
+
+
+@dataclass
+class HookStage:
+    name: str
+    command: list
+    files: list
+    per_file: bool = True
+    # Archivos cuyo contenido forma parte de la versión de la etapa
+    config: list = field(default_factory=list)
+    manual: bool = False
+    # Comando que corrige en el lugar (solo etapas por archivo)
+    fix: list | None = None
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def version(self, index):
+        """Hash de la definición y de los blobs de sus archivos de configuración"""
+        h = hashlib.sha1(json.dumps([self.command, self.files, self.per_file], sort_keys=True).encode())
+        for path in self.config:
+            h.update(f'\0{path}\0{index.get(path, "-")}'.encode())
+        return h.hexdigest()
+
+
+@dataclass
+class StageResult:
+    stage: str
+    ok: bool
+    duration: float
+    checked: list = field(default_factory=list)
+    cached: int = 0
+    output: str = ''
+    skipped: bool = False
+    # Archivos que el `fix` reescribió y se volvieron a preparar
+    fixed: list = field(default_factory=list)
+
+
+def stages(config, names=None):
+    """Etapas configuradas; con `names`, esas (incluidas las manuales)"""
+    defined = [HookStage.from_dict(s) for s in config.hook_stages]
+    if names:
+        unknown = set(names) - {s.name for s in defined}
+        if unknown:
+            raise ValueError(f"etapas desconocidas: {', '.join(sorted(unknown))}")
+        return [s for s in defined if s.name in names]
+    return [s for s in defined if not s.manual]
+
+
+def index_blobs(session):
+    """{ruta: oid} de todo el índice"""
+    raw = session.run('ls-files', '-s', '-z').stdout
+    blobs = {}
+    for entry in raw.split(b'\0'):
+        if not entry:
+            continue
+        meta, path = entry.split(b'\t', 1)
+        mode, oid, _ = meta.split()
+        if mode != b'160000':
+            blobs[path.decode('utf-8', 'surrogateescape')] = oid.decode()
+    return blobs
+
+
+def unstaged_paths(session):
+    """Rutas con cambios en disco que no están en el índice"""
+    raw = session.run('diff', '--name-only', '-z', '--no-renames').stdout
+    return {p.decode('utf-8', 'surrogateescape') for p in raw.split(b'\0') if p}
+
+
+def _key(version, path, oid):
+    return hashlib.sha1(f'{version}\0{path}\0{oid}'.encode('utf-8', 'surrogateescape')).hexdigest()
+
+
+def _tree_key(version, index, paths):
+    h = hashlib.sha1(version.encode())
+    for path in sorted(paths):
+        h.update(f'\0{path}\0{index[path]}'.encode('utf-8', 'surrogateescape'))
+    return h.hexdigest()
+
+
+class PassCache:
+    """Claves aprobadas por etapa, en orden de inserción"""
+
+    def __init__(self, root):
+        self.path = os.path.join(state_dir(root), CACHE_FILE)
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            data = {}
+        self.keys = {stage: dict.fromkeys(keys) for stage, keys in data.items()}
+        self.dirty = False
+
+    def __contains__(self, item):
+        stage, key = item
+        return key in self.keys.get(stage, ())
+
+    def add(self, stage, keys):
+        passed = self.keys.setdefault(stage, {})
+        for key in keys:
+            passed.pop(key, None)
+            passed[key] = None
+        self.dirty = True
+
+    def save(self):
+        data = {stage: list(keys)[-MAX_KEYS:] for stage, keys in self.keys.items()}
+        with open(self.path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(self.path + '.tmp', self.path)
+        self.dirty = False
+
+    def clear(self):
+        self.keys = {}
+        self.save()
+
+
+def _resolve(root, command):
+    """Comando con el binario resuelto (node_modules/.bin primero) o None"""
+    name = command[0]
+    local = os.path.join(root, 'node_modules', '.bin', name + ('.cmd' if os.name == 'nt' else ''))
+    if os.path.exists(local):
+        return [local, *command[1:]]
+    found = shutil.which(name)
+    return [found, *command[1:]] if found else None
+
+
+def _batches(paths, jobs):
+    count = max(1, min(jobs, -(-len(paths) // MIN_BATCH)))
+    return [paths[i::count] for i in range(count) if paths[i::count]]
+
+
+def _fix(session, selected, targets, unstaged, cache, jobs):
+    """Corre los `fix` sobre los archivos preparados sin cambios en disco,
+    etapa por etapa, y vuelve a preparar los que cambiaron. Devuelve
+    ({etapa: [reescritos]}, {etapa: [(ruta, clave)] de los que el fix dejó
+    igual y sin errores})"""
+    from . import runner
+    from .impact import compile_globs
+
+    root = session.root
+    index = index_blobs(session)
+    touched, clean = {}, {}
+    for stage in selected:
+        if not stage.fix or not stage.per_file:
+            continue
+        pattern = compile_globs(stage.files)
+        version = stage.version(index)
+        keys = {p: _key(version, p, index[p]) for p in targets
+                if p in index and p not in unstaged and pattern.match(p)}
+        todo = sorted(p for p, key in keys.items() if (stage.name, key) not in cache)
+        command = _resolve(root, stage.fix)
+        if not todo or command is None:
+            continue
+        chunks = _batches(todo, jobs)
+        passed = []
+
+        def finished(n, run_result):
+            if run_result.ok:
+                passed.extend(chunks[n])
+
+        # Una etapa a la vez: sus lotes no comparten archivos
+        runner.run_many([(n, command + chunk, {'cwd': root}) for n, chunk in enumerate(chunks)],
+                        limit=jobs, on_result=finished)
+        rewritten = unstaged_paths(session).intersection(todo)
+        if rewritten:
+            session.run('add', '--', *sorted(rewritten))
+            touched[stage.name] = sorted(rewritten)
+        clean[stage.name] = [(p, keys[p]) for p in passed if p not in rewritten]
+    return touched, clean
+
+
+def run(session, config, names=None, all_files=False, jobs=None, on_result=None, fix=False):
+    """Corre las etapas sobre lo preparado (o todo el índice con `all_files`)
+    y devuelve [StageResult] en el orden de las etapas. Con `fix` antes se
+    corrige y se vuelve a preparar"""
+    from . import runner
+    from .guard import staged_blobs
+    from .impact import compile_globs
+
+    root = session.root
+    jobs = jobs or config.hook_jobs or os.cpu_count() or 1
+    selected = stages(config, names)
+    targets = None if all_files else sorted(p for p, _ in staged_blobs(session))
+    unstaged = unstaged_paths(session)
+    cache = PassCache(root)
+    touched = {}
+    if fix:
+        touched, clean = _fix(session, selected, targets if targets is not None else sorted(index_blobs(session)),
+                              unstaged, cache, jobs)
+        rewritten = set().union(*touched.values()) if touched else set()
+        for name, passed in clean.items():
+            # Lo que otra etapa reescribió después tiene otro blob
+            cache.add(name, [key for p, key in passed if p not in rewritten])
+    index = index_blobs(session)
+    if targets is None:
+        targets = sorted(index)
+
+    results, plans = {}, []
+    for stage in selected:
+        pattern = compile_globs(stage.files)
+        matched = [p for p in targets if p in index and pattern.match(p)]
+        version = stage.version(index)
+        if stage.per_file:
+            keys = {p: _key(version, p, index[p]) for p in matched}
+            todo = [p for p in matched if (stage.name, keys[p]) not in cache]
+            chunks = _batches(todo, jobs)
+        else:
+            covered = [p for p in index if pattern.match(p)]
+            keys = {None: _tree_key(version, index, covered)}
+            # Preparar solo uno de sus archivos de configuración también la dispara
+            triggered = matched or any(p in stage.config for p in targets)
+            todo = covered if triggered and (stage.name, keys[None]) not in cache else []
+            chunks = [[]] if todo else []
+        results[stage.name] = StageResult(stage.name, True, 0.0, checked=todo, cached=len(matched) - len(todo),
+                                          fixed=touched.get(stage.name, []))
+        if chunks:
+            plans.append((stage, keys, chunks))
+
+    outputs, pending = {}, {}
+
+    def finished(job, run_result):
+        name = job[0]
+        result = results[name]
+        result.duration = max(result.duration, run_result.duration)
+        if run_result.ok:
+            cache.add(name, pending[job])
+        else:
+            result.ok = False
+            text = (run_result.stdout + run_result.stderr).decode('utf-8', 'replace').strip()
+            outputs.setdefault(name, []).append(text)
+
+    started = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        base, env = root, None
+        checking = {p for stage, _, _ in plans for p in results[stage.name].checked}
+        if unstaged & checking:
+            # Lo que está en disco no es lo que se commitea: se revisa el índice
+            from . import worktrees
+
+            checkout = stack.enter_context(worktrees.claim(session, config, worktrees.snapshot(session)))
+            base, env = checkout.path, checkout.env
+        work = []
+        for stage, keys, chunks in plans:
+            command = _resolve(base, stage.command)
+            if command is None:
+                results[stage.name].skipped = True
+                results[stage.name].output = f'{stage.command[0]} no instalado'
+                continue
+            for n, chunk in enumerate(chunks):
+                job = (stage.name, n)
+                work.append((job, command + chunk, {'cwd': base, 'env': env}))
+                pending[job] = [keys[p] for p in chunk] if stage.per_file else [keys[None]]
+        if work:
+            runner.run_many(work, limit=jobs, on_result=finished)
+    for name, texts in outputs.items():
+        lines = '\n'.join(texts).splitlines()
+        results[name].output = '\n'.join(lines[-OUTPUT_TAIL:])
+    if cache.dirty:
+        cache.save()
+    ordered = list(results.values())
+    if on_result:
+        for result in ordered:
+            on_result(result)
+    elapsed = time.perf_counter() - started
+    return ordered, elapsed
+
+
+def pre_commit_check(pipeline):
+    """Chequeo pre-commit: las etapas de hook_stages sobre lo preparado,
+    corrigiendo antes como el hook de husky"""
+    results, elapsed = run(pipeline.session, pipeline.config, fix=True)
+    failed = [r for r in results if not r.ok]
+    checked = sum(len(r.checked) for r in results if not r.skipped)
+    cached = sum(r.cached for r in results)
+    fixed = {p for r in results for p in r.fixed}
+    skipped = [r.stage for r in results if r.skipped]
+    detail = f'{checked} revisados, {cached} en caché ({elapsed:.1f} s)'
+    if fixed:
+        detail += f', {len(fixed)} corregidos'
+    if skipped:
+        detail += f", ⚠️  sin ejecutar: {', '.join(skipped)}"
+    for result in failed:
+        detail += f'\n      ❌ {result.stage}:\n      ' + result.output.replace('\n', '\n      ')
+    return not failed, detail
+
+
+pre_commit_check.step = 'hooks'
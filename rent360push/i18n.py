@@ -0,0 +1,273 @@
+"""
+Consistencia de los catálogos de next-intl con su uso en `src/`.
+
+Una clave que falta en `messages/en.json`, un `{name}` que en español se
+llama `{nombre}` o un `t('clave')` que no existe en ningún catálogo solo se
+veían en tiempo de ejecución. Aquí:
+
+- cada catálogo (`i18n_catalogs`) se aplana a claves con puntos
+  (`common.loading`) y se extraen los argumentos ICU de cada mensaje
+  (`{count}`, `{count, plural, ...}`);
+- los archivos de `i18n_sources` se recorren buscando los traductores
+  (`useTranslations('ns')`, `await getTranslations({namespace: 'ns'})`, los
+  hooks de `src/hooks/useTranslation.ts` con sus ayudantes `tv`/`te`/`ts`/
+  `tn`) y sus llamadas con clave literal (`t('x')`, `t.rich('x')`). Una
+  clave armada con `${...}` cuenta como prefijo dinámico: lo que empiece así
+  no se marca como huérfano;
+- la extracción se guarda por archivo y hash de contenido (FileCache en
+  `.git/rent360push/i18n.json`): solo se vuelven a leer los componentes
+  editados, y en paralelo si son muchos.
+
+El informe tiene claves que faltan en algún catálogo, claves usadas que no
+están en ninguno, argumentos que no coinciden entre idiomas y huérfanas
+(en los catálogos pero sin uso). El chequeo pre-push bloquea solo lo que
+toca el push: problemas de catálogo si cambió un catálogo y claves
+inexistentes usadas en archivos cambiados. El resto se informa.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+
+from . import imports
+from .filecache import FileCache
+
+CACHE_NAME = 'i18n'
+CACHE_VERSION = 1
+I18N_EXTS = ('.ts', '.tsx', '.js', '.jsx')
+# Ayudantes de useTranslation() (src/hooks/useTranslation.ts) y su prefijo
+HELPERS = {'t': '', 'tv': 'validation', 'te': 'errors', 'ts': 'success', 'tn': 'navigation'}
+METHODS = ('rich', 'markup', 'raw', 'has')
+
+_BINDING = re.compile(
+    r'(?:const|let|var)\s+(?P<lhs>\w+|\{[^}]*\})\s*=\s*(?:await\s+)?'
+    r'(?P<fn>useTranslations|getTranslations|use(?P<hook>\w*)Translation)\s*\((?P<args>[^)]*)\)'
+)
+_LITERAL = re.compile(r'''(['"`])([\w.-]*)\1''')
+_NAMESPACE_OPTION = re.compile(r'''namespace\s*:\s*(['"`])([\w.-]*)\1''')
+_DESTRUCTURED = re.compile(r'(\w+)(?:\s*:\s*(\w+))?')
+# Argumentos ICU: {name} o {name, plural|select|number|date, ...}
+_ARGUMENT = re.compile(r'\{\s*([A-Za-z_]\w*)\s*[,}]')
+
+
+@dataclass
+class Usage:
+    path: str
+    line: int
+    key: str
+
+
+@dataclass
+class Report:
+    # {idioma: número de claves}
+    catalogs: dict = field(default_factory=dict)
+    # {idioma: [claves que tienen otros catálogos y este no]}
+    missing: dict = field(default_factory=dict)
+    # [Usage] de claves que no están en ningún catálogo
+    undefined: list = field(default_factory=list)
+    # {clave: {idioma: [argumentos]}} cuando los idiomas no coinciden
+    placeholders: dict = field(default_factory=dict)
+    orphans: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+    files: int = 0
+    rescanned: int = 0
+    used: int = 0
+    dynamic: list = field(default_factory=list)
+    # Llamadas de traductores con espacio de nombres no literal
+    unresolved: int = 0
+
+    @property
+    def problems(self):
+        return (sum(len(keys) for keys in self.missing.values()) + len(self.undefined)
+                + len(self.placeholders) + len(self.errors))
+
+
+# Catálogos ------------------------------------------------------------------
+
+def flatten(data, prefix=''):
+    """{'a': {'b': 'x'}} -> {'a.b': 'x'}; listas y otros valores son hojas"""
+    flat = {}
+    for key, value in data.items():
+        name = f'{prefix}.{key}' if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        else:
+            flat[name] = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+    return flat
+
+
+def arguments(message):
+    """Nombres de los argumentos ICU de un mensaje"""
+    return sorted(set(_ARGUMENT.findall(message)))
+
+
+def load_catalogs(root, paths):
+    """({idioma: {clave: mensaje}}, [errores]); el idioma es el nombre del archivo"""
+    catalogs, errors = {}, []
+    for rel in paths:
+        lang = os.path.splitext(os.path.basename(rel))[0]
+        try:
+            with open(os.path.join(root, rel), encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            continue
+        except ValueError as exc:
+            errors.append(f'{rel}: JSON inválido ({exc})')
+            continue
+        catalogs[lang] = flatten(data) if isinstance(data, dict) else {}
+    return catalogs, errors
+
+
+# Uso en el código -----------------------------------------------------------
+
+def _namespace(match):
+    """Espacio de nombres de un traductor ('' = raíz, None = no literal)"""
+    hook, args = match.group('hook'), match.group('args').strip()
+    if hook:
+        # useCommonTranslation() -> 'common'
+        return hook[0].lower() + hook[1:]
+    if args.startswith('{'):
+        # getTranslations({ locale, namespace: 'ns' }); sin namespace es la raíz
+        literal = _NAMESPACE_OPTION.search(args)
+        if literal:
+            return literal.group(2)
+        return None if 'namespace' in args else ''
+    literal = _LITERAL.fullmatch(args)
+    if literal:
+        return literal.group(2)
+    # Una variable no se puede seguir
+    return '' if not args else None
+
+
+def _bindings(text):
+    """{nombre local: [(posición, espacio de nombres, prefijo del ayudante)]}"""
+    found = {}
+    for match in _BINDING.finditer(text):
+        namespace, lhs = _namespace(match), match.group('lhs')
+        if match.group('hook') is None:
+            # useTranslations/getTranslations devuelven la función
+            if not lhs.startswith('{'):
+                found.setdefault(lhs, []).append((match.start(), namespace, ''))
+        elif lhs.startswith('{'):
+            # const { t, tv: validate } = useTranslation('ns')
+            for helper, local in _DESTRUCTURED.findall(lhs[1:-1]):
+                if helper in HELPERS:
+                    found.setdefault(local or helper, []).append((match.start(), namespace, HELPERS[helper]))
+    return found
+
+
+def extract(rel, data):
+    """Claves usadas en un archivo: {'keys': [[clave, línea]], 'dynamic':
+    [prefijos], 'unresolved': llamadas con traductor de espacio no literal}"""
+    if b'Translation' not in data:
+        return {'keys': [], 'dynamic': [], 'unresolved': 0}
+    text = data.decode('utf-8', 'replace')
+    keys, dynamic, unresolved = [], [], 0
+    for name, bindings in _bindings(text).items():
+        call = re.compile(
+            rf'(?<![\w.$]){re.escape(name)}(?:\.(?:{"|".join(METHODS)}))?\(\s*(?P<q>[\'"`])(?P<key>(?:(?!(?P=q)).)*)(?P=q)'
+        )
+        for match in call.finditer(text):
+            position = match.start()
+            previous = [b for b in bindings if b[0] < position]
+            _, namespace, prefix = (previous or bindings)[-1]
+            if namespace is None:
+                unresolved += 1
+                continue
+            key = match.group('key')
+            if '${' in key:
+                key, complete = key.split('${', 1)[0].rstrip('.'), False
+            else:
+                complete = True
+            full = '.'.join(part for part in (namespace, prefix, key) if part)
+            if complete:
+                keys.append([full, text.count('\n', 0, position) + 1])
+            else:
+                dynamic.append(full)
+    return {'keys': keys, 'dynamic': sorted(set(dynamic)), 'unresolved': unresolved}
+
+
+def scan(root, config, jobs=None):
+    """({archivo: extracción}, archivos re-leídos)"""
+    files = [f for f in imports.source_files(root, config.i18n_sources) if f.endswith(I18N_EXTS)]
+    cache = FileCache(root, CACHE_NAME, extract, version=CACHE_VERSION)
+    found = cache.update(files, jobs)
+    if cache.dirty:
+        cache.save()
+    return found, len(cache.recomputed)
+
+
+# Informe --------------------------------------------------------------------
+
+def _defined(key, keys, prefixes):
+    # t('features') con t.raw devuelve todo el objeto: basta con que sea prefijo
+    return key in keys or key in prefixes
+
+
+def describe_arguments(present):
+    """{'es': ['nombre'], 'en': ['name']} -> 'es {nombre} / en {name}'"""
+    return ' / '.join(f"{lang} {' '.join('{' + n + '}' for n in names) or '-'}" for lang, names in present.items())
+
+
+def check(root, config, jobs=None):
+    """Informe de los catálogos y de su uso en i18n_sources"""
+    catalogs, errors = load_catalogs(root, config.i18n_catalogs)
+    usage, rescanned = scan(root, config, jobs)
+    report = Report(errors=errors, files=len(usage), rescanned=rescanned)
+    report.catalogs = {lang: len(keys) for lang, keys in catalogs.items()}
+
+    every = set().union(*(set(keys) for keys in catalogs.values())) if catalogs else set()
+    for lang, keys in catalogs.items():
+        absent = sorted(every - set(keys))
+        if absent:
+            report.missing[lang] = absent
+    for key in sorted(every):
+        present = {lang: arguments(keys[key]) for lang, keys in catalogs.items() if key in keys}
+        if len({tuple(names) for names in present.values()}) > 1:
+            report.placeholders[key] = present
+
+    prefixes = {key.rsplit('.', n)[0] for key in every for n in range(1, key.count('.') + 1)}
+    used, dynamic = set(), set()
+    for rel, found in sorted(usage.items()):
+        dynamic.update(found['dynamic'])
+        report.unresolved += found['unresolved']
+        for key, line in found['keys']:
+            used.add(key)
+            if not _defined(key, every, prefixes):
+                report.undefined.append(Usage(rel, line, key))
+    report.used = len(used)
+    report.dynamic = sorted(dynamic)
+    # Usada como objeto (t.raw('features')) o con prefijo dinámico
+    covered = tuple(f'{key}.' for key in used) + tuple(dynamic)
+    report.orphans = sorted(k for k in every if k not in used and not k.startswith(covered))
+    return report
+
+
+def pre_push_check(pipeline):
+    """Chequeo pre-push: bloquea los problemas que introduce lo que se sube"""
+    from .docker import pending_paths
+
+    session, config = pipeline.session, pipeline.config
+    report = check(session.root, config)
+    if not report.catalogs and not report.errors:
+        return True, 'sin catálogos'
+    changed = set(pending_paths(session, config))
+    blocking = []
+    if changed.intersection(config.i18n_catalogs):
+        blocking += report.errors
+        blocking += [f'falta en {lang}: {key}' for lang, keys in report.missing.items() for key in keys]
+        blocking += [f'argumentos distintos en {key}: {describe_arguments(present)}'
+                     for key, present in report.placeholders.items()]
+    blocking += [f'{u.path}:{u.line} {u.key} no está en ningún catálogo' for u in report.undefined
+                 if u.path in changed]
+    detail = (f"{report.used} claves usadas, {report.rescanned}/{report.files} archivos re-leídos, "
+              f"{report.problems} problemas, {len(report.orphans)} huérfanas")
+    if blocking:
+        detail += '\n      ' + '\n      '.join(blocking[:20])
+        if len(blocking) > 20:
+            detail += f'\n      ... y {len(blocking) - 20} más'
+    return not blocking, detail
+
+
+pre_push_check.step = 'i18n'
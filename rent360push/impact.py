@@ -0,0 +1,151 @@
+"""
+Clasificación del diff a empujar según su efecto en el deploy.
+
+En la raíz del repositorio viven ~135 informes Markdown y decenas de scripts
+`.cmd`/`.ps1`/`.py`; cualquier commit que solo toque esos archivos igual
+llegaba a `main` y disparaba un `npm run build` completo en DigitalOcean.
+Aquí las rutas del diff contra la rama remota se reparten en "afectan el
+build" y "no afectan el build" con globs configurables:
+
+- `no_build_paths`: rutas que no entran en el build (docs, scripts);
+- `build_paths`: excepciones que siempre cuentan como build aunque coincidan
+  con las anteriores (p.ej. un `.md` dentro de `src/`).
+
+Un glob sin `/` se compara con el nombre del archivo a cualquier
+profundidad; con `/` se compara con la ruta completa desde la raíz. `**`
+abarca directorios, `*` y `?` no.
+
+Los builds evitados se registran en `.git/rent360push/impact.jsonl`.
+"""
+
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+
+from . import remotes
+from .config import state_dir
+
+LOG_FILE = 'impact.jsonl'
+
+
+@dataclass
+class Impact:
+    build: list = field(default_factory=list)
+    no_build: list = field(default_factory=list)
+    # Ref remota contra la que se calculó el diff (None = desconocida)
+    base: str | None = None
+
+    @property
+    def affects_build(self):
+        # Sin base no sabemos qué se enviaría: mejor construir
+        return self.base is None or bool(self.build)
+
+    def describe(self):
+        if self.base is None:
+            return 'sin rama remota de referencia'
+        return f'{len(self.build)} archivos de build, {len(self.no_build)} sin build'
+
+
+def _glob_re(pattern):
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            parts.append('[^/]')
+            i += 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    body = ''.join(parts)
+    if '/' not in pattern:
+        return f'(?:.*/)?{body}'
+    return body.lstrip('/')
+
+
+def compile_globs(patterns):
+    """Un solo regex para toda la lista (None si está vacía)"""
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{_glob_re(p)})' for p in patterns) + r'\Z')
+
+
+def classify(paths, config):
+    build_re = compile_globs(config.build_paths)
+    no_build_re = compile_globs(config.no_build_paths)
+    impact = Impact()
+    for path in paths:
+        skip = no_build_re is not None and no_build_re.match(path)
+        forced = build_re is not None and build_re.match(path)
+        (impact.build if forced or not skip else impact.no_build).append(path)
+    return impact
+
+
+def pending(session, config):
+    """Clasifica todo lo que HEAD tiene y la rama remota todavía no"""
+    base = remotes.tracking_ref(session, config)
+    if base is None:
+        return Impact()
+    raw = session.run('diff', '--name-only', '-z', '--no-renames', base, 'HEAD').stdout
+    paths = [p.decode('utf-8', 'surrogateescape') for p in raw.split(b'\0') if p]
+    impact = classify(paths, config)
+    impact.base = base
+    return impact
+
+
+def _entries(root):
+    try:
+        with open(os.path.join(state_dir(root), LOG_FILE), encoding='utf-8') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return []
+    entries = []
+    for line in lines:
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            continue
+    return entries
+
+
+def record_skip(root, config, impact, commit, mode):
+    """Anota un build evitado por `commit`; cada commit cuenta una vez.
+    Devuelve False si no se anotó"""
+    if commit is None or any(e.get('commit') == commit for e in _entries(root)):
+        return False
+    entry = {
+        'time': time.time(),
+        'commit': commit,
+        'mode': mode,
+        'files': len(impact.no_build),
+        'minutes': config.build_minutes,
+    }
+    with open(os.path.join(state_dir(root), LOG_FILE), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry) + '\n')
+    return True
+
+
+def saved(root):
+    """Totales del registro: builds evitados y minutos de build ahorrados
+    (una vez por commit; las entradas sin commit de versiones anteriores,
+    repeticiones sin commit nuevo, no cuentan)"""
+    builds = minutes = 0
+    seen = set()
+    for entry in _entries(root):
+        commit = entry.get('commit')
+        if commit is None or commit in seen:
+            continue
+        seen.add(commit)
+        builds += 1
+        minutes += entry.get('minutes', 0)
+    return {'builds': builds, 'minutes': minutes}
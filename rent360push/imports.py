@@ -0,0 +1,132 @@
+"""
+Resolución de imports TypeScript/JavaScript de Rent360.
+
+Entiende imports relativos y los alias `paths` de `tsconfig.json`
+(`@/lib/...`, `@/components/...`); los paquetes de node_modules se ignoran.
+"""
+
+import json
+import os
+import re
+
+SOURCE_EXTS = ('.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs')
+SOURCE_DIRS = ('src', 'services', 'tests')
+SKIP_DIRS = {'node_modules', 'dist', '.next', 'coverage', 'build'}
+_RESOLVE_SUFFIXES = ('', '.ts', '.tsx', '.d.ts', '.js', '.jsx', '/index.ts', '/index.tsx', '/index.js', '/index.jsx')
+
+IMPORT_RE = re.compile(
+    r"""(?:\bfrom\s*|\bimport\s*\(?\s*|\brequire\s*\(\s*|\bjest\.(?:mock|requireActual)\s*\(\s*)['"]([^'"\n]+)['"]"""
+)
+
+
+def read_tsconfig(path):
+    """Lee un tsconfig tolerando comentarios y comas finales"""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    text = re.sub(r'^\s*//[^\n]*', '', text, flags=re.M)
+    text = re.sub(r',(\s*[}\]])', r'\1', text)
+    return json.loads(text)
+
+
+def _compiler_options(path, seen=()):
+    """compilerOptions efectivas siguiendo `extends`; `baseUrl` se devuelve
+    absoluto porque es relativo al tsconfig que lo define"""
+    if path in seen:
+        return {}
+    config = read_tsconfig(path)
+    options = {}
+    parent = config.get('extends')
+    if isinstance(parent, str) and parent.startswith('.'):
+        parent_path = os.path.normpath(os.path.join(os.path.dirname(path), parent))
+        if not parent_path.endswith('.json'):
+            parent_path += '.json'
+        try:
+            options.update(_compiler_options(parent_path, (*seen, path)))
+        except (OSError, ValueError):
+            pass
+    own = dict(config.get('compilerOptions', {}))
+    if 'baseUrl' in own:
+        own['baseUrl'] = os.path.normpath(os.path.join(os.path.dirname(path), own['baseUrl']))
+    options.update(own)
+    return options
+
+
+def load_aliases(root, tsconfig='tsconfig.json'):
+    """Devuelve [(prefijo, [destinos relativos a root])] de `compilerOptions.paths`
+    (siguiendo `extends`), del prefijo más largo al más corto"""
+    path = os.path.join(root, tsconfig)
+    try:
+        options = _compiler_options(path)
+    except (OSError, ValueError):
+        return []
+    base = options.get('baseUrl', os.path.dirname(path))
+    aliases = []
+    for pattern, targets in options.get('paths', {}).items():
+        prefix = pattern[:-1] if pattern.endswith('*') else pattern
+        resolved = [
+            os.path.relpath(os.path.join(base, t[:-1] if t.endswith('*') else t), root).replace(os.sep, '/')
+            for t in targets
+        ]
+        aliases.append((prefix, [r + '/' if pattern.endswith('*') and not r.endswith('/') else r for r in resolved]))
+    aliases.sort(key=lambda item: len(item[0]), reverse=True)
+    return aliases
+
+
+def nearest_tsconfig(root, path):
+    """tsconfig.json más cercano a `path` subiendo directorios (relativo a root)"""
+    directory = os.path.dirname(path)
+    while True:
+        candidate = f'{directory}/tsconfig.json' if directory else 'tsconfig.json'
+        if os.path.exists(os.path.join(root, candidate)):
+            return candidate
+        if not directory:
+            return None
+        directory = os.path.dirname(directory)
+
+
+def parse_imports(text):
+    """Especificadores importados por un archivo fuente.
+
+    No se quitan comentarios: un import comentado solo agrega una arista de
+    más, lo que para seleccionar validaciones es conservador.
+    """
+    return sorted(set(IMPORT_RE.findall(text)))
+
+
+def _candidate(root, rel, files):
+    for suffix in _RESOLVE_SUFFIXES:
+        path = rel + suffix
+        if path in files if files is not None else os.path.isfile(os.path.join(root, path)):
+            return path
+    return None
+
+
+def resolve(root, importer, spec, aliases, files=None):
+    """Ruta relativa a root del módulo importado, o None si es externo.
+
+    Con `files` (conjunto de rutas conocidas) no se toca el disco.
+    """
+    if spec.startswith('.'):
+        base = os.path.dirname(importer)
+        rel = os.path.normpath(os.path.join(base, spec)).replace(os.sep, '/')
+        return _candidate(root, rel, files)
+    for prefix, targets in aliases:
+        if spec.startswith(prefix):
+            rest = spec[len(prefix):]
+            for target in targets:
+                found = _candidate(root, os.path.normpath(target + rest).replace(os.sep, '/'), files)
+                if found:
+                    return found
+            return None
+    return None
+
+
+def source_files(root, dirs=SOURCE_DIRS):
+    """Rutas relativas de todos los archivos fuente bajo `dirs`"""
+    found = []
+    for top in dirs:
+        for base, subdirs, files in os.walk(os.path.join(root, top)):
+            subdirs[:] = [d for d in subdirs if d not in SKIP_DIRS]
+            rel_base = os.path.relpath(base, root).replace(os.sep, '/')
+            found.extend(f'{rel_base}/{name}' for name in files if name.endswith(SOURCE_EXTS))
+    return found
@@ -0,0 +1,140 @@
+"""
+Acceso mínimo a inotify (Linux) vía ctypes, sin dependencias externas.
+
+En plataformas sin inotify `available()` devuelve False y quien lo use debe
+caer a un escaneo por stat.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+
+_EVENT = struct.Struct('iIII')
+_libc = None
+
+
+def _load():
+    global _libc
+    if _libc is None and sys.platform.startswith('linux'):
+        lib = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        if hasattr(lib, 'inotify_init1'):
+            _libc = lib
+    return _libc
+
+
+def available():
+    return _load() is not None
+
+
+class Inotify:
+    """Descriptor inotify con vigilancia recursiva de directorios.
+
+    `skip` recibe la ruta relativa de un directorio y devuelve True si no se
+    debe vigilar (p.ej. `.git`, `node_modules`).
+    """
+
+    def __init__(self, root, skip=None):
+        libc = _load()
+        if libc is None:
+            raise OSError(errno.ENOSYS, 'inotify no disponible en esta plataforma')
+        self.libc = libc
+        self.root = os.path.abspath(root)
+        self.skip = skip or (lambda rel: False)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 falló')
+        self.dirs = {}
+        self.add_tree('')
+
+    def fileno(self):
+        return self.fd
+
+    def add_tree(self, rel):
+        """Vigila `rel` y todos sus subdirectorios; devuelve las rutas de
+        archivos encontradas (útil cuando aparece un directorio nuevo)"""
+        found = []
+        stack = [rel]
+        while stack:
+            current = stack.pop()
+            if current and self.skip(current):
+                continue
+            path = os.path.join(self.root, current)
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+            if wd < 0:
+                continue
+            self.dirs[wd] = current
+            try:
+                entries = list(os.scandir(path))
+            except OSError:
+                continue
+            for entry in entries:
+                child = f'{current}/{entry.name}' if current else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(child)
+                else:
+                    found.append(child)
+        return found
+
+    def read(self, timeout=None):
+        """Devuelve [(ruta_relativa, máscara)]; lista vacía si vence `timeout`.
+        Una ruta None indica desbordamiento de la cola del kernel."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'surrogateescape')
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                events.append((None, mask))
+                continue
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            parent = self.dirs.get(wd)
+            if parent is None:
+                continue
+            rel = f'{parent}/{name}' if parent and name else (name or parent)
+            events.append((rel, mask))
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                # Los archivos creados antes de registrar la vigilancia no
+                # generan eventos: se reportan como creados
+                events.extend((path, IN_CREATE) for path in self.add_tree(rel))
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
@@ -0,0 +1,429 @@
+"""
+Jest repartido en shards según la duración de cada archivo de test.
+
+`scripts/run-all-tests.js` y compañía corren cada config de Jest
+(`jest.config.js`, `jest.config.integration.js`) como un solo proceso, uno
+detrás de otro: demasiado lento para frenar una subida. Aquí:
+
+- los archivos de cada config salen de `jest --listTests`;
+- el modelo de tiempos (`.git/rent360push/jest-timings.json`) guarda por
+  config y archivo una media móvil exponencial de la duración real que
+  reporta Jest (`--json`); un archivo sin historia se estima con la mediana
+  de los conocidos;
+- los núcleos se reparten entre configs según su tiempo estimado y dentro
+  de cada una los archivos se asignan LPT (el más largo primero, al shard
+  menos cargado);
+- cada shard es un proceso `jest --runTestsByPath` con un worker; corren a
+  la vez con runner.run_many;
+- los resultados JSON de los shards se unen en uno solo y, con
+  `--coverage`, los `coverage-final.json` de cada shard se suman (los mismos
+  contadores de Istanbul) y se escriben `coverage/coverage-final.json` y
+  `coverage/coverage-summary.json`. Los umbrales de cobertura de la config se
+  desactivan por shard (un shard solo ejecuta parte de los tests) y se
+  comprueban como Jest sobre la cobertura unida de cada config: `global`,
+  rutas (`./src/lib/`, todos sus archivos juntos) y globs (cada archivo);
+- después de cada corrida se actualiza el modelo.
+"""
+
+import heapq
+import json
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+
+from .config import state_dir
+from .impact import compile_globs
+
+TIMINGS_FILE = 'jest-timings.json'
+# Peso de la última corrida en la media móvil
+ALPHA = 0.5
+# Estimación sin ninguna historia (segundos)
+DEFAULT_SECONDS = 2.0
+COVERAGE_KEYS = ('lines', 'statements', 'functions', 'branches')
+
+
+@dataclass
+class Shard:
+    config: str
+    index: int
+    files: list = field(default_factory=list)
+    estimate: float = 0.0
+
+
+@dataclass
+class FileResult:
+    path: str
+    ok: bool
+    duration: float
+    tests: int = 0
+    failed: int = 0
+    message: str = ''
+
+
+@dataclass
+class ShardResult:
+    shard: Shard
+    ok: bool
+    duration: float
+    files: list = field(default_factory=list)
+    output: str = ''
+
+
+@dataclass
+class Report:
+    shards: list = field(default_factory=list)
+    wall: float = 0.0
+    coverage: dict | None = None
+    # Umbrales de coverageThreshold no alcanzados
+    coverage_misses: list = field(default_factory=list)
+
+    @property
+    def files(self):
+        return [f for s in self.shards for f in s.files]
+
+    @property
+    def ok(self):
+        return all(s.ok for s in self.shards) and not self.coverage_misses
+
+    @property
+    def failed_files(self):
+        return [f for f in self.files if not f.ok]
+
+    def totals(self):
+        files = self.files
+        return sum(f.tests for f in files), sum(f.failed for f in files)
+
+
+# Modelo de tiempos ----------------------------------------------------------
+
+class Timings:
+    """{config: {archivo: {'mean': s, 'runs': n}}} en el directorio de estado"""
+
+    def __init__(self, root):
+        self.path = os.path.join(state_dir(root), TIMINGS_FILE)
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.data = {}
+
+    def estimate(self, config, path):
+        known = self.data.get(config, {})
+        if path in known:
+            return known[path]['mean']
+        means = sorted(entry['mean'] for entry in known.values())
+        return means[len(means) // 2] if means else DEFAULT_SECONDS
+
+    def record(self, config, path, seconds):
+        known = self.data.setdefault(config, {})
+        entry = known.get(path)
+        if entry is None:
+            known[path] = {'mean': round(seconds, 3), 'runs': 1}
+        else:
+            entry['mean'] = round(ALPHA * seconds + (1 - ALPHA) * entry['mean'], 3)
+            entry['runs'] += 1
+
+    def forget_missing(self, config, present):
+        """Quita los archivos que ya no existen"""
+        known = self.data.get(config, {})
+        for path in set(known) - set(present):
+            del known[path]
+
+    def save(self):
+        with open(self.path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=1, sort_keys=True)
+        os.replace(self.path + '.tmp', self.path)
+
+
+def lpt(items, count):
+    """Reparte [(archivo, segundos)] en `count` grupos: el más largo primero,
+    siempre al grupo menos cargado. Devuelve [(carga, [archivos])]"""
+    count = max(1, min(count, len(items)))
+    heap = [(0.0, i, []) for i in range(count)]
+    for path, seconds in sorted(items, key=lambda item: (-item[1], item[0])):
+        load, i, files = heapq.heappop(heap)
+        files.append(path)
+        heapq.heappush(heap, (load + seconds, i, files))
+    return [(load, files) for load, _, files in sorted(heap, key=lambda entry: entry[1]) if files]
+
+
+def plan(root, files_by_config, jobs, timings=None):
+    """Shards para {config: [archivos]} con `jobs` procesos en total"""
+    timings = timings or Timings(root)
+    estimated = {
+        config: [(path, timings.estimate(config, path)) for path in files]
+        for config, files in files_by_config.items() if files
+    }
+    total = sum(seconds for items in estimated.values() for _, seconds in items) or 1.0
+    shards = []
+    for config, items in estimated.items():
+        share = sum(seconds for _, seconds in items) / total
+        count = max(1, round(jobs * share))
+        for i, (load, files) in enumerate(lpt(items, count), 1):
+            shards.append(Shard(config, i, files, round(load, 3)))
+    # Los más largos arrancan primero
+    shards.sort(key=lambda shard: -shard.estimate)
+    return shards
+
+
+# Ejecución -----------------------------------------------------------------
+
+def jest_command(root, config):
+    """Comando de Jest (node_modules/.bin primero) o None si no está"""
+    command = list(config.jest_command)
+    local = os.path.join(root, 'node_modules', '.bin', command[0] + ('.cmd' if os.name == 'nt' else ''))
+    if os.path.exists(local):
+        return [local, *command[1:]]
+    found = shutil.which(command[0])
+    return [found, *command[1:]] if found else None
+
+
+def list_tests(root, command, jest_config):
+    """Archivos de test de una config, relativos a la raíz"""
+    from . import runner
+
+    result = runner.run([*command, '--config', jest_config, '--listTests'], cwd=root)
+    if not result.ok:
+        raise RuntimeError(f'jest --listTests ({jest_config}) falló:\n'
+                           + (result.stdout + result.stderr).decode('utf-8', 'replace').strip()[-2000:])
+    files = []
+    for line in result.stdout.decode('utf-8', 'replace').splitlines():
+        line = line.strip()
+        if line:
+            files.append(os.path.relpath(line, root).replace(os.sep, '/') if os.path.isabs(line) else line)
+    return sorted(set(files))
+
+
+def coverage_thresholds(root, command, jest_config):
+    """`coverageThreshold` de una config, leído con `jest --showConfig`"""
+    from . import runner
+
+    result = runner.run([*command, '--config', jest_config, '--showConfig'], cwd=root)
+    try:
+        if not result.ok:
+            raise ValueError
+        return json.loads(result.stdout).get('globalConfig', {}).get('coverageThreshold') or {}
+    except ValueError:
+        raise RuntimeError(f'jest --showConfig ({jest_config}) falló:\n'
+                           + (result.stdout + result.stderr).decode('utf-8', 'replace').strip()[-2000:]) from None
+
+
+def _parse_results(root, path):
+    """[FileResult] del --json de un shard (None si no se escribió)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    results = []
+    for entry in data.get('testResults', []):
+        name = entry.get('name', '')
+        rel = os.path.relpath(name, root).replace(os.sep, '/') if os.path.isabs(name) else name
+        tests = entry.get('assertionResults', [])
+        failed = sum(1 for t in tests if t.get('status') == 'failed')
+        duration = max(0.0, (entry.get('endTime', 0) - entry.get('startTime', 0)) / 1000)
+        ok = entry.get('status') == 'passed'
+        results.append(FileResult(rel, ok, round(duration, 3), len(tests), failed, entry.get('message', '')))
+    return results
+
+
+def run(root, config, shards, coverage=False, jobs=None, on_shard=None):
+    """Ejecuta los shards en paralelo y une sus resultados (y cobertura)"""
+    from . import runner
+
+    command = jest_command(root, config)
+    if command is None:
+        raise RuntimeError(f'{config.jest_command[0]} no instalado (npm ci)')
+    thresholds = {}
+    if coverage:
+        for shard in shards:
+            if shard.config not in thresholds:
+                thresholds[shard.config] = coverage_thresholds(root, command, shard.config)
+    work = tempfile.mkdtemp(prefix='jest-', dir=state_dir(root))
+    report = Report()
+    try:
+        specs = []
+        for n, shard in enumerate(shards):
+            argv = [*command, '--config', shard.config, '--ci', '--maxWorkers=1', '--reporters=default',
+                    '--json', f'--outputFile={os.path.join(work, f"{n}.json")}']
+            if coverage:
+                argv += ['--coverage', '--coverageReporters=json', '--coverageThreshold={}',
+                         f'--coverageDirectory={os.path.join(work, f"coverage-{n}")}']
+            argv += ['--runTestsByPath', *shard.files]
+            specs.append((n, argv, {'cwd': root}))
+
+        def done(n, result):
+            shard = shards[n]
+            files = _parse_results(root, os.path.join(work, f'{n}.json'))
+            output = (result.stdout + result.stderr).decode('utf-8', 'replace').strip()
+            if files is None:
+                # Jest no llegó a escribir resultados: todo el shard falla
+                files = [FileResult(path, False, 0.0, message='sin resultados de Jest') for path in shard.files]
+            shard_result = ShardResult(shard, result.ok and all(f.ok for f in files), round(result.duration, 3),
+                                       files, '\n'.join(output.splitlines()[-40:]))
+            report.shards.append(shard_result)
+            if on_shard:
+                on_shard(shard_result)
+
+        start = time.perf_counter()
+        runner.run_many(specs, limit=jobs or len(shards) or 1, on_result=done)
+        report.wall = round(time.perf_counter() - start, 3)
+        if coverage:
+            by_config = {}
+            for n, shard in enumerate(shards):
+                part = os.path.join(work, f'coverage-{n}', 'coverage-final.json')
+                if os.path.exists(part):
+                    by_config.setdefault(shard.config, []).append(part)
+            merged = {}
+            for jest_config, threshold in thresholds.items():
+                covered = merge_coverage(by_config.get(jest_config, []))
+                report.coverage_misses += check_thresholds(root, covered, threshold)
+                combine_coverage(merged, covered)
+            report.coverage = write_coverage(root, merged)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    return report
+
+
+def update_timings(root, report, timings=None):
+    """Ajusta el modelo con las duraciones reales de la corrida"""
+    timings = timings or Timings(root)
+    for shard_result in report.shards:
+        for file_result in shard_result.files:
+            if file_result.duration > 0:
+                timings.record(shard_result.shard.config, file_result.path, file_result.duration)
+    timings.save()
+    return timings
+
+
+# Cobertura -----------------------------------------------------------------
+
+def combine_coverage(merged, data):
+    """Suma en `merged` la cobertura {archivo: Istanbul} de `data`"""
+    for name, cov in data.items():
+        current = merged.get(name)
+        if current is None:
+            merged[name] = cov
+            continue
+        for key in ('s', 'f'):
+            for id_, count in cov.get(key, {}).items():
+                current[key][id_] = current[key].get(id_, 0) + count
+        for id_, counts in cov.get('b', {}).items():
+            previous = current['b'].get(id_, [0] * len(counts))
+            current['b'][id_] = [a + b for a, b in zip(previous, counts)]
+    return merged
+
+
+def merge_coverage(paths):
+    """Suma los coverage-final.json (Istanbul) de varios shards"""
+    merged = {}
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            combine_coverage(merged, json.load(f))
+    return merged
+
+
+def _pct(covered, total):
+    return {'total': total, 'covered': covered, 'skipped': 0,
+            'pct': round(covered * 100 / total, 2) if total else 100}
+
+
+def file_summary(cov):
+    """Resumen al estilo json-summary de Istanbul para un archivo"""
+    lines = {}
+    for id_, count in cov.get('s', {}).items():
+        line = cov['statementMap'][id_]['start']['line']
+        lines[line] = max(lines.get(line, 0), count)
+    branches = [c for counts in cov.get('b', {}).values() for c in counts]
+    return {
+        'lines': _pct(sum(1 for c in lines.values() if c), len(lines)),
+        'statements': _pct(sum(1 for c in cov.get('s', {}).values() if c), len(cov.get('s', {}))),
+        'functions': _pct(sum(1 for c in cov.get('f', {}).values() if c), len(cov.get('f', {}))),
+        'branches': _pct(sum(1 for c in branches if c), len(branches)),
+    }
+
+
+def summarize_coverage(merged):
+    summary = {'total': {key: _pct(0, 0) for key in COVERAGE_KEYS}}
+    totals = {key: [0, 0] for key in COVERAGE_KEYS}
+    for name, cov in sorted(merged.items()):
+        summary[name] = file_summary(cov)
+        for key in COVERAGE_KEYS:
+            totals[key][0] += summary[name][key]['covered']
+            totals[key][1] += summary[name][key]['total']
+    summary['total'] = {key: _pct(*totals[key]) for key in COVERAGE_KEYS}
+    return summary
+
+
+def _misses(group, summary, threshold):
+    """Incumplimientos de un grupo: un umbral positivo es el porcentaje
+    mínimo; uno negativo, el máximo de elementos sin cubrir"""
+    misses = []
+    for key in COVERAGE_KEYS:
+        limit = threshold.get(key)
+        if limit is None:
+            continue
+        entry = summary[key]
+        uncovered = entry['total'] - entry['covered']
+        if limit < 0 and uncovered > -limit:
+            misses.append(f'{group}: {uncovered} {key} sin cubrir (máximo {-limit})')
+        elif limit >= 0 and entry['pct'] < limit:
+            misses.append(f'{group}: {key} {entry["pct"]}% (mínimo {limit}%)')
+    return misses
+
+
+def check_thresholds(root, merged, thresholds):
+    """Aplica `coverageThreshold` como Jest y devuelve los incumplimientos.
+
+    Cada clave que no es `global` se resuelve desde la raíz: si la ruta del
+    archivo empieza con ella es un grupo de ruta (se suman sus archivos); si
+    no, un glob (cada archivo por separado). Lo que no cae en ninguna va a
+    `global`. Un grupo sin archivos también falla.
+    """
+    keys = [key for key in thresholds if key != 'global']
+    prefixes = {key: os.path.normpath(os.path.join(root, key)) for key in keys}
+    # '/' delante: el glob se ancla en la raíz, como en Jest
+    patterns = {key: compile_globs(['/' + os.path.normpath(key).replace(os.sep, '/')]) for key in keys}
+    groups = {key: [] for key in thresholds}
+    globs = set()
+    for name in sorted(merged):
+        rel = os.path.relpath(name, root).replace(os.sep, '/')
+        found = False
+        for key in keys:
+            if name.startswith(prefixes[key]):
+                groups[key].append(name)
+            elif patterns[key].match(rel):
+                groups[key].append(name)
+                globs.add(key)
+            else:
+                continue
+            found = True
+        if not found and 'global' in groups:
+            groups['global'].append(name)
+
+    misses = []
+    for key, names in groups.items():
+        if not names:
+            misses.append(f'{key}: sin datos de cobertura')
+        elif key in globs:
+            for name in names:
+                rel = os.path.relpath(name, root).replace(os.sep, '/')
+                misses += _misses(rel, file_summary(merged[name]), thresholds[key])
+        else:
+            summary = summarize_coverage({name: merged[name] for name in names})['total']
+            misses += _misses(key, summary, thresholds[key])
+    return misses
+
+
+def write_coverage(root, merged, directory='coverage'):
+    """Escribe coverage-final.json y coverage-summary.json; devuelve el total"""
+    target = os.path.join(root, directory)
+    os.makedirs(target, exist_ok=True)
+    summary = summarize_coverage(merged)
+    with open(os.path.join(target, 'coverage-final.json'), 'w', encoding='utf-8') as f:
+        json.dump(merged, f)
+    with open(os.path.join(target, 'coverage-summary.json'), 'w', encoding='utf-8') as f:
+        json.dump(summary, f)
+    return summary['total']
@@ -0,0 +1,297 @@
+"""
+Mantenimiento del repositorio local entre pushes.
+
+Los `git add .` de archivos generados dejaron miles de objetos sueltos y
+packs chicos, y nadie revisaba el estado antes de subir: cada push pagaba
+la enumeración de objetos sueltos y la búsqueda en N packs. Aquí:
+
+- `stats()` junta las estadísticas con un solo `git count-objects -v` y un
+  par de `stat` (sin recorrer objetos);
+- `plan()` decide qué tarea compensa: `repack -d` incremental si hay
+  demasiados objetos sueltos, `repack --geometric=2` si hay demasiados
+  packs y, a partir de `maintenance_loose_objects` objetos en total,
+  `commit-graph write` si falta o es más viejo que los packs y
+  `multi-pack-index write` si hay varios packs sin índice al día;
+- el hook `post_push` revisa como mucho cada `maintenance_interval` segundos
+  y, si hay algo que hacer, lanza `python -m rent360push maintenance run
+  --auto` en segundo plano: nunca en el camino crítico de una subida, y el
+  proceso espera a que no haya una subida en curso antes de empezar.
+
+Cada corrida registra en `.git/rent360push/maintenance.json` el tamaño y
+los conteos antes y después, y el tiempo de una enumeración de objetos como
+la de un push (`rev-list --objects --all`). `effect()` compara además el
+p50 del paso `push` de las trazas antes y después del último mantenimiento.
+"""
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+
+from . import coordinator, trace
+from .config import state_dir
+
+STATE_FILE = 'maintenance.json'
+LOCK_FILE = 'maintenance.lock'
+MAX_RUNS = 20
+# Espera máxima a que termine una subida en curso antes de mantener
+WAIT_UPLOAD = 600
+# Argumentos de git de cada tarea
+TASKS = {
+    'loose': ['repack', '-d', '-q'],
+    'geometric': ['repack', '-d', '-q', '--geometric=2'],
+    'commit-graph': ['commit-graph', 'write', '--reachable', '--split', '--changed-paths'],
+    'midx': ['multi-pack-index', 'write'],
+}
+
+
+@dataclass
+class PackStats:
+    loose_objects: int = 0
+    loose_bytes: int = 0
+    packed_objects: int = 0
+    packs: int = 0
+    pack_bytes: int = 0
+    garbage: int = 0
+    commit_graph: bool = False
+    commit_graph_stale: bool = False
+    midx: bool = False
+    midx_stale: bool = False
+
+    @property
+    def total_bytes(self):
+        return self.loose_bytes + self.pack_bytes
+
+
+@dataclass
+class Task:
+    name: str
+    reason: str
+    args: list
+
+
+@dataclass
+class TaskResult:
+    name: str
+    ok: bool
+    duration: float
+    error: str = ''
+
+
+@dataclass
+class Run:
+    time: float
+    tasks: list = field(default_factory=list)
+    before: dict = field(default_factory=dict)
+    after: dict = field(default_factory=dict)
+    # Segundos de `rev-list --objects --all` antes y después
+    probe_before: float | None = None
+    probe_after: float | None = None
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def stats(session):
+    """Estadísticas de objetos y packs (barato: count-objects + stat)"""
+    raw = session.run('count-objects', '-v').text
+    values = {}
+    for line in raw.splitlines():
+        key, _, value = line.partition(':')
+        try:
+            values[key.strip()] = int(value.strip())
+        except ValueError:
+            continue
+    objects = session.run('rev-parse', '--git-path', 'objects').text.strip()
+    objects = objects if os.path.isabs(objects) else os.path.join(session.root, objects)
+    pack_dir = os.path.join(objects, 'pack')
+    try:
+        packs = [e.path for e in os.scandir(pack_dir) if e.name.endswith('.pack')]
+    except OSError:
+        packs = []
+    newest_pack = max((_mtime(p) or 0 for p in packs), default=0)
+    graph = _mtime(os.path.join(objects, 'info', 'commit-graph'))
+    if graph is None:
+        graph = _mtime(os.path.join(objects, 'info', 'commit-graphs', 'commit-graph-chain'))
+    midx = _mtime(os.path.join(pack_dir, 'multi-pack-index'))
+    return PackStats(
+        loose_objects=values.get('count', 0),
+        loose_bytes=values.get('size', 0) * 1024,
+        packed_objects=values.get('in-pack', 0),
+        packs=values.get('packs', len(packs)),
+        pack_bytes=values.get('size-pack', 0) * 1024,
+        garbage=values.get('garbage', 0),
+        commit_graph=graph is not None,
+        commit_graph_stale=graph is not None and newest_pack > graph,
+        midx=midx is not None,
+        midx_stale=midx is not None and newest_pack > midx,
+    )
+
+
+def plan(pack_stats, config):
+    """Tareas que compensan con estas estadísticas, en orden de ejecución"""
+    tasks = []
+    packs = pack_stats.packs
+    if pack_stats.loose_objects >= config.maintenance_loose_objects:
+        tasks.append(Task('loose', f'{pack_stats.loose_objects} objetos sueltos', TASKS['loose']))
+        packs += 1
+    if packs > config.maintenance_max_packs:
+        tasks.append(Task('geometric', f'{packs} packs', TASKS['geometric']))
+    repacked = bool(tasks)
+    # En un repo chico los índices no ahorran nada medible
+    if pack_stats.loose_objects + pack_stats.packed_objects < config.maintenance_loose_objects:
+        return tasks
+    if not pack_stats.commit_graph or pack_stats.commit_graph_stale or repacked:
+        reason = 'sin commit-graph' if not pack_stats.commit_graph else 'commit-graph desactualizado'
+        tasks.append(Task('commit-graph', reason, TASKS['commit-graph']))
+    if packs >= 2 and (not pack_stats.midx or pack_stats.midx_stale or repacked):
+        reason = 'sin multi-pack-index' if not pack_stats.midx else 'multi-pack-index desactualizado'
+        tasks.append(Task('midx', reason, TASKS['midx']))
+    return tasks
+
+
+def largest_blobs(session, limit=10):
+    """[(bytes en disco, bytes, sha, ruta)] de los blobs más pesados de la
+    historia. Recorre todos los objetos: solo a pedido"""
+    raw = session.run('cat-file', '--batch-all-objects', '--unordered',
+                      '--batch-check=%(objecttype) %(objectsize:disk) %(objectsize) %(objectname)').text
+    blobs = []
+    for line in raw.splitlines():
+        kind, disk, size, sha = line.split(' ')
+        if kind == 'blob':
+            blobs.append((int(disk), int(size), sha))
+    blobs.sort(reverse=True)
+    top = blobs[:limit]
+    wanted = {sha for _, _, sha in top}
+    paths = {}
+    for line in session.run('rev-list', '--objects', '--all').text.splitlines():
+        sha, _, path = line.partition(' ')
+        if sha in wanted and sha not in paths:
+            paths[sha] = path
+    return [(disk, size, sha, paths.get(sha, '?')) for disk, size, sha in top]
+
+
+def probe(session):
+    """Segundos de una enumeración de objetos como la de un push"""
+    start = time.perf_counter()
+    result = session.run('rev-list', '--objects', '--all', check=False)
+    return round(time.perf_counter() - start, 4) if result.ok else None
+
+
+def execute(session, tasks, on_task=None):
+    """Ejecuta las tareas en orden; devuelve [TaskResult]"""
+    results = []
+    for task in tasks:
+        start = time.perf_counter()
+        with trace.step(f'maintenance:{task.name}'):
+            result = session.run(*task.args, check=False)
+        done = TaskResult(task.name, result.ok, round(time.perf_counter() - start, 3),
+                          '' if result.ok else result.error_text)
+        results.append(done)
+        if on_task:
+            on_task(task, done)
+    return results
+
+
+# Estado y ejecución en segundo plano -----------------------------------------
+
+def _path(root):
+    return os.path.join(state_dir(root), STATE_FILE)
+
+
+def load(root):
+    try:
+        with open(_path(root), encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {'checked_at': 0, 'runs': []}
+
+
+def _save(root, state):
+    path = _path(root)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=1)
+    os.replace(path + '.tmp', path)
+
+
+def maintain(session, config, tasks=None, on_task=None):
+    """Corrida completa con medición antes/después; devuelve el Run (None si
+    ya hay otro mantenimiento en curso)"""
+    root = session.root
+    lock = coordinator.FileLock(os.path.join(state_dir(root), LOCK_FILE))
+    if not lock.acquire(blocking=False):
+        return None
+    try:
+        before = stats(session)
+        tasks = plan(before, config) if tasks is None else tasks
+        run = Run(time.time(), before=asdict(before))
+        if not tasks:
+            run.after = run.before
+            return run
+        with trace.run():
+            run.probe_before = probe(session)
+            run.tasks = [asdict(r) for r in execute(session, tasks, on_task)]
+            run.probe_after = probe(session)
+        run.after = asdict(stats(session))
+        state = load(root)
+        state['runs'] = (state['runs'] + [asdict(run)])[-MAX_RUNS:]
+        state['checked_at'] = run.time
+        _save(root, state)
+        return run
+    finally:
+        lock.release()
+
+
+def wait_for_uploads(root, timeout=WAIT_UPLOAD, poll=1.0):
+    """Espera a que no haya una subida en curso (sin retener el lock: la
+    próxima subida no espera al mantenimiento)"""
+    deadline = time.monotonic() + timeout
+    lock = coordinator.lock(root)
+    while True:
+        if lock.acquire(blocking=False):
+            lock.release()
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(poll)
+
+
+def due(session, config, now=None):
+    """Tareas pendientes si pasó `maintenance_interval` desde la última
+    revisión (y anota la revisión); [] si no toca o no hay nada que hacer"""
+    now = time.time() if now is None else now
+    state = load(session.root)
+    if now - state.get('checked_at', 0) < config.maintenance_interval:
+        return []
+    state['checked_at'] = now
+    _save(session.root, state)
+    return plan(stats(session), config)
+
+
+def post_push(pipeline, result):
+    """Hook post_push: mantenimiento en segundo plano si hace falta"""
+    if not result.ok or not due(pipeline.session, pipeline.config):
+        return
+    from .runner import spawn
+
+    spawn(pipeline.session.root, 'maintenance', 'run', '--auto', '--quiet')
+
+
+def effect(root, run=None):
+    """(p50 de `push` antes, p50 después, pushes después) alrededor del
+    último mantenimiento según las trazas; None si no hay datos"""
+    runs = load(root)['runs']
+    run = run or (runs[-1] if runs else None)
+    if run is None:
+        return None
+    before, after = [], []
+    for record in trace.read(root):
+        if record.get('kind') == 'step' and record.get('step') == 'push' and record.get('ok'):
+            (after if record['start'] >= run['time'] else before).append(record['duration_ms'])
+    if not before or not after:
+        return None
+    return trace.percentile(sorted(before[-20:]), 50), trace.percentile(sorted(after), 50), len(after)
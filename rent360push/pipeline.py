@@ -0,0 +1,314 @@
+"""
+Pipeline de subida: estado -> agregar -> commit -> push.
+
+Reemplaza el wrapper de "un subprocess por paso" copiado en SOLUTION-FINAL.py,
+EXECUTE-GIT-UPLOAD.py, git-upload-final.py, push-simple.py y compañía. Todos
+los pasos comparten una única GitSession.
+"""
+
+import time
+from dataclasses import dataclass, field
+
+from . import remotes, trace
+from .git import GitError
+
+
+@dataclass
+class StepResult:
+    name: str
+    ok: bool
+    duration: float
+    detail: str = ''
+
+
+@dataclass
+class UploadResult:
+    steps: list = field(default_factory=list)
+    commit: str | None = None
+    pushed_to: str | None = None
+    # remotes.PushResult por destino (con su latencia)
+    pushes: list = field(default_factory=list)
+    # Destinos sin conexión cuyo push quedó en cola (spool.py)
+    spooled: list = field(default_factory=list)
+
+    @property
+    def ok(self):
+        return all(step.ok for step in self.steps)
+
+
+@dataclass
+class StatusEntry:
+    """Entrada de `git status --porcelain`: X = índice, Y = árbol de trabajo"""
+
+    index: str
+    worktree: str
+    path: str
+
+    @property
+    def untracked(self):
+        return self.index == '?'
+
+    @property
+    def staged(self):
+        return self.index not in (' ', '?')
+
+    @property
+    def needs_staging(self):
+        return self.untracked or self.worktree != ' '
+
+
+def parse_porcelain(raw):
+    """Parsea la salida de `git status --porcelain=v1 -z --no-renames`"""
+    entries = []
+    for record in raw.split(b'\0'):
+        if not record:
+            continue
+        text = record.decode('utf-8', 'surrogateescape')
+        entries.append(StatusEntry(text[0], text[1], text[3:]))
+    return entries
+
+
+class UploadPipeline:
+    """Ejecuta los pasos de una subida sobre una GitSession abierta.
+
+    `on_step` recibe cada StepResult a medida que termina, para que la CLI
+    (o los scripts antiguos) muestren el progreso. Con un `detector`
+    (changes.ChangeDetector) el paso de estado usa la caché de stat en lugar
+    de `git status`.
+
+    `checks` son chequeos pre-push: callables `check(pipeline) -> (ok, detalle)`
+    que se ejecutan después del commit; si alguno falla no se hace el push.
+    `commit_checks` tienen la misma forma pero se ejecutan entre el stage y el
+    commit (sobre lo que quedó en el índice); si alguno falla no se commitea.
+    `on_check` recibe los resultados parciales que reporten esos chequeos y
+    `on_output(stream, línea)` la salida en vivo del push.
+
+    `plugins` (plugins.Registry) agrega chequeos `pre_commit`/`pre_push`,
+    constructores de mensaje `commit_message` y hooks `post_push`; cada uno
+    se importa recién cuando su paso se ejecuta.
+
+    Con `classify` el push revisa primero si el diff afecta el build
+    (impact.py) y, si no, aplica `config.non_build_push`.
+    """
+
+    def __init__(self, session, config, on_step=None, detector=None, checks=None, on_check=None, on_output=None,
+                 classify=False, commit_checks=None, plugins=None):
+        self.session = session
+        self.config = config
+        self.on_step = on_step
+        self.detector = detector
+        self.checks = list(checks or [])
+        self.commit_checks = list(commit_checks or [])
+        self.on_check = on_check
+        self.on_output = on_output
+        self.classify = classify
+        self.plugins = plugins
+        self.result = UploadResult()
+
+    def _record(self, name, start, ok, detail=''):
+        step = StepResult(name, ok, time.perf_counter() - start, detail)
+        self.result.steps.append(step)
+        trace.step_result(step)
+        if self.on_step:
+            self.on_step(step)
+        return step
+
+    def status(self):
+        start = time.perf_counter()
+        if self.detector is not None:
+            entries = self.detector.detect()
+            mode = self.detector.mode
+        else:
+            raw = self.session.run('status', '--porcelain=v1', '-z', '--no-renames', '--untracked-files=all').stdout
+            entries = parse_porcelain(raw)
+            mode = 'status'
+        self._record('status', start, True, f'{len(entries)} cambios ({mode})')
+        return entries
+
+    def stage(self, entries, paths=None):
+        """Agrega al índice solo las rutas con cambios (equivale a `git add .`
+        o a `git add <paths>` si se indica una lista)"""
+        start = time.perf_counter()
+        wanted = set(paths) if paths else None
+        pending = [
+            e.path for e in entries
+            if e.needs_staging and (wanted is None or e.path in wanted)
+        ]
+        self.session.stage(pending)
+        self.session.flush_index()
+        if self.detector is not None:
+            self.detector.mark_staged(pending)
+        self._record('stage', start, True, f'{len(pending)} rutas')
+        return pending
+
+    def commit(self, message, entries, staged_paths):
+        start = time.perf_counter()
+        if not staged_paths and not any(e.staged for e in entries):
+            self._record('commit', start, True, 'No hay cambios para commitear')
+            return None
+        # Una ruta tocada pero con el mismo contenido no genera diferencias
+        if self.session.run('diff-index', '--cached', '--quiet', 'HEAD', '--', check=False).ok:
+            self._record('commit', start, True, 'No hay cambios para commitear')
+            return None
+        for build in self._hook('commit_message'):
+            message = build(self, message, staged_paths)
+        self.session.run('commit', '-q', '-m', message)
+        oid = self.session.resolve('HEAD')
+        self.result.commit = oid
+        self._record('commit', start, True, oid[:12])
+        return oid
+
+    def _hook(self, hook):
+        return self.plugins.get(hook) if self.plugins is not None else []
+
+    def pre_commit(self):
+        return self._run_checks(self.commit_checks + self._hook('pre_commit'))
+
+    def pre_push(self):
+        return self._run_checks(self.checks + self._hook('pre_push'))
+
+    def post_push(self):
+        for hook in self._hook('post_push'):
+            start = time.perf_counter()
+            with trace.step(hook.name):
+                try:
+                    hook(self, self.result)
+                except Exception as e:
+                    # El push ya se hizo: un hook roto no lo vuelve fallido
+                    self._record(hook.name, start, True, f'⚠️  {type(e).__name__}: {e}')
+
+    def up_to_date(self):
+        """True si todos los destinos ya tienen HEAD (según las ramas de
+        seguimiento locales): no hay nada que validar ni empujar"""
+        head = self.session.resolve('HEAD')
+        resolved = remotes.resolve_targets(self.session, self.config)
+        return head is not None and all(
+            self.session.resolve(f'refs/remotes/{t.remote}/{t.branch}') == head for t in resolved
+        )
+
+    def _run_checks(self, checks):
+        for check in checks:
+            start = time.perf_counter()
+            name = getattr(check, 'step', 'validate')
+            with trace.step(name):
+                ok, detail = check(self)
+            self._record(name, start, ok, detail)
+            if not ok:
+                return False
+        return True
+
+    def push(self):
+        """Empuja HEAD a todos los destinos configurados a la vez"""
+        from .runner import idle_allowance
+
+        start = time.perf_counter()
+        if self.classify and self.config.non_build_push != 'push':
+            from . import impact as impacts
+
+            impact = impacts.pending(self.session, self.config)
+            if impact.no_build and not impact.affects_build:
+                return self._push_without_build(start, impact)
+        configured = remotes.targets(self.config)
+        resolved = remotes.resolve_targets(self.session, self.config)
+        idle = {}
+        for target in resolved:
+            if target.remote not in idle:
+                size = self.session.pending_pack_size(target.remote)
+                idle[target.remote] = idle_allowance(self.config.idle_timeout, self.config.idle_timeout_per_mb, size)
+
+        pushes = remotes.push_all(self.session, resolved, lambda t: idle[t.remote], self.on_output)
+        self.result.pushes = pushes
+        spooled = self._spool(pushes, configured)
+        for push, target in zip(pushes, configured):
+            if not push.ok and push not in spooled and target.branch is None:
+                # La rama por defecto guardada puede estar desactualizada
+                remotes.forget(self.session.root, target.remote)
+
+        ok = all(p.ok or p in spooled for p in pushes)
+        done = [str(p.target) for p in pushes if p.ok]
+        self.result.pushed_to = ', '.join(done) or None
+        detail = ', '.join(
+            f'{p.target} {p.duration * 1000:.0f} ms' if p.ok
+            else f'{p.target} 📴 en cola ({p.error})' if p in spooled
+            else f'{p.target} ❌ {p.error}'
+            for p in pushes
+        )
+        self._record('push', start, ok, detail)
+        return ok
+
+    def _spool(self, pushes, configured):
+        """Pushes fallidos por falta de red: el commit queda en la cola de
+        spool.py para reintentarlo. Los exitosos sacan su destino de la cola.
+        Si la rama por defecto no se pudo consultar nunca (se supuso), se
+        encola el destino sin rama y se averigua al reintentar"""
+        from . import spool
+
+        root = self.session.root
+        done = [p.target for p in pushes if p.ok]
+        done += [t for p, t in zip(pushes, configured) if p.ok and t.branch is None]
+        spool.discard(root, done)
+        if not self.config.offline_spool:
+            return []
+        offline = [p for p in pushes if spool.is_offline(p)]
+        if offline:
+            queued = []
+            for push, target in zip(pushes, configured):
+                if push in offline:
+                    guessed = target.branch is None and remotes.cached_default_branch(root, target.remote) is None
+                    queued.append(target if guessed else push.target)
+            spool.add(root, self.config, self.session.resolve('HEAD'), queued,
+                      '; '.join(p.error for p in offline))
+            self.result.spooled = queued
+        return offline
+
+    def _push_without_build(self, start, impact):
+        """Diff sin archivos de build: no se toca la rama de deploy"""
+        mode = self.config.non_build_push
+        if mode == 'side-branch':
+            side = []
+            for target in remotes.targets(self.config):
+                if target.remote not in (t.remote for t in side):
+                    side.append(remotes.Target(target.remote, self.config.non_build_branch))
+            pushes = remotes.push_all(self.session, side, on_output=self.on_output)
+            self.result.pushes = pushes
+            ok = all(p.ok for p in pushes)
+            self.result.pushed_to = ', '.join(str(p.target) for p in pushes if p.ok) or None
+            detail = ', '.join(
+                f'{p.target} {p.duration * 1000:.0f} ms' if p.ok else f'{p.target} ❌ {p.error}' for p in pushes
+            )
+        else:
+            ok = True
+            detail = 'en espera del próximo push con build'
+        if ok and self.result.commit is not None:
+            # Solo un commit nuevo evita un build; repetir sin commit no suma
+            from . import impact as impacts
+
+            impacts.record_skip(self.session.root, self.config, impact, self.result.commit, mode)
+        self._record('push', start, ok, f'sin build ({len(impact.no_build)} archivos): {detail}')
+        return ok
+
+    def run(self, message, paths=None, push=True):
+        started = time.perf_counter()
+        with trace.run():
+            try:
+                with trace.step('status'):
+                    entries = self.status()
+                with trace.step('stage'):
+                    staged = self.stage(entries, paths)
+                # Sin nada en el índice no hay commit: los chequeos sobran
+                if not (staged or any(e.staged for e in entries)) or self.pre_commit():
+                    with trace.step('commit'):
+                        self.commit(message, entries, staged)
+                    if push and self.result.commit is None and self.up_to_date():
+                        self._record('push', time.perf_counter(), True, 'sin commits nuevos')
+                    elif push and self.pre_push():
+                        with trace.step('push'):
+                            self.push()
+                        self.post_push()
+            except GitError as e:
+                self._record(e.command[0] if e.command else 'git', time.perf_counter(), False, str(e))
+            finally:
+                if self.detector is not None:
+                    self.detector.save()
+            trace.run_result(self.result, time.perf_counter() - started)
+        return self.result
@@ -0,0 +1,133 @@
+"""
+API de plugins en proceso para los pasos de la subida.
+
+Los scripts encadenaban intérpretes (`execute-push.py` lanzaba
+`push-final.py` con `subprocess.run([sys.executable, ...])`) para sumar un
+paso. Ahora los pasos extra se registran como plugins y corren dentro del
+mismo proceso:
+
+- `pre_commit`: `check(pipeline) -> (ok, detalle)` entre el stage y el
+  commit (guard.py, hooks.py);
+- `pre_push`: misma forma, después del commit (docker.py, validate.py);
+- `commit_message`: `build(pipeline, mensaje, rutas) -> mensaje`;
+- `post_push`: `hook(pipeline, resultado)` después del push (buildlog.py,
+  maintenance.py).
+
+Un plugin se declara como punto de entrada `"módulo:atributo"`: los
+incluidos, los de `plugins` en `.rent360push.json` y los que publiquen los
+paquetes instalados en el grupo `rent360push.<hook>`. Nada se importa hasta
+que el hook se ejecuta, y los paquetes instalados solo se recorren la
+primera vez que se pide un hook: una invocación sin cambios no carga
+ningún plugin.
+"""
+
+import importlib
+
+HOOKS = ('pre_commit', 'pre_push', 'commit_message', 'post_push')
+CHECK_HOOKS = ('pre_commit', 'pre_push')
+ENTRY_POINT_GROUP = 'rent360push.{hook}'
+
+# (hook, nombre, punto de entrada, opción de Config que lo activa)
+BUILTIN = (
+    ('pre_commit', 'guard', 'rent360push.guard:pre_commit_check', 'guard'),
+    ('pre_commit', 'hooks', 'rent360push.hooks:pre_commit_check', 'hooks'),
+    ('pre_push', 'docker', 'rent360push.docker:pre_push_check', 'docker_check'),
+    ('pre_push', 'i18n', 'rent360push.i18n:pre_push_check', 'i18n_check'),
+    ('pre_push', 'validate', 'rent360push.validate:pre_push_check', 'validate'),
+    ('pre_push', 'build', 'rent360push.buildcache:pre_push_check', 'build_check'),
+    ('post_push', 'buildlog', 'rent360push.buildlog:post_push', None),
+    ('post_push', 'maintenance', 'rent360push.maintenance:post_push', 'maintenance'),
+)
+
+
+class Plugin:
+    """Referencia perezosa a un callable `módulo:atributo`"""
+
+    def __init__(self, hook, name, target):
+        self.hook = hook
+        self.name = name
+        self.target = target
+        self._loaded = target if callable(target) else None
+
+    @property
+    def step(self):
+        # Nombre del paso en el pipeline, sin importar el módulo
+        return self.name
+
+    def load(self):
+        if self._loaded is None:
+            module, _, attr = self.target.partition(':')
+            obj = importlib.import_module(module)
+            for part in attr.split('.') if attr else ():
+                obj = getattr(obj, part)
+            self._loaded = obj
+        return self._loaded
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def __repr__(self):
+        target = self.target if isinstance(self.target, str) else getattr(self.target, '__name__', '?')
+        return f'Plugin({self.hook}, {self.name}, {target})'
+
+
+def _parse(spec):
+    """"nombre=módulo:atributo" o "módulo:atributo" (nombre = atributo)"""
+    name, sep, target = spec.partition('=')
+    if not sep:
+        name, target = spec.rsplit(':', 1)[-1].rsplit('.', 1)[-1], spec
+    if ':' not in target:
+        raise ValueError(f'punto de entrada inválido (se espera "módulo:atributo"): {spec}')
+    return name.strip(), target.strip()
+
+
+class Registry:
+    """Plugins por hook. Con `checks=False` (`--no-verify`) los hooks
+    `pre_commit`/`pre_push` quedan vacíos"""
+
+    def __init__(self, config=None, entry_points=True, checks=True):
+        self._hooks = {hook: [] for hook in HOOKS}
+        self._discover = entry_points
+        self._checks = checks
+        disabled = set(getattr(config, 'plugins_disable', ()) or ())
+        for hook, name, target, option in BUILTIN:
+            if name in disabled or (option and config is not None and not getattr(config, option)):
+                continue
+            self.register(hook, target, name)
+        for hook, specs in (getattr(config, 'plugins', None) or {}).items():
+            for spec in specs:
+                name, target = _parse(spec)
+                if name not in disabled:
+                    self.register(hook, target, name)
+        self._disabled = disabled
+
+    def register(self, hook, target, name=None):
+        if hook not in self._hooks:
+            raise ValueError(f"hook desconocido: {hook} (válidos: {', '.join(HOOKS)})")
+        if name is None:
+            name = target.rsplit(':', 1)[-1] if isinstance(target, str) else target.__name__
+        plugin = Plugin(hook, name, target)
+        self._hooks[hook].append(plugin)
+        return plugin
+
+    def _entry_points(self):
+        """Plugins de paquetes instalados (importlib.metadata es lento: se
+        consulta una sola vez y solo cuando se necesita un hook)"""
+        self._discover = False
+        from importlib.metadata import entry_points
+
+        for hook in HOOKS:
+            for entry in entry_points(group=ENTRY_POINT_GROUP.format(hook=hook)):
+                if entry.name not in self._disabled:
+                    self.register(hook, entry.value, entry.name)
+
+    def get(self, hook):
+        if not self._checks and hook in CHECK_HOOKS:
+            return []
+        if self._discover:
+            self._entry_points()
+        return list(self._hooks[hook])
+
+    def declared(self):
+        """{hook: [Plugin]} sin importar nada (incluye paquetes instalados)"""
+        return {hook: self.get(hook) for hook in HOOKS}
@@ -0,0 +1,194 @@
+"""
+Destinos de push y rama por defecto de cada remoto.
+
+Los scripts hacían `git push origin master` y, si fallaba, `git push origin
+main`: dos viajes de ida y vuelta en cada subida cuando master no era la rama
+correcta (app.yaml despliega desde `main`). Aquí la rama por defecto del
+remoto se averigua una vez con `git ls-remote --symref` y se guarda en
+`.git/rent360push/remotes.json` durante `default_branch_ttl` segundos.
+
+Los destinos (`targets` en la configuración) se empujan a la vez, p.ej.
+GitHub más un espejo de respaldo, y se informa la latencia de cada uno.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass
+
+from .config import state_dir
+
+CACHE_FILE = 'remotes.json'
+
+
+@dataclass
+class Target:
+    """Un destino de push: `remote` o `remote:rama` en la configuración.
+    Sin rama se usa la rama por defecto del remoto."""
+
+    remote: str
+    branch: str | None = None
+
+    @classmethod
+    def parse(cls, spec):
+        remote, _, branch = spec.partition(':')
+        return cls(remote, branch or None)
+
+    def __str__(self):
+        return f'{self.remote}/{self.branch}' if self.branch else self.remote
+
+
+@dataclass
+class PushResult:
+    target: Target
+    ok: bool
+    duration: float
+    timed_out: bool = False
+    error: str = ''
+
+
+def _push_error(stderr):
+    """Línea más útil del stderr de un push fallido"""
+    lines = [l.strip() for l in stderr.decode('utf-8', 'replace').splitlines() if l.strip()]
+    for line in lines:
+        if line.startswith(('! ', 'fatal:', 'remote: error')):
+            return line
+    return lines[-1] if lines else ''
+
+
+def targets(config):
+    """Destinos configurados; por defecto solo `config.remote`"""
+    return [Target.parse(spec) for spec in (config.targets or [config.remote])]
+
+
+def _cache_path(root):
+    return os.path.join(state_dir(root), CACHE_FILE)
+
+
+def _load_cache(root):
+    try:
+        with open(_cache_path(root), encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _save_cache(root, cache):
+    path = _cache_path(root)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def _remote_url(session, remote):
+    result = session.run('remote', 'get-url', remote, check=False)
+    return result.text.strip() if result.ok else remote
+
+
+def parse_symref(output, candidates=()):
+    """Rama a la que apunta HEAD en la salida de `ls-remote --symref`; si el
+    remoto no anuncia HEAD, la primera de `candidates` que exista"""
+    heads = set()
+    for line in output.splitlines():
+        if line.startswith('ref: refs/heads/') and line.endswith('\tHEAD'):
+            return line[len('ref: refs/heads/'):-len('\tHEAD')]
+        _, _, ref = line.partition('\t')
+        if ref.startswith('refs/heads/'):
+            heads.add(ref[len('refs/heads/'):])
+    return next((b for b in candidates if b in heads), None)
+
+
+def cached_default_branch(root, remote):
+    """Rama por defecto guardada (sin red ni TTL); None si no se conoce"""
+    entry = _load_cache(root).get(remote)
+    return entry['branch'] if entry else None
+
+
+def default_branch(session, config, remote, refresh=False, guess=True):
+    """Rama por defecto de `remote`, desde la caché si no venció el TTL.
+
+    Devuelve (rama, desde_cache). Si el remoto está vacío se usa la primera
+    de `config.branches`; si no responde y nunca se consultó, también, salvo
+    con `guess=False` (entonces la rama es None).
+    """
+    cache = _load_cache(session.root)
+    url = _remote_url(session, remote)
+    entry = cache.get(remote)
+    fresh = entry and entry.get('url') == url and time.time() - entry['checked'] < config.default_branch_ttl
+    if fresh and not refresh:
+        return entry['branch'], True
+
+    patterns = ['HEAD', *(f'refs/heads/{b}' for b in config.branches)]
+    result = session.run('ls-remote', '--symref', remote, *patterns, check=False)
+    branch = parse_symref(result.text, config.branches) if result.ok else None
+    if branch is None:
+        # Sin red o remoto vacío: no se guarda, se reintenta la próxima vez
+        if entry:
+            return entry['branch'], False
+        return (config.branches[0] if result.ok or guess else None), False
+    cache[remote] = {'url': url, 'branch': branch, 'checked': time.time()}
+    _save_cache(session.root, cache)
+    return branch, False
+
+
+def forget(root, remote):
+    """Descarta la rama guardada (p.ej. porque el push a ella falló)"""
+    cache = _load_cache(root)
+    if cache.pop(remote, None) is not None:
+        _save_cache(root, cache)
+
+
+def tracking_ref(session, config):
+    """Ref remota de seguimiento de la rama de deploy de `config.remote`
+    (la rama por defecto guardada, o la primera de `config.branches` que
+    exista); None si no hay ninguna"""
+    default = cached_default_branch(session.root, config.remote)
+    for branch in ([default] if default else []) + list(config.branches):
+        ref = f'refs/remotes/{config.remote}/{branch}'
+        if session.resolve(ref):
+            return ref
+    return None
+
+
+def resolve_targets(session, config):
+    """Destinos con la rama resuelta"""
+    resolved = []
+    for target in targets(config):
+        branch = target.branch or default_branch(session, config, target.remote)[0]
+        resolved.append(Target(target.remote, branch))
+    return resolved
+
+
+def push_all(session, resolved, idle_for=None, on_output=None, rev='HEAD'):
+    """Empuja `rev` a todos los destinos a la vez; devuelve [PushResult] en
+    el mismo orden. `idle_for(target)` da el timeout por inactividad de cada
+    uno y `on_output(stream, línea)` recibe la salida con el destino delante."""
+    # runner.py arrastra asyncio: solo se importa si de verdad hay push
+    from . import runner
+
+    session.flush_index()
+    jobs = []
+    for i, target in enumerate(resolved):
+        kwargs = {
+            'cwd': session.root,
+            'env': session.env,
+            'idle_timeout': idle_for(target) if idle_for else None,
+        }
+        if on_output is not None:
+            prefix = f'[{target}] ' if len(resolved) > 1 else ''
+            kwargs['on_output'] = lambda stream, line, prefix=prefix: on_output(stream, prefix + line)
+        command = ['git', 'push', '--progress', target.remote, f'{rev}:refs/heads/{target.branch}']
+        jobs.append((i, command, kwargs))
+    results = runner.run_many(jobs, limit=len(jobs))
+    session.spawned += len(jobs)
+
+    pushed = []
+    for i, target in enumerate(resolved):
+        result = results[i]
+        error = ''
+        if result.timed_out:
+            error = f"sin salida durante {jobs[i][2]['idle_timeout']:.0f} s"
+        elif not result.ok:
+            error = _push_error(result.stderr)
+        pushed.append(PushResult(target, result.ok, result.duration, result.timed_out, error))
+    return pushed
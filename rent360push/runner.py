@@ -0,0 +1,171 @@
+"""
+Ejecución de procesos con salida en streaming y timeouts por inactividad.
+
+Los scripts antiguos usaban `capture_output=True` con `timeout=30`/`60`: un
+push grande por una conexión lenta se cortaba a mitad de camino y el usuario
+no veía nada hasta el final. Aquí la salida se entrega línea a línea (también
+las líneas de progreso de git, que terminan en `\\r`) y el proceso solo se
+mata si pasa `idle_timeout` segundos sin escribir nada.
+"""
+
+import asyncio
+import os
+import re
+import time
+from dataclasses import dataclass
+
+from . import trace
+
+_LINE_END = re.compile(rb'[\r\n]')
+CHUNK = 4096
+
+
+@dataclass
+class RunResult:
+    command: list
+    returncode: int
+    stdout: bytes
+    stderr: bytes
+    duration: float
+    timed_out: bool = False
+
+    @property
+    def ok(self):
+        return self.returncode == 0 and not self.timed_out
+
+
+def idle_allowance(base, per_mb, size_bytes):
+    """Segundos de inactividad permitidos: base + margen por MB a transferir.
+
+    Del lado del servidor hay fases silenciosas (resolver deltas, hooks) que
+    crecen con el tamaño del pack.
+    """
+    if base is None:
+        return None
+    return base + per_mb * (size_bytes or 0) / (1024 * 1024)
+
+
+async def _pump(reader, name, sink, on_output, touch):
+    pending = b''
+    while True:
+        chunk = await reader.read(CHUNK)
+        if not chunk:
+            break
+        touch()
+        sink.append(chunk)
+        if on_output is None:
+            continue
+        pending += chunk
+        parts = _LINE_END.split(pending)
+        pending = parts.pop()
+        for part in parts:
+            if part:
+                on_output(name, part.decode('utf-8', 'replace'))
+    if on_output is not None and pending:
+        on_output(name, pending.decode('utf-8', 'replace'))
+
+
+async def run_async(command, cwd=None, env=None, input=None, idle_timeout=None, on_output=None):
+    """Ejecuta `command` (lista, sin shell) entregando cada línea a
+    `on_output(stream, línea)`; lo mata tras `idle_timeout` s sin salida"""
+    started = time.time()
+    start = time.perf_counter()
+    proc = await asyncio.create_subprocess_exec(
+        *command,
+        cwd=cwd,
+        env=env,
+        stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    last = [time.monotonic()]
+
+    def touch():
+        last[0] = time.monotonic()
+
+    stdout, stderr = [], []
+    pumps = asyncio.gather(
+        _pump(proc.stdout, 'stdout', stdout, on_output, touch),
+        _pump(proc.stderr, 'stderr', stderr, on_output, touch),
+    )
+    if input is not None:
+        proc.stdin.write(input)
+        await proc.stdin.drain()
+        proc.stdin.close()
+
+    timed_out = False
+    waiter = asyncio.ensure_future(proc.wait())
+    while not waiter.done():
+        if idle_timeout is None:
+            await waiter
+            break
+        remaining = idle_timeout - (time.monotonic() - last[0])
+        if remaining <= 0:
+            timed_out = True
+            proc.kill()
+            break
+        await asyncio.wait([waiter], timeout=remaining)
+    await waiter
+    if timed_out:
+        # Un nieto (p.ej. ssh) puede seguir con los pipes abiertos
+        try:
+            await asyncio.wait_for(pumps, 2)
+        except asyncio.TimeoutError:
+            pass
+    else:
+        await pumps
+    result = RunResult(
+        list(command), proc.returncode, b''.join(stdout), b''.join(stderr), time.perf_counter() - start, timed_out
+    )
+    trace.command(command, started, result.duration, proc.returncode, len(result.stdout), len(result.stderr), timed_out)
+    return result
+
+
+def run(command, **kwargs):
+    """Versión síncrona de run_async"""
+    return asyncio.run(run_async(command, **kwargs))
+
+
+def run_many(jobs, limit=None, on_result=None):
+    """Ejecuta varios comandos independientes a la vez.
+
+    `jobs` es una lista de (clave, command, kwargs); devuelve {clave: RunResult}
+    y llama a `on_result(clave, resultado)` a medida que terminan.
+    """
+    limit = limit or os.cpu_count() or 1
+
+    async def main():
+        semaphore = asyncio.Semaphore(limit)
+        results = {}
+
+        async def one(key, command, kwargs):
+            async with semaphore:
+                result = await run_async(command, **kwargs)
+            results[key] = result
+            if on_result:
+                on_result(key, result)
+
+        await asyncio.gather(*(one(key, command, kwargs) for key, command, kwargs in jobs))
+        return results
+
+    return asyncio.run(main())
+
+
+def spawn(root, *args):
+    """Lanza `python -m rent360push <args>` desacoplado de este proceso (sin
+    salida, sobrevive al final de la subida)"""
+    import subprocess
+    import sys
+
+    env = dict(os.environ)
+    package_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [package_parent, env.get('PYTHONPATH')]))
+    kwargs = {}
+    if os.name == 'nt':
+        kwargs['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs['start_new_session'] = True
+    return subprocess.Popen(
+        [sys.executable, '-m', 'rent360push', *args], cwd=root, env=env,
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **kwargs,
+    )
@@ -0,0 +1,117 @@
+"""
+Escaneo incremental de patrones en el código fuente (`console_usage.csv`).
+
+`console_usage.csv` (Path, LineNumber, Line de cada llamada `console.*`)
+salió de un barrido único con PowerShell en Windows y ya estaba
+desactualizado. Aquí se recorre `scan_dirs` buscando `scan_patterns`
+(expresiones regulares; por defecto `console.*` y `logger.error/warn` con el
+error suelto como segundo argumento en lugar de un objeto de contexto).
+
+Cada archivo se mapea en memoria y se busca con un único regex de bytes
+que combina todos los patrones, repartido en un pool de procesos. Los
+resultados se guardan por hash de contenido (FileCache `scan`), así que una
+segunda pasada solo vuelve a leer los archivos modificados.
+"""
+
+import csv
+import functools
+import io
+import os
+import re
+import time
+from dataclasses import dataclass
+
+from . import imports
+from .filecache import FileCache, digest
+
+CACHE_NAME = 'scan'
+CACHE_VERSION = 1
+HEADER = ('Path', 'LineNumber', 'Line')
+
+
+@dataclass
+class ScanResult:
+    rows: list
+    files: int
+    rescanned: int
+    ms: float
+
+
+@functools.lru_cache(maxsize=8)
+def _compiled(patterns):
+    """Un solo regex para todos los patrones; si alguno tiene grupos
+    (posibles referencias \\1) se compilan por separado para no romperlas"""
+    compiled = [re.compile(p.encode('utf-8')) for p in patterns]
+    if len(compiled) > 1 and not any(c.groups for c in compiled):
+        return [re.compile(b'|'.join(b'(?:' + p.encode('utf-8') + b')' for p in patterns))]
+    return compiled
+
+
+def _scan(patterns, rel, data):
+    """[[línea, texto]] de las líneas de `data` que coinciden con algún patrón"""
+    regexes = _compiled(patterns)
+    if len(regexes) == 1:
+        return _scan_one(regexes[0], data)
+    lines = {}
+    for regex in regexes:
+        lines.update(_scan_one(regex, data))
+    return sorted([line, text] for line, text in lines.items())
+
+
+def _scan_one(regex, data):
+    rows = []
+    line = 1
+    pos = 0
+    last = 0
+    for match in regex.finditer(data):
+        start = match.start()
+        line += data[pos:start].count(b'\n')
+        pos = start
+        if line == last:
+            continue
+        last = line
+        begin = data.rfind(b'\n', 0, start) + 1
+        end = data.find(b'\n', start)
+        text = data[begin:end if end >= 0 else len(data)]
+        rows.append([line, text.decode('utf-8', 'replace').rstrip('\r')])
+    return rows
+
+
+def scan(root, config, jobs=None):
+    """Escanea `config.scan_dirs` y devuelve las coincidencias ordenadas"""
+    start = time.perf_counter()
+    patterns = tuple(config.scan_patterns)
+    version = f'{CACHE_VERSION}:{digest(repr(patterns).encode("utf-8"))}'
+    cache = FileCache(root, CACHE_NAME, functools.partial(_scan, patterns), version=version, use_mmap=True)
+    files = imports.source_files(root, config.scan_dirs)
+    found = cache.update(files, jobs)
+    if cache.dirty:
+        cache.save()
+    rows = [(rel, line, text) for rel in sorted(found) for line, text in found[rel]]
+    return ScanResult(rows, len(files), len(cache.recomputed), round((time.perf_counter() - start) * 1000, 1))
+
+
+def render_csv(rows):
+    """Mismo formato que el Export-Csv original: todo entre comillas"""
+    out = io.StringIO()
+    writer = csv.writer(out, quoting=csv.QUOTE_ALL, lineterminator='\n')
+    writer.writerow(HEADER)
+    writer.writerows(rows)
+    return out.getvalue()
+
+
+def write_csv(path, rows):
+    """Escribe el CSV solo si cambió (no toca el mtime en vano); devuelve True
+    si lo escribió"""
+    content = render_csv(rows)
+    try:
+        with open(path, encoding='utf-8', newline='') as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8', newline='') as f:
+        f.write(content)
+    os.replace(tmp, path)
+    return True
@@ -0,0 +1,205 @@
+"""
+Cola de pushes pendientes para trabajar sin conexión.
+
+Sin red, `git push` fallaba en cada script y había que volver a lanzarlo a
+mano más tarde. Ahora, si el push de una subida falla por la red (host sin
+resolver, conexión rechazada, remoto inaccesible, sin salida hasta el
+timeout), el commit local queda registrado en `.git/rent360push/spool.json`
+y un proceso en segundo plano (`python -m rent360push spool drain`) reintenta
+con backoff exponencial con jitter. Cuando vuelve la conexión se empuja el
+commit más nuevo de cada destino: todo lo acumulado sale en un solo push.
+
+La cola solo se modifica con el lock de subida tomado (coordinator.py), así
+que no se mezcla con una subida en curso; un segundo lock (`spool.lock`)
+garantiza un único proceso de reintentos por repositorio. Un fallo que no es
+de red (p.ej. un push rechazado, o un remoto mal configurado) detiene los
+reintentos y queda anotado en la cola hasta que una subida normal lo
+resuelva.
+
+Si la rama por defecto del remoto nunca se pudo consultar, la entrada no
+guarda la rama supuesta sino el destino simbólico (`branch: null`): la rama
+se averigua al reintentar, con la red de vuelta.
+"""
+
+import json
+import os
+import random
+import time
+
+from . import coordinator, remotes, trace
+from .config import load_config, state_dir
+from .git import GitSession
+
+SPOOL_FILE = 'spool.json'
+LOCK_FILE = 'spool.lock'
+# Fragmentos (en minúsculas) del error de git que indican falta de red
+OFFLINE_ERRORS = (
+    'could not resolve host', 'temporary failure in name resolution', 'failed to connect',
+    'connection refused', 'connection timed out', 'connection reset', 'operation timed out',
+    'network is unreachable', 'no route to host', 'could not read from remote repository',
+    'unable to access',
+)
+
+
+def is_offline(push):
+    """True si un remotes.PushResult fallido se debe a la red"""
+    if push.ok:
+        return False
+    error = push.error.lower()
+    return push.timed_out or any(fragment in error for fragment in OFFLINE_ERRORS)
+
+
+def backoff(attempt, base, cap, rng=random):
+    """Espera antes del reintento `attempt` (1, 2, ...): exponencial con
+    tope y "full jitter", para que varios equipos no reintenten a la vez"""
+    return rng.uniform(base, max(base, min(cap, base * 2 ** (attempt - 1))))
+
+
+def _path(root):
+    return os.path.join(state_dir(root), SPOOL_FILE)
+
+
+def load(root):
+    try:
+        with open(_path(root), encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {'entries': [], 'attempts': 0, 'next_at': 0, 'error': None}
+
+
+def _save(root, spool):
+    path = _path(root)
+    if not spool['entries']:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        return
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(spool, f, ensure_ascii=False, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def pending(root):
+    """Entradas en cola (sin crear nada si no hay cola)"""
+    if not os.path.exists(_path(root)):
+        return []
+    return load(root)['entries']
+
+
+def add(root, config, commit, targets, error):
+    """Registra `commit` como pendiente para `targets` (remotes.Target; sin
+    rama, la rama por defecto del remoto); devuelve el número de commits
+    distintos en cola"""
+    spool = load(root)
+    now = time.time()
+    if not spool['entries']:
+        # El push acaba de fallar: el primer reintento espera el backoff
+        spool.update(attempts=1, next_at=now + backoff(1, config.spool_backoff, config.spool_backoff_max))
+    for target in targets:
+        spool['entries'].append({
+            'commit': commit, 'remote': target.remote, 'branch': target.branch, 'time': now, 'error': error,
+        })
+    spool['error'] = None
+    _save(root, spool)
+    return len({e['commit'] for e in spool['entries']})
+
+
+def discard(root, targets):
+    """Saca de la cola los destinos que se acaban de empujar con éxito (el
+    push de HEAD ya incluye los commits anteriores)"""
+    if not pending(root):
+        return
+    done = {(t.remote, t.branch) for t in targets}
+    spool = load(root)
+    spool['entries'] = [e for e in spool['entries'] if (e['remote'], e['branch']) not in done]
+    if not spool['entries']:
+        spool.update(attempts=0, next_at=0, error=None)
+    _save(root, spool)
+
+
+def clear(root):
+    """Descarta la cola (los commits siguen en el repo local)"""
+    with coordinator.exclusive(root):
+        _save(root, {'entries': []})
+
+
+def latest(entries):
+    """Commit más nuevo en cola por destino: {(remote, branch): commit}"""
+    newest = {}
+    for entry in sorted(entries, key=lambda e: e['time']):
+        newest[(entry['remote'], entry['branch'])] = entry['commit']
+    return newest
+
+
+def attempt(root, config=None, on_output=None):
+    """Un intento de vaciar la cola: un push por destino con su commit más
+    nuevo. Devuelve (ok, offline, [PushResult])"""
+    with coordinator.exclusive(root), GitSession(root) as session:
+        config = config or load_config(session.root)
+        trace.configure(session.root, config)
+        spool = load(root)
+        groups, queued, unknown = {}, {}, []
+        with trace.run(), trace.step('spool'), trace.retrying(spool['attempts']):
+            for (remote, branch), commit in latest(spool['entries']).items():
+                target = remotes.Target(remote, branch)
+                if branch is None:
+                    target.branch = remotes.default_branch(session, config, remote, guess=False)[0]
+                    if target.branch is None:
+                        # El remoto sigue sin responder: no se adivina la rama
+                        unknown.append(remotes.PushResult(remotes.Target(remote), False, 0.0,
+                                                          error='rama por defecto desconocida'))
+                        continue
+                groups.setdefault(commit, []).append(target)
+                queued.setdefault((remote, target.branch), []).append(remotes.Target(remote, branch))
+            pushes = []
+            for commit, targets in groups.items():
+                pushes += remotes.push_all(session, targets, on_output=on_output, rev=commit)
+        discard(root, [t for p in pushes if p.ok for t in queued[(p.target.remote, p.target.branch)]])
+        pushes += unknown
+        failed = [p for p in pushes if not p.ok]
+        offline = bool(failed) and all(is_offline(p) or p in unknown for p in failed)
+        if failed:
+            spool = load(root)
+            spool['attempts'] += 1
+            spool['error'] = '; '.join(f'{p.target}: {p.error}' for p in failed)
+            spool['next_at'] = time.time() + backoff(spool['attempts'], config.spool_backoff, config.spool_backoff_max)
+            _save(root, spool)
+    return not failed, offline, pushes
+
+
+def drain(root, config=None, once=False, sleep=time.sleep, on_attempt=None, on_output=None):
+    """Reintenta hasta vaciar la cola, esperando el backoff entre intentos
+    (con `once`, un solo intento inmediato). Devuelve True si quedó vacía,
+    False si se detuvo (fallo que no es de red, o `once` y la red sigue
+    caída) y None si ya hay otro proceso de reintentos"""
+    lock = coordinator.FileLock(os.path.join(state_dir(root), LOCK_FILE))
+    if not lock.acquire(blocking=False):
+        return None
+    try:
+        while True:
+            spool = load(root)
+            if not spool['entries']:
+                return True
+            wait = spool['next_at'] - time.time()
+            if wait > 0 and not once:
+                sleep(wait)
+            ok, offline, pushes = attempt(root, config, on_output)
+            if on_attempt:
+                on_attempt(ok, pushes)
+            if not ok and (once or not offline):
+                return False
+    finally:
+        lock.release()
+
+
+def start_drainer(root):
+    """Lanza `spool drain` en segundo plano (si no hay uno corriendo)"""
+    lock = coordinator.FileLock(os.path.join(state_dir(root), LOCK_FILE))
+    if not lock.acquire(blocking=False):
+        return False
+    lock.release()
+    from .runner import spawn
+
+    spawn(root, 'spool', 'drain', '--quiet')
+    return True
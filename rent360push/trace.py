@@ -0,0 +1,254 @@
+"""
+Trazas JSON-lines de cada paso y cada comando de la subida.
+
+Los scripts solo imprimían "✅ ÉXITO"/"❌ ERROR", así que cuando un push se
+colgaba no había forma de saber en qué paso ni cuánto tardaba cada uno.
+Con un tracer activo (`configure`), cada comando lanzado por GitSession o
+por runner.py y cada paso del pipeline agrega una línea JSON a
+`.git/rent360push/trace/trace.jsonl`:
+
+    {"kind": "command", "run": "…", "step": "push", "command": [...],
+     "start": …, "end": …, "duration_ms": …, "exit_code": 0,
+     "stdout_bytes": …, "stderr_bytes": …, "retries": 0}
+
+El archivo rota al pasar `trace_max_bytes` (trace.jsonl.1, .2, …).
+`python -m rent360push summary` agrega p50/p95 por paso entre corridas.
+
+Sin tracer configurado todas las funciones son no-ops.
+"""
+
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+
+TRACE_DIR = 'trace'
+TRACE_FILE = 'trace.jsonl'
+
+_tracer = None
+_run = contextvars.ContextVar('rent360push_run', default=None)
+_step = contextvars.ContextVar('rent360push_step', default=None)
+_retries = contextvars.ContextVar('rent360push_retries', default=0)
+
+
+class Tracer:
+    """Escritor JSON-lines con rotación por tamaño"""
+
+    def __init__(self, path, max_bytes=5_000_000, backups=3):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.lock = threading.Lock()
+
+    def emit(self, record):
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+        data = line.encode('utf-8')
+        with self.lock:
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                size = 0
+            if size and size + len(data) > self.max_bytes:
+                self._rotate()
+            with open(self.path, 'ab') as f:
+                f.write(data)
+
+    def _rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            older = f'{self.path}.{i}'
+            if os.path.exists(older):
+                os.replace(older, f'{self.path}.{i + 1}')
+        if self.backups:
+            os.replace(self.path, f'{self.path}.1')
+        else:
+            os.remove(self.path)
+
+    def files(self):
+        """Archivos del log, del más viejo al más nuevo"""
+        rotated = [f'{self.path}.{i}' for i in range(self.backups, 0, -1)]
+        return [p for p in rotated + [self.path] if os.path.exists(p)]
+
+
+def trace_path(root):
+    from .config import state_dir
+
+    return os.path.join(state_dir(root, TRACE_DIR), TRACE_FILE)
+
+
+def configure(root, config):
+    """Activa el tracer global según la configuración (idempotente)"""
+    global _tracer
+    if not config.trace:
+        _tracer = None
+        return None
+    path = trace_path(root)
+    if _tracer is None or _tracer.path != path:
+        _tracer = Tracer(path, config.trace_max_bytes, config.trace_backups)
+    return _tracer
+
+
+def disable():
+    global _tracer
+    _tracer = None
+
+
+def active():
+    return _tracer is not None
+
+
+@contextlib.contextmanager
+def run():
+    """Agrupa las trazas siguientes bajo un mismo id de corrida"""
+    token = _run.set(os.urandom(6).hex())
+    try:
+        yield _run.get()
+    finally:
+        _run.reset(token)
+
+
+@contextlib.contextmanager
+def step(name):
+    """Los comandos lanzados dentro quedan asociados al paso `name`"""
+    token = _step.set(name)
+    try:
+        yield
+    finally:
+        _step.reset(token)
+
+
+@contextlib.contextmanager
+def retrying(attempt):
+    """Marca los comandos lanzados dentro como el reintento número `attempt`"""
+    token = _retries.set(attempt)
+    try:
+        yield
+    finally:
+        _retries.reset(token)
+
+
+def command(argv, start, duration, exit_code, stdout_bytes, stderr_bytes, timed_out=False):
+    """Traza de un comando terminado. `start` es time.time() al lanzarlo"""
+    if _tracer is None:
+        return
+    record = {
+        'kind': 'command',
+        'run': _run.get(),
+        'step': _step.get(),
+        'command': [str(a) for a in argv],
+        'start': round(start, 6),
+        'end': round(start + duration, 6),
+        'duration_ms': round(duration * 1000, 3),
+        'exit_code': exit_code,
+        'stdout_bytes': stdout_bytes,
+        'stderr_bytes': stderr_bytes,
+        'retries': _retries.get(),
+    }
+    if timed_out:
+        record['timed_out'] = True
+    _tracer.emit(record)
+
+
+def step_result(result):
+    """Traza de un pipeline.StepResult recién terminado"""
+    if _tracer is None:
+        return
+    end = time.time()
+    _tracer.emit({
+        'kind': 'step',
+        'run': _run.get(),
+        'step': result.name,
+        'ok': result.ok,
+        'detail': result.detail,
+        'start': round(end - result.duration, 6),
+        'end': round(end, 6),
+        'duration_ms': round(result.duration * 1000, 3),
+    })
+
+
+def run_result(result, duration):
+    """Traza de una subida completa (pipeline.UploadResult)"""
+    if _tracer is None:
+        return
+    end = time.time()
+    _tracer.emit({
+        'kind': 'run',
+        'run': _run.get(),
+        'ok': result.ok,
+        'commit': result.commit,
+        'pushed_to': result.pushed_to,
+        'start': round(end - duration, 6),
+        'end': round(end, 6),
+        'duration_ms': round(duration * 1000, 3),
+    })
+
+
+# Lectura y resumen ----------------------------------------------------------
+
+def read(root, backups=None):
+    """Todas las trazas (incluidas las rotadas), de la más vieja a la más nueva"""
+    tracer = Tracer(trace_path(root), backups=backups if backups is not None else 99)
+    for path in tracer.files():
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+def percentile(values, p):
+    """Percentil por rango más cercano (values ordenados)"""
+    if not values:
+        return None
+    index = max(0, min(len(values) - 1, -(-p * len(values) // 100) - 1))
+    return values[int(index)]
+
+
+def summarize(records, last_runs=None):
+    """{'steps': {paso: stats}, 'commands': {(paso, comando): stats}, 'runs': n}
+
+    stats = {count, failures, p50_ms, p95_ms, max_ms}. Con `last_runs` solo
+    se consideran las últimas N corridas.
+    """
+    records = list(records)
+    if last_runs:
+        order = {}
+        for record in records:
+            if record.get('run'):
+                order.setdefault(record['run'], None)
+        keep = set(list(order)[-last_runs:])
+        records = [r for r in records if r.get('run') in keep]
+
+    steps, commands = {}, {}
+    runs = set()
+    for record in records:
+        runs.add(record.get('run'))
+        if record.get('kind') == 'step':
+            row = steps.setdefault(record['step'], {'durations': [], 'failures': 0})
+            row['failures'] += not record.get('ok', True)
+        elif record.get('kind') == 'command':
+            argv = record.get('command') or ['?']
+            name = ' '.join(argv[:2]) if os.path.basename(argv[0]) == 'git' else os.path.basename(argv[0])
+            row = commands.setdefault((record.get('step') or '-', name), {'durations': [], 'failures': 0})
+            row['failures'] += record.get('exit_code') != 0 or record.get('timed_out', False)
+        else:
+            continue
+        row['durations'].append(record.get('duration_ms', 0))
+
+    def stats(row):
+        values = sorted(row['durations'])
+        return {
+            'count': len(values),
+            'failures': row['failures'],
+            'p50_ms': percentile(values, 50),
+            'p95_ms': percentile(values, 95),
+            'max_ms': values[-1],
+        }
+
+    return {
+        'runs': len(runs - {None}),
+        'steps': {name: stats(row) for name, row in steps.items()},
+        'commands': {key: stats(row) for key, row in commands.items()},
+    }
@@ -0,0 +1,235 @@
+"""
+Validación previa al push, limitada a los archivos afectados.
+
+`git push origin main` dispara directamente un build en DigitalOcean
+(`deploy_on_push: true` en app.yaml), así que un error de tipos como el de
+`createdAt` se descubría después de un ciclo completo de build remoto. Aquí
+se calculan los archivos cambiados respecto al remoto, se agregan los
+módulos que los importan (según el índice de graph.py) y se ejecutan `tsc --noEmit`, ESLint y los tests de
+Jest relacionados, repartidos en tantos procesos como núcleos haya. Si algo
+falla el push no se hace. Con `validate_isolated` todo corre en un worktree
+del pool (worktrees.py) con el commit que se sube, no en el árbol de trabajo.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+
+from . import imports, remotes, runner
+from .graph import ImportGraph
+from .config import state_dir
+
+TYPECHECK_EXTS = ('.ts', '.tsx')
+LINT_EXTS = ('.ts', '.tsx', '.js', '.jsx')
+LINT_DIRS = ('src/', 'services/')
+TEST_SUFFIXES = ('.test.ts', '.test.tsx', '.spec.ts', '.spec.tsx')
+# Playwright, no Jest
+JEST_EXCLUDE = ('tests/e2e/',)
+# Config que Jest toma por defecto (clave del modelo de tiempos)
+JEST_CONFIG = 'jest.config.js'
+# Declaraciones globales que tsc necesita aunque no se importen
+GLOBAL_TYPES = ('next-env.d.ts', 'src/types/**/*.d.ts', 'types/**/*.d.ts')
+OUTPUT_TAIL = 40
+
+
+@dataclass
+class Task:
+    name: str
+    shard: int
+    shards: int
+    command: list
+    files: list = field(default_factory=list)
+
+    @property
+    def label(self):
+        return f'{self.name} [{self.shard}/{self.shards}]' if self.shards > 1 else self.name
+
+
+@dataclass
+class CheckResult:
+    task: Task
+    ok: bool
+    duration: float
+    output: str = ''
+    skipped: bool = False
+
+
+def default_jobs():
+    return os.cpu_count() or 1
+
+
+def _bin(root, name):
+    path = os.path.join(root, 'node_modules', '.bin', name)
+    if os.name == 'nt':
+        path += '.cmd'
+    return path if os.path.exists(path) else None
+
+
+def _is_test(path):
+    return path.endswith(TEST_SUFFIXES) or '/__tests__/' in path
+
+
+def _shard(items, count):
+    items = sorted(items)
+    count = max(1, min(count, len(items)))
+    return [items[i::count] for i in range(count)]
+
+
+def _tsc_project(root, tsconfig, files, shard, checkout=None):
+    """tsconfig temporario (en .git) que extiende el real y solo incluye
+    `files`; tsc revisa además todo lo que esos archivos importan"""
+    base = checkout or root
+    name = f"{tsconfig.replace('/', '_')}.{shard}"
+    if checkout:
+        name += f'.{os.path.basename(checkout)}'
+    target = os.path.join(state_dir(root, 'tsc'), f'{name}.json')
+    project = {
+        'extends': os.path.join(base, tsconfig),
+        'compilerOptions': {'noEmit': True, 'incremental': False},
+        'files': [os.path.join(base, f) for f in files],
+        'include': [os.path.join(base, pattern) for pattern in GLOBAL_TYPES],
+    }
+    with open(target, 'w', encoding='utf-8') as f:
+        json.dump(project, f, indent=2)
+    return target
+
+
+def diff_paths(session, config, base=None, staged=False):
+    """(agregados/modificados, borrados) entre el remoto y HEAD (o el índice,
+    con `staged`). El origen de un renombre cuenta como borrado"""
+    if base is None:
+        base = remotes.tracking_ref(session, config)
+    if base is None:
+        listing = session.run('ls-files', '-z').stdout
+        return [p.decode('utf-8', 'surrogateescape') for p in listing.split(b'\0') if p], []
+    if staged:
+        listing = session.run('diff', '--cached', '--name-status', '-z', base).stdout
+    else:
+        listing = session.run('diff', '--name-status', '-z', base, 'HEAD').stdout
+    fields = [p.decode('utf-8', 'surrogateescape') for p in listing.split(b'\0')]
+    changed, removed = [], []
+    i = 0
+    while i < len(fields) and fields[i]:
+        status = fields[i][0]
+        if status in 'RC':
+            if status == 'R':
+                removed.append(fields[i + 1])
+            changed.append(fields[i + 2])
+            i += 3
+            continue
+        (removed if status == 'D' else changed).append(fields[i + 1])
+        i += 2
+    return changed, removed
+
+
+def changed_files(session, config, base=None, staged=False):
+    """Archivos agregados/modificados entre el remoto y HEAD (o el índice,
+    con `staged`)"""
+    return diff_paths(session, config, base, staged)[0]
+
+
+def plan(root, changed, jobs=None, checkout=None, removed=()):
+    """Tareas de validación para los archivos cambiados y sus dependientes.
+
+    Los `removed` (borrados) no se validan, pero sí quienes los importaban.
+    Con `checkout` (un worktree del pool) los comandos apuntan a ese árbol;
+    el grafo de imports y los tiempos siguen saliendo del repo."""
+    jobs = jobs or default_jobs()
+    base = checkout or root
+    removed = [p for p in removed if p.endswith(imports.SOURCE_EXTS)]
+    sources = [p for p in changed if p.endswith(imports.SOURCE_EXTS)]
+    if not sources and not removed:
+        return []
+    affected = ImportGraph.load(root).dependents(sources + removed) - set(removed)
+    tasks = []
+
+    tsc = _bin(base, 'tsc')
+    groups = {}
+    for path in affected:
+        if path.endswith(TYPECHECK_EXTS) and not _is_test(path) and not path.startswith('tests/'):
+            tsconfig = imports.nearest_tsconfig(base, path)
+            if tsconfig:
+                groups.setdefault(tsconfig, []).append(path)
+    for tsconfig, files in sorted(groups.items()):
+        shards = _shard(files, jobs)
+        for i, shard in enumerate(shards, 1):
+            command = [tsc, '--noEmit', '-p', _tsc_project(root, tsconfig, shard, i, checkout)] if tsc else None
+            tasks.append(Task(f'tsc {tsconfig}', i, len(shards), command, shard))
+
+    eslint = _bin(base, 'eslint')
+    lint = [p for p in changed if p.endswith(LINT_EXTS) and p.startswith(LINT_DIRS)]
+    if lint:
+        shards = _shard(lint, jobs)
+        for i, shard in enumerate(shards, 1):
+            tasks.append(Task('eslint', i, len(shards), [eslint, *shard] if eslint else None, shard))
+
+    jest = _bin(base, 'jest')
+    tests = [p for p in affected if _is_test(p) and not p.startswith(JEST_EXCLUDE)]
+    if tests:
+        # Repartidos por duración con el modelo de tiempos de jestshard.py
+        from .jestshard import Timings, lpt
+
+        timings = Timings(root)
+        shards = [files for _, files in lpt([(p, timings.estimate(JEST_CONFIG, p)) for p in tests], jobs)]
+        for i, shard in enumerate(shards, 1):
+            command = [jest, '--ci', '--maxWorkers=1', '--passWithNoTests', '--runTestsByPath', *shard] if jest else None
+            tasks.append(Task('jest', i, len(shards), command, shard))
+    return tasks
+
+
+def _check_result(task, result):
+    text = (result.stdout + result.stderr).decode('utf-8', 'replace').strip()
+    output = '\n'.join(text.splitlines()[-OUTPUT_TAIL:])
+    return CheckResult(task, result.ok, result.duration, output)
+
+
+def run(root, tasks, jobs=None, on_result=None, env=None):
+    """Ejecuta las tareas en paralelo (runner.run_many); cada una es un
+    proceso de node. tsc no escribe nada mientras trabaja, así que aquí no
+    hay timeout por inactividad."""
+    results = []
+    for task in tasks:
+        if task.command is None:
+            results.append(CheckResult(task, True, 0.0, 'no instalado (npm ci)', skipped=True))
+            if on_result:
+                on_result(results[-1])
+
+    def done(index, result):
+        results.append(_check_result(tasks[index], result))
+        if on_result:
+            on_result(results[-1])
+
+    jobs_spec = [(i, task.command, {'cwd': root, 'env': env}) for i, task in enumerate(tasks) if task.command is not None]
+    if jobs_spec:
+        runner.run_many(jobs_spec, limit=jobs or default_jobs(), on_result=done)
+    return results
+
+
+def pre_push_check(pipeline):
+    """Chequeo pre-push para UploadPipeline: bloquea el push si algo falla"""
+    session, config = pipeline.session, pipeline.config
+    changed, removed = diff_paths(session, config)
+    jobs = config.validate_jobs or None
+    if config.validate_isolated:
+        from . import worktrees
+
+        with worktrees.claim(session, config, 'HEAD') as checkout:
+            tasks = plan(session.root, changed, jobs, checkout.path, removed)
+            results = run(checkout.path, tasks, jobs, on_result=pipeline.on_check, env=checkout.env)
+    else:
+        tasks = plan(session.root, changed, jobs, removed=removed)
+        results = run(session.root, tasks, jobs, on_result=pipeline.on_check)
+    failed = [r for r in results if not r.ok]
+    skipped = [r for r in results if r.skipped]
+    detail = f'{len(changed)} archivos'
+    if removed:
+        detail += f', {len(removed)} borrados'
+    detail += f', {len(tasks)} tareas'
+    if skipped:
+        detail += f", sin ejecutar: {', '.join(sorted({r.task.name for r in skipped}))}"
+    if failed:
+        detail += f", fallaron: {', '.join(r.task.label for r in failed)}"
+    return not failed, detail
+
+
+pre_push_check.step = 'validate'
@@ -0,0 +1,160 @@
+"""
+Modo vigilante: commits automáticos agrupados y pushes con límite de ritmo.
+
+auto-push.py prometía que "los próximos cambios serán subidos
+automáticamente", pero solo hacía un add/commit/push. Ejecutarlo después de
+cada guardado dispararía un build de DigitalOcean por cada archivo. Aquí un
+proceso de larga duración escucha inotify y:
+
+- agrupa las ráfagas de eventos y hace un commit local cuando pasan
+  `watch_quiet` segundos sin cambios (o `watch_max_delay` desde el primero);
+- empuja como mucho una vez cada `watch_min_push_interval` segundos, y solo
+  cuando no hay ediciones pendientes, así varios commits viajan en un solo
+  push y un solo build.
+
+Sin cambios pendientes el proceso queda bloqueado en `select()` sin timeout,
+por lo que en reposo no consume CPU.
+"""
+
+import time
+from datetime import datetime
+
+from . import coordinator, trace
+from .changes import ALWAYS_SKIP
+from .config import load_config
+from .git import GitError, GitSession
+from .pipeline import StepResult, UploadPipeline
+from .plugins import Registry
+
+# Con `stop` (tests, hilos) se revisa cada tanto aunque no haya eventos
+STOP_POLL = 0.5
+
+
+class Debouncer:
+    """Decide cuándo commitear y cuándo empujar. No lee el reloj: todos los
+    métodos reciben `now` (time.monotonic()) para poder probarlo aislado."""
+
+    def __init__(self, quiet, max_delay, min_push_interval):
+        self.quiet = quiet
+        self.max_delay = max_delay
+        self.min_push_interval = min_push_interval
+        self.pending = set()
+        self.first = None
+        self.last = None
+        self.unpushed = False
+        self.last_push = None
+
+    def add(self, paths, now):
+        if not self.pending:
+            self.first = now
+        self.pending.update(paths)
+        self.last = now
+
+    def commit_at(self):
+        if not self.pending:
+            return None
+        return min(self.last + self.quiet, self.first + self.max_delay)
+
+    def push_at(self):
+        # Mientras se sigue editando no se empuja: vendría otro commit detrás
+        if not self.unpushed or self.pending:
+            return None
+        if self.last_push is None:
+            return 0.0
+        return self.last_push + self.min_push_interval
+
+    def deadline(self):
+        """Próximo instante en que hay algo que hacer; None = nada (esperar
+        eventos indefinidamente)"""
+        times = [t for t in (self.commit_at(), self.push_at()) if t is not None]
+        return min(times) if times else None
+
+    def take(self):
+        paths, self.pending = self.pending, set()
+        self.first = self.last = None
+        return paths
+
+    def committed(self):
+        self.unpushed = True
+
+    def pushed(self, now, ok):
+        # Un push fallido también consume el turno: se reintenta en el siguiente
+        self.last_push = now
+        if ok:
+            self.unpushed = False
+
+
+def _skip(rel):
+    return rel.rsplit('/', 1)[-1] in ALWAYS_SKIP
+
+
+def commit_pending(root, config, paths, message, on_step=None):
+    """Commit local de lo acumulado; devuelve el oid o None si no hubo cambios"""
+    with coordinator.exclusive(root), GitSession(root) as session:
+        detector = None
+        if config.stat_cache:
+            from .changes import ChangeDetector
+            detector = ChangeDetector(session)
+        stamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        pipeline = UploadPipeline(session, config, on_step=on_step, detector=detector, plugins=Registry(config))
+        result = pipeline.run(f'{message} - {len(paths)} archivos - {stamp}', push=False)
+    return result.commit if result.ok else None
+
+
+def push_pending(root, config, on_step=None, on_check=None, on_output=None):
+    """Validación pre-push y push de los commits acumulados"""
+    with coordinator.exclusive(root), GitSession(root) as session:
+        pipeline = UploadPipeline(
+            session, config, on_step=on_step, plugins=Registry(config), on_check=on_check, on_output=on_output,
+            classify=True,
+        )
+        try:
+            with trace.run():
+                if not pipeline.pre_push():
+                    return False
+                with trace.step('push'):
+                    pushed = pipeline.push()
+                if pushed:
+                    pipeline.post_push()
+                if pipeline.result.spooled:
+                    from . import spool
+                    spool.start_drainer(root)
+                return pushed
+        except GitError as e:
+            if on_step:
+                on_step(StepResult('push', False, 0.0, str(e)))
+            return False
+
+
+def run_watch(root, config=None, message='auto-commit', push=True, stop=None,
+              on_step=None, on_check=None, on_output=None):
+    """Vigila `root` hasta que `stop()` devuelva True (o hasta Ctrl+C)"""
+    from .inotify import Inotify
+
+    config = config or load_config(root)
+    trace.configure(root, config)
+    debouncer = Debouncer(config.watch_quiet, config.watch_max_delay, config.watch_min_push_interval)
+    watcher = Inotify(root, skip=_skip)
+    try:
+        while not (stop and stop()):
+            deadline = debouncer.deadline()
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if stop is not None:
+                timeout = STOP_POLL if timeout is None else min(timeout, STOP_POLL)
+            events = watcher.read(timeout)
+            now = time.monotonic()
+            if events:
+                # None = desbordamiento: la detección de cambios revisa todo igual
+                debouncer.add({path or '*' for path, _ in events}, now)
+
+            commit_at = debouncer.commit_at()
+            if commit_at is not None and now >= commit_at:
+                paths = debouncer.take()
+                if commit_pending(root, config, paths, message, on_step) and push:
+                    debouncer.committed()
+
+            push_at = debouncer.push_at()
+            if push_at is not None and now >= push_at:
+                debouncer.pushed(time.monotonic(), push_pending(root, config, on_step, on_check, on_output))
+    finally:
+        watcher.close()
@@ -0,0 +1,284 @@
+"""
+Pool de worktrees precalentados para chequeos aislados.
+
+Validar exactamente lo que se va a subir (el índice o el commit, no el
+árbol de trabajo con sus cambios a medias) obligaba a hacer stash o a copiar
+el repo, y un `npm ci` por copia tarda minutos. Aquí hay un pool de
+checkouts en `.git/rent360push/worktrees/wt-N` que cualquiera toma con
+`claim(rev)`:
+
+- cada lugar tiene su lock (`wt-N.lock`): dos procesos (una validación
+  pre-push, las pruebas de un bisect, un benchmark) nunca comparten uno;
+- se prefiere un lugar libre que ya esté en el árbol pedido; si no, se
+  lleva al árbol con `checkout --force` (commits) o `read-tree --reset -u`
+  (árboles sueltos, p.ej. el índice con `snapshot`). Ambos reescriben solo
+  los archivos que cambiaron. Después `clean -fd` sin `-x` y sin tocar
+  `node_modules`, `.next` ni `*.tsbuildinfo`: los ignorados y las cachés de
+  build se conservan entre usos;
+- `node_modules` se comparte con el del repo: un árbol de hardlinks
+  (`worktree_modules: "hardlink"`, segundos en vez de minutos y sin espacio
+  extra) o un enlace simbólico (`"symlink"`). Si el disco no admite
+  hardlinks se usa el enlace simbólico. `node_modules/.cache` no se enlaza
+  (webpack/babel escriben ahí y modificarían los archivos del repo). Se
+  vuelve a enlazar cuando cambia `node_modules/.package-lock.json`.
+
+El estado de cada lugar (árbol, commit, firma de node_modules) va en
+`wt-N.json`, así que elegir uno no lanza ningún git.
+
+Los comandos dentro de un lugar usan `Checkout.env`: sin las variables con
+que git apunta un hook al repo principal (husky corre con
+`GIT_INDEX_FILE=.git/index`, relativo, que en el worktree es un archivo).
+"""
+
+import contextlib
+import errno
+import hashlib
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+
+from . import coordinator
+from .config import state_dir
+
+POOL_DIR = 'worktrees'
+# Archivo que npm reescribe en cada install; si no existe, el lockfile
+MODULES_STAMPS = ('node_modules/.package-lock.json', 'package-lock.json')
+# Directorios de node_modules que no se enlazan (se escriben en el lugar)
+UNSHARED = ('.cache',)
+# Lo que `clean` no borra entre usos aunque el .gitignore no lo cubra
+KEEP = ('/node_modules', '/.next', '*.tsbuildinfo')
+POLL = 0.2
+# Variables que git exporta a los hooks y que no valen dentro de un lugar
+REPO_VARS = ('GIT_INDEX_FILE', 'GIT_DIR', 'GIT_WORK_TREE', 'GIT_PREFIX')
+
+
+@dataclass
+class Checkout:
+    name: str
+    path: str
+    rev: str
+    tree: str
+    # Segundos que tardó en quedar listo
+    reset: float = 0.0
+    modules: str | None = None
+    # Entorno para los comandos que corren en `path`
+    env: dict | None = None
+
+
+def checkout_env(env=None):
+    """Copia de `env` (o del entorno) sin las variables de REPO_VARS"""
+    env = dict(os.environ if env is None else env)
+    for name in REPO_VARS:
+        env.pop(name, None)
+    return env
+
+
+def _base(root):
+    return state_dir(root, POOL_DIR)
+
+
+def _load(root, name):
+    try:
+        with open(os.path.join(_base(root), f'{name}.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _save(root, name, data):
+    path = os.path.join(_base(root), f'{name}.json')
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(path + '.tmp', path)
+
+
+def modules_signature(root):
+    """Firma del node_modules del repo (None si no hay node_modules)"""
+    if not os.path.isdir(os.path.join(root, 'node_modules')):
+        return None
+    for stamp in MODULES_STAMPS:
+        try:
+            with open(os.path.join(root, stamp), 'rb') as f:
+                return hashlib.sha1(f.read()).hexdigest()
+        except FileNotFoundError:
+            continue
+    return 'sin-lockfile'
+
+
+def _remove_modules(target):
+    if os.path.islink(target):
+        os.unlink(target)
+    elif os.path.isdir(target):
+        shutil.rmtree(target)
+
+
+def _hardlink_tree(source, target):
+    """Copia la estructura de `source` en `target` con hardlinks (los
+    enlaces simbólicos, como los de .bin, se copian tal cual)"""
+    for directory, dirs, files in os.walk(source):
+        rel = os.path.relpath(directory, source)
+        dest = os.path.normpath(os.path.join(target, rel))
+        os.makedirs(dest, exist_ok=True)
+        if rel == '.':
+            for name in UNSHARED:
+                if name in dirs:
+                    dirs.remove(name)
+                    os.makedirs(os.path.join(dest, name), exist_ok=True)
+        for name in list(dirs):
+            src = os.path.join(directory, name)
+            if os.path.islink(src):
+                dirs.remove(name)
+                os.symlink(os.readlink(src), os.path.join(dest, name))
+        for name in files:
+            src = os.path.join(directory, name)
+            if os.path.islink(src):
+                os.symlink(os.readlink(src), os.path.join(dest, name))
+            else:
+                os.link(src, os.path.join(dest, name))
+
+
+def link_modules(root, path, mode):
+    """Enlaza el node_modules del repo en el checkout; devuelve el modo usado"""
+    source = os.path.join(root, 'node_modules')
+    target = os.path.join(path, 'node_modules')
+    _remove_modules(target)
+    if mode == 'hardlink':
+        try:
+            _hardlink_tree(source, target)
+            return 'hardlink'
+        except OSError as exc:
+            if exc.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                raise
+            _remove_modules(target)
+    os.symlink(source, target, target_is_directory=True)
+    return 'symlink'
+
+
+def snapshot(session):
+    """Árbol del índice actual (lo que entraría en el próximo commit)"""
+    return session.run('write-tree').text.strip()
+
+
+def slots(root):
+    """Nombres de los lugares creados"""
+    base = _base(root)
+    return sorted((n for n in os.listdir(base) if os.path.isdir(os.path.join(base, n))),
+                  key=lambda n: int(n.split('-')[1]))
+
+
+def _reset(session, path, rev, is_commit, env):
+    if is_commit:
+        session.run('-C', path, 'checkout', '-q', '--detach', '--force', rev, env=env)
+    else:
+        session.run('-C', path, 'read-tree', '--reset', '-u', rev, env=env)
+    session.run('-C', path, 'clean', '-fdq', *(f'--exclude={pattern}' for pattern in KEEP), env=env)
+
+
+def prepare(session, config, name, rev):
+    """Lleva el lugar `name` (ya tomado) a `rev`: commit o árbol"""
+    root = session.root
+    path = os.path.join(_base(root), name)
+    is_commit = session.run('cat-file', '-t', rev).text.strip() == 'commit'
+    tree = session.run('rev-parse', f'{rev}^{{tree}}').text.strip()
+    commit = session.run('rev-parse', rev).text.strip() if is_commit else None
+    state = _load(root, name)
+    env = checkout_env(session.env)
+    started = time.perf_counter()
+    if not os.path.exists(os.path.join(path, '.git')):
+        shutil.rmtree(path, ignore_errors=True)
+        session.run('worktree', 'prune')
+        session.run('worktree', 'add', '-q', '--detach', '--no-checkout', '--force', path, 'HEAD', env=env)
+        state = {}
+    # Siempre: el uso anterior pudo dejar archivos modificados. En el mismo
+    # árbol git solo compara stat y no reescribe nada
+    _reset(session, path, commit or tree, is_commit, env)
+    signature = modules_signature(root)
+    if signature is not None and (state.get('modules') != signature
+                                  or not os.path.lexists(os.path.join(path, 'node_modules'))):
+        state['mode'] = link_modules(root, path, config.worktree_modules)
+    state.update(tree=tree, commit=commit, modules=signature)
+    _save(root, name, state)
+    reset = time.perf_counter() - started
+    return Checkout(name, path, rev, tree, round(reset, 3), state.get('mode'), env)
+
+
+def _acquire(root, size, tree=None, timeout=None):
+    """Toma un lugar libre (el que ya esté en `tree` primero); espera si
+    los `size` lugares están ocupados. Devuelve (nombre, lock)"""
+    base = _base(root)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        existing = slots(root)
+        names = existing + [f'wt-{n}' for n in range(size) if f'wt-{n}' not in existing]
+        names = names[:max(size, 1)]
+        names.sort(key=lambda n: (_load(root, n).get('tree') != tree, int(n.split('-')[1])))
+        for name in names:
+            lock = coordinator.FileLock(os.path.join(base, f'{name}.lock'))
+            if lock.acquire(blocking=False):
+                os.makedirs(os.path.join(base, name), exist_ok=True)
+                return name, lock
+        if deadline is not None and time.monotonic() >= deadline:
+            raise RuntimeError(f'los {size} worktrees del pool están ocupados')
+        time.sleep(POLL)
+
+
+@contextlib.contextmanager
+def claim(session, config, rev, size=None, timeout=None):
+    """Checkout aislado en `rev` (commit o árbol) mientras dure el bloque"""
+    root = session.root
+    tree = session.run('rev-parse', f'{rev}^{{tree}}').text.strip()
+    name, lock = _acquire(root, size or config.worktree_pool_size, tree, timeout)
+    try:
+        yield prepare(session, config, name, rev)
+    finally:
+        lock.release()
+
+
+def warm(session, config, rev='HEAD', count=None, on_slot=None):
+    """Crea (o pone al día) `count` lugares en `rev` con node_modules enlazado"""
+    checkouts = []
+    with contextlib.ExitStack() as stack:
+        for _ in range(count or config.worktree_pool_size):
+            checkout = stack.enter_context(claim(session, config, rev, size=count, timeout=0))
+            checkouts.append(checkout)
+            if on_slot:
+                on_slot(checkout)
+    return checkouts
+
+
+def status(root):
+    """[(nombre, ocupado, estado)] de cada lugar"""
+    base = _base(root)
+    result = []
+    for name in slots(root):
+        lock = coordinator.FileLock(os.path.join(base, f'{name}.lock'))
+        busy = not lock.acquire(blocking=False)
+        if not busy:
+            lock.release()
+        result.append((name, busy, _load(root, name)))
+    return result
+
+
+def remove(session):
+    """Borra los lugares libres del pool; devuelve cuántos"""
+    root = session.root
+    base = _base(root)
+    removed = 0
+    for name in slots(root):
+        lock = coordinator.FileLock(os.path.join(base, f'{name}.lock'))
+        if not lock.acquire(blocking=False):
+            continue
+        try:
+            path = os.path.join(base, name)
+            _remove_modules(os.path.join(path, 'node_modules'))
+            session.run('worktree', 'remove', '--force', path, check=False)
+            shutil.rmtree(path, ignore_errors=True)
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(os.path.join(base, f'{name}.json'))
+            removed += 1
+        finally:
+            lock.release()
+    session.run('worktree', 'prune')
+    return removed
@@ -38,24 +38,36 @@ ALL_FILES=$(git diff --cached --name-only)
 TEST_FILES=$(echo "$MODIFIED_FILES" | grep -E "\.(test|spec)\.(ts|tsx|js|jsx)$" || true)
 SOURCE_FILES=$(echo "$MODIFIED_FILES" | grep -E "\.(ts|tsx|js|jsx)$" | grep -v -E "\.(test|spec)\." || true)
 
-# 1. Validación de TypeScript
-echo "🔧 Ejecutando type checking..."
-if npm run type-check > /dev/null 2>&1; then
-    print_status "TypeScript validation passed"
+# 1-2. TypeScript y ESLint en paralelo, con caché de las pasadas exitosas
+# por contenido (rent360push/hooks.py). Sin Python, uno detrás de otro con npm
+PYTHON=$(command -v python3 || command -v python)
+if [ -n "$PYTHON" ]; then
+    echo "🔧 Ejecutando type checking y ESLint..."
+    if "$PYTHON" -m rent360push hooks run --stage typecheck --stage eslint; then
+        print_status "TypeScript y ESLint validation passed"
+    else
+        print_error "TypeScript o ESLint validation failed"
+        echo "Ejecuta: npm run type-check && npm run lint"
+        exit 1
+    fi
 else
-    print_error "TypeScript validation failed"
-    echo "Ejecuta: npm run type-check"
-    exit 1
-fi
+    echo "🔧 Ejecutando type checking..."
+    if npm run type-check > /dev/null 2>&1; then
+        print_status "TypeScript validation passed"
+    else
+        print_error "TypeScript validation failed"
+        echo "Ejecuta: npm run type-check"
+        exit 1
+    fi
 
-# 2. Validación de ESLint
-echo "🎨 Ejecutando ESLint..."
-if npm run lint --silent > /dev/null 2>&1; then
-    print_status "ESLint validation passed"
-else
-    print_error "ESLint validation failed"
-    echo "Ejecuta: npm run lint"
-    exit 1
+    echo "🎨 Ejecutando ESLint..."
+    if npm run lint --silent > /dev/null 2>&1; then
+        print_status "ESLint validation passed"
+    else
+        print_error "ESLint validation failed"
+        echo "Ejecuta: npm run lint"
+        exit 1
+    fi
 fi
 
 # 3. Ejecutar tests relacionados con archivos modificados
@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Permite ejecutar `pytest tests/tooling` sin instalar el paquete
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from rent360push.bench.synthetic import bench_env, create_repo
+
+
+@pytest.fixture(autouse=True)
+def git_identity(monkeypatch):
+    for key, value in bench_env().items():
+        if key.startswith('GIT_'):
+            monkeypatch.setenv(key, value)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Repo sintético de 40 archivos con remoto bare en `<repo>.remote.git`"""
+    return create_repo(str(tmp_path / 'repo'), 40)
+
+
+def git(cwd, *args):
+    return subprocess.run(['git', *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+
+def write(root, rel, content):
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
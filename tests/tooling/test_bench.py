@@ -0,0 +1,43 @@
+import os
+
+from rent360push.bench import e2e
+from rent360push.bench.synthetic import Churn, create_repo
+
+from .conftest import git
+
+
+def test_churn_is_controlled_and_reproducible(tmp_path):
+    root = create_repo(str(tmp_path / 'repo'), 30)
+    churn = Churn(root, 30, seed=1)
+    result = churn.apply(modify=4, add=3, delete=2)
+    assert [len(result[k]) for k in ('modified', 'added', 'deleted')] == [4, 3, 2]
+    assert not set(result['modified']) & set(result['deleted'])
+    assert len(churn.live) == 31
+    status = git(root, 'status', '--porcelain', '--untracked-files=all').splitlines()
+    assert len(status) == 9
+    assert all(os.path.exists(os.path.join(root, p)) for p in result['added'])
+
+
+def test_e2e_records_phases_and_detects_regressions(tmp_path):
+    records = e2e.run(sizes=[40], modify=3, add=1, delete=1, rounds=1, warmup=0, workdir=str(tmp_path))
+    assert [r['variant'] for r in records] == ['legacy', 'pipeline']
+    for record in records:
+        assert set(record['phases']) == set(e2e.PHASES)
+        for row in record['phases'].values():
+            assert row['wall_ms'] > 0 and row['cpu_ms'] >= 0 and row['peak_rss_kb'] > 0
+        assert record['files'] == 40 and record['churn'] == {'modify': 3, 'add': 1, 'delete': 1}
+
+    history = str(tmp_path / 'history.jsonl')
+    older = [dict(r, time=r['time'] - 100, commit='abc123') for r in records]
+    for record in older:
+        record['phases'] = {p: dict(v, wall_ms=v['wall_ms'] / 10) for p, v in record['phases'].items()}
+    e2e.append_history(history, older)
+    e2e.append_history(history, records)
+    loaded = e2e.load_history(history)
+    assert len(loaded) == 4
+
+    rows = e2e.compare(records, loaded, threshold=0.2, baseline='abc')
+    assert len(rows) == 8 and all(r['baseline'] == 'abc123' for r in rows)
+    slow = [r for r in rows if r['after_ms'] - r['before_ms'] > e2e.NOISE_MS]
+    assert all(r['regression'] for r in slow)
+    assert e2e.compare(records, loaded, baseline='zzz') == []
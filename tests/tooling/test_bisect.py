@@ -0,0 +1,98 @@
+import os
+import sys
+
+from rent360push import bisect, worktrees
+from rent360push.config import Config
+from rent360push.git import GitSession
+
+from .conftest import git, write
+
+# "Build" de prueba: anota qué commit probó, falla si el árbol tiene
+# src/roto.ts y sale con 125 si tiene src/wip.ts
+CHECK = """
+import os, subprocess, sys
+head = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True).stdout.strip()
+with open(sys.argv[1], 'a') as f:
+    f.write(head + '\\n')
+if os.path.exists('src/wip.ts'):
+    sys.exit(125)
+if os.path.exists('src/roto.ts'):
+    print("src/roto.ts(1,7): error TS2322: Type 'string' is not assignable to type 'number'.")
+    sys.exit(2)
+"""
+
+
+def setup(repo, tmp_path, count, broken, wip=()):
+    """`count` commits después de la base; el número `broken` rompe el build"""
+    script = tmp_path / 'check.py'
+    script.write_text(CHECK)
+    log = tmp_path / 'builds.log'
+    base = git(repo, 'rev-parse', 'HEAD').strip()
+    commits = []
+    for n in range(1, count + 1):
+        write(repo, f'src/paso{n}.ts', f'export const paso{n} = {n};\n')
+        if n == broken:
+            write(repo, 'src/roto.ts', 'export const roto: number = "x";\n')
+        if n in wip:
+            write(repo, 'src/wip.ts', '')
+        elif os.path.exists(os.path.join(repo, 'src/wip.ts')):
+            os.remove(os.path.join(repo, 'src/wip.ts'))
+        git(repo, 'add', '-A')
+        git(repo, 'commit', '-q', '-m', f'paso {n}')
+        commits.append(git(repo, 'rev-parse', 'HEAD').strip())
+    config = Config(bisect_command=[sys.executable, str(script), str(log)])
+    return base, commits, config, log
+
+
+def built(log):
+    if not log.exists():
+        return []
+    lines = log.read_text().splitlines()
+    log.unlink()
+    return lines
+
+
+def test_wide_round_finds_first_bad_and_caches_trees(repo, tmp_path):
+    base, commits, config, log = setup(repo, tmp_path, 32, broken=19)
+    rounds = []
+    with GitSession(repo) as session:
+        result = bisect.bisect(session, config, base, jobs=31, on_round=lambda *r: rounds.append(r))
+    # 31 candidatos sin resolver (el extremo malo se da por malo): una ronda
+    assert rounds == [(1, 31, 31)] and result.rounds == 1
+    assert result.first_bad.commit == commits[18] and result.first_bad.subject == 'paso 19'
+    assert any('TS2322' in line for line in result.first_bad.errors)
+    assert len(built(log)) == 31 and result.suspects == []
+
+    # Otra vez el mismo rango: todo sale del caché de árboles
+    with GitSession(repo) as session:
+        again = bisect.bisect(session, config, base, jobs=31)
+    assert built(log) == [] and again.rounds == 0 and again.first_bad.commit == commits[18]
+    assert all(p.cached for p in again.probes)
+
+    # Un revert vuelve a un árbol conocido: no se construye de nuevo
+    git(repo, 'revert', '--no-edit', 'HEAD')
+    with GitSession(repo) as session:
+        reverted = bisect.bisect(session, config, commits[29], jobs=4)
+    assert built(log) == [] and reverted.first_bad.commit == commits[30]
+
+
+def test_narrow_jobs_take_several_rounds(repo, tmp_path):
+    base, commits, config, log = setup(repo, tmp_path, 32, broken=7)
+    with GitSession(repo) as session:
+        result = bisect.bisect(session, config, base, jobs=3)
+    # 31 → 3 puntos por ronda: log4(32) rondas con menos de 31 builds
+    assert result.first_bad.commit == commits[6]
+    assert 2 <= result.rounds <= 3
+    assert len(built(log)) == len(result.built) < 12
+    # Los worktrees del pool se reutilizan entre rondas
+    assert worktrees.slots(repo) == ['wt-0', 'wt-1', 'wt-2']
+    assert bisect.pick(list(range(10)), 3) == [1, 4, 7]
+
+
+def test_untestable_commits_are_reported_as_suspects(repo, tmp_path):
+    base, commits, config, log = setup(repo, tmp_path, 8, broken=5, wip=(4,))
+    with GitSession(repo) as session:
+        result = bisect.bisect(session, config, base, jobs=7)
+    assert result.first_bad.commit == commits[4]
+    assert [p.commit for p in result.suspects] == [commits[3]]
+    assert result.suspects[0].status == bisect.SKIP
@@ -0,0 +1,120 @@
+import os
+import sys
+
+from rent360push import buildcache
+from rent360push.config import Config
+from rent360push.git import GitSession
+
+from .conftest import git, write
+
+# "Build" de prueba: falla si algún archivo de src/ contiene ROTO, si no
+# escribe un artefacto en out/ (con una caché que no se archiva)
+BUILD = """
+import os, sys
+with open('builds.log', 'a') as f:
+    f.write('build\\n')
+for base, _, names in os.walk('src'):
+    for name in sorted(names):
+        path = os.path.join(base, name)
+        if 'ROTO' in open(path).read():
+            print(f'./{path}:1:7')
+            print("Type error: Type 'string' is not assignable to type 'number'.")
+            sys.exit(1)
+os.makedirs('out/cache', exist_ok=True)
+open('out/app.js', 'w').write('ok')
+open('out/cache/big.bin', 'wb').write(b'0' * 100000)
+"""
+
+
+def config(**kwargs):
+    return Config(build_command=[sys.executable, 'build.py'],
+                  build_inputs=['src', 'public', 'tsconfig.json', 'package.json'], build_artifact='out', **kwargs)
+
+
+def builds(root):
+    with open(os.path.join(root, 'builds.log')) as f:
+        return len(f.readlines())
+
+
+def commit(repo, message):
+    git(repo, 'add', '-A')
+    git(repo, 'commit', '-q', '-m', message)
+
+
+def check(repo, **kwargs):
+    with GitSession(repo) as session:
+        return buildcache.check(session, config(), **kwargs)
+
+
+def test_build_is_skipped_when_the_pushed_tree_is_unchanged(repo):
+    write(repo, 'build.py', BUILD)
+    write(repo, '.gitignore', 'out/\nbuilds.log\nnode_modules/\n')
+    write(repo, '.dockerignore', 'public\n*.md\n')
+    write(repo, 'src/page.tsx', 'export const a = 1;\n')
+    write(repo, 'tsconfig.json', '{}\n')
+    commit(repo, 'base')
+
+    result, cached = check(repo)
+    assert result.ok and not cached and builds(repo) == 1
+
+    # Cambios fuera de las entradas o excluidos por .dockerignore no cuentan
+    write(repo, 'public/logo.svg', '<svg/>')
+    write(repo, 'NOTAS.md', 'x')
+    commit(repo, 'docs')
+    result, cached = check(repo)
+    assert result.ok and cached and builds(repo) == 1
+
+    # package.json define el script de build y las dependencias
+    assert 'package.json' in Config().build_inputs
+    write(repo, 'package.json', '{"scripts": {"build": "next build"}}\n')
+    os.makedirs(os.path.join(repo, 'node_modules'))
+    commit(repo, 'package')
+    result, cached = check(repo)
+    assert result.ok and not cached and builds(repo) == 2
+
+    # Un cambio sin commitear no es lo que se sube: acierto del commit
+    write(repo, 'src/page.tsx', 'export const a: number = "ROTO";\n')
+    result, cached = check(repo)
+    assert result.ok and cached and builds(repo) == 2
+
+    commit(repo, 'roto')
+    failed, cached = check(repo)
+    assert not failed.ok and not cached and builds(repo) == 3
+    assert failed.errors == ["src/page.tsx:1:7 type-error Type 'string' is not assignable to type 'number'."]
+
+    # Volver al contenido anterior reutiliza el build ya registrado, con su artefacto
+    write(repo, 'src/page.tsx', 'export const a = 1;\n')
+    commit(repo, 'arreglado')
+    result, cached = check(repo)
+    assert result.ok and cached and builds(repo) == 3
+    cache = buildcache.BuildCache(repo, config().build_cache_max_bytes)
+    os.rename(os.path.join(repo, 'out'), os.path.join(repo, 'out.old'))
+    assert cache.restore(result, repo)
+    assert os.path.exists(os.path.join(repo, 'out', 'app.js'))
+    assert not os.path.exists(os.path.join(repo, 'out', 'cache'))
+
+    # Con las entradas modificadas en disco el build corre pero no se guarda
+    write(repo, 'src/nuevo.ts', 'export const b = 1;\n')
+    commit(repo, 'nuevo')
+    write(repo, 'src/nuevo.ts', 'export const b = 2;\n')
+    result, cached = check(repo)
+    assert result.ok and not cached and result.log is None
+    git(repo, 'checkout', '--', 'src/nuevo.ts')
+    result, cached = check(repo)
+    assert not cached and result.log is not None and builds(repo) == 5
+    assert check(repo)[1]
+
+
+def test_lru_eviction_by_size(tmp_path):
+    root = str(tmp_path)
+    os.makedirs(os.path.join(root, '.git'))
+    # Cada entrada ocupa ~1.2 KB (log sin comprimir de 1000 bytes aleatorios)
+    cache = buildcache.BuildCache(root, max_bytes=4000)
+    for key in ('a' * 64, 'b' * 64, 'c' * 64):
+        assert cache.put(buildcache.BuildResult(key, False, 1.0), os.urandom(1000)) == []
+    # 'a' es la más antigua, pero volver a pedirla la marca como reciente
+    assert cache.get('a' * 64) is not None
+    evicted = cache.put(buildcache.BuildResult('d' * 64, True, 1.0), os.urandom(1000))
+    assert evicted == ['b' * 64]
+    assert sorted(k[0] for k in cache.index) == ['a', 'c', 'd'] and cache.total_bytes() <= 4000
+    assert not os.path.exists(cache.entry_dir('b' * 64))
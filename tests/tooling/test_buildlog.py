@@ -0,0 +1,68 @@
+import io
+
+from rent360push import buildlog
+
+from .conftest import write
+
+LOG = """[2025-10-16 12:00:01] rent360 | > next build
+[2025-10-16 12:00:02] rent360 | prisma:info Generated Prisma Client
+rent360 2025-10-16T12:00:03.123Z Failed to compile.
+rent360 2025-10-16T12:00:03.124Z
+rent360 2025-10-16T12:00:03.125Z ./src/app/page.tsx:12:5
+rent360 2025-10-16T12:00:03.126Z Type error: Property 'x' does not exist on type 'Y'.
+
+./src/lib/logger.ts
+12:5  Error: 'x' is assigned a value but never used.  @typescript-eslint/no-unused-vars
+45:1  Warning: React Hook useEffect has a missing dependency.  react-hooks/exhaustive-deps
+
+/workspace/src/lib/logger.ts(3,1): error TS2304: Cannot find name 'foo'.
+/workspace/src/lib/logger.ts(3,1): error TS2304: Cannot find name 'foo'.
+/workspace/src/lib/logger.ts(3,1): error TS2304: Cannot find name 'foo'.
+ERROR in ./src/app/layout.tsx 7:0-40
+Module not found: Error: Can't resolve '@/components/nope' in '/app/src/app'
+[tsl] ERROR in /app/src/lib/auth.ts(20,3)
+      TS2322: Type 'string' is not assignable to type 'number'.
+"""
+
+
+def parse(text, root=None, **kwargs):
+    return buildlog.parse_stream(io.BytesIO(text.encode('utf-8')), root, **kwargs)
+
+
+def test_extracts_dedupes_and_maps_to_repo(tmp_path):
+    root = str(tmp_path)
+    for rel in ('src/app/page.tsx', 'src/lib/logger.ts', 'src/app/layout.tsx', 'src/lib/auth.ts'):
+        write(root, rel, '')
+    report = parse(LOG, root)
+
+    assert report.failed
+    ranked = [(e.severity, e.location, e.code, e.count) for e in report.ranked()]
+    assert ranked == [
+        ('error', 'src/lib/logger.ts:3:1', 'TS2304', 3),
+        ('error', 'src/app/page.tsx:12:5', 'type-error', 1),
+        ('error', 'src/lib/logger.ts:12:5', '@typescript-eslint/no-unused-vars', 1),
+        ('error', 'src/app/layout.tsx:7', 'module-not-found', 1),
+        ('error', 'src/lib/auth.ts:20:3', 'TS2322', 1),
+        ('warning', 'src/lib/logger.ts:45:1', 'react-hooks/exhaustive-deps', 1),
+    ]
+    assert all(e.in_repo for e in report.errors)
+    assert report.ranked()[-2].message == "Type 'string' is not assignable to type 'number'."
+
+
+def test_bounded_lines_and_unique_errors():
+    huge = 'x' * (buildlog.MAX_LINE * 4) + ' src/a.ts(1,1): error TS1005: perdido\n'
+    lines = ''.join(f'src/f{i}.ts(1,1): error TS2304: nombre\n' for i in range(50))
+    report = parse(huge + lines, max_errors=10)
+    # El resto de la línea larga se descarta, no se interpreta como otra línea
+    assert report.lines == 51
+    assert len(report.errors) == 10 and report.dropped == 40
+    assert not any(e.code == 'TS1005' for e in report.errors)
+
+
+def test_saved_report_round_trip(repo):
+    report = parse(LOG, repo)
+    buildlog.save(repo, report)
+    loaded = buildlog.load(repo)
+    assert [e.key for e in loaded.ranked()] == [e.key for e in report.ranked()]
+    buildlog.clear(repo)
+    assert buildlog.load(repo) is None
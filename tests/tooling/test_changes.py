@@ -0,0 +1,128 @@
+import os
+import threading
+import time
+
+import pytest
+
+from rent360push import inotify
+from rent360push.changes import ChangeDetector, run_journal
+from rent360push.config import Config
+from rent360push.git import GitSession
+from rent360push.pipeline import UploadPipeline
+
+from .conftest import git, write
+
+
+def detect(repo):
+    with GitSession(repo) as session:
+        detector = ChangeDetector(session)
+        entries = detector.detect()
+        detector.save()
+        return detector.mode, sorted((e.index + e.worktree, e.path) for e in entries)
+
+
+def upload(repo, message='cambio'):
+    with GitSession(repo) as session:
+        detector = ChangeDetector(session)
+        result = UploadPipeline(session, Config(), detector=detector).run(message, push=False)
+        return detector.mode, result
+
+
+def age_tree(repo):
+    """Retrocede los mtime para salir de la ventana "racy" de la caché"""
+    past = time.time() - 10
+    for base, dirs, files in os.walk(repo):
+        dirs[:] = [d for d in dirs if d != '.git']
+        for name in files + dirs:
+            os.utime(os.path.join(base, name), (past, past))
+    os.utime(repo, (past, past))
+
+
+def test_detects_changes_without_git_status(repo):
+    write(repo, '.gitignore', 'build/\n*.log\n')
+    age_tree(repo)
+    assert detect(repo)[0] == 'full'
+    assert upload(repo, 'gitignore')[1].commit
+    assert detect(repo) == ('stat', [])
+
+    write(repo, 'src/mod0000/file000003.ts', 'editado\n')
+    os.remove(os.path.join(repo, 'src/mod0000/file000004.ts'))
+    write(repo, 'src/nuevo/dir/archivo.ts', 'nuevo\n')
+    write(repo, 'build/out.js', 'ignorado\n')
+    write(repo, 'debug.log', 'ignorado\n')
+    mode, entries = detect(repo)
+    assert mode == 'stat'
+    assert entries == [
+        (' D', 'src/mod0000/file000004.ts'),
+        (' M', 'src/mod0000/file000003.ts'),
+        ('??', 'src/nuevo/dir/archivo.ts'),
+    ]
+
+    mode, result = upload(repo)
+    assert mode == 'stat' and result.commit
+    assert git(repo, 'status', '--porcelain') == ''
+    # Lo recién escrito queda en la ventana "racy": se revisa otra vez, pero
+    # como el contenido no cambió no se genera un commit vacío
+    mode, result = upload(repo)
+    assert mode == 'stat' and result.ok and result.commit is None
+
+
+def test_new_directories_need_one_check_ignore(repo):
+    age_tree(repo)
+    detect(repo)
+    for n in range(200):
+        write(repo, f'src/nuevo{n % 2}/archivo{n:03d}.ts', 'nuevo\n')
+    with GitSession(repo) as session:
+        detector = ChangeDetector(session)
+        calls = []
+        run = session.run
+        session.run = lambda *args, **kwargs: calls.append(args[0]) or run(*args, **kwargs)
+        entries = detector.detect()
+    assert detector.mode == 'stat'
+    assert len([e for e in entries if e.worktree == '?']) == 200
+    # Uno para los candidatos de primer nivel y otro para los directorios nuevos
+    assert calls.count('check-ignore') == 2
+
+
+def test_foreign_index_change_forces_rebuild(repo):
+    detect(repo)
+    write(repo, 'a.txt', 'a\n')
+    git(repo, 'add', 'a.txt')
+    mode, entries = detect(repo)
+    assert mode == 'full'
+    assert entries == [('A ', 'a.txt')]
+
+
+def test_touched_but_identical_file_is_not_committed(repo):
+    age_tree(repo)
+    upload(repo)
+    head = git(repo, 'rev-parse', 'HEAD')
+    os.utime(os.path.join(repo, 'src/mod0000/file000001.ts'))
+    mode, result = upload(repo)
+    assert mode == 'stat' and result.ok and result.commit is None
+    assert git(repo, 'rev-parse', 'HEAD') == head
+
+
+@pytest.mark.skipif(not inotify.available(), reason='requiere inotify')
+def test_journal_limits_checks_to_reported_paths(repo):
+    stop = threading.Event()
+    watcher = threading.Thread(target=run_journal, args=(repo, stop.is_set), daemon=True)
+    watcher.start()
+    info = os.path.join(repo, '.git', 'rent360push', 'journal', 'watcher.json')
+    deadline = time.time() + 5
+    while not os.path.exists(info) and time.time() < deadline:
+        time.sleep(0.01)
+    try:
+        age_tree(repo)
+        detect(repo)
+        assert detect(repo) == ('journal', [])
+        write(repo, 'src/mod0001/file000035.ts', 'editado\n')
+        write(repo, 'src/extra/nuevo.ts', 'nuevo\n')
+        time.sleep(1.2)
+        assert detect(repo) == ('journal', [
+            (' M', 'src/mod0001/file000035.ts'),
+            ('??', 'src/extra/nuevo.ts'),
+        ])
+    finally:
+        stop.set()
+        watcher.join()
@@ -0,0 +1,91 @@
+import os
+
+from rent360push import codemod
+from rent360push.config import Config
+
+from .conftest import git, write
+
+ROUTE = """import { NextRequest } from 'next/server';
+import { ValidationError, handleError } from '@/lib/errors';
+import { logger } from '@/lib/logger';
+
+export async function GET(request: NextRequest) {
+  try {
+    return cargar();
+  } catch (error) {
+    logger.error('Error cargando datos:', error);
+    logger.error('Error con contexto', { error });
+    return handleError(error);
+  }
+}
+"""
+
+
+def read(root, rel):
+    with open(os.path.join(root, rel), encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def test_all_rules_applied_in_one_pass(repo):
+    write(repo, 'src/app/api/route.ts', ROUTE)
+    write(repo, 'src/lib/otro.tsx', 'export const x = handleError(1);\r\n')
+    result = codemod.run(repo, Config(), jobs=1)
+
+    assert result.paths == ['src/app/api/route.ts']
+    assert result.changes[0].rules == {
+        'logger-error-context': 1, 'handle-api-error-import': 1, 'handle-api-error-calls': 1,
+    }
+    text = read(repo, 'src/app/api/route.ts')
+    assert "import { ValidationError, handleApiError } from '@/lib/api-error-handler';" in text
+    assert ("logger.error('Error cargando datos:', "
+            "{ error: error instanceof Error ? error.message : String(error) });") in text
+    assert "logger.error('Error con contexto', { error });" in text
+    assert 'return handleApiError(error);' in text
+    # Sin import de @/lib/errors la regla de llamadas no aplica
+    assert read(repo, 'src/lib/otro.tsx') == 'export const x = handleError(1);\r\n'
+
+
+def test_tsx_keeps_import_and_calls_together(repo):
+    write(repo, 'src/app/page.tsx', ROUTE)
+    result = codemod.run(repo, Config(), jobs=1)
+
+    assert result.changes[0].rules == {'logger-error-context': 1}
+    text = read(repo, 'src/app/page.tsx')
+    assert "import { ValidationError, handleError } from '@/lib/errors';" in text
+    assert 'return handleError(error);' in text
+
+
+def test_dry_run_and_clean_cache(repo):
+    write(repo, 'src/a.ts', "logger.error('x', err);\n")
+    config = Config(codemod_rules=[{'name': 'var', 'pattern': 'var ', 'replace': 'let ', 'literal': True}])
+    dry = codemod.run(repo, config, dry_run=True, jobs=1)
+    assert dry.paths == ['src/a.ts']
+    assert "+logger.error('x', { error: err instanceof Error" in dry.changes[0].diff
+    assert read(repo, 'src/a.ts') == "logger.error('x', err);\n"
+
+    codemod.run(repo, config, jobs=1)
+    # El archivo reescrito se vuelve a leer una vez; luego queda como limpio
+    again = codemod.run(repo, config, jobs=1)
+    assert again.read == 1 and not again.changes
+    assert codemod.run(repo, config, jobs=1).read == 0
+
+    write(repo, 'src/b.js', 'var a = 1;\n')
+    only = codemod.run(repo, config, jobs=1)
+    assert only.read == 1 and only.changes[0].rules == {'var': 1}
+    assert read(repo, 'src/b.js') == 'let a = 1;\n'
+
+
+def test_upload_fix_commits_modified_paths(repo):
+    from rent360push import upload
+
+    write(repo, 'src/a.ts', "logger.error('x', err);\n")
+    write(repo, 'notas.md', 'sin commitear\n')
+    git(repo, 'add', '-A')
+    git(repo, 'commit', '-qm', 'base')
+    write(repo, 'src/a.ts', "logger.error('y', err);\n")
+    write(repo, 'src/b.ts', 'export const b = 1;\n')
+    write(repo, 'notas.md', 'cambio\n')
+
+    assert upload('fix: codemods', paths=['src/b.ts'], root=repo, push=False, verbose=False, verify=False, fix=True)
+    assert git(repo, 'show', '--name-only', '--format=', 'HEAD').split() == ['src/a.ts', 'src/b.ts']
+    assert 'String(err)' in read(repo, 'src/a.ts')
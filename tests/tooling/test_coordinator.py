@@ -0,0 +1,93 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from rent360push import coordinator
+
+from .conftest import git, write
+
+
+def test_burst_is_merged_behind_the_leader(repo):
+    batches = []
+
+    def run_batch(intents):
+        batches.append([i.message for i in intents])
+        time.sleep(0.3)
+        return {'ok': True, 'commit': coordinator.merge_messages(i.message for i in intents)}
+
+    results = {}
+
+    def invoke(n):
+        intent = coordinator.Intent(f'fix: cambio {n}', paths=[f'src/{n}.ts'])
+        results[n] = coordinator.submit(repo, intent, run_batch)
+
+    threads = [threading.Thread(target=invoke, args=(n,)) for n in range(6)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.02)
+    for thread in threads:
+        thread.join()
+
+    assert sorted(m for batch in batches for m in batch) == [f'fix: cambio {n}' for n in range(6)]
+    # El primero va solo; los que llegan mientras tanto se juntan
+    assert len(batches) <= 3
+    assert all(r['ok'] for r in results.values())
+    merged = max(batches, key=len)
+    assert results[int(merged[0][-1])]['commit'].startswith(f'{merged[0]} (+{len(merged) - 1})')
+    assert not [n for n in os.listdir(coordinator._queue(repo)) if not n.endswith('.tmp')]
+
+
+def test_orphaned_intents_are_recovered(repo):
+    # Un líder que murió después de tomar un pedido
+    lost = coordinator.Intent('fix: perdido')
+    coordinator.enqueue(repo, lost)
+    assert [i.id for i in coordinator.claim(repo)] == [lost.id]
+
+    seen = []
+    result = coordinator.submit(repo, coordinator.Intent('fix: nuevo'),
+                                lambda intents: seen.append(len(intents)) or {'ok': True})
+    assert result['ok'] and seen == [2]
+    assert coordinator._take_result(repo, lost)['batch'] == 2
+
+
+def test_concurrent_uploads_do_not_fight_over_index_lock(repo):
+    script = (
+        'import sys; from rent360push import upload; '
+        'sys.exit(0 if upload(sys.argv[1], paths=[sys.argv[2]], root=sys.argv[3], verbose=False, verify=False) else 1)'
+    )
+    before = int(git(repo, 'rev-list', '--count', 'HEAD'))
+    env = {**os.environ, 'PYTHONPATH': os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))}
+    procs = []
+    for n in range(4):
+        write(repo, f'src/burst{n}.ts', f'export const n = {n};\n')
+        procs.append(subprocess.Popen(
+            [sys.executable, '-c', script, f'feat: ráfaga {n}', f'src/burst{n}.ts', repo], env=env,
+        ))
+    assert [p.wait(timeout=60) for p in procs] == [0, 0, 0, 0]
+
+    committed = git(repo, 'log', '--name-only', '--format=', f'HEAD~{int(git(repo, "rev-list", "--count", "HEAD")) - before}..HEAD')
+    assert sorted(committed.split()) == [f'src/burst{n}.ts' for n in range(4)]
+    assert int(git(repo, 'rev-list', '--count', 'HEAD')) - before <= 4
+    assert git(repo, 'rev-parse', 'HEAD') == git(repo, 'rev-parse', 'origin/master')
+
+
+def test_queued_no_push_intent_is_never_pushed(repo):
+    from rent360push import upload
+
+    remote = git(repo, 'rev-parse', 'origin/master').strip()
+    write(repo, 'src/local.ts', 'export const local = 1;\n')
+    write(repo, 'src/leader.ts', 'export const leader = 1;\n')
+    # Llegó antes que el líder: su grupo sube primero, con sus opciones
+    queued = coordinator.Intent('wip: solo local', paths=['src/local.ts'], push=False, verify=False)
+    coordinator.enqueue(repo, queued)
+
+    # El push del líder arrastraría el commit sin push: se rechaza
+    assert not upload('feat: líder', paths=['src/leader.ts'], root=repo, verbose=False, verify=False)
+
+    result = coordinator._take_result(repo, queued)
+    assert result['ok'] and result['batch'] == 1 and not result['pushed_to']
+    assert git(repo, 'log', '-1', '--name-only', '--format=%s').split() == ['wip:', 'solo', 'local', 'src/local.ts']
+    assert git(repo, 'ls-remote', f'{repo}.remote.git', 'refs/heads/master').split()[0] == remote
+    assert 'src/leader.ts' in git(repo, 'status', '--porcelain')
@@ -0,0 +1,108 @@
+from rent360push import docker
+
+from .conftest import write
+
+DOCKERIGNORE = """
+# comentario
+node_modules
+*.md
+!README.md
+docs/
+**/*.test.ts
+.vscode/*
+!.vscode/extensions.json
+build/
+!build/keep.txt
+"""
+
+
+def test_dockerignore_uses_docker_semantics():
+    ignore = docker.DockerIgnore(docker.parse(DOCKERIGNORE.splitlines()))
+    excluded = {
+        'node_modules/react/index.js': True,
+        # Anclados a la raíz, a diferencia de .gitignore
+        'src/node_modules/x.js': False,
+        'NOTAS.md': True,
+        'src/NOTAS.md': False,
+        'README.md': False,
+        'docs/guia.txt': True,
+        'src/lib/a.test.ts': True,
+        'a.test.ts': True,
+        'src/lib/a.ts': False,
+        '.vscode/settings.json': True,
+        '.vscode/extensions.json': False,
+        'build/out.js': True,
+        'build/keep.txt': False,
+    }
+    assert {path: ignore.excluded(path) for path in excluded} == excluded
+    assert ignore.can_prune('node_modules') and ignore.can_prune('docs')
+    assert not ignore.can_prune('build') and not ignore.can_prune('src')
+
+
+def test_context_files_prunes_excluded_dirs(tmp_path):
+    root = str(tmp_path)
+    write(root, '.dockerignore', DOCKERIGNORE)
+    for rel in ('src/a.ts', 'src/a.test.ts', 'node_modules/x/y.js', 'README.md', 'NOTAS.md', 'build/keep.txt',
+                'build/out.js'):
+        write(root, rel, 'x' * 10)
+    files = dict(docker.context_files(root))
+    assert sorted(files) == ['.dockerignore', 'README.md', 'build/keep.txt', 'src/a.ts']
+    assert files['src/a.ts'] == 10
+    assert sorted(dict(docker.context_files(root, paths=['src', 'NOTAS.md']))) == ['src/a.ts']
+
+
+DOCKERFILE = """
+FROM node:18-alpine AS base
+WORKDIR /app
+# dependencias
+COPY package*.json ./
+COPY prisma ./prisma/
+
+FROM base AS deps
+RUN npm ci --only=production \\
+    && npm cache clean --force
+
+FROM base AS builder
+COPY --from=deps /app/node_modules ./node_modules
+COPY . .
+RUN npm run build
+
+FROM base AS runner
+RUN adduser --system nextjs
+COPY --from=builder --chown=nextjs:nodejs /app/.next ./.next
+COPY public ./public
+"""
+
+
+def test_predicts_invalidated_layers():
+    stages = docker.parse_dockerfile(DOCKERFILE)
+    assert [(s.label, s.base) for s in stages] == [('base', 'node:18-alpine'), ('deps', 'base'),
+                                                  ('builder', 'base'), ('runner', 'base')]
+    install = stages[1].instructions[0]
+    assert install.line == 9 and install.installs_dependencies
+    ignore = docker.DockerIgnore(docker.parse(['*.md', 'public']))
+
+    def busted(*paths):
+        prediction = docker.predict(stages, paths, ignore)
+        return [layer.instruction.line for layer in prediction.invalidated], bool(prediction.install_busted)
+
+    # El esquema de Prisma se copia antes de `npm ci`: reinstala todo
+    assert busted('prisma/schema.prisma') == ([6, 9, 13, 14, 15, 18, 19, 20], True)
+    assert busted('package-lock.json') == ([5, 6, 9, 13, 14, 15, 18, 19, 20], True)
+    # El código fuente solo invalida desde `COPY . .`, y la etapa final por el --from
+    assert busted('src/app/page.tsx') == ([14, 15, 19, 20], False)
+    # Lo excluido por .dockerignore no invalida nada, aunque un COPY lo nombre
+    assert busted('NOTAS.md', 'public/logo.png') == ([], False)
+    assert [str(i) for i in docker.unmatched_copies(stages, ['package.json', 'prisma/schema.prisma'])] == [
+        'COPY public ./public']
+
+
+def test_context_report_groups_by_directory(tmp_path):
+    root = str(tmp_path)
+    write(root, '.dockerignore', 'node_modules\n')
+    for rel, size in [('src/app/a.ts', 100), ('src/lib/b.ts', 50), ('INFORME.md', 7), ('node_modules/x.js', 999)]:
+        write(root, rel, 'x' * size)
+    files, total, groups = docker.context_report(root)
+    assert (files, total) == (4, 100 + 50 + 7 + len('node_modules\n'))
+    assert groups == {'src/': [2, 150], '*': [2, 20]}
+    assert docker.context_report(root, depth=2)[2] == {'src/app/': [1, 100], 'src/lib/': [1, 50], '*': [2, 20]}
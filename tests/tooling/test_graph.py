@@ -0,0 +1,53 @@
+import json
+
+from rent360push.graph import ImportGraph
+
+from .conftest import write
+
+
+def make_tree(repo):
+    write(repo, 'tsconfig.json', json.dumps({'compilerOptions': {'baseUrl': '.', 'paths': {'@/*': ['./src/*']}}}))
+    write(repo, 'services/tsconfig.json', json.dumps({'extends': '../tsconfig.json'}))
+    write(repo, 'services/api-gateway/tsconfig.json', json.dumps(
+        {'compilerOptions': {'baseUrl': '.', 'paths': {'@/*': ['../../src/*']}}}
+    ))
+    write(repo, 'src/lib/db.ts', 'export const db = {};\n')
+    write(repo, 'src/lib/auth.ts', "import { db } from './db';\n")
+    write(repo, 'src/app/api/route.ts', "import { auth } from '@/lib/auth';\n")
+    write(repo, 'services/api-gateway/src/index.ts', "import { db } from '@/lib/db';\n")
+    write(repo, 'services/auth-service/src/index.ts', "const { auth } = require('@/lib/auth');\n")
+
+
+def test_resolves_aliases_across_src_and_services(repo):
+    make_tree(repo)
+    graph = ImportGraph.load(repo)
+    assert graph.dependents(['src/lib/db.ts'], transitive=False) == {
+        'src/lib/db.ts', 'src/lib/auth.ts', 'services/api-gateway/src/index.ts'
+    }
+    assert graph.dependents(['src/lib/db.ts']) >= {'src/app/api/route.ts', 'services/auth-service/src/index.ts'}
+
+
+def test_only_modified_files_are_reparsed(repo):
+    make_tree(repo)
+    first = ImportGraph.load(repo)
+    assert first.stats['parsed'] == first.stats['files']
+    assert ImportGraph.load(repo).stats['parsed'] == 0
+
+    write(repo, 'src/app/api/route.ts', "import { db } from '@/lib/db';\n")
+    write(repo, 'src/app/nueva.tsx', "import '@/app/api/route';\n")
+    graph = ImportGraph.load(repo)
+    assert graph.stats['parsed'] == 2
+    assert graph.dependencies('src/app/api/route.ts') == ['src/lib/db.ts']
+    assert 'src/app/nueva.tsx' in graph.dependents(['src/lib/db.ts'])
+    assert 'src/app/api/route.ts' not in graph.dependents(['src/lib/auth.ts'])
+
+
+def test_parallel_parse_matches_serial(repo, monkeypatch):
+    from rent360push import filecache
+
+    make_tree(repo)
+    serial = ImportGraph.load(repo, jobs=1).forward
+    monkeypatch.setattr(filecache, 'PARALLEL_THRESHOLD', 1)
+    monkeypatch.setattr(filecache, 'CHUNK_SIZE', 2)
+    write(repo, '.git/rent360push/imports.json', '{}')
+    assert ImportGraph.load(repo, jobs=2).forward == serial
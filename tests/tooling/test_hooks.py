@@ -0,0 +1,217 @@
+import json
+import os
+import stat
+import subprocess
+import sys
+import time
+
+from rent360push import hooks
+from rent360push.config import Config
+from rent360push.git import GitSession
+from rent360push.pipeline import UploadPipeline
+from rent360push.plugins import Registry
+
+from .conftest import git, write
+
+# "Linter" de prueba: anota qué archivos revisó y falla con los que dicen MAL
+LINT = """
+import sys, time
+time.sleep(float(sys.argv[1]))
+with open('hook.log', 'a') as f:
+    f.write(' '.join(sorted(sys.argv[3:])) + '\\n')
+bad = [p for p in sys.argv[3:] if 'MAL' in open(p).read()]
+for p in bad:
+    print(f'{p}: {sys.argv[2]} MAL')
+sys.exit(1 if bad else 0)
+"""
+
+# Corrector de prueba: reemplaza MAL por BIEN en el lugar
+FIX = """
+import sys
+for path in sys.argv[1:]:
+    text = open(path).read()
+    if 'MAL' in text:
+        open(path, 'w').write(text.replace('MAL', 'BIEN'))
+"""
+
+
+def config(delay=0.0, **kwargs):
+    return Config(validate=False, guard=False, hook_stages=[
+        {'name': 'lint', 'command': [sys.executable, 'lint.py', str(delay), 'lint'], 'files': ['src/**/*.ts'],
+         'config': ['lint.json']},
+        {'name': 'tree', 'command': [sys.executable, 'lint.py', str(delay), 'tree'], 'files': ['*.ts'],
+         'per_file': False},
+    ], **kwargs)
+
+
+def run(repo, cfg=None, **kwargs):
+    if os.path.exists(os.path.join(repo, 'hook.log')):
+        os.remove(os.path.join(repo, 'hook.log'))
+    with GitSession(repo) as session:
+        results, _ = hooks.run(session, cfg or config(), **kwargs)
+    try:
+        with open(os.path.join(repo, 'hook.log')) as f:
+            calls = f.read().splitlines()
+    except FileNotFoundError:
+        calls = []
+    return {r.stage: r for r in results}, calls
+
+
+def stage(repo, *paths):
+    git(repo, 'add', '--', *paths)
+
+
+def test_passes_are_cached_by_content(repo):
+    write(repo, 'lint.py', LINT)
+    write(repo, 'lint.json', '{}')
+    write(repo, 'src/a.ts', 'export const a = 1;\n')
+    write(repo, 'src/b.ts', 'export const b = 1;\n')
+    stage(repo, 'src/a.ts', 'src/b.ts')
+
+    results, calls = run(repo)
+    assert results['lint'].ok and sorted(results['lint'].checked) == ['src/a.ts', 'src/b.ts']
+    assert results['tree'].ok and len(calls) == 2
+    # Mismo índice: nada se vuelve a ejecutar
+    results, calls = run(repo)
+    assert calls == [] and results['lint'].cached == 2 and results['lint'].checked == []
+
+    # Solo se revisa lo que cambió; la etapa de árbol vuelve a correr entera
+    write(repo, 'src/b.ts', 'export const b = 2;\n')
+    stage(repo, 'src/b.ts')
+    results, calls = run(repo)
+    assert results['lint'].checked == ['src/b.ts'] and results['lint'].cached == 1
+    assert 'src/b.ts' in calls and len(calls) == 2
+
+    # Volver a un contenido ya aprobado es un acierto de caché
+    write(repo, 'src/b.ts', 'export const b = 1;\n')
+    stage(repo, 'src/b.ts')
+    assert run(repo)[1] == []
+
+    # Cambiar la configuración de la etapa invalida sus pasadas
+    write(repo, 'lint.json', '{"strict": true}')
+    stage(repo, 'lint.json')
+    results, _ = run(repo, all_files=True)
+    assert 'src/b.ts' in results['lint'].checked
+
+
+def test_tree_stage_runs_when_only_its_config_is_staged(repo):
+    write(repo, 'lint.py', LINT)
+    write(repo, 'tsconfig.json', '{}')
+    write(repo, 'src/a.ts', 'export const a = 1;\n')
+    stage(repo, 'lint.py', 'tsconfig.json', 'src/a.ts')
+    git(repo, 'commit', '-q', '-m', 'base')
+    cfg = Config(validate=False, guard=False, hook_stages=[
+        {'name': 'tree', 'command': [sys.executable, 'lint.py', '0', 'tree'], 'files': ['*.ts'],
+         'per_file': False, 'config': ['tsconfig.json']},
+    ])
+
+    write(repo, 'tsconfig.json', '{"strict": true}')
+    stage(repo, 'tsconfig.json')
+    results, calls = run(repo, cfg)
+    assert len(calls) == 1 and 'src/a.ts' in results['tree'].checked
+    # Otro archivo que no es de la etapa no la dispara
+    write(repo, 'README.md', '# cambio\n')
+    stage(repo, 'README.md')
+    git(repo, 'commit', '-q', '-m', 'strict')
+    write(repo, 'README.md', '# otro\n')
+    stage(repo, 'README.md')
+    assert run(repo, cfg)[1] == []
+
+
+def test_failures_are_not_cached_and_the_index_is_checked(repo):
+    write(repo, 'lint.py', LINT)
+    write(repo, 'src/a.ts', 'export const a = "MAL";\n')
+    stage(repo, 'lint.py', 'src/a.ts')
+    results, _ = run(repo)
+    assert not results['lint'].ok and 'src/a.ts: lint MAL' in results['lint'].output
+    assert run(repo)[0]['lint'].checked == ['src/a.ts']
+
+    # Corregido en disco pero sin preparar: se revisa lo que se commitea
+    # (en un worktree con el árbol del índice), que sigue mal
+    write(repo, 'src/a.ts', 'export const a = 1;\n')
+    results, calls = run(repo)
+    assert not results['lint'].ok and 'src/a.ts: lint MAL' in results['lint'].output and calls == []
+
+    # Y al revés: lo preparado está bien aunque en disco no
+    stage(repo, 'src/a.ts')
+    write(repo, 'src/a.ts', 'export const a = "MAL";\n')
+    assert run(repo)[0]['lint'].ok
+    assert run(repo)[0]['lint'].checked == []
+
+
+def test_fix_restages_only_fully_staged_files(repo):
+    write(repo, 'lint.py', LINT)
+    write(repo, 'fix.py', FIX)
+    cfg = Config(validate=False, guard=False, hook_stages=[
+        {'name': 'lint', 'command': [sys.executable, 'lint.py', '0', 'lint'], 'files': ['src/**/*.ts'],
+         'fix': [sys.executable, 'fix.py']},
+    ])
+    write(repo, 'src/a.ts', 'export const a = "MAL";\n')
+    write(repo, 'src/b.ts', 'export const b = "MAL";\n')
+    stage(repo, 'lint.py', 'fix.py', 'src/a.ts', 'src/b.ts')
+    # b.ts tiene además cambios sin preparar: corregirlo los mezclaría
+    write(repo, 'src/b.ts', 'export const b = "MAL"; // a medias\n')
+
+    results, _ = run(repo, cfg, fix=True)
+    assert results['lint'].fixed == ['src/a.ts']
+    assert git(repo, 'show', ':src/a.ts') == 'export const a = "BIEN";\n'
+    assert git(repo, 'show', ':src/b.ts') == 'export const b = "MAL";\n'
+    assert not results['lint'].ok and 'src/b.ts: lint MAL' in results['lint'].output
+    assert 'src/a.ts' not in results['lint'].output
+
+    # El fix de a.ts no cambió nada más: queda en caché; b.ts sigue revisándose
+    git(repo, 'checkout', '--', 'src/b.ts')
+    results, _ = run(repo, cfg, fix=True)
+    assert results['lint'].ok and results['lint'].fixed == ['src/b.ts']
+    assert run(repo, cfg, fix=True)[0]['lint'].checked == []
+
+
+def test_git_commit_hook_checks_partially_staged_files(repo):
+    # Como husky: git exporta GIT_INDEX_FILE (relativo) al hook
+    package_parent = os.path.dirname(os.path.dirname(os.path.abspath(hooks.__file__)))
+    write(repo, '.git/hooks/pre-commit', f"""#!/bin/sh
+PYTHONPATH="{package_parent}" exec "{sys.executable}" -m rent360push hooks run --fix
+""")
+    os.chmod(os.path.join(repo, '.git/hooks/pre-commit'), stat.S_IRWXU)
+    write(repo, 'lint.py', LINT)
+    write(repo, '.rent360push.json', json.dumps({'hook_stages': [
+        {'name': 'lint', 'command': [sys.executable, 'lint.py', '0', 'lint'], 'files': ['src/**/*.ts']},
+    ]}))
+    write(repo, 'src/a.ts', 'export const a = "MAL";\n')
+    stage(repo, 'lint.py', '.rent360push.json', 'src/a.ts')
+    write(repo, 'src/a.ts', 'export const a = 1;\n')
+
+    def commit():
+        # git manda la salida del hook a stderr
+        proc = subprocess.run(['git', 'commit', '-q', '-m', 'feat: a'], cwd=repo, capture_output=True, text=True)
+        return proc.returncode, proc.stdout + proc.stderr
+
+    # Se revisa lo preparado en un worktree del pool, que sigue mal
+    code, output = commit()
+    assert code == 1 and 'src/a.ts: lint MAL' in output and 'Traceback' not in output
+
+    stage(repo, 'src/a.ts')
+    write(repo, 'src/a.ts', 'export const a = "MAL"; // a medias\n')
+    code, output = commit()
+    assert code == 0, output
+    assert git(repo, 'show', 'HEAD:src/a.ts') == 'export const a = 1;\n'
+
+
+def test_stages_run_concurrently_before_the_commit(repo):
+    write(repo, 'lint.py', LINT)
+    write(repo, 'src/a.ts', 'export const a = "MAL";\n')
+    cfg = config(delay=0.6, hook_jobs=2)
+    stage(repo, 'src/a.ts')
+    start = time.perf_counter()
+    results, _ = run(repo, cfg)
+    assert time.perf_counter() - start < 1.1
+    assert not results['lint'].ok and results['tree'].ok
+
+    # En la subida el plugin pre_commit frena el commit
+    steps = []
+    with GitSession(repo) as session:
+        head = session.resolve('HEAD')
+        result = UploadPipeline(session, cfg, on_step=steps.append,
+                                plugins=Registry(cfg, entry_points=False)).run('feat: mal', push=False)
+        assert not result.ok and steps[-1].name == 'hooks' and session.resolve('HEAD') == head
+    assert 'src/a.ts: lint MAL' in steps[-1].detail
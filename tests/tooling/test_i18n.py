@@ -0,0 +1,119 @@
+import json
+import os
+
+from rent360push import i18n
+from rent360push.config import Config
+from rent360push.git import GitSession
+from rent360push.pipeline import UploadPipeline
+from rent360push.plugins import Registry
+
+from .conftest import git, write
+
+ES = {
+    'common': {'save': 'Guardar', 'greeting': 'Hola {nombre}', 'items': '{count, plural, one {# ítem} other {# ítems}}'},
+    'status': {'active': 'Activo', 'inactive': 'Inactivo'},
+    'validation': {'required': 'Obligatorio', 'min': 'Mínimo {min}'},
+    'features': {'title': 'Funciones', 'list': ['a', 'b']},
+    'unused': 'Sin uso',
+}
+EN = {
+    'common': {'save': 'Save', 'greeting': 'Hello {name}', 'items': '{count, plural, one {# item} other {# items}}'},
+    'status': {'active': 'Active', 'inactive': 'Inactive'},
+    'validation': {'required': 'Required'},
+    'features': {'title': 'Features', 'list': ['a', 'b']},
+    'unused': 'Unused',
+}
+
+PAGE = """
+import { useTranslations } from 'next-intl';
+import { useTranslation, useCommonTranslation } from '@/hooks/useTranslation';
+
+export function Header({ state }) {
+  const t = useTranslations('common');
+  const { t: tr, tv } = useTranslation();
+  return [t('save'), t.rich('greeting'), tv('required'), tr(`status.${state}`), t('missing')];
+}
+
+export async function Page() {
+  const t = await getTranslations({ locale: 'es' });
+  const { t: common } = useCommonTranslation();
+  return [t('features.title'), t.raw('features'), common('items')];
+}
+"""
+
+
+def catalogs(root, es=ES, en=EN):
+    write(root, 'messages/es.json', json.dumps(es))
+    write(root, 'messages/en.json', json.dumps(en))
+
+
+def test_catalogs_are_compared_key_by_key(tmp_path):
+    root = str(tmp_path)
+    os.makedirs(os.path.join(root, '.git'))
+    catalogs(root)
+    assert i18n.flatten({'a': {'b': 'x', 'c': [1]}}) == {'a.b': 'x', 'a.c': '[1]'}
+    assert i18n.arguments('{count, plural, one {# ítem} other {{count} de {total}}}') == ['count', 'total']
+
+    report = i18n.check(root, Config())
+    assert report.catalogs == {'es': 10, 'en': 9}
+    assert report.missing == {'en': ['validation.min']}
+    assert report.placeholders == {'common.greeting': {'es': ['nombre'], 'en': ['name']}}
+    assert i18n.describe_arguments(report.placeholders['common.greeting']) == 'es {nombre} / en {name}'
+
+    write(root, 'messages/en.json', '{"common": ')
+    report = i18n.check(root, Config())
+    assert report.errors and 'JSON inválido' in report.errors[0] and report.problems
+
+
+def test_usages_are_resolved_and_cached_per_file(tmp_path):
+    root = str(tmp_path)
+    os.makedirs(os.path.join(root, '.git'))
+    catalogs(root, en=ES)
+    write(root, 'src/app/page.tsx', PAGE)
+    write(root, 'src/lib/util.ts', 'export const t = (x) => x;\nt("no.es.traduccion");\n')
+
+    report = i18n.check(root, Config())
+    assert [(u.path, u.line, u.key) for u in report.undefined] == [('src/app/page.tsx', 8, 'common.missing')]
+    # common.save, common.greeting, validation.required, features.title,
+    # features (objeto), common.items y common.missing
+    assert report.used == 7 and report.dynamic == ['status']
+    assert report.orphans == ['unused', 'validation.min']
+    assert report.files == 2 and report.rescanned == 2
+
+    # Sin cambios no se relee nada; solo el componente editado
+    assert i18n.check(root, Config()).rescanned == 0
+    write(root, 'src/app/page.tsx', PAGE.replace("t('missing')", "t('save')"))
+    report = i18n.check(root, Config())
+    assert report.rescanned == 1 and report.undefined == []
+
+
+def test_pre_push_blocks_only_what_the_push_introduces(repo):
+    catalogs(repo, en=ES)
+    write(repo, 'src/viejo.tsx', "const t = useTranslations('common');\nt('roto');\n")
+    git(repo, 'add', '-A')
+    git(repo, 'commit', '-q', '-m', 'base')
+    git(repo, 'push', '-q', 'origin', 'HEAD:master')
+    config = Config(validate=False, guard=False, hooks=False, docker_check=False)
+
+    def upload(message):
+        steps = []
+        with GitSession(repo) as session:
+            result = UploadPipeline(session, config, on_step=steps.append,
+                                    plugins=Registry(config, entry_points=False)).run(message)
+        return result, {s.name: s for s in steps}
+
+    # El problema viejo (src/viejo.tsx) se informa pero no frena
+    write(repo, 'src/nuevo.tsx', "const t = useTranslations('common');\nt('save');\n")
+    result, steps = upload('feat: nuevo')
+    assert result.ok and steps['i18n'].ok and '1 problemas' in steps['i18n'].detail
+
+    write(repo, 'src/nuevo.tsx', "const t = useTranslations('common');\nt('guardar');\n")
+    result, steps = upload('feat: clave inexistente')
+    assert not result.ok and 'src/nuevo.tsx:2 common.guardar' in steps['i18n'].detail
+    git(repo, 'reset', '-q', '--hard', 'origin/master')
+
+    catalogs(repo)
+    result, steps = upload('feat: catálogo incompleto')
+    assert not result.ok
+    assert 'falta en en: validation.min' in steps['i18n'].detail
+    assert 'common.greeting: es {nombre} / en {name}' in steps['i18n'].detail
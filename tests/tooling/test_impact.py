@@ -0,0 +1,63 @@
+from rent360push import impact
+from rent360push.config import Config
+from rent360push.git import GitSession
+from rent360push.pipeline import UploadPipeline
+
+from .conftest import git, write
+
+
+def test_classify_with_default_globs():
+    result = impact.classify([
+        'INFORME_FINAL.md', 'push-final.cmd', 'docs/guia/uso.md', 'rent360push/cli.py',
+        'src/app/page.tsx', 'src/docs/notas.md', 'package.json', 'scripts/migrate-production.js',
+    ], Config())
+    assert result.no_build == ['INFORME_FINAL.md', 'push-final.cmd', 'docs/guia/uso.md', 'rent360push/cli.py']
+    assert result.build == ['src/app/page.tsx', 'src/docs/notas.md', 'package.json', 'scripts/migrate-production.js']
+
+
+def test_glob_syntax():
+    regex = impact.compile_globs(['docs/*.md', 'a/**/b.txt'])
+    assert regex.match('docs/x.md') and not regex.match('docs/sub/x.md')
+    assert regex.match('a/b.txt') and regex.match('a/x/y/b.txt')
+    assert impact.compile_globs([]) is None
+
+
+def upload(repo, config, message, deploy=False):
+    with GitSession(repo) as session:
+        return UploadPipeline(session, config, classify=not deploy).run(message)
+
+
+def test_docs_only_push_is_batched_until_a_build_change(repo):
+    remote = repo + '.remote.git'
+    before = git(remote, 'rev-parse', 'master')
+    write(repo, 'INFORME.md', '# informe\n')
+    result = upload(repo, Config(validate=False, build_minutes=7), 'docs')
+    assert result.ok and result.pushed_to is None
+    assert 'sin build' in result.steps[-1].detail
+    assert git(remote, 'rev-parse', 'master') == before
+    assert impact.saved(repo) == {'builds': 1, 'minutes': 7}
+    # Volver a correr sin commit nuevo (modo lote) no suma otro build evitado
+    assert upload(repo, Config(validate=False, build_minutes=7), 'docs').commit is None
+    assert not impact.record_skip(repo, Config(), impact.Impact(), result.commit, 'batch')
+    assert impact.saved(repo) == {'builds': 1, 'minutes': 7}
+
+    # El siguiente cambio de código lleva también el commit de docs
+    write(repo, 'src/app/page.tsx', 'export default 1;\n')
+    result = upload(repo, Config(validate=False), 'codigo')
+    assert result.ok and result.pushed_to == 'origin/master'
+    assert git(remote, 'rev-parse', 'master') == git(repo, 'rev-parse', 'HEAD')
+    assert 'INFORME.md' in git(remote, 'ls-tree', '--name-only', 'master')
+
+
+def test_docs_only_push_goes_to_side_branch(repo):
+    remote = repo + '.remote.git'
+    before = git(remote, 'rev-parse', 'master')
+    write(repo, 'deploy.ps1', 'echo hola\n')
+    config = Config(validate=False, non_build_push='side-branch', non_build_branch='docs')
+    result = upload(repo, config, 'script')
+    assert result.ok and result.pushed_to == 'origin/docs'
+    assert git(remote, 'rev-parse', 'master') == before
+    assert git(remote, 'rev-parse', 'docs') == git(repo, 'rev-parse', 'HEAD')
+
+    write(repo, 'otro.md', 'x\n')
+    assert upload(repo, config, 'forzado', deploy=True).pushed_to == 'origin/master'
@@ -0,0 +1,161 @@
+import json
+import os
+import sys
+
+from rent360push import jestshard
+from rent360push.config import Config
+
+from .conftest import write
+
+# Jest de prueba: cada "test" es un JSON con lo que tarda, si falla y qué
+# sentencias de src/lib.ts cubre
+FAKE_JEST = """
+import json, os, sys, time
+args = sys.argv[1:]
+config = args[args.index('--config') + 1]
+tests_dir = 'tests' if config == 'jest.config.js' else 'itests'
+if '--listTests' in args:
+    for name in sorted(os.listdir(tests_dir)):
+        print(os.path.abspath(os.path.join(tests_dir, name)))
+    sys.exit(0)
+if '--showConfig' in args:
+    thresholds = json.load(open('thresholds.json')) if os.path.exists('thresholds.json') else {}
+    print(json.dumps({'configs': [], 'globalConfig': {'coverageThreshold': thresholds}}))
+    sys.exit(0)
+opts = dict(a[2:].split('=', 1) for a in args if a.startswith('--') and '=' in a)
+files = args[args.index('--runTestsByPath') + 1:]
+results, covered = [], set()
+for path in files:
+    start = time.time() * 1000
+    spec = json.load(open(path))
+    time.sleep(spec['sleep'])
+    covered.update(spec.get('covers', []))
+    status = 'failed' if spec.get('fail') else 'passed'
+    results.append({'name': os.path.abspath(path), 'status': status, 'startTime': start,
+                    'endTime': time.time() * 1000, 'message': 'expect(received).toBe(expected)' * spec.get('fail', 0),
+                    'assertionResults': [{'status': status}, {'status': 'passed'}]})
+with open(opts['outputFile'], 'w') as f:
+    json.dump({'testResults': results}, f)
+if '--coverage' in args:
+    assert opts['coverageThreshold'] == '{}'
+    os.makedirs(opts['coverageDirectory'], exist_ok=True)
+    loc = lambda i: {'start': {'line': i // 2 + 1, 'column': 0}, 'end': {'line': i // 2 + 1, 'column': 5}}
+    lib = os.path.abspath('src/lib.ts')
+    cov = {lib: {'path': lib, 'statementMap': {str(i): loc(i) for i in range(4)},
+           'fnMap': {}, 'branchMap': {}, 's': {str(i): int(i in covered) for i in range(4)}, 'f': {},
+           'b': {'0': [int(0 in covered), int(3 in covered)]}}}
+    with open(os.path.join(opts['coverageDirectory'], 'coverage-final.json'), 'w') as f:
+        json.dump(cov, f)
+sys.exit(1 if any(r['status'] == 'failed' for r in results) else 0)
+"""
+
+CONFIG = Config(jest_command=[sys.executable, 'fakejest.py'])
+
+
+def project(tmp_path, tests):
+    root = str(tmp_path)
+    os.makedirs(os.path.join(root, '.git'))
+    write(root, 'fakejest.py', FAKE_JEST)
+    for rel, spec in tests.items():
+        write(root, rel, json.dumps(spec))
+    return root
+
+
+def test_lpt_uses_recorded_durations(tmp_path):
+    loads = jestshard.lpt([('a', 8), ('b', 5), ('c', 4), ('d', 3), ('e', 2)], 2)
+    assert loads == [(11, ['a', 'd']), (11, ['b', 'c', 'e'])]
+    assert jestshard.lpt([('a', 1)], 4) == [(1, ['a'])]
+
+    root = project(tmp_path, {})
+    timings = jestshard.Timings(root)
+    timings.record('unit', 'tests/lento.test.ts', 9.0)
+    timings.record('unit', 'tests/medio.test.ts', 3.0)
+    timings.record('unit', 'tests/rapido.test.ts', 1.0)
+    timings.record('unit', 'tests/rapido.test.ts', 2.0)
+    assert timings.data['unit']['tests/rapido.test.ts'] == {'mean': 1.5, 'runs': 2}
+    # Sin historia: la mediana de los conocidos
+    assert timings.estimate('unit', 'tests/nuevo.test.ts') == 3.0
+    assert timings.estimate('otra', 'tests/nuevo.test.ts') == jestshard.DEFAULT_SECONDS
+
+    files = {'unit': ['tests/lento.test.ts', 'tests/medio.test.ts', 'tests/rapido.test.ts', 'tests/nuevo.test.ts'],
+             'integration': ['itests/a.test.ts']}
+    shards = jestshard.plan(root, files, 3, timings)
+    # Los núcleos se reparten según el tiempo estimado de cada config (al
+    # menos un shard por config) y los más largos van primero
+    assert [(s.config, s.files, s.estimate) for s in shards] == [
+        ('unit', ['tests/lento.test.ts'], 9.0),
+        ('unit', ['tests/medio.test.ts', 'tests/rapido.test.ts'], 4.5),
+        ('unit', ['tests/nuevo.test.ts'], 3.0),
+        ('integration', ['itests/a.test.ts'], 2.0),
+    ]
+
+
+def test_shards_run_in_parallel_and_feed_the_timing_model(tmp_path):
+    root = project(tmp_path, {
+        'tests/a.test.ts': {'sleep': 0.6},
+        'tests/b.test.ts': {'sleep': 0.3},
+        'tests/c.test.ts': {'sleep': 0.3, 'fail': True},
+        'itests/d.test.ts': {'sleep': 0.1},
+    })
+    command = jestshard.jest_command(root, CONFIG)
+    files = {c: jestshard.list_tests(root, command, c) for c in ('jest.config.js', 'jest.config.integration.js')}
+    assert files['jest.config.js'] == ['tests/a.test.ts', 'tests/b.test.ts', 'tests/c.test.ts']
+
+    shards = jestshard.plan(root, files, 3)
+    report = jestshard.run(root, CONFIG, shards, jobs=3)
+    assert not report.ok and report.totals() == (8, 1)
+    assert [f.path for f in report.failed_files] == ['tests/c.test.ts']
+    assert 'toBe' in report.failed_files[0].message
+    assert report.wall < sum(s.duration for s in report.shards)
+
+    timings = jestshard.update_timings(root, report)
+    assert 0.55 <= jestshard.Timings(root).estimate('jest.config.js', 'tests/a.test.ts') < 1.0
+    # Con los tiempos reales el archivo largo queda solo en su shard
+    unit = [s for s in jestshard.plan(root, files, 3, timings) if s.config == 'jest.config.js']
+    assert ['tests/a.test.ts'] in [s.files for s in unit]
+
+
+def test_coverage_from_shards_is_merged(tmp_path):
+    root = project(tmp_path, {
+        'tests/a.test.ts': {'sleep': 0, 'covers': [0, 1]},
+        'tests/b.test.ts': {'sleep': 0, 'covers': [3]},
+    })
+    shards = jestshard.plan(root, {'jest.config.js': ['tests/a.test.ts', 'tests/b.test.ts']}, 2)
+    assert len(shards) == 2
+    report = jestshard.run(root, CONFIG, shards, coverage=True)
+    assert report.ok
+    # Sentencias 0, 1 y 3 cubiertas; líneas 1 y 2 (la 2 solo por la sentencia 3)
+    assert report.coverage['statements'] == {'total': 4, 'covered': 3, 'skipped': 0, 'pct': 75.0}
+    assert report.coverage['lines']['pct'] == 100
+    assert report.coverage['branches']['covered'] == 2
+    with open(os.path.join(root, 'coverage', 'coverage-final.json')) as f:
+        assert json.load(f)[os.path.join(root, 'src', 'lib.ts')]['s'] == {'0': 1, '1': 1, '2': 0, '3': 1}
+    with open(os.path.join(root, 'coverage', 'coverage-summary.json')) as f:
+        assert json.load(f)['total']['statements']['pct'] == 75.0
+
+
+def test_merged_coverage_is_checked_against_thresholds(tmp_path):
+    root = project(tmp_path, {
+        'tests/a.test.ts': {'sleep': 0, 'covers': [0, 1]},
+        'tests/b.test.ts': {'sleep': 0, 'covers': [3]},
+    })
+    shards = jestshard.plan(root, {'jest.config.js': ['tests/a.test.ts', 'tests/b.test.ts']}, 2)
+    # Unidos: sentencias 75 %, ramas 100 %; cada shard por separado queda más abajo
+    write(root, 'thresholds.json', json.dumps({'global': {'statements': 75, 'branches': 100}}))
+    assert jestshard.run(root, CONFIG, shards, coverage=True).ok
+
+    write(root, 'thresholds.json', json.dumps({
+        'global': {'lines': 50}, './src/': {'statements': 80, 'branches': -1}, './src/app/api/': {'lines': 80},
+    }))
+    report = jestshard.run(root, CONFIG, shards, coverage=True)
+    assert all(s.ok for s in report.shards) and not report.ok
+    # src/lib.ts cae en ./src/, así que global y ./src/app/api/ se quedan sin archivos
+    assert report.coverage_misses == [
+        'global: sin datos de cobertura',
+        './src/: statements 75.0% (mínimo 80%)',
+        './src/app/api/: sin datos de cobertura',
+    ]
+
+    write(root, 'thresholds.json', json.dumps({'src/*.ts': {'statements': 100}}))
+    report = jestshard.run(root, CONFIG, shards, coverage=True)
+    assert report.coverage_misses == ['src/lib.ts: statements 75.0% (mínimo 100%)']
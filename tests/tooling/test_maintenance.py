@@ -0,0 +1,76 @@
+import json
+import os
+import subprocess
+import sys
+
+from rent360push import coordinator, maintenance
+from rent360push.config import Config
+from rent360push.git import GitSession
+
+from .conftest import git, write
+
+CONFIG = Config(maintenance_loose_objects=20, maintenance_max_packs=2)
+PACKAGE_PARENT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+def commit_files(repo, prefix, count):
+    for i in range(count):
+        write(repo, f'src/{prefix}{i}.ts', f'export const {prefix}{i} = {i};\n')
+    git(repo, 'add', '-A')
+    git(repo, 'commit', '-q', '-m', prefix)
+
+
+def test_loose_objects_are_packed_and_graph_written(repo):
+    commit_files(repo, 'gen', 30)
+    with GitSession(repo) as session:
+        before = maintenance.stats(session)
+        assert before.loose_objects >= 30 and before.packs == 0 and not before.commit_graph
+        assert [t.name for t in maintenance.plan(before, CONFIG)] == ['loose', 'commit-graph']
+        # Con umbrales por defecto un repo de este tamaño no necesita nada
+        assert maintenance.plan(before, Config()) == []
+
+        done = []
+        run = maintenance.maintain(session, CONFIG, on_task=lambda task, result: done.append(result.ok))
+        assert done == [True, True]
+        after = maintenance.stats(session)
+        assert after.loose_objects == 0 and after.packs == 1 and after.commit_graph and not after.commit_graph_stale
+        assert run.before['loose_objects'] == before.loose_objects and run.after['packs'] == 1
+        assert run.probe_before is not None and run.probe_after is not None
+        assert maintenance.plan(after, CONFIG) == []
+    assert [t['name'] for t in maintenance.load(repo)['runs'][-1]['tasks']] == ['loose', 'commit-graph']
+
+
+def test_many_packs_get_geometric_repack_and_midx(repo):
+    for n in range(4):
+        commit_files(repo, f'p{n}_', 8)
+        git(repo, 'repack', '-d', '-q')
+    with GitSession(repo) as session:
+        maintenance.maintain(session, CONFIG, [maintenance.Task('commit-graph', '', maintenance.TASKS['commit-graph'])])
+        before = maintenance.stats(session)
+        assert before.packs == 4 and before.commit_graph and not before.midx
+        assert [t.name for t in maintenance.plan(before, CONFIG)] == ['geometric', 'commit-graph', 'midx']
+        maintenance.maintain(session, CONFIG)
+        after = maintenance.stats(session)
+    assert after.packs < 4 and after.midx and not after.midx_stale
+    assert after.packed_objects >= before.packed_objects
+    git(repo, 'fsck', '--no-progress')
+
+
+def test_background_run_is_throttled_and_waits_for_uploads(repo):
+    commit_files(repo, 'gen', 30)
+    with GitSession(repo) as session:
+        assert [t.name for t in maintenance.due(session, CONFIG, now=10 ** 6)] == ['loose', 'commit-graph']
+        assert maintenance.due(session, CONFIG, now=10 ** 6 + CONFIG.maintenance_interval - 1) == []
+
+    with coordinator.lock(repo):
+        assert maintenance.wait_for_uploads(repo, timeout=0) is False
+    assert maintenance.wait_for_uploads(repo, timeout=0) is True
+
+    # Lo que lanza el hook post_push, sin desacoplar para poder esperarlo
+    write(repo, '.rent360push.json', json.dumps({'maintenance_loose_objects': 20}))
+    env = dict(os.environ, PYTHONPATH=PACKAGE_PARENT)
+    proc = subprocess.run([sys.executable, '-m', 'rent360push', 'maintenance', 'run', '--auto', '--quiet'],
+                          cwd=repo, env=env, capture_output=True, text=True)
+    assert proc.returncode == 0 and proc.stdout == ''
+    with GitSession(repo) as session:
+        assert maintenance.stats(session).loose_objects == 0
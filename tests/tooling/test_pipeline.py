@@ -0,0 +1,103 @@
+import os
+import threading
+
+from rent360push.config import Config
+from rent360push.git import GitSession
+from rent360push.pipeline import UploadPipeline, parse_porcelain
+
+from .conftest import git, write
+
+
+def test_parse_porcelain():
+    entries = parse_porcelain(b' M src/a.ts\0?? nuevo archivo.md\0D  viejo.js\0')
+    assert [(e.index, e.worktree, e.path) for e in entries] == [
+        (' ', 'M', 'src/a.ts'),
+        ('?', '?', 'nuevo archivo.md'),
+        ('D', ' ', 'viejo.js'),
+    ]
+    assert [e.needs_staging for e in entries] == [True, True, False]
+    assert entries[2].staged
+
+
+def test_session_reuses_helpers_and_sees_new_head(repo):
+    with GitSession(repo) as session:
+        first = session.resolve('HEAD')
+        blob = session.read_object('HEAD:src/mod0000/file000000.ts')
+        assert blob.type == 'blob' and 'archivo sintético 0'.encode() in blob.data
+        assert session.read_object('HEAD:no/existe.ts') is None
+
+        write(repo, 'src/mod0000/file000001.ts', 'cambio\n')
+        session.stage(['src/mod0000/file000001.ts'])
+        session.run('commit', '-q', '-m', 'cambio')
+        assert session.resolve('HEAD') != first
+        # status + commit + 2 helpers cat-file + update-index
+        assert session.spawned == 4
+
+
+def test_stage_counts_paths_and_survives_many_warnings(repo):
+    # Cada archivo genera un aviso CRLF: tanto las rutas como los avisos
+    # superan el buffer de un pipe
+    git(repo, 'config', 'core.autocrlf', 'true')
+    paths = [f'crlf/{"directorio-largo-" * 5}/archivo{i:04d}.txt' for i in range(1500)]
+    for path in paths:
+        write(repo, path, 'linea\n')
+
+    flushed = []
+    session = GitSession(repo)
+    worker = threading.Thread(
+        target=lambda: (session.stage(paths), flushed.append(session.flush_index())), daemon=True
+    )
+    worker.start()
+    worker.join(60)
+    if worker.is_alive():
+        session._index.kill()
+        raise AssertionError('update-index se bloqueó escribiendo avisos')
+    session.close()
+    assert flushed == [len(paths)]
+    assert git(repo, 'ls-files', 'crlf').count('\n') == len(paths)
+
+
+def test_upload_stages_only_changes_and_pushes(repo):
+    write(repo, 'src/mod0000/file000002.ts', 'editado\n')
+    write(repo, 'docs/nuevo.md', '# nuevo\n')
+    os.remove(os.path.join(repo, 'src/mod0001/file000031.ts'))
+
+    with GitSession(repo) as session:
+        result = UploadPipeline(session, Config()).run('fix: cambios')
+
+    assert result.ok
+    assert result.pushed_to == 'origin/master'
+    assert git(repo, 'status', '--porcelain') == ''
+    changed = git(repo, 'show', '--name-status', '--format=', 'HEAD').split('\n')
+    assert sorted(filter(None, changed)) == [
+        'A\tdocs/nuevo.md', 'D\tsrc/mod0001/file000031.ts', 'M\tsrc/mod0000/file000002.ts'
+    ]
+    assert git(repo + '.remote.git', 'rev-parse', 'master') == git(repo, 'rev-parse', 'HEAD')
+
+
+def test_upload_limited_to_paths_and_nothing_to_commit(repo):
+    write(repo, 'a.txt', 'a\n')
+    write(repo, 'b.txt', 'b\n')
+    with GitSession(repo) as session:
+        result = UploadPipeline(session, Config()).run('fix: solo a', paths=['a.txt'], push=False)
+    assert result.ok and result.commit
+    assert git(repo, 'status', '--porcelain') == '?? b.txt\n'
+
+    os.remove(os.path.join(repo, 'b.txt'))
+    with GitSession(repo) as session:
+        result = UploadPipeline(session, Config()).run('vacío', push=False)
+    assert result.ok and result.commit is None
+    assert result.steps[-1].detail == 'No hay cambios para commitear'
+
+
+def test_push_goes_to_remote_default_branch(repo):
+    # El remoto despliega desde main aunque la rama local siga siendo master
+    remote = repo + '.remote.git'
+    git(remote, 'branch', 'main', 'master')
+    git(remote, 'symbolic-ref', 'HEAD', 'refs/heads/main')
+    write(repo, 'a.txt', 'a\n')
+    with GitSession(repo) as session:
+        result = UploadPipeline(session, Config()).run('fix')
+    assert result.ok and result.pushed_to == 'origin/main'
+    assert len(result.pushes) == 1
+    assert git(remote, 'rev-parse', 'main') == git(repo, 'rev-parse', 'HEAD')
@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from rent360push.bench import startup
+from rent360push.config import Config
+from rent360push.git import GitSession
+from rent360push.pipeline import UploadPipeline
+from rent360push.plugins import Registry
+
+from .conftest import git, write
+
+PLUGIN = """
+calls = []
+
+def check(pipeline):
+    calls.append('pre_push')
+    return False, 'rechazado por el plugin'
+
+def sign(pipeline, message, paths):
+    return f'{message}\\n\\nArchivos: {len(paths)}'
+
+def notify(pipeline, result):
+    calls.append(result.commit)
+"""
+
+
+@pytest.fixture
+def plugin_module(tmp_path, monkeypatch):
+    (tmp_path / 'r360_plugin.py').write_text(PLUGIN, encoding='utf-8')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield 'r360_plugin'
+    sys.modules.pop('r360_plugin', None)
+
+
+def test_registry_is_lazy_and_configurable(plugin_module):
+    config = Config(guard=False, hooks=False, plugins={'pre_push': [f'{plugin_module}:check']}, plugins_disable=['buildlog', 'maintenance'])
+    registry = Registry(config, entry_points=False)
+    assert [p.name for p in registry.get('pre_commit')] == []
+    assert [p.name for p in registry.get('pre_push')] == ['docker', 'i18n', 'validate', 'check']
+    assert registry.get('post_push') == []
+    assert plugin_module not in sys.modules
+    assert registry.get('pre_push')[3](None) == (False, 'rechazado por el plugin')
+    assert plugin_module in sys.modules
+
+    assert Registry(config, entry_points=False, checks=False).get('pre_push') == []
+    with pytest.raises(ValueError):
+        Registry(Config(plugins={'pre_push': ['sin_atributo']}))
+    with pytest.raises(ValueError):
+        Registry(Config(plugins={'on_deploy': ['mod:attr']}))
+
+
+def test_pipeline_runs_hooks_in_process(repo, plugin_module):
+    write(repo, 'src/extra.ts', 'export const extra = 1;\n')
+    config = Config(validate=False, guard=False, plugins={
+        'commit_message': [f'{plugin_module}:sign'],
+        'post_push': [f'{plugin_module}:notify'],
+    })
+    with GitSession(repo) as session:
+        pipeline = UploadPipeline(session, config, plugins=Registry(config, entry_points=False))
+        result = pipeline.run('feat: extra')
+    assert result.ok
+    assert git(repo, 'log', '-1', '--format=%B').strip() == 'feat: extra\n\nArchivos: 1'
+    assert sys.modules[plugin_module].calls == [result.commit]
+
+    # Un pre_push que falla frena el push; sin commits nuevos no se intenta
+    write(repo, 'src/extra.ts', 'export const extra = 2;\n')
+    config.plugins = {'pre_push': [f'{plugin_module}:check']}
+    steps = []
+    with GitSession(repo) as session:
+        result = UploadPipeline(session, config, on_step=steps.append,
+                                plugins=Registry(config, entry_points=False)).run('feat: extra 2')
+        assert not result.ok and [s.name for s in steps][-1] == 'check'
+        git(repo, 'reset', '-q', '--hard', 'HEAD~1')
+        steps.clear()
+        result = UploadPipeline(session, config, on_step=steps.append,
+                                plugins=Registry(config, entry_points=False)).run('feat: nada')
+    assert result.ok and steps[-1].detail == 'sin commits nuevos'
+
+
+def test_noop_push_skips_heavy_imports(repo):
+    # Archivos viejos: la caché de stat no los considera "racy"
+    old = time.time() - 60
+    for base, _, files in os.walk(os.path.join(repo, 'src')):
+        for name in files:
+            os.utime(os.path.join(base, name), (old, old))
+    git(repo, 'update-index', '-q', '--refresh')
+    cmd = startup.commands()['noop']
+    env = startup._env()
+    first = subprocess.run(cmd, cwd=repo, env=env, capture_output=True, text=True)
+    assert first.returncode == 0, first.stdout + first.stderr
+    modules = startup.imported_modules(cmd, repo, env)
+    assert 'rent360push.pipeline' in modules
+    assert startup.eager(modules) == []
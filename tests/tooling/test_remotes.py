@@ -0,0 +1,77 @@
+import json
+import os
+import subprocess
+
+from rent360push import remotes
+from rent360push.config import Config, state_dir
+from rent360push.git import GitSession
+from rent360push.pipeline import UploadPipeline
+
+from .conftest import git, write
+
+
+def add_mirror(repo, name, branch='main'):
+    path = f'{repo}.{name}.git'
+    subprocess.run(['git', 'init', '-q', '--bare', '-b', branch, path], check=True)
+    git(repo, 'remote', 'add', name, path)
+    return path
+
+
+def test_parse_symref():
+    output = 'ref: refs/heads/main\tHEAD\nabc\tHEAD\nabc\trefs/heads/main\n'
+    assert remotes.parse_symref(output) == 'main'
+    assert remotes.parse_symref('abc\trefs/heads/main\n', ['master', 'main']) == 'main'
+    assert remotes.parse_symref('', ['master']) is None
+    assert remotes.Target.parse('backup:deploy') == remotes.Target('backup', 'deploy')
+
+
+def test_default_branch_is_cached_until_ttl(repo):
+    remote = repo + '.remote.git'
+    config = Config()
+    with GitSession(repo) as session:
+        assert remotes.default_branch(session, config, 'origin') == ('master', False)
+        git(remote, 'branch', 'main', 'master')
+        git(remote, 'symbolic-ref', 'HEAD', 'refs/heads/main')
+        # Dentro del TTL no se vuelve a consultar el remoto
+        spawned = session.spawned
+        assert remotes.default_branch(session, config, 'origin') == ('master', True)
+        assert session.spawned - spawned == 1  # solo `remote get-url`
+
+        path = os.path.join(state_dir(repo), remotes.CACHE_FILE)
+        with open(path) as f:
+            cache = json.load(f)
+        cache['origin']['checked'] -= config.default_branch_ttl + 1
+        with open(path, 'w') as f:
+            json.dump(cache, f)
+        assert remotes.default_branch(session, config, 'origin') == ('main', False)
+
+
+def test_pushes_all_targets_concurrently(repo):
+    backup = add_mirror(repo, 'backup')
+    write(repo, 'src/nuevo.ts', 'export const a = 1;\n')
+    config = Config(targets=['origin', 'backup:respaldo'])
+    steps = []
+    with GitSession(repo) as session:
+        result = UploadPipeline(session, config, on_step=steps.append).run('nuevo')
+    assert result.ok
+    assert result.pushed_to == 'origin/master, backup/respaldo'
+    assert all(p.ok and p.duration > 0 for p in result.pushes)
+    head = git(repo, 'rev-parse', 'HEAD')
+    assert git(repo + '.remote.git', 'rev-parse', 'master') == head
+    assert git(backup, 'rev-parse', 'respaldo') == head
+    assert ' ms' in steps[-1].detail and 'backup/respaldo' in steps[-1].detail
+
+
+def test_failed_target_is_reported_and_forgets_cached_branch(repo):
+    git(repo, 'remote', 'add', 'roto', repo + '.no-existe.git')
+    write(repo, 'a.txt', 'a\n')
+    # Un remoto mal configurado no es falta de red: falla sin ir a la cola
+    config = Config(targets=['origin', 'roto'])
+    with GitSession(repo) as session:
+        result = UploadPipeline(session, config).run('fix')
+    assert not result.ok and result.spooled == []
+    assert result.pushed_to == 'origin/master'
+    failed = [p for p in result.pushes if not p.ok]
+    assert [str(p.target) for p in failed] == ['roto/master'] and failed[0].error
+    assert remotes.cached_default_branch(repo, 'roto') is None
+    assert remotes.cached_default_branch(repo, 'origin') == 'master'
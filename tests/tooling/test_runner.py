@@ -0,0 +1,63 @@
+import sys
+import time
+
+from rent360push import runner
+from rent360push.config import Config
+from rent360push.git import GitSession
+from rent360push.pipeline import UploadPipeline
+
+from .conftest import write
+
+PY = sys.executable
+
+
+def test_streams_lines_split_on_carriage_return():
+    lines = []
+    script = "import sys; sys.stderr.write('10%\\r50%\\r100%, done.\\n'); print('fin')"
+    result = runner.run([PY, '-c', script], on_output=lambda stream, line: lines.append((stream, line)))
+    assert result.ok
+    assert [l for s, l in lines if s == 'stderr'] == ['10%', '50%', '100%, done.']
+    assert ('stdout', 'fin') in lines
+    assert result.stdout == b'fin\n'
+
+
+def test_kills_process_after_idle_timeout():
+    result = runner.run([PY, '-c', 'import time; print("hola", flush=True); time.sleep(30)'], idle_timeout=0.5)
+    assert result.timed_out and not result.ok
+    assert result.stdout == b'hola\n'
+    assert result.duration < 10
+
+
+def test_output_keeps_slow_process_alive():
+    script = 'import time\nfor i in range(6):\n    print(i, flush=True); time.sleep(0.2)'
+    result = runner.run([PY, '-c', script], idle_timeout=0.6)
+    assert result.ok
+    assert result.duration > 1
+
+
+def test_run_many_runs_jobs_concurrently():
+    jobs = [(i, [PY, '-c', 'import time; time.sleep(0.5)'], {}) for i in range(4)]
+    seen = []
+    start = time.perf_counter()
+    results = runner.run_many(jobs, limit=4, on_result=lambda key, result: seen.append(key))
+    assert time.perf_counter() - start < 1.8
+    assert sorted(seen) == [0, 1, 2, 3] and all(r.ok for r in results.values())
+
+
+def test_idle_allowance_grows_with_pack_size():
+    assert runner.idle_allowance(60, 2, 0) == 60
+    assert runner.idle_allowance(60, 2, 10 * 1024 * 1024) == 80
+    assert runner.idle_allowance(None, 2, 1) is None
+
+
+def test_push_streams_progress(repo):
+    write(repo, 'src/nuevo.ts', 'export const a = 1;\n')
+    lines = []
+    with GitSession(repo) as session:
+        assert session.pending_pack_size('origin') == 0
+        pipeline = UploadPipeline(
+            session, Config(validate=False), on_output=lambda stream, line: lines.append(line)
+        )
+        result = pipeline.run('nuevo')
+    assert result.ok and result.pushed_to == 'origin/master'
+    assert any('master' in line for line in lines)
@@ -0,0 +1,64 @@
+import os
+
+from rent360push import scan
+from rent360push.config import Config
+
+from .conftest import write
+
+SAMPLE = """import { logger } from '@/lib/logger';
+
+export function cargar() {
+  console.log('cargando'); console.warn('dos en la misma línea');
+  try {
+    hacer();
+  } catch (error) {
+    logger.error('Error cargando datos:', error);
+    logger.error('Error con contexto', { error });
+  }
+}
+"""
+
+
+def make_sources(root):
+    write(root, 'src/app/page.tsx', SAMPLE)
+    write(root, 'services/auth/index.ts', 'console.error("fallo");\n')
+    write(root, 'src/vacio.ts', '')
+    write(root, 'docs/no.ts', 'console.log(1);\n')
+
+
+def test_scan_finds_configured_patterns(repo):
+    make_sources(repo)
+    result = scan.scan(repo, Config(), jobs=1)
+    found = [(path, line) for path, line, _ in result.rows if not path.startswith('src/mod')]
+    assert found == [('services/auth/index.ts', 1), ('src/app/page.tsx', 4), ('src/app/page.tsx', 8)]
+    text = {(p, l): t for p, l, t in result.rows}
+    assert text[('src/app/page.tsx', 8)] == "    logger.error('Error cargando datos:', error);"
+
+
+def test_rescan_only_touches_changed_files(repo):
+    make_sources(repo)
+    config = Config()
+    first = scan.scan(repo, config)
+    assert first.rescanned == first.files
+    write(repo, 'services/auth/index.ts', '// sin consola\n')
+    second = scan.scan(repo, config)
+    assert second.rescanned == 1
+    assert all(path != 'services/auth/index.ts' for path, _, _ in second.rows)
+
+    # Cambiar los patrones invalida la caché
+    config.scan_patterns = [r"(['\"])fallo\1"]
+    write(repo, 'services/auth/index.ts', 'console.error("fallo");\n')
+    third = scan.scan(repo, config)
+    assert third.rescanned == third.files
+    assert [(p, l) for p, l, _ in third.rows] == [('services/auth/index.ts', 1)]
+
+
+def test_csv_matches_export_csv_format_and_skips_rewrites(tmp_path):
+    path = str(tmp_path / 'console_usage.csv')
+    rows = [('src/a.ts', 3, 'console.log("hola", x);')]
+    assert scan.write_csv(path, rows)
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == '"Path","LineNumber","Line"\n"src/a.ts","3","console.log(""hola"", x);"\n'
+    mtime = os.stat(path).st_mtime_ns
+    assert not scan.write_csv(path, rows)
+    assert os.stat(path).st_mtime_ns == mtime
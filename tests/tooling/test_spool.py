@@ -0,0 +1,73 @@
+import os
+import random
+
+from rent360push import spool
+from rent360push.config import Config
+from rent360push.git import GitSession
+from rent360push.pipeline import UploadPipeline
+
+from .conftest import git, write
+
+CONFIG = Config(validate=False, guard=False, spool_backoff=1, spool_backoff_max=8)
+
+
+def upload(repo, message, rel):
+    write(repo, rel, f'export const v = "{message}";\n')
+    steps = []
+    with GitSession(repo) as session:
+        result = UploadPipeline(session, CONFIG, on_step=steps.append).run(message)
+    return result, steps
+
+
+def test_backoff_is_exponential_with_jitter():
+    rng = random.Random(7)
+    for attempt, ceiling in [(1, 1), (2, 2), (3, 4), (4, 8), (9, 8)]:
+        delays = [spool.backoff(attempt, 1, 8, rng) for _ in range(50)]
+        assert all(1 <= d <= ceiling for d in delays)
+        if ceiling > 2:
+            assert max(delays) - min(delays) > ceiling / 4
+
+
+def test_offline_commits_are_spooled_and_sent_in_one_push(repo):
+    remote = repo + '.remote.git'
+    # Sin red: el remoto no responde (nunca se consultó su rama por defecto)
+    git(repo, 'remote', 'set-url', 'origin', 'http://127.0.0.1:9/rent360.git')
+
+    first, steps = upload(repo, 'feat: sin red 1', 'src/offline1.ts')
+    second, _ = upload(repo, 'feat: sin red 2', 'src/offline2.ts')
+    assert first.ok and second.ok
+    assert 'en cola' in steps[-1].detail
+    # No se encola la rama supuesta (master) sino el destino simbólico
+    assert [str(t) for t in second.spooled] == ['origin']
+    entries = spool.pending(repo)
+    assert [(e['commit'], e['branch']) for e in entries] == [(first.commit, None), (second.commit, None)]
+
+    # Sigue sin red: el intento falla, se programa el siguiente con backoff
+    assert spool.drain(repo, CONFIG, once=True) is False
+    state = spool.load(repo)
+    assert state['attempts'] == 2 and 'rama por defecto desconocida' in state['error']
+
+    # Vuelve la red; el remoto despliega desde main
+    git(remote, 'branch', 'main', 'master')
+    git(remote, 'symbolic-ref', 'HEAD', 'refs/heads/main')
+    git(repo, 'remote', 'set-url', 'origin', remote)
+    waits, attempts = [], []
+    assert spool.drain(repo, CONFIG, sleep=waits.append, on_attempt=lambda ok, p: attempts.append(len(p))) is True
+    assert attempts == [1] and len(waits) == 1 and 0 < waits[0] <= 2
+    assert git(remote, 'rev-parse', 'main').strip() == second.commit
+    assert git(remote, 'rev-parse', 'master').strip() != second.commit
+    assert spool.pending(repo) == []
+
+
+def test_rejected_push_is_not_spooled(repo):
+    other = repo + '.other'
+    git(os.path.dirname(repo), 'clone', '-q', repo + '.remote.git', other)
+    write(other, 'src/other.ts', 'export const other = 1;\n')
+    git(other, 'add', '-A')
+    git(other, 'commit', '-q', '-m', 'otro equipo')
+    git(other, 'push', '-q', 'origin', 'master')
+
+    result, steps = upload(repo, 'feat: rechazado', 'src/mine.ts')
+    assert not result.ok and result.spooled == []
+    assert '❌' in steps[-1].detail
+    assert spool.pending(repo) == []
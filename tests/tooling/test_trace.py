@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from rent360push import trace
+from rent360push.config import Config
+from rent360push.git import GitSession
+from rent360push.pipeline import UploadPipeline
+
+from .conftest import write
+
+
+@pytest.fixture
+def tracer(repo):
+    yield trace.configure(repo, Config())
+    trace.disable()
+
+
+def test_upload_writes_step_and_command_spans(repo, tracer):
+    write(repo, 'src/nuevo.ts', 'export const a = 1;\n')
+    with GitSession(repo) as session:
+        result = UploadPipeline(session, Config(validate=False)).run('nuevo')
+    assert result.ok
+
+    records = list(trace.read(repo))
+    runs = {r['run'] for r in records}
+    assert len(runs) == 1 and None not in runs
+    steps = [r['step'] for r in records if r['kind'] == 'step']
+    assert steps == ['status', 'stage', 'commit', 'push']
+    commands = [r for r in records if r['kind'] == 'command']
+    push = [r for r in commands if r['command'][:2] == ['git', 'push']]
+    assert len(push) == 1 and push[0]['step'] == 'push' and push[0]['exit_code'] == 0
+    assert push[0]['stderr_bytes'] > 0 and push[0]['end'] >= push[0]['start']
+    commit = [r for r in commands if r['command'][:2] == ['git', 'commit']]
+    assert commit[0]['step'] == 'commit' and commit[0]['retries'] == 0
+    assert any(r['command'][:2] == ['git', 'update-index'] and r['step'] == 'stage' for r in commands)
+    assert records[-1]['kind'] == 'run' and records[-1]['ok']
+
+
+def test_log_rotates_and_is_read_in_order(tmp_path):
+    path = str(tmp_path / 'trace.jsonl')
+    tracer = trace.Tracer(path, max_bytes=200, backups=2)
+    for i in range(30):
+        tracer.emit({'kind': 'step', 'run': 'r', 'step': 'x', 'n': i, 'duration_ms': i})
+    files = tracer.files()
+    assert len(files) == 3 and files[-1] == path
+    seen = []
+    for name in files:
+        with open(name) as f:
+            seen.extend(json.loads(line)['n'] for line in f)
+    assert seen == sorted(seen) and seen[-1] == 29 and len(seen) < 30
+
+
+def test_summary_percentiles_and_retries(repo, tracer):
+    with trace.run(), trace.step('push'):
+        for attempt, ms in enumerate([10, 20, 30, 40, 1000]):
+            with trace.retrying(attempt):
+                trace.command(['git', 'push', 'origin'], 0.0, ms / 1000, 0 if attempt == 4 else 1, 0, 10)
+    records = list(trace.read(repo))
+    assert [r['retries'] for r in records] == [0, 1, 2, 3, 4]
+    summary = trace.summarize(records)
+    row = summary['commands'][('push', 'git push')]
+    assert row['count'] == 5 and row['failures'] == 4
+    assert row['p50_ms'] == 30 and row['p95_ms'] == 1000 and row['max_ms'] == 1000
+    assert trace.percentile(list(range(1, 101)), 95) == 95
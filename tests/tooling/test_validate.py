@@ -0,0 +1,102 @@
+import json
+import os
+import stat
+
+from rent360push import imports, validate
+from rent360push.graph import ImportGraph
+from rent360push.config import Config
+from rent360push.git import GitSession
+from rent360push.pipeline import UploadPipeline
+
+from .conftest import git, write
+
+# Herramienta falsa: falla si algún archivo recibido contiene "ROTO"
+FAKE_TOOL = """#!/bin/sh
+for arg in "$@"; do
+  case "$arg" in
+    *.json) files=$(python3 -c "import json,sys; print(' '.join(json.load(open(sys.argv[1]))['files']))" "$arg") ;;
+    *) files="$files $arg" ;;
+  esac
+done
+grep -l ROTO $files 2>/dev/null && exit 1
+exit 0
+"""
+
+
+def make_project(repo):
+    write(repo, '.gitignore', 'node_modules/\n')
+    write(repo, 'tsconfig.json', json.dumps({'compilerOptions': {'baseUrl': '.', 'paths': {'@/*': ['./src/*']}}}))
+    write(repo, 'src/lib/precio.ts', 'export const precio = 1;\n')
+    write(repo, 'src/app/pagina.tsx', "import { precio } from '@/lib/precio';\n")
+    write(repo, 'src/app/otra.ts', "export * from './pagina';\n")
+    write(repo, 'src/aislado.ts', 'export const x = 1;\n')
+    write(repo, 'tests/unit/precio.test.ts', "import { precio } from '../../src/lib/precio';\n")
+    for tool in ('tsc', 'eslint', 'jest'):
+        path = os.path.join(repo, 'node_modules', '.bin', tool)
+        write(repo, f'node_modules/.bin/{tool}', FAKE_TOOL)
+        os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    git(repo, 'add', '-A')
+    git(repo, 'commit', '-q', '-m', 'proyecto')
+    git(repo, 'push', '-q', 'origin', 'master')
+
+
+def test_resolves_aliases_relative_and_index_imports(repo):
+    make_project(repo)
+    aliases = imports.load_aliases(repo)
+    assert imports.resolve(repo, 'src/app/pagina.tsx', '@/lib/precio', aliases) == 'src/lib/precio.ts'
+    assert imports.resolve(repo, 'src/app/otra.ts', './pagina', aliases) == 'src/app/pagina.tsx'
+    assert imports.resolve(repo, 'src/app/otra.ts', 'react', aliases) is None
+    assert ImportGraph.load(repo).dependents(['src/lib/precio.ts']) == {
+        'src/lib/precio.ts', 'src/app/pagina.tsx', 'src/app/otra.ts', 'tests/unit/precio.test.ts'
+    }
+
+
+def test_plan_limits_checks_to_affected_files(repo):
+    make_project(repo)
+    tasks = validate.plan(repo, ['src/lib/precio.ts'], jobs=2)
+    by_name = {}
+    for task in tasks:
+        by_name.setdefault(task.name, []).extend(task.files)
+    assert sorted(by_name['tsc tsconfig.json']) == ['src/app/otra.ts', 'src/app/pagina.tsx', 'src/lib/precio.ts']
+    assert by_name['eslint'] == ['src/lib/precio.ts']
+    assert by_name['jest'] == ['tests/unit/precio.test.ts']
+    assert len([t for t in tasks if t.name.startswith('tsc')]) == 2
+    assert validate.plan(repo, ['README.md']) == []
+
+
+def test_failed_validation_blocks_push(repo):
+    make_project(repo)
+    remote_head = git(repo + '.remote.git', 'rev-parse', 'master')
+    write(repo, 'src/lib/precio.ts', 'export const precio: number = "ROTO";\n')
+    with GitSession(repo) as session:
+        pipeline = UploadPipeline(session, Config(), checks=[validate.pre_push_check])
+        result = pipeline.run('fix: precio')
+    assert result.commit and not result.ok
+    assert result.steps[-1].name == 'validate'
+    assert 'fallaron: tsc tsconfig.json' in result.steps[-1].detail
+    assert git(repo + '.remote.git', 'rev-parse', 'master') == remote_head
+
+    write(repo, 'src/lib/precio.ts', 'export const precio = 2;\n')
+    with GitSession(repo) as session:
+        result = UploadPipeline(session, Config(), checks=[validate.pre_push_check]).run('fix: precio')
+    assert result.ok and result.pushed_to == 'origin/master'
+
+
+def test_deleted_and_renamed_files_check_their_importers(repo):
+    make_project(repo)
+    git(repo, 'rm', '-q', 'src/lib/precio.ts')
+    git(repo, 'mv', 'src/aislado.ts', 'src/movido.ts')
+    git(repo, 'commit', '-q', '-m', 'borrar precio')
+    with GitSession(repo) as session:
+        changed, removed = validate.diff_paths(session, Config())
+    assert changed == ['src/movido.ts']
+    assert sorted(removed) == ['src/aislado.ts', 'src/lib/precio.ts']
+
+    by_name = {}
+    for task in validate.plan(repo, changed, jobs=1, removed=removed):
+        by_name.setdefault(task.name, []).extend(task.files)
+    # Quienes importaban el borrado ya no compilan; el borrado no se revisa
+    assert sorted(by_name['tsc tsconfig.json']) == ['src/app/otra.ts', 'src/app/pagina.tsx', 'src/movido.ts']
+    assert by_name['eslint'] == ['src/movido.ts']
+    assert by_name['jest'] == ['tests/unit/precio.test.ts']
+    assert validate.plan(repo, [], removed=['src/lib/precio.ts'])
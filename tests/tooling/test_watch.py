@@ -0,0 +1,81 @@
+import threading
+import time
+
+import pytest
+
+from rent360push import inotify
+from rent360push.config import Config
+from rent360push.watch import Debouncer, run_watch
+
+from .conftest import git, write
+
+
+def test_debouncer_groups_bursts_and_limits_pushes():
+    d = Debouncer(quiet=5, max_delay=60, min_push_interval=300)
+    assert d.deadline() is None  # en reposo: esperar sin timeout
+
+    d.add({'a.ts'}, 0)
+    d.add({'b.ts'}, 3)
+    assert d.commit_at() == 8
+    # Ediciones continuas: como mucho max_delay desde el primer evento
+    for t in range(4, 100, 2):
+        d.add({'a.ts'}, t)
+    assert d.commit_at() == 60
+    assert d.push_at() is None  # no se empuja mientras hay pendientes
+
+    assert d.take() == {'a.ts', 'b.ts'}
+    d.committed()
+    assert d.push_at() == 0.0
+    d.pushed(100, ok=True)
+    assert d.deadline() is None
+
+    d.add({'c.ts'}, 110)
+    d.take()
+    d.committed()
+    assert d.push_at() == 400
+    d.pushed(400, ok=False)
+    assert d.push_at() == 700  # el reintento también respeta el intervalo
+
+
+@pytest.mark.skipif(not inotify.available(), reason='requiere inotify')
+def test_watch_coalesces_edits_into_rate_limited_pushes(repo):
+    config = Config(validate=False, watch_quiet=0.3, watch_max_delay=5, watch_min_push_interval=60)
+    stop = threading.Event()
+    steps = []
+    thread = threading.Thread(
+        target=run_watch, args=(repo, config), kwargs={'stop': stop.is_set, 'on_step': steps.append}
+    )
+    base = int(git(repo, 'rev-list', '--count', 'HEAD'))
+    thread.start()
+    try:
+        time.sleep(0.3)
+        for i in range(5):
+            write(repo, f'src/nuevo{i}.ts', f'export const n = {i};\n')
+            time.sleep(0.05)
+
+        def commits():
+            return int(git(repo, 'rev-list', '--count', 'HEAD')) - base
+
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline and not any(s.name == 'push' for s in steps):
+            time.sleep(0.1)
+        assert commits() == 1
+        assert [s.ok for s in steps if s.name == 'push'] == [True]
+
+        # Segunda ráfaga: commit local, pero el push espera al intervalo mínimo
+        write(repo, 'src/otro.ts', 'export const o = 1;\n')
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline and commits() < 2:
+            time.sleep(0.1)
+        time.sleep(0.5)
+        assert commits() == 2
+        assert len([s for s in steps if s.name == 'push']) == 1
+        assert git(repo, 'rev-parse', 'origin/master') != git(repo, 'rev-parse', 'HEAD')
+
+        # En reposo casi no usa CPU
+        cpu = time.process_time()
+        time.sleep(1)
+        assert time.process_time() - cpu < 0.1
+    finally:
+        stop.set()
+        thread.join(5)
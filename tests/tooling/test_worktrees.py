@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from rent360push import worktrees
+from rent360push.config import Config
+from rent360push.git import GitSession
+
+from .conftest import git, write
+
+CONFIG = Config(worktree_pool_size=2)
+
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def node_modules(repo, lock='v1'):
+    write(repo, 'node_modules/.package-lock.json', lock)
+    write(repo, 'node_modules/typescript/lib/tsc.js', 'module.exports = 1;\n')
+    write(repo, 'node_modules/.cache/next/babel.json', '{}')
+    os.makedirs(os.path.join(repo, 'node_modules', '.bin'), exist_ok=True)
+    os.symlink('../typescript/lib/tsc.js', os.path.join(repo, 'node_modules', '.bin', 'tsc'))
+
+
+def test_snapshot_checkout_has_only_staged_changes(repo):
+    write(repo, 'src/a.ts', 'export const a = "preparado";\n')
+    git(repo, 'add', 'src/a.ts')
+    write(repo, 'src/a.ts', 'export const a = "a medias";\n')
+    write(repo, 'src/nuevo.ts', 'sin preparar\n')
+    with GitSession(repo) as session:
+        tree = worktrees.snapshot(session)
+        with worktrees.claim(session, CONFIG, tree) as checkout:
+            assert read(os.path.join(checkout.path, 'src/a.ts')) == 'export const a = "preparado";\n'
+            assert not os.path.exists(os.path.join(checkout.path, 'src/nuevo.ts'))
+            # Lo que deja un chequeo: basura y una caché de build
+            write(checkout.path, 'src/a.ts', 'pisado\n')
+            write(checkout.path, 'basura.txt', 'x')
+            write(checkout.path, '.next/cache/build.json', '{}')
+            first = checkout.name
+
+        # Vuelve al árbol de HEAD reescribiendo solo lo distinto; la caché queda
+        with worktrees.claim(session, CONFIG, 'HEAD') as checkout:
+            assert checkout.name == first
+            # src/a.ts solo existe en lo preparado
+            assert not os.path.exists(os.path.join(checkout.path, 'src/a.ts'))
+            assert git(checkout.path, 'rev-parse', 'HEAD') == git(repo, 'rev-parse', 'HEAD')
+            assert not os.path.exists(os.path.join(checkout.path, 'basura.txt'))
+            assert os.path.exists(os.path.join(checkout.path, '.next/cache/build.json'))
+            assert git(checkout.path, 'status', '--porcelain', '--untracked-files=no') == ''
+    # El árbol de trabajo del repo no se tocó
+    assert read(os.path.join(repo, 'src/a.ts')) == 'export const a = "a medias";\n'
+
+
+def test_node_modules_are_shared_by_hardlinks(repo):
+    node_modules(repo)
+    with GitSession(repo) as session:
+        with worktrees.claim(session, CONFIG, 'HEAD') as checkout:
+            assert checkout.modules == 'hardlink'
+            shared = os.path.join(checkout.path, 'node_modules', 'typescript', 'lib', 'tsc.js')
+            original = os.path.join(repo, 'node_modules', 'typescript', 'lib', 'tsc.js')
+            assert os.stat(shared).st_ino == os.stat(original).st_ino
+            assert os.readlink(os.path.join(checkout.path, 'node_modules', '.bin', 'tsc')) == '../typescript/lib/tsc.js'
+            # La caché de webpack/babel no se comparte
+            assert os.listdir(os.path.join(checkout.path, 'node_modules', '.cache')) == []
+
+        # Sin cambios en node_modules no se vuelve a enlazar
+        write(repo, 'node_modules/typescript/extra.js', '')
+        with worktrees.claim(session, CONFIG, 'HEAD') as checkout:
+            assert not os.path.exists(os.path.join(checkout.path, 'node_modules', 'typescript', 'extra.js'))
+        # Un `npm ci` (otro .package-lock.json) sí
+        write(repo, 'node_modules/.package-lock.json', 'v2')
+        with worktrees.claim(session, CONFIG, 'HEAD') as checkout:
+            assert os.path.exists(os.path.join(checkout.path, 'node_modules', 'typescript', 'extra.js'))
+
+        symlinked = Config(worktree_pool_size=2, worktree_modules='symlink')
+        with worktrees.claim(session, symlinked, 'HEAD') as a, worktrees.claim(session, symlinked, 'HEAD') as b:
+            assert a.name != b.name
+            assert os.path.realpath(os.path.join(b.path, 'node_modules')) == os.path.realpath(
+                os.path.join(repo, 'node_modules'))
+    assert read(os.path.join(repo, 'node_modules', 'typescript', 'lib', 'tsc.js')) == 'module.exports = 1;\n'
+
+
+def test_claims_are_exclusive_and_pool_can_be_cleaned(repo):
+    with GitSession(repo) as session:
+        warmed = worktrees.warm(session, CONFIG)
+        assert [c.name for c in warmed] == ['wt-0', 'wt-1']
+        with worktrees.claim(session, CONFIG, 'HEAD') as first:
+            with worktrees.claim(session, CONFIG, 'HEAD') as second:
+                assert first.name != second.name
+                with pytest.raises(RuntimeError, match='ocupados'):
+                    with worktrees.claim(session, CONFIG, 'HEAD', timeout=0):
+                        pass
+            busy = [name for name, is_busy, _ in worktrees.status(repo) if is_busy]
+            assert busy == [first.name]
+            # Los ocupados no se borran
+            assert worktrees.remove(session) == 1
+        assert worktrees.remove(session) == 1
+    assert worktrees.slots(repo) == []
+    assert len(git(repo, 'worktree', 'list').splitlines()) == 1